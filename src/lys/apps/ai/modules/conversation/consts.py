@@ -14,6 +14,18 @@ AI_PURPOSE_CHATBOT = "chatbot"
 DEFAULT_DYNAMIC_CONTEXT_HEADER = "## Dynamic context"
 DEFAULT_SUMMARY_HEADER = "## Previous conversation summary"
 
+# Read-only tool calls of a same LLM turn run concurrently, at most this many at a time.
+# Overridable via the ai plugin config (chatbot.max_concurrent_tool_calls); 1 runs every
+# tool call one after another.
+DEFAULT_MAX_CONCURRENT_TOOL_CALLS = 4
+
+# Serialized conversation histories kept between turns (cf. conversation.history), at most
+# this many conversations, each for this many seconds after its last turn. Overridable via
+# the ai plugin config (chatbot.history_cache.{size, ttl, redis}); a size of 0 disables the
+# cache, redis also keeps the histories in Redis for the other workers.
+DEFAULT_HISTORY_CACHE_SIZE = 1000
+DEFAULT_HISTORY_CACHE_TTL_SECONDS = 3600
+
 
 # Conversation compaction. Defaults are locale-neutral and overridable via the ai plugin
 # config: the `conversation_summary` endpoint (provider / model / system_prompt) and
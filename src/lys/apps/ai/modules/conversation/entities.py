@@ -92,11 +92,12 @@ class AIMessage(Entity):
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # For tool calls (role=assistant)
-    tool_calls: Mapped[Optional[List[dict]]] = mapped_column(JSON, nullable=True)
+    # none_as_null: the rows written by a message buffer pass None explicitly, store SQL NULL
+    tool_calls: Mapped[Optional[List[dict]]] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     # For tool results (role=tool)
     tool_call_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    tool_result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    tool_result: Mapped[Optional[dict]] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     # Metrics (role=assistant only)
     provider: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
@@ -0,0 +1,253 @@
+"""
+Incremental cache of the conversation histories sent to the LLM.
+
+Every chatbot turn sends the history of its conversation (the messages after the
+current compaction summary boundary) to the LLM. Instead of selecting and
+serializing the whole history on every turn, ``AIConversationService`` keeps the
+serialized history of each conversation here and only selects the messages
+written after the last one it holds (cf. ``ConversationHistory.cursor``):
+
+- Each entry is bound to the compaction summary it was built after. When a
+  compaction job completes a new summary, the next turn finds another current
+  summary and drops the messages now carried by it (``rebased``), or rebuilds
+  the entry when its new boundary is not among the cached messages.
+- Messages get their ``created_at`` when a turn buffers them and are committed
+  when it ends, so a turn overlapping another one of the conversation may commit
+  messages behind the cursor of an entry. The turns count the messages up to the
+  cursor of the entry they start from, and rebuild it when the count differs.
+- An entry also carries the message references the compaction boundary is
+  picked from and a running token estimate of the history, so
+  ``maybe_enqueue_compaction`` does not reload the conversation either.
+- Entries live in a bounded in-process LRU and, when ``redis`` is enabled and
+  the pubsub plugin configured, in Redis under ``lys:ai_history:`` so that the
+  other workers of the app start from them too. Both expire ``ttl`` seconds
+  after their last update.
+
+Settings (ai plugin, ``chatbot.history_cache``): ``size``, ``ttl`` and
+``redis``; a ``size`` of 0 disables the cache.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from lys.apps.ai.modules.conversation.consts import AIMessageRole
+from lys.core.managers.pubsub import PubSubManager
+
+logger = logging.getLogger(__name__)
+
+HISTORY_CACHE_KEY_PREFIX = "lys:ai_history:"
+
+# Rough size of a token in characters, for the running estimate of a history
+CHARACTERS_PER_TOKEN = 4
+
+
+def serialize_message(message: Any) -> Dict[str, Any]:
+    """Build the LLM message of a stored AIMessage (entity or selected row)."""
+    if message.role == AIMessageRole.TOOL.value:
+        return {
+            "role": message.role,
+            "content": str(message.tool_result) if message.tool_result else "",
+            "tool_call_id": message.tool_call_id,
+        }
+    if message.role == AIMessageRole.ASSISTANT.value and message.tool_calls:
+        # Include tool_calls for assistant messages that made tool calls
+        return {
+            "role": message.role,
+            "content": message.content or "",
+            "tool_calls": message.tool_calls,
+        }
+    return {
+        "role": message.role,
+        "content": message.content or "",
+    }
+
+
+def estimate_tokens(message: Dict[str, Any]) -> int:
+    """Rough token count of an LLM message."""
+    size = len(message.get("content") or "")
+    if message.get("tool_calls"):
+        size += len(json.dumps(message["tool_calls"]))
+    return size // CHARACTERS_PER_TOKEN + 1
+
+
+@dataclass
+class HistoryMessage:
+    """Reference of a message of a history: what the compaction boundary is picked from."""
+
+    id: str
+    role: str
+    created_at: datetime
+
+
+@dataclass
+class ConversationHistory:
+    """Serialized history of a conversation, after the boundary of its summary."""
+
+    summary_id: Optional[str] = None
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    refs: List[HistoryMessage] = field(default_factory=list)
+    token_estimate: int = 0
+    # (created_at, id) of the boundary message of the summary, None without summary
+    boundary: Optional[Tuple[datetime, str]] = None
+
+    @property
+    def cursor(self) -> Optional[Tuple[datetime, str]]:
+        """(created_at, id) of the last message held, None when empty."""
+        if not self.refs:
+            return None
+        return self.refs[-1].created_at, self.refs[-1].id
+
+    def extended(self, rows: List[Any]) -> "ConversationHistory":
+        """Copy of the history followed by messages selected in (created_at, id) order after its cursor."""
+        messages = [serialize_message(row) for row in rows]
+        return ConversationHistory(
+            summary_id=self.summary_id,
+            messages=self.messages + messages,
+            refs=self.refs + [HistoryMessage(row.id, row.role, row.created_at) for row in rows],
+            token_estimate=self.token_estimate + sum(estimate_tokens(message) for message in messages),
+            boundary=self.boundary,
+        )
+
+    def rebased(self, summary_id: Optional[str], boundary_id: Optional[str]) -> Optional["ConversationHistory"]:
+        """
+        Copy of the history without the messages carried by a new summary (up to and
+        including its boundary).
+
+        Returns:
+            None when the boundary is not among the messages held: the history has to
+            be rebuilt
+        """
+        for index, ref in enumerate(self.refs):
+            if ref.id == boundary_id:
+                messages = self.messages[index + 1:]
+                return ConversationHistory(
+                    summary_id=summary_id,
+                    messages=messages,
+                    refs=self.refs[index + 1:],
+                    token_estimate=sum(estimate_tokens(message) for message in messages),
+                    boundary=(ref.created_at, ref.id),
+                )
+        return None
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "summary_id": self.summary_id,
+            "messages": self.messages,
+            "refs": [[ref.id, ref.role, ref.created_at.isoformat()] for ref in self.refs],
+            "token_estimate": self.token_estimate,
+            "boundary": [self.boundary[0].isoformat(), self.boundary[1]] if self.boundary else None,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ConversationHistory":
+        data = json.loads(raw)
+        boundary = data.get("boundary")
+        return cls(
+            summary_id=data["summary_id"],
+            messages=data["messages"],
+            refs=[
+                HistoryMessage(id_, role, datetime.fromisoformat(created_at))
+                for id_, role, created_at in data["refs"]
+            ],
+            token_estimate=data["token_estimate"],
+            boundary=(datetime.fromisoformat(boundary[0]), boundary[1]) if boundary else None,
+        )
+
+
+class ConversationHistoryCache:
+    """Bounded in-process LRU of conversation histories, with an optional Redis tier."""
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 3600, redis: bool = False):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis
+        # conversation id -> (monotonic expiry, history)
+        self._entries: "OrderedDict[str, Tuple[float, ConversationHistory]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def configure(self, max_size: int, ttl_seconds: float, redis: bool):
+        """Resize the cache (ai plugin config), dropping every entry."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis
+        self._entries.clear()
+
+    @staticmethod
+    def _key(conversation_id: str) -> str:
+        return f"{HISTORY_CACHE_KEY_PREFIX}{conversation_id}"
+
+    def _get_local(self, conversation_id: str) -> Optional[ConversationHistory]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        expires_at, history = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(conversation_id, None)
+            return None
+        self._entries.move_to_end(conversation_id)
+        return history
+
+    def _set_local(self, conversation_id: str, history: ConversationHistory):
+        self._entries[conversation_id] = (time.monotonic() + self.ttl_seconds, history)
+        self._entries.move_to_end(conversation_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self, conversation_id: str, pubsub: Optional[PubSubManager] = None
+    ) -> Optional[ConversationHistory]:
+        """
+        Get the cached history of a conversation.
+
+        Histories are never modified in place: ``extended`` and ``rebased`` return
+        copies, stored back with ``set``, so concurrent turns can share an entry.
+        """
+        if not self.enabled:
+            return None
+        history = self._get_local(conversation_id)
+        if history is not None or not self.redis or pubsub is None:
+            return history
+        try:
+            raw = await pubsub.get_key(self._key(conversation_id))
+            if raw is None:
+                return None
+            history = ConversationHistory.from_json(raw)
+        except Exception as ex:
+            logger.warning("Could not read the cached history of conversation %s: %s", conversation_id, ex)
+            return None
+        self._set_local(conversation_id, history)
+        return history
+
+    async def set(
+        self, conversation_id: str, history: ConversationHistory, pubsub: Optional[PubSubManager] = None
+    ):
+        if not self.enabled:
+            return
+        self._set_local(conversation_id, history)
+        if not self.redis or pubsub is None:
+            return
+        try:
+            await pubsub.set_key(self._key(conversation_id), history.to_json(), ttl_seconds=int(self.ttl_seconds))
+        except Exception as ex:
+            # The other workers rebuild the history from the database
+            logger.warning("Could not cache the history of conversation %s: %s", conversation_id, ex)
+
+    def discard(self, conversation_id: str):
+        self._entries.pop(conversation_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by the chatbot turns of the process
+conversation_history_cache = ConversationHistoryCache()
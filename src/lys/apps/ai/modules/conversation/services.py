@@ -4,13 +4,15 @@ AI Conversation services.
 Services for managing conversations and feedback.
 """
 
+import asyncio
 import json
 import logging
 import time
 from datetime import datetime, timedelta, UTC
 from typing import AsyncGenerator, Optional, List, Dict, Any
+from uuid import uuid4
 
-from sqlalchemy import select, tuple_
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
@@ -23,6 +25,9 @@ from lys.apps.ai.modules.conversation.consts import (
     DEFAULT_COMPACTION_TOKEN_THRESHOLD,
     DEFAULT_COMPACTION_WINDOW_MESSAGES,
     DEFAULT_DYNAMIC_CONTEXT_HEADER,
+    DEFAULT_HISTORY_CACHE_SIZE,
+    DEFAULT_HISTORY_CACHE_TTL_SECONDS,
+    DEFAULT_MAX_CONCURRENT_TOOL_CALLS,
     DEFAULT_SUMMARY_HEADER,
 )
 from lys.apps.ai.modules.conversation.entities import (
@@ -30,12 +35,14 @@ from lys.apps.ai.modules.conversation.entities import (
     AIMessage,
     AIMessageFeedback,
 )
+from lys.apps.ai.modules.conversation.history import ConversationHistory, conversation_history_cache
 from lys.apps.ai.modules.conversation.models import PageContextModel
-from lys.apps.ai.modules.core.executors import GraphQLToolExecutor
+from lys.apps.ai.modules.core.executors import GraphQLToolExecutor, LocalToolExecutor
 from lys.apps.ai.modules.core.services import AIToolService
 from lys.apps.ai.tasks import summarize_conversation
 from lys.apps.ai.utils.guardrails import CONFIRM_ACTION_TOOL
 from lys.apps.ai.utils.providers.config import parse_plugin_config
+from lys.core.graphql.extensions import ThreadSafeSessionProxy
 from lys.core.registries import register_service
 from lys.core.services import EntityService
 from lys.core.utils.routes import filter_routes_by_permissions, build_navigate_tool, load_routes_manifest
@@ -50,6 +57,22 @@ class AIConversationService(EntityService[AIConversation]):
 
     _routes_manifest_cache: Optional[Dict[str, Any]] = None
 
+    @classmethod
+    async def on_initialize(cls):
+        """Configure the conversation history cache (chatbot.history_cache)."""
+        await super().on_initialize()
+
+        config = (
+            (cls.app_manager.settings.get_plugin_config("ai") or {})
+            .get("chatbot", {})
+            .get("history_cache", {})
+        )
+        conversation_history_cache.configure(
+            max_size=config.get("size", DEFAULT_HISTORY_CACHE_SIZE),
+            ttl_seconds=config.get("ttl", DEFAULT_HISTORY_CACHE_TTL_SECONDS),
+            redis=bool(config.get("redis", False)),
+        )
+
     @staticmethod
     def _usage_fields(usage: Optional[Dict[str, Any]]) -> Dict[str, Optional[int]]:
         """Map a provider-normalized usage dict to AIMessage token columns."""
@@ -212,6 +235,10 @@ class AIConversationService(EntityService[AIConversation]):
         message_service = cls.app_manager.get_service("ai_message")
         ai_service = cls.app_manager.get_service("ai")
 
+        # Build messages list from conversation history, before writing this turn
+        messages = await cls._build_messages(conversation, session)
+        messages.append({"role": AIMessageRole.USER.value, "content": content})
+
         # Save user message
         await message_service.create(
             session,
@@ -220,9 +247,6 @@ class AIConversationService(EntityService[AIConversation]):
             content=content,
         )
 
-        # Build messages list from conversation history
-        messages = await cls._build_messages(conversation, session)
-
         # Call AI service
         start_time = time.perf_counter()
         response = await ai_service.chat_with_purpose(messages, AI_PURPOSE_CHATBOT, tools)
@@ -410,6 +434,8 @@ class AIConversationService(EntityService[AIConversation]):
 
         The trigger metric is the turn's real billed prompt size (input + cache read + cache
         write tokens), not a message count which a single large tool output would defeat.
+        When the provider reports no usage, the running token estimate of the history
+        (cf. conversation.history) stands for it.
         """
         try:
             fields = cls._usage_fields(usage)
@@ -422,11 +448,17 @@ class AIConversationService(EntityService[AIConversation]):
             chatbot_config = (cls.app_manager.settings.get_plugin_config("ai") or {}).get("chatbot", {})
             compaction = chatbot_config.get("compaction", {})
             threshold = compaction.get("token_threshold", DEFAULT_COMPACTION_TOKEN_THRESHOLD)
+
+            # This turn's messages are not committed yet: the history is not cached back.
+            prev = history = None
+            if not prompt_tokens:
+                prev = await cls._load_current_summary(conversation.id, session)
+                history = await cls._load_history(conversation, session, prev, store=False)
+                prompt_tokens = history.token_estimate
             if prompt_tokens <= threshold:
                 return
 
             summary_entity = cls.app_manager.get_entity("ai_conversation_summary")
-            message_entity = cls.app_manager.get_entity("ai_message")
 
             # Concurrency guard: a recent pending summary blocks a second enqueue. A pending
             # row older than the TTL is treated as stale (worker died) and ignored.
@@ -441,25 +473,16 @@ class AIConversationService(EntityService[AIConversation]):
             if pending is not None:
                 return
 
+            # The boundary is picked among the messages after the previous summary boundary,
+            # so it always advances past it.
             window = compaction.get("window_messages", DEFAULT_COMPACTION_WINDOW_MESSAGES)
-            messages = (await session.execute(
-                select(message_entity)
-                .where(message_entity.conversation_id == conversation.id)
-                .order_by(message_entity.created_at, message_entity.id)
-            )).scalars().all()
-            boundary = cls._compute_compaction_boundary(messages, window)
+            if history is None:
+                prev = await cls._load_current_summary(conversation.id, session)
+                history = await cls._load_history(conversation, session, prev, store=False)
+            boundary = cls._compute_compaction_boundary(history.refs, window)
             if boundary is None:
                 return
 
-            # Skip if the boundary would not advance past the previous summary.
-            prev = await cls._load_current_summary(conversation.id, session)
-            if prev is not None:
-                prev_boundary = await session.get(message_entity, prev.through_message_id)
-                if prev_boundary is not None and (
-                    (boundary.created_at, boundary.id) <= (prev_boundary.created_at, prev_boundary.id)
-                ):
-                    return
-
             row = summary_entity(
                 conversation_id=conversation.id,
                 through_message_id=boundary.id,
@@ -480,6 +503,105 @@ class AIConversationService(EntityService[AIConversation]):
         except Exception as e:
             logger.warning(f"Compaction enqueue skipped for conversation {conversation.id}: {e}")
 
+    @classmethod
+    async def _load_history(
+        cls,
+        conversation: "AIConversation",
+        session: AsyncSession,
+        current_summary: Optional[Any] = None,
+        store: bool = True,
+    ) -> ConversationHistory:
+        """
+        Load the history of a conversation after the boundary of its current summary.
+
+        Starts from the cached history (cf. conversation.history) and only selects the
+        messages written after its last one, so the cost of a turn does not grow with the
+        conversation. A cached history built before another summary is rebased on the
+        boundary of the current one, or rebuilt when that boundary is not among its messages.
+        It is rebuilt too when messages were committed behind its cursor (see
+        _is_history_complete).
+
+        Args:
+            conversation: Conversation
+            session: Database session
+            current_summary: Current compaction summary (see _load_current_summary)
+            store: Cache the history loaded. Only when the session has not written messages
+                of the turn yet: rows flushed but not committed must not be cached.
+
+        Returns:
+            ConversationHistory of the conversation
+        """
+        message_entity = cls.app_manager.get_entity("ai_message")
+        pubsub = cls.app_manager.pubsub
+        summary_id = current_summary.id if current_summary is not None else None
+
+        history = await conversation_history_cache.get(conversation.id, pubsub)
+        cached = history
+        if history is not None and history.summary_id != summary_id:
+            history = history.rebased(summary_id, current_summary.through_message_id) \
+                if current_summary is not None else None
+        if history is not None and not await cls._is_history_complete(history, conversation.id, session):
+            history = None
+
+        # Columns only: the messages are serialized, not loaded as entities (no feedback)
+        stmt = select(
+            message_entity.id,
+            message_entity.role,
+            message_entity.content,
+            message_entity.tool_calls,
+            message_entity.tool_call_id,
+            message_entity.tool_result,
+            message_entity.created_at,
+        ).where(message_entity.conversation_id == conversation.id)
+
+        if history is not None:
+            after = history.cursor or history.boundary
+        else:
+            after = None
+            if current_summary is not None:
+                boundary = await session.get(message_entity, current_summary.through_message_id)
+                if boundary is not None:
+                    after = (boundary.created_at, boundary.id)
+            history = ConversationHistory(summary_id=summary_id, boundary=after)
+
+        if after is not None:
+            # Strictly after the cursor, matching the (created_at, id) ordering.
+            stmt = stmt.where(tuple_(message_entity.created_at, message_entity.id) > after)
+
+        rows = (await session.execute(
+            stmt.order_by(message_entity.created_at, message_entity.id)
+        )).all()
+        if rows:
+            history = history.extended(rows)
+
+        if store and history is not cached:
+            await conversation_history_cache.set(conversation.id, history, pubsub)
+        return history
+
+    @classmethod
+    async def _is_history_complete(
+        cls, history: ConversationHistory, conversation_id: str, session: AsyncSession
+    ) -> bool:
+        """
+        Check that a cached history holds every message up to its cursor.
+
+        Messages get their created_at when the turn buffers them and are committed when
+        it ends: of two overlapping turns of a conversation, the later one may commit
+        first and a history cached after it misses the messages of the other one.
+        """
+        cursor = history.cursor
+        if cursor is None:
+            return True
+
+        message_entity = cls.app_manager.get_entity("ai_message")
+        stmt = select(func.count()).select_from(message_entity).where(
+            message_entity.conversation_id == conversation_id,
+            tuple_(message_entity.created_at, message_entity.id) <= cursor,
+        )
+        if history.boundary is not None:
+            stmt = stmt.where(tuple_(message_entity.created_at, message_entity.id) > history.boundary)
+        return await session.scalar(stmt) == len(history.refs)
+
     @classmethod
     async def _build_messages(
         cls,
@@ -495,46 +617,12 @@ class AIConversationService(EntityService[AIConversation]):
         represented by the summary, injected separately as a system segment by the
         caller. A window edge that splits a tool_call/tool_result pair is harmless:
         the sanitizer drops orphan tool results and pairs any unmatched tool_calls.
-        """
-        message_entity = cls.app_manager.get_entity("ai_message")
-        stmt = select(message_entity).where(message_entity.conversation_id == conversation.id)
-
-        if current_summary is not None:
-            boundary = await session.get(message_entity, current_summary.through_message_id)
-            if boundary is not None:
-                # Strictly after the boundary, matching the (created_at, id) ordering.
-                stmt = stmt.where(
-                    tuple_(message_entity.created_at, message_entity.id)
-                    > (boundary.created_at, boundary.id)
-                )
 
-        result = await session.execute(
-            stmt.order_by(message_entity.created_at, message_entity.id)
-        )
-        db_messages = result.scalars().all()
-
-        messages = []
-        for msg in db_messages:
-            if msg.role == AIMessageRole.TOOL.value:
-                messages.append({
-                    "role": msg.role,
-                    "content": str(msg.tool_result) if msg.tool_result else "",
-                    "tool_call_id": msg.tool_call_id,
-                })
-            elif msg.role == AIMessageRole.ASSISTANT.value and msg.tool_calls:
-                # Include tool_calls for assistant messages that made tool calls
-                messages.append({
-                    "role": msg.role,
-                    "content": msg.content or "",
-                    "tool_calls": msg.tool_calls,
-                })
-            else:
-                messages.append({
-                    "role": msg.role,
-                    "content": msg.content or "",
-                })
-
-        return messages
+        Called before the turn writes its messages (see _load_history).
+        """
+        history = await cls._load_history(conversation, session, current_summary)
+        # Copies: the cached messages are shared by the turns of the conversation
+        return [dict(message) for message in history.messages]
 
     @classmethod
     async def archive(cls, conversation_id: str, session: AsyncSession) -> bool:
@@ -660,7 +748,8 @@ class AIConversationService(EntityService[AIConversation]):
             page_context: Page context for param injection
 
         Returns:
-            Configured GraphQLToolExecutor instance
+            Configured GraphQLToolExecutor instance (LocalToolExecutor when the app serves
+            a GraphQL schema and executor.local_execution is enabled)
         """
         app_manager = cls.app_manager
         plugin_config = app_manager.settings.get_plugin_config("ai")
@@ -671,20 +760,25 @@ class AIConversationService(EntityService[AIConversation]):
         bearer_token = info.context.access_token if info.context else None
 
         if bearer_token:
-            executor = GraphQLToolExecutor(
-                gateway_url=ai_config.executor.gateway_url,
-                bearer_token=bearer_token,
-                timeout=ai_config.executor.timeout,
-                verify_ssl=ai_config.executor.verify_ssl,
-            )
+            auth_kwargs = {"bearer_token": bearer_token}
         else:
-            executor = GraphQLToolExecutor(
-                gateway_url=ai_config.executor.gateway_url,
-                secret_key=app_manager.settings.secret_key,
-                service_name=ai_config.executor.service_name or app_manager.settings.service_name,
-                timeout=ai_config.executor.timeout,
-                verify_ssl=ai_config.executor.verify_ssl,
-            )
+            auth_kwargs = {
+                "secret_key": app_manager.settings.secret_key,
+                "service_name": ai_config.executor.service_name or app_manager.settings.service_name,
+            }
+
+        executor_kwargs = dict(
+            gateway_url=ai_config.executor.gateway_url,
+            timeout=ai_config.executor.timeout,
+            verify_ssl=ai_config.executor.verify_ssl,
+            **auth_kwargs,
+        )
+
+        # Tools of the webservices served by this app run in process, the others through the gateway
+        if ai_config.executor.local_execution and app_manager.graphql_schema is not None:
+            executor = LocalToolExecutor(app_manager, **executor_kwargs)
+        else:
+            executor = GraphQLToolExecutor(**executor_kwargs)
 
         await executor.initialize(
             tools=tools,
@@ -693,6 +787,78 @@ class AIConversationService(EntityService[AIConversation]):
         )
         return executor
 
+    @classmethod
+    def _get_max_concurrent_tool_calls(cls) -> int:
+        """Maximum number of read-only tool calls run at the same time (chatbot.max_concurrent_tool_calls)."""
+        chatbot_config = (cls.app_manager.settings.get_plugin_config("ai") or {}).get("chatbot", {})
+        return max(1, int(chatbot_config.get("max_concurrent_tool_calls", DEFAULT_MAX_CONCURRENT_TOOL_CALLS)))
+
+    @staticmethod
+    def _batch_tool_calls(executor, tool_calls: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Split the tool calls of an LLM turn into batches run one after another.
+
+        Consecutive read-only calls share a batch; any other call (mutation, special
+        tool) is a batch of its own, so it runs after the calls before it and before
+        the calls after it.
+
+        Args:
+            executor: Tool executor telling which tools are read-only
+            tool_calls: Tool calls of the LLM turn, in order
+
+        Returns:
+            Batches of tool calls, in order
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        previous_read_only = False
+        for tool_call in tool_calls:
+            read_only = executor.is_read_only(tool_call.get("function", {}).get("name", ""))
+            if read_only and previous_read_only:
+                batches[-1].append(tool_call)
+            else:
+                batches.append([tool_call])
+            previous_read_only = read_only
+        return batches
+
+    @classmethod
+    async def _execute_tool_batch(
+        cls,
+        executor,
+        batch: List[Dict[str, Any]],
+        session: AsyncSession,
+        info: Any,
+        max_concurrency: int,
+    ) -> List[Any]:
+        """
+        Execute a batch of tool calls, concurrently up to max_concurrency.
+
+        Args:
+            executor: Tool executor
+            batch: Tool calls (a single one unless all read-only)
+            session: Database session
+            info: GraphQL info context (or _StreamingInfo shim)
+            max_concurrency: Maximum number of calls running at the same time
+
+        Returns:
+            Result of each call, or the exception it raised, in the order of the batch
+        """
+        if len(batch) > 1 and not isinstance(session, ThreadSafeSessionProxy):
+            # Calls executed in process share the session, which is not safe for concurrent use
+            session = ThreadSafeSessionProxy(session)
+        context = {"session": session, "info": info}
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def execute(tool_call: Dict[str, Any]) -> Any:
+            tool_args = tool_call.get("function", {}).get("arguments", "{}")
+            async with semaphore:
+                return await executor.execute(
+                    tool_name=tool_call.get("function", {}).get("name", ""),
+                    arguments=json.loads(tool_args) if isinstance(tool_args, str) else tool_args,
+                    context=context,
+                )
+
+        return await asyncio.gather(*(execute(tool_call) for tool_call in batch), return_exceptions=True)
+
     @classmethod
     async def _prepare_chat_context(
         cls,
@@ -878,13 +1044,9 @@ class AIConversationService(EntityService[AIConversation]):
         # Add new user message
         messages.append({"role": "user", "content": content})
 
-        # Save user message to DB
-        user_message = await message_service.create(
-            session,
-            conversation_id=conversation.id,
-            role=AIMessageRole.USER.value,
-            content=content,
-        )
+        # Buffer the messages of the turn, written together when it ends (see AIMessageBuffer)
+        message_buffer = message_service.buffer(conversation.id)
+        user_message_id = message_buffer.add(AIMessageRole.USER.value, content=content)
 
         return {
             "tools": tools,
@@ -895,7 +1057,8 @@ class AIConversationService(EntityService[AIConversation]):
             "ai_service": ai_service,
             "messages": messages,
             "info": info,
-            "user_message_id": user_message.id,
+            "message_buffer": message_buffer,
+            "user_message_id": user_message_id,
         }
 
     @classmethod
@@ -933,150 +1096,145 @@ class AIConversationService(EntityService[AIConversation]):
         )
         executor = ctx["executor"]
         conversation = ctx["conversation"]
-        message_service = ctx["message_service"]
+        message_buffer = ctx["message_buffer"]
         ai_service = ctx["ai_service"]
         llm_tools = ctx["llm_tools"]
         messages = ctx["messages"]
 
         tool_results = []
         tool_calls_count = 0
+        max_concurrent_tool_calls = cls._get_max_concurrent_tool_calls()
 
-        # Agent loop: call LLM, execute tools, repeat until no more tool calls
-        for iteration in range(max_tool_iterations):
-            start_time = time.perf_counter()
-            response = await ai_service.chat_with_purpose(
-                messages,
-                AI_PURPOSE_CHATBOT,
-                llm_tools if llm_tools else None
-            )
-            latency_ms = int((time.perf_counter() - start_time) * 1000)
+        try:
+            # Agent loop: call LLM, execute tools, repeat until no more tool calls
+            for iteration in range(max_tool_iterations):
+                start_time = time.perf_counter()
+                response = await ai_service.chat_with_purpose(
+                    messages,
+                    AI_PURPOSE_CHATBOT,
+                    llm_tools if llm_tools else None
+                )
+                latency_ms = int((time.perf_counter() - start_time) * 1000)
+
+                # Check if LLM wants to call tools
+                tool_calls = response.tool_calls or []
+
+                if not tool_calls:
+                    # No tool calls: save the turn and return the response
+                    message_buffer.add(
+                        AIMessageRole.ASSISTANT.value,
+                        content=response.content,
+                        provider=response.provider,
+                        model=response.model,
+                        latency_ms=latency_ms,
+                        **cls._usage_fields(response.usage),
+                    )
+                    await message_buffer.flush(session)
+
+                    frontend_actions = list(getattr(info.context, "frontend_actions", []))
+
+                    result = {
+                        "content": response.content,
+                        "conversation_id": conversation.id,
+                        "tool_calls_count": tool_calls_count,
+                        "tool_results": tool_results,
+                        "frontend_actions": frontend_actions if frontend_actions else None,
+                    }
+                    await cls.maybe_enqueue_compaction(conversation, session, response.usage)
+                    cls._process_response(result)
+                    return result
 
-            # Check if LLM wants to call tools
-            tool_calls = response.tool_calls or []
+                # Execute tool calls
+                tool_calls_count += len(tool_calls)
 
-            if not tool_calls:
-                # No tool calls, save and return the response
-                await message_service.create(
-                    session,
-                    conversation_id=conversation.id,
-                    role=AIMessageRole.ASSISTANT.value,
+                # Add assistant message with tool calls to history
+                assistant_msg = {
+                    "role": "assistant",
+                    "content": response.content,
+                    "tool_calls": tool_calls,
+                }
+                messages.append(assistant_msg)
+
+                # Save assistant message with tool calls
+                message_buffer.add(
+                    AIMessageRole.ASSISTANT.value,
                     content=response.content,
+                    tool_calls=tool_calls,
                     provider=response.provider,
                     model=response.model,
                     latency_ms=latency_ms,
                     **cls._usage_fields(response.usage),
                 )
 
-                frontend_actions = list(getattr(info.context, "frontend_actions", []))
-
-                result = {
-                    "content": response.content,
-                    "conversation_id": conversation.id,
-                    "tool_calls_count": tool_calls_count,
-                    "tool_results": tool_results,
-                    "frontend_actions": frontend_actions if frontend_actions else None,
-                }
-                await cls.maybe_enqueue_compaction(conversation, session, response.usage)
-                cls._process_response(result)
-                return result
-
-            # Execute tool calls
-            tool_calls_count += len(tool_calls)
-
-            # Add assistant message with tool calls to history
-            assistant_msg = {
-                "role": "assistant",
-                "content": response.content,
-                "tool_calls": tool_calls,
-            }
-            messages.append(assistant_msg)
-
-            # Save assistant message with tool calls
-            await message_service.create(
-                session,
-                conversation_id=conversation.id,
-                role=AIMessageRole.ASSISTANT.value,
-                content=response.content,
-                tool_calls=tool_calls,
-                provider=response.provider,
-                model=response.model,
-                latency_ms=latency_ms,
-                **cls._usage_fields(response.usage),
-            )
-
-            # Execute each tool and collect results
-            for tool_call in tool_calls:
-                tool_name = tool_call.get("function", {}).get("name", "")
-                tool_args_str = tool_call.get("function", {}).get("arguments", "{}")
-                tool_call_id = tool_call.get("id", "")
-
-                try:
-                    tool_args = json.loads(tool_args_str) if isinstance(tool_args_str, str) else tool_args_str
-                    result = await executor.execute(
-                        tool_name=tool_name,
-                        arguments=tool_args,
-                        context={"session": session, "info": info},
+                # Execute the tools and collect results, in order. Consecutive read-only
+                # calls run concurrently, the others one after another.
+                for batch in cls._batch_tool_calls(executor, tool_calls):
+                    outcomes = await cls._execute_tool_batch(
+                        executor, batch, session, info, max_concurrent_tool_calls
                     )
-                    tool_results.append({
-                        "tool_name": tool_name,
-                        "result": str(result),
-                        "success": True,
-                    })
-
-                    # Add tool result to messages
-                    tool_msg = {
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "content": json.dumps(result) if not isinstance(result, str) else result,
-                    }
-                    messages.append(tool_msg)
-
-                    # Save tool result to DB
-                    await message_service.add_tool_result(
-                        conversation.id,
-                        tool_call_id,
-                        result if isinstance(result, dict) else {"result": result},
-                        session,
-                    )
-
-                except Exception as e:
-                    logger.error(f"Tool '{tool_name}' execution failed: {e}")
-                    safe_error_msg = f"Tool '{tool_name}' failed to execute."
-                    tool_results.append({
-                        "tool_name": tool_name,
-                        "result": safe_error_msg,
-                        "success": False,
-                    })
-
-                    # Add error to messages (generic message for LLM)
-                    error_tool_msg = {
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "content": json.dumps({"error": safe_error_msg}),
-                    }
-                    messages.append(error_tool_msg)
-
-                    # Save error to DB (protected to avoid cascade failure)
-                    try:
-                        await message_service.add_tool_result(
-                            conversation.id,
-                            tool_call_id,
-                            {"error": safe_error_msg},
-                            session,
-                        )
-                    except Exception as db_err:
-                        logger.error(f"Failed to save tool error to DB: {db_err}")
+                    for tool_call, outcome in zip(batch, outcomes):
+                        tool_name = tool_call.get("function", {}).get("name", "")
+                        tool_call_id = tool_call.get("id", "")
+
+                        try:
+                            if isinstance(outcome, BaseException):
+                                raise outcome
+                            result = outcome
+                            tool_results.append({
+                                "tool_name": tool_name,
+                                "result": str(result),
+                                "success": True,
+                            })
+
+                            # Add tool result to messages
+                            tool_msg = {
+                                "role": "tool",
+                                "tool_call_id": tool_call_id,
+                                "content": json.dumps(result) if not isinstance(result, str) else result,
+                            }
+                            messages.append(tool_msg)
+
+                            # Save tool result
+                            message_buffer.add_tool_result(
+                                tool_call_id,
+                                result if isinstance(result, dict) else {"result": result},
+                            )
+
+                        except Exception as e:
+                            logger.error(f"Tool '{tool_name}' execution failed: {e}")
+                            safe_error_msg = f"Tool '{tool_name}' failed to execute."
+                            tool_results.append({
+                                "tool_name": tool_name,
+                                "result": safe_error_msg,
+                                "success": False,
+                            })
+
+                            # Add error to messages (generic message for LLM)
+                            error_tool_msg = {
+                                "role": "tool",
+                                "tool_call_id": tool_call_id,
+                                "content": json.dumps({"error": safe_error_msg}),
+                            }
+                            messages.append(error_tool_msg)
+
+                            # Save error
+                            message_buffer.add_tool_result(tool_call_id, {"error": safe_error_msg})
+
+            # Max iterations reached
+            await message_buffer.flush(session)
+            frontend_actions = getattr(info.context, "frontend_actions", [])
+
+            return {
+                "content": "Maximum tool iterations reached. Please try a simpler request.",
+                "conversation_id": conversation.id,
+                "tool_calls_count": tool_calls_count,
+                "tool_results": tool_results,
+                "frontend_actions": frontend_actions if frontend_actions else None,
+            }
+        finally:
+            # Recovery path: a failed turn still writes the history buffered so far
+            await message_buffer.flush_after_failure(session)
 
-        # Max iterations reached
-        frontend_actions = getattr(info.context, "frontend_actions", [])
-
-        return {
-            "content": "Maximum tool iterations reached. Please try a simpler request.",
-            "conversation_id": conversation.id,
-            "tool_calls_count": tool_calls_count,
-            "tool_results": tool_results,
-            "frontend_actions": frontend_actions if frontend_actions else None,
-        }
 
     # ========== Streaming Agent Loop ==========
 
@@ -1133,7 +1291,7 @@ class AIConversationService(EntityService[AIConversation]):
         )
         executor = ctx["executor"]
         conversation = ctx["conversation"]
-        message_service = ctx["message_service"]
+        message_buffer = ctx["message_buffer"]
         ai_service = ctx["ai_service"]
         llm_tools = ctx["llm_tools"]
         messages = ctx["messages"]
@@ -1141,201 +1299,198 @@ class AIConversationService(EntityService[AIConversation]):
 
         tool_results = []
         tool_calls_count = 0
+        max_concurrent_tool_calls = cls._get_max_concurrent_tool_calls()
         expose_reasoning = bool(
             (cls.app_manager.settings.get_plugin_config("ai") or {})
             .get("chatbot", {})
             .get("expose_reasoning", False)
         )
 
-        # Agent loop
-        for iteration in range(max_tool_iterations):
-            accumulated_content = ""
-            reasoning_characters = 0
-            tool_calls_accumulator: Dict[int, Dict[str, Any]] = {}
-            last_finish_reason = None
-            last_usage = None
-            last_model = None
-            last_provider = None
-
-            try:
-                async for chunk in ai_service.chat_stream_with_purpose(
-                    messages, AI_PURPOSE_CHATBOT, llm_tools if llm_tools else None
-                ):
-                    # A reasoning model can spend tens of seconds before its first answer
-                    # token, and the reasoning stream is the only thing moving meanwhile.
-                    # Its SIZE is safe to publish and enough for a client to prove liveness —
-                    # unlike elapsed time, it only grows when data actually arrives. The trace
-                    # ITSELF is a draft naming internal tools and scoring vocabulary a system
-                    # prompt may forbid showing, so it stays behind chatbot.expose_reasoning.
-                    if chunk.reasoning:
-                        reasoning_characters += len(chunk.reasoning)
-                        yield _format_sse(
-                            "reasoning_progress", {"characters": reasoning_characters}
-                        )
-                        if expose_reasoning:
-                            yield _format_sse("reasoning", {"content": chunk.reasoning})
-
-                    if chunk.content:
-                        accumulated_content += chunk.content
-                        yield _format_sse("token", {"content": chunk.content})
-
-                    # Accumulate tool calls from partial chunks
-                    if chunk.tool_calls:
-                        _accumulate_tool_calls(tool_calls_accumulator, chunk.tool_calls)
-
-                    if chunk.finish_reason:
-                        last_finish_reason = chunk.finish_reason
-                    if chunk.usage:
-                        last_usage = chunk.usage
-                    if chunk.model:
-                        last_model = chunk.model
-                    if chunk.provider:
-                        last_provider = chunk.provider
-
-            except Exception as e:
-                logger.error(f"Streaming provider error: {e}")
-                # Delete the orphaned user message to keep conversation history valid
-                if iteration == 0:
-                    try:
-                        await message_service.delete(user_message_id, session)
-                    except Exception as del_err:
-                        logger.error(f"Failed to delete orphaned user message {user_message_id}: {del_err}")
-                yield _format_sse("error", {
-                    "message": "An error occurred while generating the response.",
-                    "code": "PROVIDER_ERROR",
-                })
-                return
-
-            # Build finalized tool_calls list from accumulator
-            finalized_tool_calls = _finalize_tool_calls(tool_calls_accumulator)
-
-            if not finalized_tool_calls:
-                # No tool calls — final response
-                await message_service.create(
-                    session,
-                    conversation_id=conversation.id,
-                    role=AIMessageRole.ASSISTANT.value,
-                    content=accumulated_content,
-                    provider=last_provider,
-                    model=last_model,
-                    **cls._usage_fields(last_usage),
-                )
-
-                frontend_actions = list(getattr(info.context, "frontend_actions", []))
-
-                result = {
-                    "conversationId": conversation.id,
-                    "toolCallsCount": tool_calls_count,
-                    "frontendActions": frontend_actions if frontend_actions else None,
-                }
-                cls._process_response({
-                    "content": accumulated_content,
-                    "conversation_id": conversation.id,
-                    "tool_calls_count": tool_calls_count,
-                    "tool_results": tool_results,
-                    "frontend_actions": frontend_actions if frontend_actions else None,
-                })
-                await cls.maybe_enqueue_compaction(conversation, session, last_usage)
-                yield _format_sse("done", result)
-                return
-
-            # Tool calls detected — execute them
-            tool_calls_count += len(finalized_tool_calls)
-
-            # Save assistant message with tool calls
-            assistant_msg = {
-                "role": "assistant",
-                "content": accumulated_content,
-                "tool_calls": finalized_tool_calls,
-            }
-            messages.append(assistant_msg)
-
-            await message_service.create(
-                session,
-                conversation_id=conversation.id,
-                role=AIMessageRole.ASSISTANT.value,
-                content=accumulated_content,
-                tool_calls=finalized_tool_calls,
-                provider=last_provider,
-                model=last_model,
-                **cls._usage_fields(last_usage),
-            )
-
-            # Execute each tool
-            for tool_call in finalized_tool_calls:
-                tool_name = tool_call.get("function", {}).get("name", "")
-                tool_args_str = tool_call.get("function", {}).get("arguments", "{}")
-                tool_call_id = tool_call.get("id", "")
-
-                yield _format_sse("tool_start", {"name": tool_name, "arguments": tool_args_str})
+        # Agent loop. Messages are written when the stream ends; partial history is
+        # written too if the stream fails or is closed by the client.
+        try:
+            for iteration in range(max_tool_iterations):
+                accumulated_content = ""
+                reasoning_characters = 0
+                tool_calls_accumulator: Dict[int, Dict[str, Any]] = {}
+                last_finish_reason = None
+                last_usage = None
+                last_model = None
+                last_provider = None
 
                 try:
-                    tool_args = json.loads(tool_args_str) if isinstance(tool_args_str, str) else tool_args_str
-                    result = await executor.execute(
-                        tool_name=tool_name,
-                        arguments=tool_args,
-                        context={"session": session, "info": info},
-                    )
-                    tool_results.append({
-                        "tool_name": tool_name,
-                        "result": str(result),
-                        "success": True,
-                    })
+                    async for chunk in ai_service.chat_stream_with_purpose(
+                        messages, AI_PURPOSE_CHATBOT, llm_tools if llm_tools else None
+                    ):
+                        # A reasoning model can spend tens of seconds before its first answer
+                        # token, and the reasoning stream is the only thing moving meanwhile.
+                        # Its SIZE is safe to publish and enough for a client to prove liveness —
+                        # unlike elapsed time, it only grows when data actually arrives. The trace
+                        # ITSELF is a draft naming internal tools and scoring vocabulary a system
+                        # prompt may forbid showing, so it stays behind chatbot.expose_reasoning.
+                        if chunk.reasoning:
+                            reasoning_characters += len(chunk.reasoning)
+                            yield _format_sse(
+                                "reasoning_progress", {"characters": reasoning_characters}
+                            )
+                            if expose_reasoning:
+                                yield _format_sse("reasoning", {"content": chunk.reasoning})
+
+                        if chunk.content:
+                            accumulated_content += chunk.content
+                            yield _format_sse("token", {"content": chunk.content})
+
+                        # Accumulate tool calls from partial chunks
+                        if chunk.tool_calls:
+                            _accumulate_tool_calls(tool_calls_accumulator, chunk.tool_calls)
+
+                        if chunk.finish_reason:
+                            last_finish_reason = chunk.finish_reason
+                        if chunk.usage:
+                            last_usage = chunk.usage
+                        if chunk.model:
+                            last_model = chunk.model
+                        if chunk.provider:
+                            last_provider = chunk.provider
 
-                    yield _format_sse("tool_result", {
-                        "name": tool_name,
-                        "result": result if isinstance(result, dict) else {"result": str(result)},
-                        "success": True,
+                except Exception as e:
+                    logger.error(f"Streaming provider error: {e}")
+                    # Drop the orphaned user message to keep conversation history valid
+                    if iteration == 0:
+                        message_buffer.discard(user_message_id)
+                    yield _format_sse("error", {
+                        "message": "An error occurred while generating the response.",
+                        "code": "PROVIDER_ERROR",
                     })
+                    return
 
-                    tool_msg = {
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "content": json.dumps(result) if not isinstance(result, str) else result,
-                    }
-                    messages.append(tool_msg)
-
-                    await message_service.add_tool_result(
-                        conversation.id, tool_call_id,
-                        result if isinstance(result, dict) else {"result": result},
-                        session,
+                # Build finalized tool_calls list from accumulator
+                finalized_tool_calls = _finalize_tool_calls(tool_calls_accumulator)
+
+                if not finalized_tool_calls:
+                    # No tool calls — final response
+                    message_buffer.add(
+                        AIMessageRole.ASSISTANT.value,
+                        content=accumulated_content,
+                        provider=last_provider,
+                        model=last_model,
+                        **cls._usage_fields(last_usage),
                     )
+                    await message_buffer.flush(session)
 
-                except Exception as e:
-                    logger.error(f"Tool '{tool_name}' execution failed: {e}")
-                    safe_error_msg = f"Tool '{tool_name}' failed to execute."
-                    tool_results.append({
-                        "tool_name": tool_name,
-                        "result": safe_error_msg,
-                        "success": False,
-                    })
+                    frontend_actions = list(getattr(info.context, "frontend_actions", []))
 
-                    yield _format_sse("tool_result", {
-                        "name": tool_name,
-                        "result": {"error": safe_error_msg},
-                        "success": False,
+                    result = {
+                        "conversationId": conversation.id,
+                        "toolCallsCount": tool_calls_count,
+                        "frontendActions": frontend_actions if frontend_actions else None,
+                    }
+                    cls._process_response({
+                        "content": accumulated_content,
+                        "conversation_id": conversation.id,
+                        "tool_calls_count": tool_calls_count,
+                        "tool_results": tool_results,
+                        "frontend_actions": frontend_actions if frontend_actions else None,
                     })
+                    await cls.maybe_enqueue_compaction(conversation, session, last_usage)
+                    yield _format_sse("done", result)
+                    return
 
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call_id,
-                        "content": json.dumps({"error": safe_error_msg}),
-                    })
+                # Tool calls detected — execute them
+                tool_calls_count += len(finalized_tool_calls)
 
-                    # Save error to DB (protected to avoid cascade failure)
-                    try:
-                        await message_service.add_tool_result(
-                            conversation.id, tool_call_id,
-                            {"error": safe_error_msg}, session,
-                        )
-                    except Exception as db_err:
-                        logger.error(f"Failed to save tool error to DB: {db_err}")
+                # Save assistant message with tool calls
+                assistant_msg = {
+                    "role": "assistant",
+                    "content": accumulated_content,
+                    "tool_calls": finalized_tool_calls,
+                }
+                messages.append(assistant_msg)
 
-        # Max iterations reached
-        yield _format_sse("error", {
-            "message": "Maximum tool iterations reached.",
-            "code": "MAX_ITERATIONS",
-        })
+                message_buffer.add(
+                    AIMessageRole.ASSISTANT.value,
+                    content=accumulated_content,
+                    tool_calls=finalized_tool_calls,
+                    provider=last_provider,
+                    model=last_model,
+                    **cls._usage_fields(last_usage),
+                )
+
+                # Execute the tools, in order. Consecutive read-only calls run concurrently,
+                # the others one after another.
+                for batch in cls._batch_tool_calls(executor, finalized_tool_calls):
+                    for tool_call in batch:
+                        yield _format_sse("tool_start", {
+                            "name": tool_call.get("function", {}).get("name", ""),
+                            "arguments": tool_call.get("function", {}).get("arguments", "{}"),
+                        })
+
+                    outcomes = await cls._execute_tool_batch(
+                        executor, batch, session, info, max_concurrent_tool_calls
+                    )
+                    for tool_call, outcome in zip(batch, outcomes):
+                        tool_name = tool_call.get("function", {}).get("name", "")
+                        tool_call_id = tool_call.get("id", "")
+
+                        try:
+                            if isinstance(outcome, BaseException):
+                                raise outcome
+                            result = outcome
+                            tool_results.append({
+                                "tool_name": tool_name,
+                                "result": str(result),
+                                "success": True,
+                            })
+
+                            yield _format_sse("tool_result", {
+                                "name": tool_name,
+                                "result": result if isinstance(result, dict) else {"result": str(result)},
+                                "success": True,
+                            })
+
+                            tool_msg = {
+                                "role": "tool",
+                                "tool_call_id": tool_call_id,
+                                "content": json.dumps(result) if not isinstance(result, str) else result,
+                            }
+                            messages.append(tool_msg)
+
+                            message_buffer.add_tool_result(
+                                tool_call_id,
+                                result if isinstance(result, dict) else {"result": result},
+                            )
+
+                        except Exception as e:
+                            logger.error(f"Tool '{tool_name}' execution failed: {e}")
+                            safe_error_msg = f"Tool '{tool_name}' failed to execute."
+                            tool_results.append({
+                                "tool_name": tool_name,
+                                "result": safe_error_msg,
+                                "success": False,
+                            })
+
+                            yield _format_sse("tool_result", {
+                                "name": tool_name,
+                                "result": {"error": safe_error_msg},
+                                "success": False,
+                            })
+
+                            messages.append({
+                                "role": "tool",
+                                "tool_call_id": tool_call_id,
+                                "content": json.dumps({"error": safe_error_msg}),
+                            })
+
+                            message_buffer.add_tool_result(tool_call_id, {"error": safe_error_msg})
+
+            # Max iterations reached
+            await message_buffer.flush(session)
+            yield _format_sse("error", {
+                "message": "Maximum tool iterations reached.",
+                "code": "MAX_ITERATIONS",
+            })
+        finally:
+            await message_buffer.flush_after_failure(session)
 
 
 # ========== Streaming Helpers ==========
@@ -1396,10 +1551,119 @@ def _finalize_tool_calls(accumulator: Dict[int, Dict[str, Any]]) -> List[Dict[st
     return [accumulator[idx] for idx in sorted(accumulator.keys())]
 
 
+# ========== Message Buffer ==========
+
+
+class AIMessageBuffer:
+    """
+    Messages of a conversation turn, kept in memory and written together.
+
+    The agent loops add the user message, the assistant messages and the tool results
+    of a turn here instead of inserting and flushing each one, and write them with one
+    multi-row INSERT (``EntityService.create_many``) when the turn ends, whatever the
+    number of tool hops.
+
+    Ids and ``created_at`` are set when a message is added, ``created_at`` strictly
+    increasing, so the ``(created_at, id)`` order of the history is the order of the
+    turn. Every row sets the same columns, which ``create_many`` needs to insert them
+    with a single statement.
+    """
+
+    def __init__(self, message_service: type["AIMessageService"], conversation_id: str):
+        self.message_service = message_service
+        self.conversation_id = conversation_id
+        self._rows: List[Dict[str, Any]] = []
+        self._last_created_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, role: str, **fields) -> str:
+        """
+        Buffer a message.
+
+        Args:
+            role: Message role (AIMessageRole value)
+            **fields: Other AIMessage columns (content, tool_calls, provider, ...)
+
+        Returns:
+            Id of the message
+        """
+        created_at = datetime.now(UTC)
+        if self._last_created_at is not None and created_at <= self._last_created_at:
+            created_at = self._last_created_at + timedelta(microseconds=1)
+        self._last_created_at = created_at
+
+        message_id = str(uuid4())
+        self._rows.append({
+            **fields,
+            "id": message_id,
+            "conversation_id": self.conversation_id,
+            "role": role,
+            "created_at": created_at,
+        })
+        return message_id
+
+    def add_tool_result(self, tool_call_id: str, result: Dict[str, Any]) -> str:
+        """Buffer a tool result message, returns its id."""
+        return self.add(AIMessageRole.TOOL.value, tool_call_id=tool_call_id, tool_result=result)
+
+    def discard(self, message_id: str) -> None:
+        """Drop a buffered message."""
+        self._rows = [row for row in self._rows if row["id"] != message_id]
+
+    async def flush(self, session: AsyncSession) -> List["AIMessage"]:
+        """
+        Write the buffered messages.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Created messages, in the order they were added
+        """
+        rows, self._rows = self._rows, []
+        if not rows:
+            return []
+
+        # Same keys for every row: one INSERT for the whole turn
+        keys = set().union(*rows)
+        return await self.message_service.create_many(
+            session, [{key: row.get(key) for key in keys} for row in rows]
+        )
+
+    async def flush_after_failure(self, session: AsyncSession) -> None:
+        """
+        Recovery path of a failed or interrupted turn: write the messages buffered so far.
+
+        Errors are logged, not raised, not to hide the failure of the turn.
+        """
+        if not self._rows:
+            return
+        try:
+            await self.flush(session)
+        except Exception as e:
+            logger.error(f"Failed to save the messages of the interrupted turn of conversation "
+                         f"{self.conversation_id}: {e}")
+
+
 @register_service()
 class AIMessageService(EntityService[AIMessage]):
     """Service for managing AI messages."""
 
+    @classmethod
+    def buffer(cls, conversation_id: str) -> AIMessageBuffer:
+        """
+        Create the message buffer of a conversation turn.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Empty AIMessageBuffer writing through this service
+        """
+        return AIMessageBuffer(cls, conversation_id)
+
     @classmethod
     async def add_tool_result(
         cls,
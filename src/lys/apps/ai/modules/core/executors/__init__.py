@@ -1,10 +1,12 @@
 """
 Tool executors for AI module.
 
-Executes tools via GraphQL calls to Apollo Gateway (microservice mode).
+Executes tools via GraphQL calls to Apollo Gateway (microservice mode), or
+in process for the webservices served by the app (monolith mode).
 """
 
 from lys.apps.ai.modules.core.executors.abstracts import ToolExecutor
 from lys.apps.ai.modules.core.executors.graphql import GraphQLToolExecutor
+from lys.apps.ai.modules.core.executors.local import LocalToolExecutor
 
-__all__ = ["ToolExecutor", "GraphQLToolExecutor"]
\ No newline at end of file
+__all__ = ["ToolExecutor", "GraphQLToolExecutor", "LocalToolExecutor"]
\ No newline at end of file
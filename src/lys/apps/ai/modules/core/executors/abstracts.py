@@ -18,7 +18,7 @@ class ToolExecutor(ABC):
     Base class for tool execution strategies.
 
     Different implementations handle tool execution in different environments:
-    - LocalToolExecutor: Direct resolver execution (monolith mode)
+    - LocalToolExecutor: In-process execution against the app schema (monolith mode)
     - GraphQLToolExecutor: Remote execution via GraphQL (microservice mode)
     """
 
@@ -120,6 +120,21 @@ class ToolExecutor(ABC):
         """
         pass
 
+    def is_read_only(self, tool_name: str) -> bool:
+        """
+        Whether a tool only reads data.
+
+        Read-only tool calls of a same LLM turn may run concurrently; the others run
+        one after another, in order. Tools are not read-only unless stated otherwise.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            True if the tool can run concurrently with other read-only tools
+        """
+        return False
+
     @abstractmethod
     async def get_tools(self) -> List[Dict[str, Any]]:
         """
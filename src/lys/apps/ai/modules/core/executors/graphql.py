@@ -255,7 +255,7 @@ class GraphQLToolExecutor(ToolExecutor):
         logger.debug(f"Variables: {variables}")
 
         try:
-            data = await self._client.execute(query, variables)
+            data = await self._execute_operation(operation_type, operation_name, query, variables, context)
 
             if "errors" in data:
                 errors = data["errors"]
@@ -282,6 +282,32 @@ class GraphQLToolExecutor(ToolExecutor):
                 "message": f"HTTP error: {str(e)}",
             }
 
+    async def _execute_operation(
+        self,
+        operation_type: str,
+        operation_name: str,
+        query: str,
+        variables: Dict[str, Any],
+        context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run a built tool operation.
+
+        Args:
+            operation_type: "query" or "mutation"
+            operation_name: GraphQL operation name (camelCase)
+            query: GraphQL operation string
+            variables: Operation variables
+            context: Execution context of the tool call
+
+        Returns:
+            Dict with 'data' and optionally 'errors' keys
+
+        Raises:
+            httpx.HTTPError: On network/HTTP errors
+        """
+        return await self._client.execute(query, variables)
+
     def _build_operation(
         self,
         operation_type: str,
@@ -429,6 +455,11 @@ class GraphQLToolExecutor(ToolExecutor):
 
         return type_mapping.get(json_type, "String")
 
+    def is_read_only(self, tool_name: str) -> bool:
+        """Tools of query webservices are read-only; mutations and special tools are not."""
+        tool = self._tools.get(tool_name)
+        return tool_name not in self._special_tools and tool is not None and tool["operation_type"] == "query"
+
     async def get_tools(self) -> List[Dict[str, Any]]:
         """Get all available tool definitions for LLM."""
         return [tool["definition"] for tool in self._tools.values()]
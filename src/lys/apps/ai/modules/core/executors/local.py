@@ -0,0 +1,203 @@
+"""
+Local Tool Executor.
+
+Executes the tools of the webservices served by this app directly against its
+GraphQL schema (monolith mode), the others via GraphQL calls to the gateway.
+"""
+
+import logging
+from types import SimpleNamespace
+from typing import Dict, Any, Optional
+
+from lys.apps.ai.modules.core.executors.graphql import GraphQLToolExecutor
+from lys.core.contexts import Context
+from lys.core.graphql.loaders import RelationLoader
+from lys.core.utils.auth import ServiceAuthUtils
+
+logger = logging.getLogger(__name__)
+
+
+class LocalToolContext(Context):
+    """
+    Context of a tool operation run in process.
+
+    Carries the identity of the caller and its database session. The identity is
+    kept in a state of its own instead of the caller's request state: the permission
+    check of the tool webservice (which sets access_type and webservice_name) leaves
+    the context of the calling operation untouched.
+    """
+
+    def __init__(
+        self,
+        app_manager,
+        session,
+        request=None,
+        connected_user: Optional[Dict[str, Any]] = None,
+        access_token: Optional[str] = None,
+        service_caller: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__()
+        self._state = SimpleNamespace(
+            connected_user=connected_user,
+            access_token=access_token,
+            service_caller=service_caller,
+        )
+        self.request = request
+        self.app_manager = app_manager
+        self.session = session
+        self.relation_loader = RelationLoader(session)
+
+    def get_from_request_state(self, name, default_value=None):
+        return getattr(self._state, name, default_value)
+
+    def set_to_request_state(self, name, value):
+        setattr(self._state, name, value)
+
+
+class LocalToolExecutor(GraphQLToolExecutor):
+    """
+    Executes tools in process when their webservice is served by this app (monolith mode).
+
+    The operation built for a tool is run directly against the app GraphQL schema,
+    with the identity and the database session of the caller: no HTTP request, no
+    second authentication and no second session. Resolvers still check the
+    webservice permission (generate_webservice_permission), as for a call through
+    the gateway. Mutations run in a savepoint, rolled back when the operation fails.
+
+    The identity is the one the gateway call would carry: the connected user when
+    the executor has the user's bearer token, the calling service otherwise.
+
+    Tools whose operation is not a field of the local schema, or called without
+    session, are executed through the gateway like with GraphQLToolExecutor.
+    """
+
+    def __init__(
+        self,
+        app_manager,
+        gateway_url: str,
+        secret_key: str = None,
+        service_name: str = None,
+        bearer_token: str = None,
+        timeout: int = 30,
+        verify_ssl: bool = True,
+    ):
+        """
+        Initialize the local tool executor.
+
+        Args:
+            app_manager: AppManager serving the GraphQL schema
+            gateway_url: URL of the GraphQL endpoint (tools of remote webservices)
+            secret_key: Secret key for service JWT generation (Service auth)
+            service_name: Name of the calling service (Service auth)
+            bearer_token: User JWT token (Bearer auth)
+            timeout: HTTP request timeout in seconds
+            verify_ssl: Whether to verify SSL certificates (set False for self-signed certs)
+        """
+        super().__init__(
+            gateway_url=gateway_url,
+            secret_key=secret_key,
+            service_name=service_name,
+            bearer_token=bearer_token,
+            timeout=timeout,
+            verify_ssl=verify_ssl,
+        )
+        self.app_manager = app_manager
+        self._service_name = service_name
+
+    def is_local_operation(self, operation_type: str, operation_name: str) -> bool:
+        """
+        Check whether an operation is a root field of the app GraphQL schema.
+
+        Args:
+            operation_type: "query" or "mutation"
+            operation_name: GraphQL operation name (camelCase)
+
+        Returns:
+            True if the operation can be executed in process
+        """
+        schema = self.app_manager.graphql_schema
+        if schema is None:
+            return False
+
+        if operation_type == "mutation":
+            root_type = schema._schema.mutation_type
+        else:
+            root_type = schema._schema.query_type
+
+        return root_type is not None and operation_name in root_type.fields
+
+    def _build_context(self, context: Dict[str, Any], session) -> LocalToolContext:
+        """Build the GraphQL context of a tool operation from the tool call context."""
+        caller_context = context["info"].context
+
+        if self._user_authed:
+            identity = {
+                "connected_user": getattr(caller_context, "connected_user", None),
+                "access_token": getattr(caller_context, "access_token", None),
+            }
+        else:
+            identity = {
+                "service_caller": {
+                    "type": ServiceAuthUtils.TOKEN_TYPE,
+                    "service_name": self._service_name,
+                },
+            }
+
+        return LocalToolContext(
+            self.app_manager,
+            session,
+            request=getattr(caller_context, "request", None),
+            **identity,
+        )
+
+    async def _execute_operation(
+        self,
+        operation_type: str,
+        operation_name: str,
+        query: str,
+        variables: Dict[str, Any],
+        context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Run a built tool operation in process, or via the gateway if it is not local.
+
+        Args:
+            operation_type: "query" or "mutation"
+            operation_name: GraphQL operation name (camelCase)
+            query: GraphQL operation string
+            variables: Operation variables
+            context: Execution context of the tool call (session and info)
+
+        Returns:
+            Dict with 'data' and optionally 'errors' keys
+        """
+        session = context.get("session")
+        if session is None or context.get("info") is None \
+                or not self.is_local_operation(operation_type, operation_name):
+            return await super()._execute_operation(operation_type, operation_name, query, variables, context)
+
+        logger.debug(f"Executing {operation_name} in process")
+
+        # A failed tool mutation must not leave partial writes in the caller's transaction
+        savepoint = await session.begin_nested() if operation_type == "mutation" else None
+        try:
+            result = await self.app_manager.graphql_schema.execute(
+                query,
+                variable_values=variables,
+                context_value=self._build_context(context, session),
+            )
+        except Exception:
+            if savepoint is not None:
+                await savepoint.rollback()
+            raise
+
+        if savepoint is not None:
+            if result.errors:
+                await savepoint.rollback()
+            else:
+                await savepoint.commit()
+
+        data = {"data": result.data}
+        if result.errors:
+            data["errors"] = [{"message": error.message} for error in result.errors]
+        return data
@@ -9,6 +9,7 @@ for managing AI tool definitions.
 import asyncio
 import logging
 import time
+from collections import OrderedDict
 from typing import AsyncGenerator, List, Dict, Any, Optional, Type, TypeVar
 
 import httpx
@@ -26,7 +27,7 @@ from lys.apps.ai.utils.providers.exceptions import (
 from lys.apps.ai.utils.message_sanitizer import sanitize_llm_messages
 from lys.apps.ai.utils.providers.anthropic import AnthropicProvider
 from lys.apps.ai.utils.providers.mistral import MistralProvider
-from lys.core.consts.ai import ToolRiskLevel
+from lys.core.consts.ai import AI_TOOLS_CHANGED, AI_TOOLS_CHANNEL, ToolRiskLevel
 from lys.core.graphql.client import GraphQLClient
 from lys.core.registries import register_service
 from lys.core.services import Service
@@ -38,6 +39,12 @@ T = TypeVar("T", bound=BaseModel)
 # Plugin name for AI configuration
 AI_PLUGIN_NAME = "ai"
 
+# Default refresh period of the AI tool catalog (executor.tools_ttl)
+DEFAULT_TOOLS_TTL_SECONDS = 300
+
+# Default number of memoized accessible tool lists (executor.tool_views_size)
+DEFAULT_TOOL_VIEWS_SIZE = 256
+
 
 @register_service()
 class AIService(Service):
@@ -118,7 +125,7 @@ class AIService(Service):
         if name not in cls._providers:
             available = list(cls._providers.keys())
             raise ValueError(f"Unknown AI provider: {name}. Available: {available}")
-        return cls._providers[name]()
+        return cls._providers[name](http_clients=cls.app_manager.http_clients)
 
     @classmethod
     def register_provider(cls, name: str, provider_class: Type[AIProvider]):
@@ -626,11 +633,21 @@ class AIToolService(Service):
     - JWT-based filtering for accessible tools
     - Lazy loading with caching
 
+    The tool catalog is reloaded from the gateway every ``tools_ttl`` seconds, and
+    on the next request after a webservice registration touching AI tools
+    (``AI_TOOLS_CHANGED`` signal, cf. ``WebserviceService.register_webservices``).
+    A failed reload keeps the previous catalog.
+
+    The accessible tool list of a set of claims is computed once per catalog and
+    memoized (bounded LRU of ``tool_views_size`` lists) by the set of accessible
+    webservices: the users sharing a permission set share one list.
+
     Configuration via executor config in AI plugin:
         settings.configure_plugin("ai",
             executor={
                 "gateway_url": "http://localhost:8000/graphql",
                 "service_name": "mimir-api",
+                "tools_ttl": 300,
             },
         )
 
@@ -644,6 +661,93 @@ class AIToolService(Service):
     # Cached tools with resolvers and metadata
     _tools: Dict[str, Dict[str, Any]] = {}
     _initialized: bool = False
+    # Monotonic time after which _tools is reloaded
+    _expires_at: float = float("inf")
+    _load_lock: Optional[asyncio.Lock] = None
+    # Accessible tool lists of _views_catalog, by frozenset of accessible webservices
+    # (None for super users)
+    _views: "OrderedDict[Optional[frozenset], List[Dict[str, Any]]]" = OrderedDict()
+    _views_catalog: Optional[Dict[str, Dict[str, Any]]] = None
+    _views_size: int = DEFAULT_TOOL_VIEWS_SIZE
+    # Marks the catalog stale on the registrations of the other processes
+    _change_listener: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def on_initialize(cls):
+        """Subscribe to the AI tool changes published by webservice registrations."""
+        await super().on_initialize()
+        pubsub = cls.app_manager.pubsub
+        if pubsub is None or cls._change_listener is not None:
+            return
+
+        async def listen():
+            try:
+                async for message in pubsub.subscribe(AI_TOOLS_CHANNEL):
+                    if message.get("signal") == AI_TOOLS_CHANGED:
+                        cls.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning("AI tool change listener stopped: %s", ex)
+
+        cls._change_listener = asyncio.get_running_loop().create_task(listen())
+
+    @classmethod
+    async def on_shutdown(cls):
+        listener, cls._change_listener = cls._change_listener, None
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+        await super().on_shutdown()
+
+    @classmethod
+    def invalidate(cls):
+        """Reload the tool catalog on the next request."""
+        cls._expires_at = 0
+
+    @classmethod
+    async def _ensure_tools(cls):
+        """Load the tool catalog on first use, reload it once expired."""
+        if cls._initialized and time.monotonic() < cls._expires_at:
+            return
+        if cls._load_lock is None:
+            cls._load_lock = asyncio.Lock()
+        async with cls._load_lock:
+            # Loaded by a concurrent request while waiting for the lock
+            if cls._initialized and time.monotonic() < cls._expires_at:
+                return
+            await cls._load_tools()
+
+    @classmethod
+    def _accessible_view(cls, accessible_ids: Optional[frozenset]) -> List[Dict[str, Any]]:
+        """
+        Get the memoized tool list of a set of accessible webservices (None: all tools).
+
+        The memoized lists are dropped whenever the catalog is replaced.
+        """
+        if cls._views_catalog is not cls._tools:
+            cls._views.clear()
+            cls._views_catalog = cls._tools
+
+        view = cls._views.get(accessible_ids)
+        if view is not None:
+            cls._views.move_to_end(accessible_ids)
+            return view
+
+        view = [
+            {
+                "webservice": name,
+                "definition": tool_data["definition"],
+                "operation_type": tool_data.get("operation_type"),
+            }
+            for name, tool_data in cls._tools.items()
+            if accessible_ids is None or name in accessible_ids
+        ]
+        if cls._views_size > 0:
+            cls._views[accessible_ids] = view
+            while len(cls._views) > cls._views_size:
+                cls._views.popitem(last=False)
+        return view
 
     @classmethod
     async def get_accessible_tools(cls, connected_user: Dict[str, Any]) -> List[Dict]:
@@ -666,22 +770,15 @@ class AIToolService(Service):
                             - "is_super_user": boolean
 
         Returns:
-            List of tool definitions for LLM function calling
+            List of tool definitions for LLM function calling. The list is a copy
+            of the memoized one; the tool dicts are shared and must not be modified.
         """
-        if not cls._initialized:
-            await cls._load_tools()
+        await cls._ensure_tools()
 
         # Super users get all tools - permission layer handles actual access control
         is_super_user = connected_user.get("is_super_user", False) if connected_user else False
         if is_super_user:
-            return [
-                {
-                    "webservice": name,
-                    "definition": tool_data["definition"],
-                    "operation_type": tool_data.get("operation_type"),
-                }
-                for name, tool_data in cls._tools.items()
-            ]
+            return list(cls._accessible_view(None))
 
         # Regular users: collect all accessible webservices from JWT claims
         accessible_ids = set()
@@ -697,15 +794,9 @@ class AIToolService(Service):
             org_webservices = org_data.get("webservices", [])
             accessible_ids.update(org_webservices)
 
-        return [
-            {
-                "webservice": name,
-                "definition": tool_data["definition"],
-                "operation_type": tool_data.get("operation_type"),
-            }
-            for name, tool_data in cls._tools.items()
-            if name in accessible_ids
-        ]
+        # Only the tools count in the fingerprint: users who differ by other
+        # webservices share the same list
+        return list(cls._accessible_view(frozenset(accessible_ids.intersection(cls._tools))))
 
     @classmethod
     async def get_tool(cls, name: str) -> Optional[Dict[str, Any]]:
@@ -719,8 +810,7 @@ class AIToolService(Service):
             Tool data dict with definition, resolver, node_type, etc.
             None if tool not found.
         """
-        if not cls._initialized:
-            await cls._load_tools()
+        await cls._ensure_tools()
 
         return cls._tools.get(name)
 
@@ -731,17 +821,29 @@ class AIToolService(Service):
         if not config:
             logger.warning("AI plugin not configured, no tools loaded")
             cls._initialized = True
+            cls._expires_at = float("inf")
             return
 
         executor_config = config.get("executor", {})
-        await cls._load_tools_remote(executor_config)
-
+        tools = await cls._load_tools_remote(executor_config)
+        if tools is not None:
+            cls._tools = tools
+
+        cls._views_size = executor_config.get("tool_views_size", DEFAULT_TOOL_VIEWS_SIZE)
+        ttl = executor_config.get("tools_ttl", DEFAULT_TOOLS_TTL_SECONDS)
+        # A failed load is retried after the TTL too, with the previous catalog meanwhile
+        cls._expires_at = time.monotonic() + ttl if ttl > 0 else float("inf")
         cls._initialized = True
         logger.debug(f"AIToolService loaded {len(cls._tools)} tools from gateway: {list(cls._tools.keys())}")
 
     @classmethod
-    async def _load_tools_remote(cls, executor_config: Dict[str, Any]):
-        """Fetch tools from GraphQL endpoint."""
+    async def _load_tools_remote(cls, executor_config: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Fetch tools from GraphQL endpoint.
+
+        Returns:
+            The tool catalog, None when it could not be fetched
+        """
         gateway_url = executor_config.get("gateway_url")
         service_name = executor_config.get("service_name")
         secret_key = cls.app_manager.settings.secret_key
@@ -750,7 +852,7 @@ class AIToolService(Service):
 
         if not gateway_url:
             logger.error("gateway_url not configured for graphql mode")
-            return
+            return None
 
         client = GraphQLClient(
             url=gateway_url,
@@ -758,6 +860,7 @@ class AIToolService(Service):
             service_name=service_name or "ai-service",
             timeout=timeout,
             verify_ssl=verify_ssl,
+            http_clients=cls.app_manager.http_clients,
         )
 
         query = """
@@ -780,15 +883,16 @@ class AIToolService(Service):
 
             if "errors" in data:
                 logger.error(f"GraphQL errors fetching tools: {data['errors']}")
-                return
+                return None
 
+            tools = {}
             edges = data.get("data", {}).get("allWebservices", {}).get("edges", [])
             for edge in edges:
                 node = edge.get("node", {})
                 ai_tool = node.get("aiTool")
                 if ai_tool:
                     name = ai_tool.get("function", {}).get("name") or node.get("code")
-                    cls._tools[name] = {
+                    tools[name] = {
                         "definition": ai_tool,
                         "resolver": None,  # No resolver in graphql mode
                         "node_type": None,
@@ -797,14 +901,22 @@ class AIToolService(Service):
                         "confirmation_fields": [],
                     }
 
+            return tools
+
         except httpx.HTTPError as e:
             logger.error(f"Failed to fetch tools from gateway: {e}")
+            return None
 
     @classmethod
     def reset(cls):
         """Reset the service state. Useful for testing."""
         cls._tools = {}
         cls._initialized = False
+        cls._expires_at = float("inf")
+        cls._views.clear()
+        cls._views_catalog = None
+        cls._views_size = DEFAULT_TOOL_VIEWS_SIZE
+        cls._load_lock = None
 
 
 @register_service()
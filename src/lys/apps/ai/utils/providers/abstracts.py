@@ -12,6 +12,7 @@ from typing import AsyncGenerator, List, Dict, Any, Optional, TypeVar, Type
 from pydantic import BaseModel
 
 from lys.apps.ai.utils.providers.config import AIEndpointConfig
+from lys.core.managers.http import HttpClientManager, get_http_clients
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -62,11 +63,24 @@ class AIProvider(ABC):
     - OpenAI: response_format with json_schema (strict)
     - Mistral: response_format with json_schema (strict)
     - Anthropic: tool_use with forced tool choice
+
+    Requests go through the shared clients of the HttpClientManager, under the
+    provider ``name`` as target (timeouts and connection limits configurable
+    in the ``http_clients`` plugin).
     """
 
     name: str
     default_base_url: str
 
+    def __init__(self, http_clients: Optional[HttpClientManager] = None):
+        self._http_clients = http_clients
+
+    @property
+    def http_clients(self) -> HttpClientManager:
+        if self._http_clients is None:
+            self._http_clients = get_http_clients()
+        return self._http_clients
+
     # ========== Standard Chat ==========
 
     @abstractmethod
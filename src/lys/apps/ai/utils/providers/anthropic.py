@@ -93,13 +93,13 @@ class AnthropicProvider(AIProvider):
         """Send a chat request to the Anthropic Messages API."""
         payload, headers, base_url = self._prepare(messages, config, tools=tools)
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{base_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_async(self.name)
+            response = await client.post(
+                f"{base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
             return self._parse_response(response)
         except httpx.TimeoutException:
             raise AITimeoutError(f"Request timed out after {config.timeout}s")
@@ -113,13 +113,13 @@ class AnthropicProvider(AIProvider):
         """Synchronous version using httpx sync client."""
         payload, headers, base_url = self._prepare(messages, config, tools=tools)
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{base_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_sync(self.name)
+            response = client.post(
+                f"{base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
             return self._parse_response(response)
         except httpx.TimeoutException:
             raise AITimeoutError(f"Request timed out after {config.timeout}s")
@@ -144,34 +144,34 @@ class AnthropicProvider(AIProvider):
         """
         payload, headers, base_url = self._prepare(messages, config, tools=tools, stream=True)
         try:
-            async with httpx.AsyncClient() as client:
-                async with client.stream(
-                    "POST",
-                    f"{base_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                ) as response:
-                    if response.status_code != 200:
-                        await response.aread()
-                    self._handle_error_status(response)
-
-                    # Anthropic reports input_tokens only in message_start; carry it
-                    # forward so the final usage chunk is complete (prompt + completion).
-                    stream_state: Dict[str, Any] = {"input_tokens": None, "tool_arg_seen": {}}
-                    async for line in response.aiter_lines():
-                        if not line.startswith("data: "):
-                            continue
-                        data_str = line[6:]
-                        try:
-                            event = json.loads(data_str)
-                        except json.JSONDecodeError:
-                            logger.warning(f"Anthropic stream: invalid JSON: {data_str}")
-                            continue
-
-                        chunk = self._translate_stream_event(event, stream_state)
-                        if chunk is not None:
-                            yield chunk
+            client = self.http_clients.get_async(self.name)
+            async with client.stream(
+                "POST",
+                f"{base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                self._handle_error_status(response)
+
+                # Anthropic reports input_tokens only in message_start; carry it
+                # forward so the final usage chunk is complete (prompt + completion).
+                stream_state: Dict[str, Any] = {"input_tokens": None, "tool_arg_seen": {}}
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data_str = line[6:]
+                    try:
+                        event = json.loads(data_str)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Anthropic stream: invalid JSON: {data_str}")
+                        continue
+
+                    chunk = self._translate_stream_event(event, stream_state)
+                    if chunk is not None:
+                        yield chunk
         except httpx.TimeoutException:
             raise AITimeoutError(f"Request timed out after {config.timeout}s")
 
@@ -310,13 +310,13 @@ class AnthropicProvider(AIProvider):
             messages, config, tools=[tool], tool_choice={"type": "tool", "name": tool["name"]}
         )
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{base_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_async(self.name)
+            response = await client.post(
+                f"{base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
             ai_response = self._parse_response(response)
             return self._validate_tool_output(ai_response, schema)
         except httpx.TimeoutException:
@@ -334,13 +334,13 @@ class AnthropicProvider(AIProvider):
             messages, config, tools=[tool], tool_choice={"type": "tool", "name": tool["name"]}
         )
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{base_url}/messages",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_sync(self.name)
+            response = client.post(
+                f"{base_url}/messages",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
             ai_response = self._parse_response(response)
             return self._validate_tool_output(ai_response, schema)
         except httpx.TimeoutException:
@@ -33,6 +33,7 @@ class ExecutorConfig:
     service_name: Optional[str] = None  # Service name for JWT auth
     timeout: int = 30
     verify_ssl: bool = True  # Set False for self-signed certificates
+    local_execution: bool = True  # Run the tools of the app's own webservices in process
 
 
 @dataclass
@@ -103,7 +104,8 @@ def parse_plugin_config(plugin_config: Dict[str, Any]) -> AIConfig:
             "executor": {
                 "gateway_url": "https://gateway:8000/graphql",
                 "service_name": "mimir-api",
-                "timeout": 30
+                "timeout": 30,
+                "local_execution": True
             },
             "chatbot": {
                 "provider": "mistral",
@@ -135,6 +137,7 @@ def parse_plugin_config(plugin_config: Dict[str, Any]) -> AIConfig:
         service_name=executor_cfg.get("service_name"),
         timeout=executor_cfg.get("timeout", 30),
         verify_ssl=executor_cfg.get("verify_ssl", True),
+        local_execution=executor_cfg.get("local_execution", True),
     )
 
     for purpose, cfg in plugin_config.items():
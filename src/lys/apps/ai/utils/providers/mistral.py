@@ -163,13 +163,13 @@ class MistralProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_async(self.name)
+            response = await client.post(
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
 
             return self._parse_response(response)
 
@@ -212,13 +212,13 @@ class MistralProvider(AIProvider):
         }
 
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_sync(self.name)
+            response = client.post(
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
 
             return self._parse_response(response)
 
@@ -262,50 +262,50 @@ class MistralProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                async with client.stream(
-                    "POST",
-                    f"{base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                ) as response:
-                    if response.status_code != 200:
-                        await response.aread()
-                    self._handle_error_status(response)
-
-                    async for line in response.aiter_lines():
-                        if not line.startswith("data: "):
-                            continue
-
-                        data_str = line[6:]  # Strip "data: " prefix
-                        if data_str.strip() == "[DONE]":
-                            return
-
-                        try:
-                            data = json.loads(data_str)
-                        except json.JSONDecodeError:
-                            logger.warning(f"Mistral stream: invalid JSON: {data_str}")
-                            continue
-
-                        choice = data.get("choices", [{}])[0]
-                        delta = choice.get("delta", {})
-                        finish_reason = choice.get("finish_reason")
-
-                        raw_content = delta.get("content")
-                        content = self._extract_text(raw_content)
-                        reasoning = self._extract_reasoning(raw_content)
-                        tool_calls = delta.get("tool_calls")
-
-                        yield AIStreamChunk(
-                            content=content,
-                            reasoning=reasoning,
-                            tool_calls=tool_calls,
-                            finish_reason=finish_reason,
-                            usage=self._normalize_usage(data.get("usage")),
-                            model=data.get("model"),
-                            provider=self.name,
-                        )
+            client = self.http_clients.get_async(self.name)
+            async with client.stream(
+                "POST",
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                self._handle_error_status(response)
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+
+                    data_str = line[6:]  # Strip "data: " prefix
+                    if data_str.strip() == "[DONE]":
+                        return
+
+                    try:
+                        data = json.loads(data_str)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Mistral stream: invalid JSON: {data_str}")
+                        continue
+
+                    choice = data.get("choices", [{}])[0]
+                    delta = choice.get("delta", {})
+                    finish_reason = choice.get("finish_reason")
+
+                    raw_content = delta.get("content")
+                    content = self._extract_text(raw_content)
+                    reasoning = self._extract_reasoning(raw_content)
+                    tool_calls = delta.get("tool_calls")
+
+                    yield AIStreamChunk(
+                        content=content,
+                        reasoning=reasoning,
+                        tool_calls=tool_calls,
+                        finish_reason=finish_reason,
+                        usage=self._normalize_usage(data.get("usage")),
+                        model=data.get("model"),
+                        provider=self.name,
+                    )
 
         except httpx.TimeoutException:
             raise AITimeoutError(f"Request timed out after {config.timeout}s")
@@ -358,13 +358,13 @@ class MistralProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_async(self.name)
+            response = await client.post(
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
 
             ai_response = self._parse_response(response)
             self._warn_if_non_stop_finish(ai_response, schema)
@@ -410,13 +410,13 @@ class MistralProvider(AIProvider):
         }
 
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_sync(self.name)
+            response = client.post(
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
 
             ai_response = self._parse_response(response)
             self._warn_if_non_stop_finish(ai_response, schema)
@@ -455,13 +455,13 @@ class MistralProvider(AIProvider):
             "Content-Type": "application/json",
         }
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{base_url}/ocr",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_sync(self.name)
+            response = client.post(
+                f"{base_url}/ocr",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
             return self._parse_ocr_response(response)
         except httpx.TimeoutException:
             raise AITimeoutError(f"Request timed out after {config.timeout}s")
@@ -484,13 +484,13 @@ class MistralProvider(AIProvider):
             "Content-Type": "application/json",
         }
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{base_url}/ocr",
-                    headers=headers,
-                    json=payload,
-                    timeout=config.timeout,
-                )
+            client = self.http_clients.get_async(self.name)
+            response = await client.post(
+                f"{base_url}/ocr",
+                headers=headers,
+                json=payload,
+                timeout=config.timeout,
+            )
             return self._parse_ocr_response(response)
         except httpx.TimeoutException:
             raise AITimeoutError(f"Request timed out after {config.timeout}s")
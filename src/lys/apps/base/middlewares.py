@@ -8,15 +8,15 @@ import logging
 from typing import Dict, Any, Optional
 
 from jwt import ExpiredSignatureError, InvalidTokenError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from lys.core.interfaces.middlewares import MiddlewareInterface
-from lys.core.utils.auth import ServiceAuthUtils
+from lys.core.utils.auth import ServiceAuthUtils, VerifiedServiceTokenCache
 from lys.core.utils.manager import AppManagerCallerMixin
 
 
-class ServiceAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerCallerMixin):
+class ServiceAuthMiddleware(MiddlewareInterface, AppManagerCallerMixin):
     """Middleware for service-to-service JWT authentication.
 
     This middleware validates JWT tokens from internal service calls and
@@ -24,15 +24,33 @@ class ServiceAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerC
 
     The token is expected in the Authorization header with the format:
     Authorization: Service <token>
+
+    Callers reuse their token for most of its lifetime: the claims of the
+    verified tokens are kept in a VerifiedServiceTokenCache until their exp,
+    so a repeated token skips the JWT decoding and signature check.
     """
 
     AUTHORIZATION_PREFIX = "Service "
 
-    def __init__(self, app):
-        BaseHTTPMiddleware.__init__(self, app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.auth_utils = ServiceAuthUtils(self.app_manager.settings.secret_key)
-
-    async def dispatch(self, request: Request, call_next):
+        self.verified_tokens = VerifiedServiceTokenCache()
+
+    def decode_token(self, token: str) -> Dict[str, Any]:
+        """Claims of a service token, verified once per token and then served from the cache."""
+        service_caller = self.verified_tokens.get(token)
+        if service_caller is None:
+            service_caller = self.auth_utils.decode_token(token)
+            self.verified_tokens.set(token, service_caller)
+        # request handlers get their own copy of the cached claims
+        return dict(service_caller)
+
+    def authenticate(self, request: Request) -> Optional[Dict[str, Any]]:
+        """
+        Decode the service token of the request and inject the service caller
+        into the request state (None when the token is absent or invalid).
+        """
         service_caller: Optional[Dict[str, Any]] = None
 
         auth_header = request.headers.get("Authorization", "")
@@ -41,7 +59,7 @@ class ServiceAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerC
             token = auth_header[len(self.AUTHORIZATION_PREFIX):]
 
             try:
-                service_caller = self.auth_utils.decode_token(token)
+                service_caller = self.decode_token(token)
                 logging.debug(f"Service {service_caller.get('service_name')} authenticated via JWT")
 
             except ExpiredSignatureError as e:
@@ -52,5 +70,13 @@ class ServiceAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerC
                 logging.error(f"Unexpected service JWT validation error: {e}")
 
         request.state.service_caller = service_caller
+        return service_caller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.authenticate(Request(scope))
 
-        return await call_next(request)
\ No newline at end of file
+        await self.app(scope, receive, send)
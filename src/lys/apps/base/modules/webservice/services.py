@@ -1,16 +1,28 @@
-from typing import Any, List
+import asyncio
+import logging
+from typing import Any, List, Set
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from lys.apps.base.modules.webservice.entities import Webservice
+from lys.core.consts.ai import AI_TOOLS_CHANGED, AI_TOOLS_CHANNEL
 from lys.core.models.webservices import WebserviceFixturesModel
 from lys.core.registries import register_service
 from lys.core.services import EntityService
 
+logger = logging.getLogger(__name__)
+
+# session.info key set when the transaction changed the AI tool catalog
+_AI_TOOLS_CHANGED_KEY = "lys_ai_tools_changed"
+
 
 @register_service()
 class WebserviceService(EntityService[Webservice]):
+    # Keeps a reference to the running publications
+    _publish_tasks: Set[asyncio.Task] = set()
+
     @classmethod
     async def accessible_webservices(
             cls,
@@ -69,6 +81,10 @@ class WebserviceService(EntityService[Webservice]):
         This method upserts webservices into the database. Called by business
         microservices at startup to register their webservices with Auth Server.
 
+        When an AI tool is added, changed or removed, or changes its operation type,
+        AI_TOOLS_CHANGED is published once the session commits, so that the AI tool
+        services reload their catalog.
+
         Args:
             webservices: List of webservice configurations to register
             app_name: Name of the application/microservice registering the webservices
@@ -78,6 +94,7 @@ class WebserviceService(EntityService[Webservice]):
             Number of webservices registered
         """
         access_level_entity = cls.app_manager.get_entity("access_level")
+        ai_tools_changed = False
 
         for ws_config in webservices:
             # Fetch access levels first
@@ -90,6 +107,15 @@ class WebserviceService(EntityService[Webservice]):
             # Check if webservice exists
             webservice = await session.get(cls.entity_class, ws_config.id)
 
+            if webservice is None:
+                ai_tools_changed |= bool(ws_config.attributes.ai_tool)
+            else:
+                # The tool catalog holds the operation type of the tools too
+                ai_tools_changed |= webservice.ai_tool != ws_config.attributes.ai_tool or bool(
+                    ws_config.attributes.ai_tool
+                    and webservice.operation_type != ws_config.attributes.operation_type
+                )
+
             if webservice is None:
                 # Create with all attributes
                 webservice = cls.entity_class(
@@ -114,4 +140,57 @@ class WebserviceService(EntityService[Webservice]):
                 webservice.ai_tool = ws_config.attributes.ai_tool
 
         await session.flush()
+
+        if ai_tools_changed:
+            cls._publish_ai_tools_changed_on_commit(session)
+
         return len(webservices)
+
+    @classmethod
+    def _publish_ai_tools_changed_on_commit(cls, session: AsyncSession):
+        """Publish AI_TOOLS_CHANGED once the session commits the registration."""
+        # The AI tool services reload the catalog from the database: publishing
+        # before the commit would let them reload the previous catalog.
+        sync_session = session.sync_session
+        sync_session.info[_AI_TOOLS_CHANGED_KEY] = True
+        if not event.contains(sync_session, "after_commit", cls._after_commit):
+            event.listen(sync_session, "after_commit", cls._after_commit)
+            event.listen(sync_session, "after_transaction_end", cls._after_transaction_end)
+
+    @classmethod
+    def _after_commit(cls, session: Session):
+        if session.info.pop(_AI_TOOLS_CHANGED_KEY, False):
+            cls._publish_ai_tools_changed()
+
+    @classmethod
+    def _after_transaction_end(cls, session: Session, transaction):
+        # rolled back: the registration never reached the database
+        if transaction.parent is None:
+            session.info.pop(_AI_TOOLS_CHANGED_KEY, None)
+
+    @classmethod
+    def _publish_ai_tools_changed(cls):
+        """Notify the AI tool services that the tool catalog changed."""
+        pubsub = cls.app_manager.pubsub
+        if pubsub is None:
+            return
+
+        async def publish():
+            try:
+                await pubsub.publish(AI_TOOLS_CHANNEL, AI_TOOLS_CHANGED, {})
+            except Exception as ex:
+                # The AI tool services still reload their catalog after its TTL
+                logger.warning("Could not publish AI tool catalog change: %s", ex)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no event loop: synchronous session
+            try:
+                pubsub.publish_sync(AI_TOOLS_CHANNEL, AI_TOOLS_CHANGED, {})
+            except Exception as ex:
+                logger.warning("Could not publish AI tool catalog change: %s", ex)
+            return
+        task = loop.create_task(publish())
+        cls._publish_tasks.add(task)
+        task.add_done_callback(cls._publish_tasks.discard)
@@ -4,19 +4,25 @@ Auth service for licensing app.
 Extends OrganizationAuthService to filter organization webservices based on
 license status. Only users with active licenses can access licensed webservices.
 
-Adds subscription claims to JWT with payment provider verification.
+Adds subscription claims to JWT with payment provider verification. The
+provider statuses are read from ``provider_status_cache``: the provider is only
+called, in a worker thread and concurrently for all the clients of the user,
+for the statuses the webhooks did not record.
 """
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from sqlalchemy import select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lys.apps.licensing.modules.mollie.services import (
     get_mollie_client,
+    get_payment_config,
     get_payment_provider
 )
 from lys.apps.licensing.modules.subscription.entities import subscription_user
+from lys.apps.licensing.modules.subscription.status import provider_status_cache
 from lys.apps.organization.consts import ORGANIZATION_ROLE_ACCESS_LEVEL
 from lys.apps.organization.modules.auth.services import OrganizationAuthService
 from lys.apps.user_auth.modules.user.entities import User
@@ -40,6 +46,50 @@ class LicensingAuthService(OrganizationAuthService):
     - subscriptions: {client_id: {plan_id, status, rules}}
     """
 
+    _status_listener: Optional[asyncio.Task] = None
+    # provider subscription id -> background refresh of its cached status
+    _status_refreshes: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    async def on_initialize(cls):
+        """
+        Configure the provider status cache and subscribe to the status
+        changes recorded by the webhooks of the other workers.
+        """
+        await super().on_initialize()
+
+        config = get_payment_config()
+        provider_status_cache.configure(
+            max_size=config.get("status_cache_size", 10000),
+            ttl_seconds=config.get("status_cache_ttl", 300),
+            stale_seconds=config.get("status_cache_stale", 3600),
+        )
+
+        pubsub = cls.app_manager.pubsub
+        if pubsub is None or cls._status_listener is not None:
+            return
+
+        async def listen():
+            try:
+                await provider_status_cache.listen(pubsub)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning("Subscription status listener stopped: %s", ex)
+
+        cls._status_listener = asyncio.get_running_loop().create_task(listen())
+
+    @classmethod
+    async def on_shutdown(cls):
+        await super().on_shutdown()
+        tasks = list(cls._status_refreshes.values())
+        listener, cls._status_listener = cls._status_listener, None
+        if listener is not None:
+            tasks.append(listener)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     @classmethod
     async def generate_access_claims(cls, user: User, session: AsyncSession) -> dict:
         """
@@ -101,11 +151,10 @@ class LicensingAuthService(OrganizationAuthService):
         # Combine unique client IDs
         all_client_ids = list(set(owned_client_ids + ([member_client_id] if member_client_id else [])))
 
-        # Get subscription claim for each client
-        for client_id in all_client_ids:
-            claim = await cls._get_client_subscription_claim(client_id, session)
-            if claim:
-                subscriptions[client_id] = claim
+        if not all_client_ids:
+            return subscriptions
+
+        subscriptions.update(await cls._get_clients_subscription_claims(all_client_ids, session))
 
         return subscriptions
 
@@ -123,61 +172,162 @@ class LicensingAuthService(OrganizationAuthService):
         Returns:
             Dict with plan_id, plan_version_id, status, rules or None
         """
-        subscription_service = cls.app_manager.get_service("subscription")
-        subscription = await subscription_service.get_client_subscription(client_id, session)
+        claims = await cls._get_clients_subscription_claims([client_id], session)
+        return claims.get(str(client_id))
 
-        if not subscription:
-            return None
+    @classmethod
+    async def _get_clients_subscription_claims(
+        cls,
+        client_ids: List[str],
+        session: AsyncSession
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the subscription claims of several clients.
 
-        # Load plan version with rules
-        await session.refresh(subscription, ["plan_version"])
-        plan_version = subscription.plan_version
+        Two statements whatever the number of clients and rules: the subscriptions
+        with their plan version, then the rules of these plan versions.
+        For paid subscriptions, verifies status with payment provider.
 
-        if not plan_version:
-            return None
+        Returns:
+            Dict: {client_id: {plan_id, plan_version_id, status, rules}} for the
+            clients having a subscription
+        """
+        subscription_entity = cls.app_manager.get_entity("subscription")
+        plan_version_entity = cls.app_manager.get_entity("license_plan_version")
+        version_rule_entity = cls.app_manager.get_entity("license_plan_version_rule")
+        client_entity = cls.app_manager.get_entity("client")
 
-        await session.refresh(plan_version, ["rules"])
+        stmt = (
+            select(
+                subscription_entity.client_id,
+                subscription_entity.provider_subscription_id,
+                plan_version_entity.id,
+                plan_version_entity.plan_id,
+                client_entity.provider_customer_id,
+            )
+            .join(plan_version_entity, plan_version_entity.id == subscription_entity.plan_version_id)
+            .join(client_entity, client_entity.id == subscription_entity.client_id)
+            .where(subscription_entity.client_id.in_(client_ids))
+        )
+        result = await session.execute(stmt)
+        subscriptions = result.all()
 
-        # Build rules dict
-        rules = {}
-        for version_rule in plan_version.rules:
-            await session.refresh(version_rule, ["rule"])
-            rule_id = version_rule.rule_id
+        if not subscriptions:
+            return {}
 
-            if version_rule.limit_value is not None:
+        # Build rules dict of every plan version
+        plan_version_rules: Dict[str, Dict[str, Any]] = {}
+        stmt = select(
+            version_rule_entity.plan_version_id,
+            version_rule_entity.rule_id,
+            version_rule_entity.limit_value,
+        ).where(version_rule_entity.plan_version_id.in_({row[2] for row in subscriptions}))
+        result = await session.execute(stmt)
+        for plan_version_id, rule_id, limit_value in result.all():
+            rules = plan_version_rules.setdefault(str(plan_version_id), {})
+            if limit_value is not None:
                 # Quota rule
-                rules[rule_id] = version_rule.limit_value
+                rules[rule_id] = limit_value
             else:
                 # Feature toggle (presence = enabled)
                 rules[rule_id] = True
 
-        # Determine subscription status
-        status = "active"  # Default for free plans
+        # Paid plans: status reported by the payment provider
+        provider_statuses = await cls._get_provider_statuses({
+            (provider_customer_id, provider_subscription_id)
+            for _, provider_subscription_id, _, _, provider_customer_id in subscriptions
+            if provider_subscription_id and provider_customer_id
+        })
+
+        claims = {}
+        for client_id, provider_subscription_id, plan_version_id, plan_id, provider_customer_id in subscriptions:
+            # Determine subscription status
+            status = "active"  # Default for free plans
+
+            if provider_subscription_id and provider_customer_id:
+                status = provider_statuses[provider_subscription_id]
+
+            claims[str(client_id)] = {
+                "plan_id": plan_id,
+                "plan_version_id": str(plan_version_id),
+                "status": status,
+                "rules": dict(plan_version_rules.get(str(plan_version_id), {}))
+            }
 
-        if subscription.provider_subscription_id:
-            # Paid plan: verify with payment provider
-            client_entity = cls.app_manager.get_entity("client")
-            client = await session.get(client_entity, client_id)
+        return claims
 
-            if client and client.provider_customer_id:
-                status = await cls._verify_subscription_status(
-                    client.provider_customer_id,
-                    subscription.provider_subscription_id
-                )
+    @classmethod
+    async def _get_provider_statuses(
+        cls,
+        provider_subscriptions: Iterable[Tuple[str, str]]
+    ) -> Dict[str, str]:
+        """
+        Get the payment provider status of paid subscriptions.
 
-        return {
-            "plan_id": plan_version.plan_id,
-            "plan_version_id": str(plan_version.id),
-            "status": status,
-            "rules": rules
-        }
+        Cached statuses are served without calling the provider; stale ones are
+        refreshed in the background. The provider is called concurrently for
+        the statuses not in cache.
+
+        Args:
+            provider_subscriptions: (provider customer ID, provider subscription ID) pairs
+
+        Returns:
+            Dict: {provider subscription ID: status}
+        """
+        statuses: Dict[str, str] = {}
+        missing: Set[Tuple[str, str]] = set()
+
+        for customer_id, subscription_id in provider_subscriptions:
+            cached = provider_status_cache.get(subscription_id)
+            if cached is None:
+                missing.add((customer_id, subscription_id))
+                continue
+            status, fresh = cached
+            statuses[subscription_id] = status
+            if not fresh:
+                cls._refresh_provider_status(customer_id, subscription_id)
+
+        if missing:
+            missing = list(missing)
+            fetched = await asyncio.gather(*(
+                cls._fetch_provider_status(customer_id, subscription_id)
+                for customer_id, subscription_id in missing
+            ))
+            statuses.update(zip((subscription_id for _, subscription_id in missing), fetched))
+
+        return statuses
+
+    @classmethod
+    async def _fetch_provider_status(cls, customer_id: str, subscription_id: str) -> str:
+        """
+        Get the status of a subscription from the payment provider and cache it.
+
+        When the provider cannot be reached, the cached status (if any) is kept and
+        the subscription is assumed active for this call only.
+        """
+        status = await cls._verify_subscription_status(customer_id, subscription_id)
+        if status is None:
+            return "active"  # Fail open to avoid blocking users
+        provider_status_cache.set(subscription_id, status)
+        return status
+
+    @classmethod
+    def _refresh_provider_status(cls, customer_id: str, subscription_id: str):
+        """Refresh the cached status of a subscription in the background, once at a time."""
+        if subscription_id in cls._status_refreshes:
+            return
+        task = asyncio.get_running_loop().create_task(
+            cls._fetch_provider_status(customer_id, subscription_id)
+        )
+        cls._status_refreshes[subscription_id] = task
+        task.add_done_callback(lambda _: cls._status_refreshes.pop(subscription_id, None))
 
     @classmethod
     async def _verify_subscription_status(
         cls,
         customer_id: str,
         subscription_id: str
-    ) -> str:
+    ) -> Optional[str]:
         """
         Verify subscription status with payment provider.
 
@@ -186,7 +336,8 @@ class LicensingAuthService(OrganizationAuthService):
             subscription_id: Payment provider subscription ID
 
         Returns:
-            Status string: "active", "pending", "canceled", "suspended", "past_due"
+            Status string: "active", "pending", "canceled", "suspended", "past_due",
+            None when the provider could not be reached
         """
         provider = get_payment_provider()
 
@@ -202,25 +353,32 @@ class LicensingAuthService(OrganizationAuthService):
         cls,
         customer_id: str,
         subscription_id: str
-    ) -> str:
+    ) -> Optional[str]:
         """
         Verify subscription status with Mollie API.
 
+        The Mollie SDK is synchronous: it runs in a worker thread so that the
+        HTTP round trip does not block the event loop.
+
         Returns:
-            Status: "active", "pending", "canceled", "suspended", "completed"
+            Status: "active", "pending", "canceled", "suspended", "completed",
+            None when the Mollie API call failed
         """
         mollie = get_mollie_client()
         if not mollie:
             logger.warning("Mollie not configured, assuming active status")
             return "active"
 
-        try:
+        def get_status() -> str:
             customer = mollie.customers.get(customer_id)
             subscription = customer.subscriptions.get(subscription_id)
             return subscription.status
+
+        try:
+            return await asyncio.to_thread(get_status)
         except Exception as e:
             logger.error(f"Error verifying Mollie subscription: {e}")
-            return "active"  # Fail open to avoid blocking users
+            return None
 
     @classmethod
     async def _get_owner_webservices(cls, user_id: str, session: AsyncSession) -> dict:
@@ -241,22 +399,21 @@ class LicensingAuthService(OrganizationAuthService):
         access_level_entity = cls.app_manager.get_entity("access_level")
         subscription_entity = cls.app_manager.get_entity("subscription")
 
-        # Get owned clients
-        stmt = select(client_entity).where(client_entity.owner_id == user_id)
+        # Get owned clients, with their subscription if any
+        stmt = (
+            select(client_entity.id, subscription_entity.id)
+            .outerjoin(subscription_entity, subscription_entity.client_id == client_entity.id)
+            .where(client_entity.owner_id == user_id)
+        )
         result = await session.execute(stmt)
-        owned_clients = list(result.scalars().all())
+        owned_clients = result.all()
 
         if not owned_clients:
             return {}
 
-        # Get clients with active subscriptions
-        stmt = select(subscription_entity.client_id)
-        result = await session.execute(stmt)
-        clients_with_subscription = {str(row[0]) for row in result.all()}
-
         # Get all webservices with ORGANIZATION_ROLE_ACCESS_LEVEL enabled
         stmt = (
-            select(webservice_entity)
+            select(webservice_entity.id, webservice_entity.is_licenced)
             .where(
                 webservice_entity.access_levels.any(
                     access_level_entity.id == ORGANIZATION_ROLE_ACCESS_LEVEL,
@@ -265,22 +422,26 @@ class LicensingAuthService(OrganizationAuthService):
             )
         )
         result = await session.execute(stmt)
-        all_org_webservices = list(result.scalars().all())
+        all_org_webservices = result.all()
 
         # Separate licensed and non-licensed webservices
-        licensed_ws_names = [ws.id for ws in all_org_webservices if ws.is_licenced]
-        non_licensed_ws_names = [ws.id for ws in all_org_webservices if not ws.is_licenced]
+        licensed_ws_names = [ws_id for ws_id, is_licenced in all_org_webservices if is_licenced]
+        non_licensed_ws_names = [ws_id for ws_id, is_licenced in all_org_webservices if not is_licenced]
 
-        organizations = {}
-        for client in owned_clients:
-            client_id = str(client.id)
+        # Clients sharing a license status share the same list
+        webservices_without_subscription = non_licensed_ws_names
+        webservices_with_subscription = non_licensed_ws_names + licensed_ws_names
 
-            # Owner gets non-licensed webservices always
-            webservices = list(non_licensed_ws_names)
+        organizations = {}
+        for client_id, subscription_id in owned_clients:
+            client_id = str(client_id)
 
-            # Owner gets licensed webservices only if client has subscription
-            if client_id in clients_with_subscription:
-                webservices.extend(licensed_ws_names)
+            # Owner gets non-licensed webservices always,
+            # licensed webservices only if client has subscription
+            if subscription_id is not None:
+                webservices = webservices_with_subscription
+            else:
+                webservices = webservices_without_subscription
 
             if webservices:
                 organizations[client_id] = {
@@ -305,13 +466,13 @@ class LicensingAuthService(OrganizationAuthService):
             Dictionary: {client_id: {"level": "client", "webservices": [...]}}
         """
         user_entity = cls.app_manager.get_entity("user")
+        webservice_entity = cls.app_manager.get_entity("webservice")
 
-        # Get user with client_id
-        stmt = select(user_entity).where(user_entity.id == user_id)
+        stmt = select(user_entity.client_id).where(user_entity.id == user_id)
         result = await session.execute(stmt)
-        user = result.scalar_one_or_none()
+        client_id = result.scalar_one_or_none()
 
-        if not user or not user.client_id:
+        if not client_id:
             return {}
 
         # Check if user has a license (is in subscription_user)
@@ -319,42 +480,28 @@ class LicensingAuthService(OrganizationAuthService):
         result = await session.execute(stmt)
         has_license = result.scalar()
 
-        await session.refresh(user, ["client_user_roles"])
-
-        # Collect webservice IDs from all roles
-        role_webservice_ids = set()
-        for client_user_role in user.client_user_roles:
-            await session.refresh(client_user_role, ["role"])
-            role = client_user_role.role
-
-            if role and role.enabled:
-                role_webservice_ids.update(role.get_webservice_ids())
-
-        if not role_webservice_ids:
-            return {}
-
-        # Filter webservices by license status
-        webservice_entity = cls.app_manager.get_entity("webservice")
-        webservice_names = set()
-
-        stmt = select(webservice_entity).where(
-            webservice_entity.id.in_(role_webservice_ids)
+        # Webservices of the enabled roles of the user, with their license flag.
+        # Webservices unknown to the database are dropped.
+        role_webservices = cls._client_user_role_webservices_statement(user_id).subquery()
+        stmt = select(webservice_entity.id, webservice_entity.is_licenced).join(
+            role_webservices, role_webservices.c.webservice_id == webservice_entity.id
         )
         result = await session.execute(stmt)
 
-        for ws in result.scalars().all():
-            # Include webservice only if:
-            # - It's not licensed, OR
-            # - User has a license
-            if not ws.is_licenced or has_license:
-                webservice_names.add(ws.id)
+        # Include webservice only if:
+        # - It's not licensed, OR
+        # - User has a license
+        webservice_names = {
+            ws_id for ws_id, is_licenced in result.all()
+            if not is_licenced or has_license
+        }
 
         if not webservice_names:
             return {}
 
         return {
-            str(user.client_id): {
+            str(client_id): {
                 "level": "client",
                 "webservices": list(webservice_names)
             }
-        }
\ No newline at end of file
+        }
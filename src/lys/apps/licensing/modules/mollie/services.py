@@ -34,6 +34,7 @@ from lys.apps.licensing.modules.event.consts import (
     SUBSCRIPTION_CANCELED,
 )
 from lys.apps.licensing.modules.subscription.prorata import calculate_period_end
+from lys.apps.licensing.modules.subscription.status import provider_status_cache
 from lys.apps.user_auth.modules.event.tasks import trigger_event
 from lys.core.configs import settings
 from lys.core.errors import LysError
@@ -154,6 +155,12 @@ class MollieWebhookService(Service):
     async def _handle_payment(cls, payment: Any, session: AsyncSession) -> Dict[str, Any]:
         """Handle payment webhook."""
         status = payment.status
+
+        # The status of the subscription may follow its payment (e.g. suspended after
+        # failed charges): drop the cached one so that the next token asks the provider
+        if getattr(payment, "subscription_id", None):
+            await provider_status_cache.publish(payment.subscription_id, None, cls.app_manager.pubsub)
+
         handler_name = cls.PAYMENT_HANDLERS.get(status)
 
         if not handler_name:
@@ -170,6 +177,10 @@ class MollieWebhookService(Service):
     async def _handle_subscription(cls, subscription: Any, session: AsyncSession) -> Dict[str, Any]:
         """Handle subscription webhook."""
         status = subscription.status
+
+        # Token issuance reads the subscription status from this cache
+        await provider_status_cache.publish(subscription.id, status, cls.app_manager.pubsub)
+
         handler_name = cls.SUBSCRIPTION_HANDLERS.get(status)
 
         if not handler_name:
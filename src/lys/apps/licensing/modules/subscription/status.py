@@ -0,0 +1,134 @@
+"""
+In-process cache of the payment provider subscription statuses.
+
+The subscription claims carry the status of paid subscriptions as reported by
+the payment provider. Asking the provider on every login or token refresh
+puts an external HTTP round trip on the token issuance path, so the statuses
+are kept here, keyed by provider subscription id:
+
+- ``MollieWebhookService`` records the status of every subscription webhook
+  and drops the status of a subscription whose payment changed, then
+  publishes the change on the ``subscription_status`` channel so that the
+  other workers apply it too (cf. ``ProviderStatusCache.listen``).
+- An entry younger than ``ttl_seconds`` is served as is. An older one is
+  served while ``LicensingAuthService`` refreshes it in the background, and
+  dropped after ``stale_seconds``: only a status never seen (or long gone)
+  makes the token issuance wait for the provider.
+
+Settings (payment plugin): ``status_cache_ttl``, ``status_cache_stale`` and
+``status_cache_size``; a ``status_cache_size`` of 0 disables the cache.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from lys.core.managers.pubsub import PubSubManager
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_STATUS_CHANNEL = "subscription_status"
+SUBSCRIPTION_STATUS_CHANGED = "SUBSCRIPTION_STATUS_CHANGED"
+
+
+class ProviderStatusCache:
+    """Bounded in-process LRU of provider subscription statuses."""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300, stale_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        # provider subscription id -> (monotonic time of the status, status)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def configure(self, max_size: int, ttl_seconds: float, stale_seconds: float):
+        """Resize the cache (payment plugin config), dropping every entry."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = max(stale_seconds, ttl_seconds)
+        self._entries.clear()
+
+    def get(self, subscription_id: str) -> Optional[Tuple[str, bool]]:
+        """
+        Get the cached status of a provider subscription.
+
+        Returns:
+            (status, fresh) or None when the status is unknown or too old to be served
+        """
+        entry = self._entries.get(subscription_id)
+        if entry is None:
+            return None
+        recorded_at, status = entry
+        age = time.monotonic() - recorded_at
+        if age >= self.stale_seconds:
+            self._entries.pop(subscription_id, None)
+            return None
+        self._entries.move_to_end(subscription_id)
+        return status, age < self.ttl_seconds
+
+    def set(self, subscription_id: str, status: str):
+        if not self.enabled:
+            return
+        self._entries[subscription_id] = (time.monotonic(), status)
+        self._entries.move_to_end(subscription_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, subscription_id: str):
+        self._entries.pop(subscription_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _apply(self, subscription_id: str, status: Optional[str]):
+        if status is None:
+            self.discard(subscription_id)
+        else:
+            self.set(subscription_id, status)
+
+    async def publish(self, subscription_id: str, status: Optional[str], pubsub: Optional[PubSubManager]):
+        """
+        Record the status of a subscription in every worker.
+
+        Args:
+            subscription_id: Provider subscription ID
+            status: Status reported by the provider, None to drop the cached one
+            pubsub: PubSubManager of the app, None when not configured
+        """
+        self._apply(subscription_id, status)
+        if pubsub is None:
+            return
+        try:
+            await pubsub.publish(
+                SUBSCRIPTION_STATUS_CHANNEL,
+                SUBSCRIPTION_STATUS_CHANGED,
+                {"subscription_id": subscription_id, "status": status},
+            )
+        except Exception as ex:
+            # The other workers still refresh the status when their entry gets stale
+            logger.warning("Could not publish subscription status change: %s", ex)
+
+    async def listen(self, pubsub: PubSubManager):
+        """
+        Apply the status changes published by the other workers.
+
+        Runs until cancelled; started by ``LicensingAuthService.on_initialize``.
+        """
+        async for message in pubsub.subscribe(SUBSCRIPTION_STATUS_CHANNEL):
+            if message.get("signal") != SUBSCRIPTION_STATUS_CHANGED:
+                continue
+            params = message.get("params", {})
+            subscription_id = params.get("subscription_id")
+            if subscription_id:
+                self._apply(subscription_id, params.get("status"))
+
+
+# Shared by the webhook handlers and the token issuance of the process
+provider_status_cache = ProviderStatusCache()
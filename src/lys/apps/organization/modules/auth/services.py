@@ -34,7 +34,7 @@ but AI tool filtering uses JWT claims. See AIToolService.get_accessible_tools()
 which bypasses filtering for super_users.
 =============================================================================
 """
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lys.apps.organization.consts import ORGANIZATION_ROLE_ACCESS_LEVEL
@@ -155,8 +155,9 @@ class OrganizationAuthService(RoleAuthService):
             return {}
 
         # Get all webservices with ORGANIZATION_ROLE_ACCESS_LEVEL enabled
+        # (ids only: loading the entities would also load their relationships)
         stmt = (
-            select(webservice_entity)
+            select(webservice_entity.id)
             .where(
                 webservice_entity.access_levels.any(
                     access_level_entity.id == ORGANIZATION_ROLE_ACCESS_LEVEL,
@@ -165,7 +166,7 @@ class OrganizationAuthService(RoleAuthService):
             )
         )
         result = await session.execute(stmt)
-        org_webservices = [ws.id for ws in result.scalars().all()]
+        org_webservices = list(result.scalars().all())
 
         # Each owned client gets all organization webservices
         organizations = {}
@@ -191,31 +192,49 @@ class OrganizationAuthService(RoleAuthService):
         """
         user_entity = cls.app_manager.get_entity("user")
 
-        # Get user with client_user_roles
-        stmt = select(user_entity).where(user_entity.id == user_id)
+        stmt = select(user_entity.client_id).where(user_entity.id == user_id)
         result = await session.execute(stmt)
-        user = result.scalar_one_or_none()
+        client_id = result.scalar_one_or_none()
 
-        if not user or not user.client_id:
+        if not client_id:
             return {}
 
-        await session.refresh(user, ["client_user_roles"])
-
-        # Collect webservices from all roles
-        webservice_ids = set()
-        for client_user_role in user.client_user_roles:
-            await session.refresh(client_user_role, ["role"])
-            role = client_user_role.role
-
-            if role and role.enabled:
-                webservice_ids.update(role.get_webservice_ids())
+        # Collect webservices from all enabled roles of the user, in one statement
+        result = await session.execute(cls._client_user_role_webservices_statement(user_id))
+        webservice_ids = set(result.scalars().all())
 
         if not webservice_ids:
             return {}
 
         return {
-            str(user.client_id): {
+            str(client_id): {
                 "level": "client",
                 "webservices": list(webservice_ids)
             }
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def _client_user_role_webservices_statement(cls, user_id: str) -> Select:
+        """
+        Statement selecting the webservice ids of the enabled client_user_roles of a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            SELECT of distinct webservice ids
+        """
+        client_user_role_entity = cls.app_manager.get_entity("client_user_role")
+        role_entity = cls.app_manager.get_entity("role")
+        role_webservice_entity = cls.app_manager.get_entity("role_webservice")
+
+        return (
+            select(role_webservice_entity.webservice_id)
+            .join(role_entity, role_entity.id == role_webservice_entity.role_id)
+            .join(client_user_role_entity, client_user_role_entity.role_id == role_entity.id)
+            .where(
+                client_user_role_entity.user_id == user_id,
+                role_entity.enabled.is_(True)
+            )
+            .distinct()
+        )
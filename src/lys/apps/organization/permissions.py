@@ -22,7 +22,9 @@ class OrganizationPermission(PermissionInterface):
 
     This class checks if the webservice name is present in any of the user's
     organization claims (from JWT 'organizations' dict). No database queries
-    are performed.
+    are performed. Claims read from the AccessTokenStore hold WebserviceSet
+    bitsets instead of lists (cf. lys.apps.user_auth.modules.auth.claims);
+    membership is a bit test either way.
 
     JWT organizations structure:
     {
@@ -80,14 +82,22 @@ class OrganizationPermission(PermissionInterface):
         if not organizations:
             return None, None
 
-        # Find organizations that grant access to this webservice
+        # Find organizations that grant access to this webservice.
+        # Stored claims share one WebserviceSet per distinct set of webservices:
+        # the membership is tested once per set, not once per organization.
         accessible_orgs = {}
+        granted_by_set = {}
 
         for org_id, org_data in organizations.items():
             org_level = org_data.get("level", "client")
             org_webservices = org_data.get("webservices", [])
 
-            if webservice_id in org_webservices:
+            granted = granted_by_set.get(id(org_webservices))
+            if granted is None:
+                granted = webservice_id in org_webservices
+                granted_by_set[id(org_webservices)] = granted
+
+            if granted:
                 # Initialize level list if needed
                 if org_level not in accessible_orgs:
                     accessible_orgs[org_level] = []
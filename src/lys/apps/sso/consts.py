@@ -1,5 +1,8 @@
 SSO_PLUGIN_KEY = "sso"
 
+# HttpClientManager target of the provider discovery and JWKS requests
+SSO_HTTP_TARGET = "sso"
+
 # Redis key prefixes
 SSO_STATE_PREFIX = "sso:state:"
 SSO_SESSION_PREFIX = "sso:session:"
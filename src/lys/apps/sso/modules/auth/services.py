@@ -3,13 +3,13 @@ import logging
 import uuid
 from typing import Optional
 
-import httpx
 from authlib.integrations.httpx_client import AsyncOAuth2Client
 from authlib.jose import JsonWebKey, jwt as authlib_jwt
 from authlib.jose.errors import JoseError
 from starlette.responses import Response
 
 from lys.apps.sso.consts import (
+    SSO_HTTP_TARGET,
     SSO_PLUGIN_KEY,
     SSO_STATE_PREFIX,
     SSO_SESSION_PREFIX,
@@ -100,11 +100,11 @@ class SSOAuthService(Service):
         issuer_url = provider_config["issuer_url"]
         discovery_url = f"{issuer_url}/.well-known/openid-configuration"
 
-        async with httpx.AsyncClient() as http_client:
-            discovery_resp = await http_client.get(discovery_url)
-            discovery_resp.raise_for_status()
-            discovery = discovery_resp.json()
-            authorization_endpoint = discovery["authorization_endpoint"]
+        http_client = cls.app_manager.http_clients.get_async(SSO_HTTP_TARGET)
+        discovery_resp = await http_client.get(discovery_url)
+        discovery_resp.raise_for_status()
+        discovery = discovery_resp.json()
+        authorization_endpoint = discovery["authorization_endpoint"]
 
         # Build authorization URL
         client = AsyncOAuth2Client(
@@ -164,11 +164,11 @@ class SSOAuthService(Service):
         discovery_url = f"{issuer_url}/.well-known/openid-configuration"
 
         # Fetch OIDC discovery document
-        async with httpx.AsyncClient() as http_client:
-            discovery_resp = await http_client.get(discovery_url)
-            discovery_resp.raise_for_status()
-            discovery = discovery_resp.json()
-            token_endpoint = discovery["token_endpoint"]
+        http_client = cls.app_manager.http_clients.get_async(SSO_HTTP_TARGET)
+        discovery_resp = await http_client.get(discovery_url)
+        discovery_resp.raise_for_status()
+        discovery = discovery_resp.json()
+        token_endpoint = discovery["token_endpoint"]
 
         # Exchange code for tokens
         async with AsyncOAuth2Client(
@@ -192,10 +192,10 @@ class SSOAuthService(Service):
         if not jwks_uri:
             raise LysError(SSO_CALLBACK_ERROR, "No jwks_uri in provider discovery document")
 
-        async with httpx.AsyncClient() as http_client:
-            jwks_resp = await http_client.get(jwks_uri)
-            jwks_resp.raise_for_status()
-            jwks = jwks_resp.json()
+        http_client = cls.app_manager.http_clients.get_async(SSO_HTTP_TARGET)
+        jwks_resp = await http_client.get(jwks_uri)
+        jwks_resp.raise_for_status()
+        jwks = jwks_resp.json()
 
         # Decode and verify ID token with provider's public keys
         canonical_issuer = discovery.get("issuer", issuer_url)
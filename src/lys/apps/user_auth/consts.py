@@ -8,6 +8,8 @@ These constants are used in fixtures, permissions, and business logic.
 
 AUTH_PLUGIN_KEY = "auth"
 AUTH_PLUGIN_CHECK_XSRF_TOKEN_KEY = "check_xsrf_token"
+AUTH_PLUGIN_ACCESS_CLAIMS_CACHE_TTL_KEY = "access_claims_cache_ttl"
+AUTH_PLUGIN_ACCESS_CLAIMS_CACHE_SIZE_KEY = "access_claims_cache_size"
 
 # Key used in permission dictionaries for owner-type access
 OWNER_ACCESS_KEY = "owner"
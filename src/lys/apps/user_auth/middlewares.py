@@ -14,39 +14,58 @@ embedded inline in a JWT.
 XSRF semantics are unchanged: the ``xsrf_token`` claim still lives in
 the claims dict (now stored server-side); the middleware compares it to
 the ``x-xsrf-token`` header on state-changing cookie requests.
+
+Decoded claims are kept in the process-wide ``access_claims_cache`` for at
+most ``access_claims_cache_ttl`` seconds (auth plugin config, default 30,
+0 disables it); revoked tokens are evicted from every worker through pubsub.
+
+Like the core middlewares, it is a plain ASGI application: the request
+context is written to ``scope["state"]``, which is what ``request.state``
+reads downstream.
 """
 import hmac
 import logging
 from typing import Union, Dict, Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-
-from lys.apps.user_auth.consts import ACCESS_COOKIE_KEY, AUTH_PLUGIN_CHECK_XSRF_TOKEN_KEY, REQUEST_HEADER_XSRF_TOKEN_KEY
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from lys.apps.user_auth.consts import (
+    ACCESS_COOKIE_KEY,
+    AUTH_PLUGIN_ACCESS_CLAIMS_CACHE_SIZE_KEY,
+    AUTH_PLUGIN_ACCESS_CLAIMS_CACHE_TTL_KEY,
+    AUTH_PLUGIN_CHECK_XSRF_TOKEN_KEY,
+    REQUEST_HEADER_XSRF_TOKEN_KEY,
+)
 from lys.apps.user_auth.errors import INVALID_XSRF_TOKEN_ERROR
-from lys.apps.user_auth.modules.auth.store import AccessTokenStore
+from lys.apps.user_auth.modules.auth.store import AccessTokenStore, access_claims_cache
 from lys.apps.user_auth.utils import AuthUtils
 from lys.core.errors import LysError
 from lys.core.interfaces.middlewares import MiddlewareInterface
 from lys.core.utils.manager import AppManagerCallerMixin
 
 
-class UserAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerCallerMixin):
+class UserAuthMiddleware(MiddlewareInterface, AppManagerCallerMixin):
     """User authentication middleware that resolves opaque access tokens and injects user context."""
 
     REQUIRED_CLAIMS = ["sub", "exp", "xsrf_token"]
 
-    def __init__(self, app):
-        BaseHTTPMiddleware.__init__(self, app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         # AuthUtils is kept for cookie/XSRF config access (cookie_secure,
         # check_xsrf_token, …). It no longer encodes/decodes user JWTs.
         self.auth_utils = AuthUtils()
+        access_claims_cache.configure(
+            max_size=int(self.auth_utils.config.get(AUTH_PLUGIN_ACCESS_CLAIMS_CACHE_SIZE_KEY, 10000)),
+            ttl_seconds=float(self.auth_utils.config.get(AUTH_PLUGIN_ACCESS_CLAIMS_CACHE_TTL_KEY, 30)),
+        )
 
     def _build_store(self) -> Union[AccessTokenStore, None]:
         """
-        Build an AccessTokenStore bound to the current app_manager pubsub.
+        Build an AccessTokenStore bound to the current app_manager pubsub,
+        reading through the process-wide claims cache.
 
-        Returns None when pubsub is not initialised — the dispatch loop
+        Returns None when pubsub is not initialised — ``authenticate``
         treats this the same as "no token", which means unauthenticated.
         Logged at warning level because in normal operation the lifespan
         always initialises pubsub before requests are accepted.
@@ -58,9 +77,20 @@ class UserAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerCall
                 "Ensure the 'pubsub' plugin is configured."
             )
             return None
-        return AccessTokenStore(pubsub)
+        return AccessTokenStore(pubsub, claims_cache=access_claims_cache)
+
+    async def authenticate(self, request: Request) -> Union[Dict[str, Any], None]:
+        """
+        Resolve the access token of the request and inject the user context
+        (``connected_user``, ``access_token``) into the request state.
 
-    async def dispatch(self, request: Request, call_next):
+        Returns:
+            The claims of the connected user, None for an anonymous request
+
+        Raises:
+            LysError: INVALID_XSRF_TOKEN_ERROR on a cookie-authenticated unsafe request
+                without a matching XSRF header
+        """
         # Initialize default user context
         connected_user: Union[Dict[str, Any], None] = None
 
@@ -146,10 +176,18 @@ class UserAuthMiddleware(MiddlewareInterface, BaseHTTPMiddleware, AppManagerCall
         request.state.connected_user = connected_user
         request.state.access_token = access_token if connected_user else None
 
+        return connected_user
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        connected_user = await self.authenticate(Request(scope))
+
         # Process request with error handling
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         except Exception as e:
             user_id = connected_user["sub"] if connected_user else None
             logging.error(f"Request processing failed for user {user_id}: {e}")
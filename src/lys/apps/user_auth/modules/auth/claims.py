@@ -0,0 +1,256 @@
+"""
+Compact encoding of the webservice claims.
+
+The claims built by the ``generate_access_claims`` chain name every accessible
+webservice, once in ``webservices`` and once more per organization: an owner of
+40 clients holds the same organization webservice list 40 times. Before they
+are stored, ``encode_claims`` replaces these lists by bitsets over a versioned
+webservice catalog:
+
+    {
+        "sub": "user-id",
+        ...
+        "webservice_catalog": "9f2c4e01d3a7b655",
+        "webservice_sets": ["1f0a", "6c00000"],
+        "webservices": {"full": 0, "owner": 1},
+        "organizations": {
+            "client-uuid-1": {"level": "client", "webservices": 1},
+            "client-uuid-2": {"level": "client", "webservices": 1}
+        }
+    }
+
+- A catalog is a sorted tuple of webservice names; its version is a hash of
+  them, and it is stored in Redis under ``lys:webservice_catalog:<version>``
+  so that every worker (and every microservice sharing the store) can decode
+  the claims of another one.
+- ``webservice_sets`` is the table of the distinct sets, as hexadecimal
+  bitsets over the catalog; ``webservices`` maps each access type to its set
+  and every organization references its set.
+
+``decode_claims`` turns the table into shared ``WebserviceSet`` instances, so
+the decoding cost and the memory no longer grow with the number of clients.
+``WebserviceSet`` and ``WebserviceAccess`` answer membership with a bit test
+and behave as the set and dict they replace for the claims readers.
+"""
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Mapping, Set
+from typing import Dict, Iterable, Iterator, Optional
+
+from lys.core.managers.pubsub import PubSubManager
+
+logger = logging.getLogger(__name__)
+
+WEBSERVICE_CATALOG_KEY_PREFIX = "lys:webservice_catalog:"
+# Outlives any access token encoded against the catalog
+WEBSERVICE_CATALOG_TTL_SECONDS = 30 * 24 * 3600
+
+CATALOG_CLAIM = "webservice_catalog"
+SETS_CLAIM = "webservice_sets"
+
+
+class WebserviceCatalog:
+    """Versioned, ordered list of webservice names indexing the claim bitsets."""
+
+    def __init__(self, names: Iterable[str]):
+        self.names = tuple(sorted(set(names)))
+        self.indexes: Dict[str, int] = {name: index for index, name in enumerate(self.names)}
+        self.version = hashlib.sha256("\n".join(self.names).encode("utf-8")).hexdigest()[:16]
+
+    def covers(self, names: Iterable[str]) -> bool:
+        return all(name in self.indexes for name in names)
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= 1 << self.indexes[name]
+        return mask
+
+
+class WebserviceSet(Set):
+    """Immutable set of webservice names stored as a bitset over a catalog."""
+
+    __slots__ = ("catalog", "mask")
+
+    def __init__(self, catalog: WebserviceCatalog, mask: int):
+        self.catalog = catalog
+        self.mask = mask
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # results of the set operators (&, |, -) are plain frozensets
+        return frozenset(iterable)
+
+    def __contains__(self, name) -> bool:
+        index = self.catalog.indexes.get(name)
+        return index is not None and (self.mask >> index) & 1 == 1
+
+    def __iter__(self) -> Iterator[str]:
+        mask, index = self.mask, 0
+        while mask:
+            if mask & 1:
+                yield self.catalog.names[index]
+            mask >>= 1
+            index += 1
+
+    def __len__(self) -> int:
+        return bin(self.mask).count("1")
+
+    def __repr__(self) -> str:
+        return f"WebserviceSet({sorted(self)!r})"
+
+
+class WebserviceAccess(Mapping):
+    """Webservice name -> access type ("full", "owner"), one WebserviceSet per access type."""
+
+    __slots__ = ("sets",)
+
+    def __init__(self, sets: Dict[str, WebserviceSet]):
+        self.sets = sets
+
+    def __getitem__(self, name: str) -> str:
+        for access_type, webservices in self.sets.items():
+            if name in webservices:
+                return access_type
+        raise KeyError(name)
+
+    def __contains__(self, name) -> bool:
+        return any(name in webservices for webservices in self.sets.values())
+
+    def __iter__(self) -> Iterator[str]:
+        for webservices in self.sets.values():
+            yield from webservices
+
+    def __len__(self) -> int:
+        return sum(len(webservices) for webservices in self.sets.values())
+
+    def __repr__(self) -> str:
+        return f"WebserviceAccess({dict(self)!r})"
+
+
+class WebserviceCatalogs:
+    """
+    Catalogs known by the process.
+
+    The catalog used for encoding only grows: claims naming a webservice it
+    does not know (registered by a microservice after startup) get a new
+    catalog, the union of both.
+    """
+
+    def __init__(self):
+        self.current: Optional[WebserviceCatalog] = None
+        self._catalogs: Dict[str, WebserviceCatalog] = {}
+        # version -> monotonic time of the last Redis write
+        self._persisted: Dict[str, float] = {}
+
+    @staticmethod
+    def _key(version: str) -> str:
+        return f"{WEBSERVICE_CATALOG_KEY_PREFIX}{version}"
+
+    def _add(self, catalog: WebserviceCatalog) -> WebserviceCatalog:
+        return self._catalogs.setdefault(catalog.version, catalog)
+
+    def _extend(self, names: Iterable[str]) -> WebserviceCatalog:
+        known = self.current.names if self.current is not None else ()
+        self.current = self._add(WebserviceCatalog((*known, *names)))
+        return self.current
+
+    def seed(self, names: Iterable[str]):
+        """Start from the webservices known at startup, so that the workers share their catalog."""
+        self._extend(names)
+
+    def for_names(self, names: Iterable[str]) -> WebserviceCatalog:
+        """Catalog covering ``names``, the current one when it does."""
+        names = set(names)
+        if self.current is None or not self.current.covers(names):
+            return self._extend(names)
+        return self.current
+
+    async def persist(self, catalog: WebserviceCatalog, pubsub: PubSubManager):
+        """Store ``catalog`` in Redis, again once half its TTL elapsed."""
+        persisted_at = self._persisted.get(catalog.version)
+        if persisted_at is not None and time.monotonic() - persisted_at < WEBSERVICE_CATALOG_TTL_SECONDS / 2:
+            return
+        ok = await pubsub.set_key(
+            self._key(catalog.version), json.dumps(catalog.names), ttl_seconds=WEBSERVICE_CATALOG_TTL_SECONDS
+        )
+        if not ok:
+            raise RuntimeError(f"Failed to write webservice catalog {catalog.version} to Redis.")
+        self._persisted[catalog.version] = time.monotonic()
+
+    async def get(self, version: str, pubsub: PubSubManager) -> Optional[WebserviceCatalog]:
+        catalog = self._catalogs.get(version)
+        if catalog is not None:
+            return catalog
+        raw = await pubsub.get_key(self._key(version))
+        if raw is None:
+            return None
+        catalog = WebserviceCatalog(json.loads(raw))
+        if catalog.version != version:
+            logger.error("Webservice catalog %s does not match its names, ignoring it", version)
+            return None
+        return self._add(catalog)
+
+
+# Shared by every store of the process
+webservice_catalogs = WebserviceCatalogs()
+
+
+def get_claims_webservice_names(claims: dict) -> set[str]:
+    """Names of every webservice referenced by raw claims."""
+    names = set(claims.get("webservices") or ())
+    for organization in (claims.get("organizations") or {}).values():
+        names.update(organization.get("webservices") or ())
+    return names
+
+
+def encode_claims(claims: dict, catalog: WebserviceCatalog) -> dict:
+    """
+    Encode the webservice lists of raw claims against ``catalog``.
+
+    The catalog must cover every name of ``get_claims_webservice_names(claims)``.
+    """
+    sets: list[str] = []
+    set_indexes: Dict[int, int] = {}
+
+    def add_set(names: Iterable[str]) -> int:
+        mask = catalog.mask(names)
+        if mask not in set_indexes:
+            set_indexes[mask] = len(sets)
+            sets.append(format(mask, "x"))
+        return set_indexes[mask]
+
+    encoded = dict(claims)
+
+    access_types: Dict[str, list[str]] = {}
+    for name, access_type in (claims.get("webservices") or {}).items():
+        access_types.setdefault(access_type, []).append(name)
+    encoded["webservices"] = {access_type: add_set(names) for access_type, names in access_types.items()}
+
+    if "organizations" in claims:
+        encoded["organizations"] = {
+            organization_id: {**organization, "webservices": add_set(organization.get("webservices") or ())}
+            for organization_id, organization in claims["organizations"].items()
+        }
+
+    encoded[CATALOG_CLAIM] = catalog.version
+    encoded[SETS_CLAIM] = sets
+    return encoded
+
+
+def decode_claims(encoded: dict, catalog: WebserviceCatalog) -> dict:
+    """Decode claims produced by ``encode_claims``, sharing one WebserviceSet per distinct set."""
+    sets = [WebserviceSet(catalog, int(bits, 16)) for bits in encoded[SETS_CLAIM]]
+
+    claims = {key: value for key, value in encoded.items() if key not in (CATALOG_CLAIM, SETS_CLAIM)}
+    claims["webservices"] = WebserviceAccess(
+        {access_type: sets[index] for access_type, index in encoded.get("webservices", {}).items()}
+    )
+    if "organizations" in encoded:
+        claims["organizations"] = {
+            organization_id: {**organization, "webservices": sets[organization["webservices"]]}
+            for organization_id, organization in encoded["organizations"].items()
+        }
+    return claims
@@ -1,3 +1,4 @@
+import asyncio
 import bcrypt
 import logging
 import os
@@ -22,7 +23,8 @@ from lys.core.consts.webservices import (
 from lys.apps.user_auth.modules.auth.consts import FAILED_LOGIN_ATTEMPT_STATUS, SUCCEED_LOGIN_ATTEMPT_STATUS
 from lys.apps.user_auth.modules.auth.entities import UserLoginAttempt, LoginAttemptStatus
 from lys.apps.user_auth.modules.auth.models import LoginInputModel
-from lys.apps.user_auth.modules.auth.store import AccessTokenStore
+from lys.apps.user_auth.modules.auth.claims import webservice_catalogs
+from lys.apps.user_auth.modules.auth.store import AccessTokenStore, access_claims_cache
 from lys.apps.user_auth.modules.user.consts import ENABLED_USER_STATUS
 from lys.apps.user_auth.modules.user.entities import User
 from lys.apps.user_auth.modules.user.models import GetUserRefreshTokenInputModel
@@ -48,6 +50,41 @@ class LoginAttemptStatusService(EntityService[LoginAttemptStatus]):
 class AuthService(Service):
     service_name = "auth"
     auth_utils = AuthUtils()
+    # Evicts the tokens revoked by the other workers from the claims cache
+    _revocation_listener: Optional[asyncio.Task] = None
+    # (parametric tables version, base webservices), cf. _get_base_webservices
+    _base_webservices: Optional[tuple[tuple, dict[str, str]]] = None
+
+    @classmethod
+    async def on_initialize(cls):
+        """
+        Seed the webservice catalog of the claims encoding and subscribe to
+        the access token revocations of the other workers.
+        """
+        await super().on_initialize()
+        webservice_catalogs.seed(cls.app_manager.registry.webservices)
+
+        store = cls._get_access_token_store()
+        if store is None or cls._revocation_listener is not None:
+            return
+
+        async def listen():
+            try:
+                await store.listen_revocations()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning("Access token revocation listener stopped: %s", ex)
+
+        cls._revocation_listener = asyncio.get_running_loop().create_task(listen())
+
+    @classmethod
+    async def on_shutdown(cls):
+        listener, cls._revocation_listener = cls._revocation_listener, None
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+        await super().on_shutdown()
 
     @classmethod
     async def get_user_from_login(cls, login: str, session: AsyncSession) \
@@ -142,6 +179,7 @@ class AuthService(Service):
         Security design:
         - All failure paths raise INVALID_CREDENTIALS_ERROR (prevents user enumeration)
         - When user doesn't exist, a dummy bcrypt hash is checked (equalizes timing)
+        - bcrypt runs in app_manager.cpu_pool: a saturated pool raises a 429 LysError
         - Rate limiting is checked before user status (prevents disabled user enumeration)
         - User status is checked after password validation
 
@@ -167,7 +205,7 @@ class AuthService(Service):
 
         if user is None:
             # User not found: run dummy bcrypt to equalize timing with real password check
-            bcrypt.checkpw(password.encode("utf-8"), _DUMMY_HASH.encode("utf-8"))
+            await cls.app_manager.cpu_pool.run(bcrypt.checkpw, password.encode("utf-8"), _DUMMY_HASH.encode("utf-8"))
             raise LysError(INVALID_CREDENTIALS_ERROR, f"unknown user with login '{login}'")
 
         # get user last login attempt (any status)
@@ -194,10 +232,10 @@ class AuthService(Service):
         # verify password (bcrypt runs here for real users)
         if user.password is None:
             # SSO-only user — run dummy hash to equalize timing, then fail
-            bcrypt.checkpw(password.encode("utf-8"), _DUMMY_HASH.encode("utf-8"))
+            await cls.app_manager.cpu_pool.run(bcrypt.checkpw, password.encode("utf-8"), _DUMMY_HASH.encode("utf-8"))
             raise LysError(INVALID_CREDENTIALS_ERROR, f"unknown user with login '{login}'")
 
-        password_valid = user_service.check_password(user, password)
+        password_valid = await user_service.check_password_async(user, password)
 
         # handle failed login attempt
         if not password_valid:
@@ -398,6 +436,10 @@ class AuthService(Service):
         - Webservices with CONNECTED_ACCESS_LEVEL enabled -> "full"
         - Webservices with OWNER_ACCESS_LEVEL enabled -> "owner" (unless also has CONNECTED)
 
+        The result does not depend on the user: with the parametric cache enabled,
+        it is computed once per version of the webservice and access level tables
+        and kept in process. Otherwise a single statement computes it.
+
         Args:
             session: Database session
 
@@ -407,51 +449,57 @@ class AuthService(Service):
         webservice_entity = cls.app_manager.get_entity("webservice")
         access_level_entity = cls.app_manager.get_entity("access_level")
 
-        # Query webservices that are:
+        version = cls.app_manager.parametric_cache.get_version(
+            (webservice_entity.__tablename__, access_level_entity.__tablename__), session
+        )
+        cached = AuthService._base_webservices
+        if version is not None and cached is not None and cached[0] == version:
+            # callers extend the returned dict
+            return dict(cached[1])
+
+        # One row per webservice and enabled CONNECTED/OWNER access level of the webservices that are:
         # 1. Public with NO_LIMITATION type, OR
         # 2. Have CONNECTED_ACCESS_LEVEL enabled, OR
         # 3. Have OWNER_ACCESS_LEVEL enabled
         stmt = (
-            select(webservice_entity)
+            select(webservice_entity.id, webservice_entity.public_type_id, access_level_entity.id)
+            .outerjoin(webservice_entity.access_levels.and_(
+                access_level_entity.id.in_((CONNECTED_ACCESS_LEVEL, OWNER_ACCESS_LEVEL)),
+                access_level_entity.enabled.is_(True),
+            ))
             .where(
                 or_(
                     # Public NO_LIMITATION webservices (public_type_id is not null means is_public)
                     webservice_entity.public_type_id == NO_LIMITATION_WEBSERVICE_PUBLIC_TYPE,
-                    # CONNECTED access level
-                    webservice_entity.access_levels.any(
-                        access_level_entity.id == CONNECTED_ACCESS_LEVEL,
-                        enabled=True
-                    ),
-                    # OWNER access level
-                    webservice_entity.access_levels.any(
-                        access_level_entity.id == OWNER_ACCESS_LEVEL,
-                        enabled=True
-                    )
+                    access_level_entity.id.is_not(None),
                 )
             )
         )
         result = await session.execute(stmt)
-        webservices = list(result.scalars().all())
+
+        access_levels: dict[str, set[str]] = {}
+        public_webservices = set()
+        for webservice_id, public_type_id, access_level_id in result.all():
+            enabled_access_levels = access_levels.setdefault(webservice_id, set())
+            if access_level_id is not None:
+                enabled_access_levels.add(access_level_id)
+            if public_type_id == NO_LIMITATION_WEBSERVICE_PUBLIC_TYPE:
+                public_webservices.add(webservice_id)
 
         # Determine access type for each webservice
+        # Note: the webservice id is its name (ParametricEntity uses id as business key)
         webservice_access = {}
-        for ws in webservices:
-            # Load access_levels if needed
-            await session.refresh(ws, ["access_levels"])
-
-            enabled_access_levels = [al.id for al in ws.access_levels if al.enabled]
-
+        for webservice_id, enabled_access_levels in access_levels.items():
             # Public NO_LIMITATION or CONNECTED = full access
-            # Note: ws.id is the webservice name (ParametricEntity uses id as business key)
-            if ws.is_public and ws.public_type_id == NO_LIMITATION_WEBSERVICE_PUBLIC_TYPE:
-                webservice_access[ws.id] = "full"
-            elif CONNECTED_ACCESS_LEVEL in enabled_access_levels:
-                webservice_access[ws.id] = "full"
+            if webservice_id in public_webservices or CONNECTED_ACCESS_LEVEL in enabled_access_levels:
+                webservice_access[webservice_id] = "full"
             elif OWNER_ACCESS_LEVEL in enabled_access_levels:
                 # OWNER only = filtered access
-                webservice_access[ws.id] = "owner"
+                webservice_access[webservice_id] = "owner"
 
-        return webservice_access
+        if version is not None:
+            AuthService._base_webservices = (version, webservice_access)
+        return dict(webservice_access)
 
     @classmethod
     async def generate_access_token(cls, user: User, session: AsyncSession = None) -> tuple[str, dict]:
@@ -533,6 +581,9 @@ class AuthService(Service):
           session was abandoned without logout; purge it to avoid a
           short-lived dangling claims entry.
 
+        The revocation is published to the other workers, which evict the
+        token from their claims cache.
+
         Returns True if a stored entry was actually removed, False if the
         token was missing/empty/already gone or if the store is unavailable.
         Callers should not branch on the return value — a no-op is harmless.
@@ -556,7 +607,7 @@ class AuthService(Service):
         pubsub = getattr(cls.app_manager, "pubsub", None)
         if pubsub is None:
             return None
-        return AccessTokenStore(pubsub)
+        return AccessTokenStore(pubsub, claims_cache=access_claims_cache)
 
     @classmethod
     def _require_access_token_store(cls) -> AccessTokenStore:
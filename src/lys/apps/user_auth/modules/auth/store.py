@@ -14,22 +14,111 @@ Design notes:
 - Values are JSON-serialized claims dicts (the same dict that used to be
   embedded in the JWT payload — sub, is_super_user, webservices, exp,
   xsrf_token, plus whatever subclasses of ``AuthService.generate_access_claims``
-  add via ``super()`` chain: organizations, subscriptions, …).
+  add via ``super()`` chain: organizations, subscriptions, …), with their
+  webservice lists encoded as bitsets over a versioned catalog (cf.
+  ``lys.apps.user_auth.modules.auth.claims``). ``get`` decodes them into
+  ``WebserviceAccess`` / ``WebserviceSet`` views; entries written before the
+  encoding are returned as stored.
 - TTL is set at write time and equal to the access token lifetime
   (``access_token_expire_minutes``), so the store mirrors the previous
   ``exp`` behaviour: a cookie that "expires" simply has no entry in Redis
   any more and the middleware reads ``None``.
+- The middleware reads through ``access_claims_cache``, a bounded in-process
+  LRU of decoded claims, so most requests skip the Redis round-trip and the
+  JSON decoding. An entry lives at most ``access_claims_cache_ttl`` seconds
+  and never past the token ``exp``; ``delete`` evicts it locally and
+  publishes the token id on the ``access_token`` channel so that the other
+  workers evict theirs (cf. ``AccessTokenStore.listen_revocations``).
 """
 import json
 import logging
+import time
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Tuple
 
+from lys.apps.user_auth.modules.auth.claims import (
+    CATALOG_CLAIM,
+    decode_claims,
+    encode_claims,
+    get_claims_webservice_names,
+    webservice_catalogs,
+)
 from lys.core.managers.pubsub import PubSubManager
 
 logger = logging.getLogger(__name__)
 
 ACCESS_TOKEN_KEY_PREFIX = "lys:access_token:"
+ACCESS_TOKEN_CHANNEL = "access_token"
+ACCESS_TOKEN_REVOKED = "ACCESS_TOKEN_REVOKED"
+
+
+class AccessClaimsCache:
+    """
+    Bounded in-process LRU of decoded access claims keyed by token id.
+
+    Entries expire after ``ttl_seconds`` or at the token ``exp``, whichever
+    comes first, so a token that TTL'd out of Redis is never served from
+    memory. A ``ttl_seconds`` of 0 disables the cache.
+
+    Claims are copied in and out: the middleware hands them to the request
+    as ``connected_user``, and concurrent requests of a token must not share
+    one mutable dict.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 30):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # token id -> (monotonic expiry, claims)
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def configure(self, max_size: int, ttl_seconds: float):
+        """Resize the cache (auth plugin config), dropping every entry."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries.clear()
+
+    def get(self, token_id: str) -> Optional[dict]:
+        entry = self._entries.get(token_id)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(token_id, None)
+            return None
+        self._entries.move_to_end(token_id)
+        return dict(claims)
+
+    def set(self, token_id: str, claims: dict):
+        if not self.enabled:
+            return
+        ttl_seconds = self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl_seconds = min(ttl_seconds, exp - time.time())
+        if ttl_seconds <= 0:
+            return
+        self._entries[token_id] = (time.monotonic() + ttl_seconds, dict(claims))
+        self._entries.move_to_end(token_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, token_id: str):
+        self._entries.pop(token_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by the stores of the middleware and of AuthService: the revocation listener evicts from it
+access_claims_cache = AccessClaimsCache()
 
 
 class AccessTokenStore:
@@ -45,13 +134,15 @@ class AccessTokenStore:
     read-modify-write a single entry.
     """
 
-    def __init__(self, pubsub: PubSubManager):
+    def __init__(self, pubsub: PubSubManager, claims_cache: Optional[AccessClaimsCache] = None):
         if pubsub is None:
             raise RuntimeError(
                 "AccessTokenStore requires a PubSubManager instance. "
                 "Ensure the 'pubsub' plugin is configured in settings.py."
             )
         self._pubsub = pubsub
+        # Read-through cache of decoded claims, only used by ``get``
+        self._claims_cache = claims_cache
 
     @staticmethod
     def _key(token_id: str) -> str:
@@ -78,10 +169,13 @@ class AccessTokenStore:
                 manager not initialised). Caller should surface this as a
                 500 — login cannot succeed without a valid store.
         """
+        catalog = webservice_catalogs.for_names(get_claims_webservice_names(claims))
+        await webservice_catalogs.persist(catalog, self._pubsub)
+
         token_id = str(uuid.uuid4())
         ok = await self._pubsub.set_key(
             self._key(token_id),
-            json.dumps(claims),
+            json.dumps(encode_claims(claims, catalog)),
             ttl_seconds=ttl_seconds,
         )
         if not ok:
@@ -106,15 +200,30 @@ class AccessTokenStore:
         """
         if not token_id:
             return None
+        if self._claims_cache is not None:
+            claims = self._claims_cache.get(token_id)
+            if claims is not None:
+                return claims
         raw = await self._pubsub.get_key(self._key(token_id))
         if raw is None:
             return None
         try:
-            return json.loads(raw)
+            claims = json.loads(raw)
         except json.JSONDecodeError:
             logger.error("Corrupted access token entry for id=%s, deleting", token_id)
             await self._pubsub.delete_key(self._key(token_id))
             return None
+        if isinstance(claims, dict) and CATALOG_CLAIM in claims:
+            catalog = await webservice_catalogs.get(claims[CATALOG_CLAIM], self._pubsub)
+            if catalog is None:
+                logger.error(
+                    "Unknown webservice catalog %s for access token id=%s", claims[CATALOG_CLAIM], token_id
+                )
+                return None
+            claims = decode_claims(claims, catalog)
+        if self._claims_cache is not None and isinstance(claims, dict):
+            self._claims_cache.set(token_id, claims)
+        return claims
 
     async def delete(self, token_id: str) -> bool:
         """
@@ -130,4 +239,27 @@ class AccessTokenStore:
         """
         if not token_id:
             return False
-        return await self._pubsub.delete_key(self._key(token_id))
+        if self._claims_cache is not None:
+            self._claims_cache.discard(token_id)
+        deleted = await self._pubsub.delete_key(self._key(token_id))
+        try:
+            await self._pubsub.publish(ACCESS_TOKEN_CHANNEL, ACCESS_TOKEN_REVOKED, {"token_id": token_id})
+        except Exception as ex:
+            # The other workers still drop the entry when its cache TTL elapses
+            logger.warning("Could not publish access token revocation: %s", ex)
+        return deleted
+
+    async def listen_revocations(self, claims_cache: Optional[AccessClaimsCache] = None):
+        """
+        Evict the tokens revoked by the other workers from ``claims_cache``,
+        the claims cache of the store by default.
+
+        Runs until cancelled; started by ``AuthService.on_initialize``.
+        """
+        if claims_cache is None:
+            claims_cache = self._claims_cache
+        if claims_cache is None:
+            return
+        async for message in self._pubsub.subscribe(ACCESS_TOKEN_CHANNEL):
+            if message.get("signal") == ACCESS_TOKEN_REVOKED:
+                claims_cache.discard(message.get("params", {}).get("token_id"))
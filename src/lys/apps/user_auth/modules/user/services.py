@@ -140,6 +140,19 @@ class UserService(EntityService[User]):
         bytes_ = plain_text_password.encode('utf-8')
         return bcrypt.checkpw(bytes_, user.password.encode('utf-8'))
 
+    @classmethod
+    async def check_password_async(cls, user: User, plain_text_password: str) -> bool:
+        """
+        check_password run in app_manager.cpu_pool, off the event loop.
+
+        Raises:
+            LysError: TOO_MANY_REQUESTS_ERROR when the pool is saturated
+        """
+        # read the hash here: the worker thread must not touch the session
+        return await cls.app_manager.cpu_pool.run(
+            bcrypt.checkpw, plain_text_password.encode('utf-8'), user.password.encode('utf-8')
+        )
+
     @classmethod
     async def get_by_email(cls, email: str, session: AsyncSession) -> User | None:
         """
@@ -212,7 +225,8 @@ class UserService(EntityService[User]):
         email_address = user_email_address_service.entity_class(id=email.strip().lower())
 
         # 5. Hash the password (None for SSO-only users)
-        hashed_password = AuthUtils.hash_password(password) if password is not None else None
+        hashed_password = await cls.app_manager.cpu_pool.run(AuthUtils.hash_password, password) \
+            if password is not None else None
 
         # 6. Create private data entity
         private_data = user_private_data_service.entity_class(
@@ -557,7 +571,7 @@ class UserService(EntityService[User]):
             )
 
         # 6. Hash the new password
-        hashed_password = AuthUtils.hash_password(new_password)
+        hashed_password = await cls.app_manager.cpu_pool.run(AuthUtils.hash_password, new_password)
 
         # 7. Update user password
         user.password = hashed_password
@@ -721,7 +735,7 @@ class UserService(EntityService[User]):
             )
 
         # 6. Hash and set the new password
-        hashed_password = AuthUtils.hash_password(new_password)
+        hashed_password = await cls.app_manager.cpu_pool.run(AuthUtils.hash_password, new_password)
         user.password = hashed_password
 
         # 7. Validate email address (if not already validated)
@@ -869,14 +883,14 @@ class UserService(EntityService[User]):
             LysError: If current password is incorrect
         """
         # 1. Verify current password
-        if not cls.check_password(user, current_password):
+        if not await cls.check_password_async(user, current_password):
             raise LysError(
                 INVALID_CREDENTIALS_ERROR,
                 "Current password is incorrect"
             )
 
         # 2. Hash and update password using centralized utility
-        user.password = AuthUtils.hash_password(new_password)
+        user.password = await cls.app_manager.cpu_pool.run(AuthUtils.hash_password, new_password)
 
         return user
 
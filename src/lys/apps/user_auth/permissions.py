@@ -86,6 +86,10 @@ class JWTPermission(PermissionInterface):
     - "full": Full access to all data
     - "owner": Access only to data owned by the user
 
+    Claims read from the AccessTokenStore carry it as a WebserviceAccess,
+    which answers the lookup with bit tests on the encoded claims
+    (cf. lys.apps.user_auth.modules.auth.claims).
+
     Used by: All microservices (stateless JWT verification)
     """
 
@@ -127,9 +131,9 @@ class JWTPermission(PermissionInterface):
         # Check if webservice is in JWT claims
         user_webservices = connected_user.get("webservices", {})
 
-        if webservice_id in user_webservices:
-            access_type = user_webservices[webservice_id]
+        access_type = user_webservices.get(webservice_id)
 
+        if access_type is not None:
             if access_type == "owner":
                 return {OWNER_ACCESS_KEY: True}, None
 
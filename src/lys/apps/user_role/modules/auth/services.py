@@ -106,21 +106,18 @@ class RoleAuthService(AuthService):
             List of webservice names (unique)
         """
         role_entity = cls.app_manager.get_entity("role")
+        role_webservice_entity = cls.app_manager.get_entity("role_webservice")
 
-        # Query roles assigned to user that are enabled
+        # Webservices of the enabled roles assigned to the user, in one statement
         stmt = (
-            select(role_entity)
+            select(role_webservice_entity.webservice_id)
+            .join(role_entity, role_entity.id == role_webservice_entity.role_id)
             .where(
                 role_entity.users.any(id=user_id),
                 role_entity.enabled.is_(True)
             )
+            .distinct()
         )
         result = await session.execute(stmt)
-        roles = list(result.scalars().all())
 
-        # Collect unique webservice IDs from all roles
-        webservice_ids = set()
-        for role in roles:
-            webservice_ids.update(role.get_webservice_ids())
-
-        return list(webservice_ids)
+        return list(result.scalars().all())
@@ -1,6 +1,7 @@
 from celery import Celery, current_app, signals
 
 from lys.core.consts.component_types import AppComponentTypeEnum
+from lys.core.managers.http import HttpClientManager
 from lys.core.managers.pubsub import PubSubManager
 from lys.core.models import PubSubConfig
 
@@ -105,6 +106,10 @@ def init_worker_process(**kwargs):
             )
             current_app.app_manager.pubsub.initialize_sync()
 
+        # Fresh HTTP clients: the connections of the parent process must not be shared
+        current_app.app_manager.http_clients = HttpClientManager(current_app.app_manager)
+        current_app.app_manager.http_clients.initialize_sync()
+
 
 @signals.worker_process_shutdown.connect
 def shutdown_worker_process(**kwargs):
@@ -112,9 +117,11 @@ def shutdown_worker_process(**kwargs):
     Shutdown worker process.
 
     This signal is called when a worker process is shutting down.
-    Cleanly closes pubsub connections.
+    Cleanly closes pubsub and HTTP connections.
     """
     if hasattr(current_app, 'app_manager'):
         # Shutdown pubsub sync client if initialized
         if current_app.app_manager.pubsub:
-            current_app.app_manager.pubsub.shutdown_sync()
\ No newline at end of file
+            current_app.app_manager.pubsub.shutdown_sync()
+
+        current_app.app_manager.http_clients.shutdown_sync()
@@ -45,6 +45,30 @@ class DatabaseSettings(BaseSettings):
         # Maximum overflow connections
         self.max_overflow: Optional[int] = None
 
+        # Read replicas, each a dict of settings overriding the primary ones
+        # (e.g. {"host": "replica-1"}). Empty: read-only sessions use the primary
+        self.replicas: list[dict[str, Any]] = []
+        # How a read-only session picks its replica: "round_robin" or "least_connections"
+        self.replica_strategy: str = "round_robin"
+        # Seconds during which a user who ran a mutation keeps reading from the primary
+        # (read-your-writes). 0 disables it
+        self.replica_sticky_seconds: float = 0
+        # Sessions a query operation may hold to resolve its root fields concurrently.
+        # 0 or 1: every root field shares the request session
+        self.concurrent_query_sessions: int = 0
+        # GraphQL statements running longer than this many milliseconds are stored in
+        # the log table (normalized SQL and parameter types, never values). 0 disables it
+        self.slow_statement_threshold_ms: float = 0
+        # Fraction (0 to 1) of the slow statements also stored with their
+        # EXPLAIN (FORMAT JSON) plan (PostgreSQL only)
+        self.slow_statement_explain_rate: float = 0
+        # Keep the parametric rows in memory (see managers.parametric_cache): their
+        # relationship loads and get_by_id no longer reach the database
+        self.parametric_cache: bool = False
+        # Relationship load results (statement, primary keys) kept per parametric table,
+        # least recently used evicted first. 0: every relationship load selects the rows
+        self.parametric_cache_relation_results: int = 1000
+
     def configured(self):
         return self.type is not None
 
@@ -75,6 +99,16 @@ class DatabaseSettings(BaseSettings):
         else:
             raise ValueError(f"Unsupported database type: {self.type}. Supported: postgresql, sqlite, mysql")
 
+        if self.replica_strategy not in ("round_robin", "least_connections"):
+            raise ValueError(
+                f"Unsupported replica strategy: {self.replica_strategy}. Supported: round_robin, least_connections"
+            )
+
+        if not 0 <= self.slow_statement_explain_rate <= 1:
+            raise ValueError(
+                f"slow_statement_explain_rate must be between 0 and 1, got {self.slow_statement_explain_rate}"
+            )
+
 
 class CelerySettings(BaseSettings):
     """Configuration for Celery task queue."""
@@ -291,6 +325,14 @@ class AppSettings(BaseSettings):
         self.query_depth_limit = 10
         self.query_alias_limit = 10
         self.relay_max_results = 100
+        # A resolver path running the same SQL statement shape more than this many
+        # times in one operation is logged as an N+1 (0 disables the detection)
+        self.n_plus_one_threshold = 10
+
+        # CPU-bound work (password hashing) runs in app_manager.cpu_pool: that many
+        # threads, and that many calls waiting for one before the next gets a 429
+        self.cpu_pool_workers: int = 4
+        self.cpu_pool_queue_size: int = 64
 
         # Super user auto-creation (created once at startup if not exists)
         self.super_user_email: Optional[str] = None  # Email from .env; password is randomly generated
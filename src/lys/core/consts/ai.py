@@ -9,4 +9,10 @@ class ToolRiskLevel(Enum):
     READ = "read"       # Safe - no confirmation needed
     CREATE = "create"   # New data - requires confirmation
     UPDATE = "update"   # Modification - requires confirmation
-    DELETE = "delete"   # Deletion - requires confirmation
\ No newline at end of file
+    DELETE = "delete"   # Deletion - requires confirmation
+
+
+# Pub/sub channel of the AI tool catalog: webservice registrations touching AI
+# tools publish AI_TOOLS_CHANGED on it, the AI tool services reload their catalog
+AI_TOOLS_CHANNEL = "ai_tools"
+AI_TOOLS_CHANGED = "AI_TOOLS_CHANGED"
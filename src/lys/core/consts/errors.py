@@ -4,3 +4,5 @@ SEARCH_TOO_LONG_ERROR = (400, "SEARCH_TOO_LONG")
 PERMISSION_DENIED_ERROR = (403, "PERMISSION_DENIED")
 NOT_FOUND_ERROR = (404, "NOT_FOUND")
 UNKNOWN_WEBSERVICE_ERROR = (404, "UNKNOWN_WEBSERVICE")
+INVALID_CURSOR_ERROR = (400, "INVALID_CURSOR")
+TOO_MANY_REQUESTS_ERROR = (429, "TOO_MANY_REQUESTS")
@@ -1 +1,2 @@
-RATE_LIMIT_PLUGIN_KEY = "rate_limit"
\ No newline at end of file
+RATE_LIMIT_PLUGIN_KEY = "rate_limit"
+HTTP_CLIENTS_PLUGIN_KEY = "http_clients"
@@ -1,4 +1,5 @@
-from typing import Dict, Any, Union, TypeAlias, TYPE_CHECKING
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Tuple, Union, TypeAlias, TYPE_CHECKING
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import BaseContext
@@ -6,15 +7,46 @@ from strawberry.types import Info as StrawberryInfo
 from strawberry.types.info import RootValueType
 
 if TYPE_CHECKING:
+    from lys.core.graphql.loaders import RelationLoader
     from lys.core.managers.app import AppManager
 
 
+# (context, session, relation loader) of the root field being resolved, set by
+# DatabaseSessionExtension when the root fields of a query get their own session
+root_field_session: ContextVar[Optional[Tuple["Context", AsyncSession, "RelationLoader"]]] = ContextVar(
+    "root_field_session", default=None
+)
+
+
 class Context(BaseContext):
     def __init__(self):
         super().__init__()
 
-        self.session: AsyncSession | None = None
+        self._session: AsyncSession | None = None
         self.app_manager: "AppManager | None" = None
+        self._relation_loader: "RelationLoader | None" = None
+
+    def _get_root_field_session(self):
+        field_session = root_field_session.get()
+        return field_session if field_session is not None and field_session[0] is self else None
+
+    @property
+    def session(self) -> AsyncSession | None:
+        field_session = self._get_root_field_session()
+        return field_session[1] if field_session is not None else self._session
+
+    @session.setter
+    def session(self, value: AsyncSession | None):
+        self._session = value
+
+    @property
+    def relation_loader(self) -> "RelationLoader | None":
+        field_session = self._get_root_field_session()
+        return field_session[2] if field_session is not None else self._relation_loader
+
+    @relation_loader.setter
+    def relation_loader(self, value: "RelationLoader | None"):
+        self._relation_loader = value
 
     def get_from_request_state(self, name, default_value=None):
         if self.request is not None:
@@ -23,7 +23,10 @@ class AbstractListConnection:
     def before_compute_returning_list(cls, info: Info, before: Optional[str],
                                       after: Optional[str], first: Optional[int], last: Optional[int]):
         slice_metadata = SliceMetadata.from_arguments(info, before=before, after=after, first=first, last=last)
+        return slice_metadata, cls.get_edge_class()
 
+    @classmethod
+    def get_edge_class(cls) -> type[Edge[NodeType]]:
         type_def = get_object_definition(cls)
         assert type_def
         field_def = type_def.get_field("edges")
@@ -32,9 +35,7 @@ class AbstractListConnection:
         field_ = field_def.resolve_type(type_definition=type_def)
         while isinstance(field_, StrawberryContainer):
             field_ = field_.of_type
-        edge_class = cast(Edge[NodeType], field_)
-
-        return slice_metadata, edge_class
+        return cast(type[Edge[NodeType]], field_)
 
     @classmethod
     def prepare_returning_list(cls, slice_metadata: SliceMetadata,edges: list[Edge], last: Optional[int],
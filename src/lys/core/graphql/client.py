@@ -8,10 +8,19 @@ from typing import Dict, Any, Optional
 
 import httpx
 
+from lys.core.managers.http import HttpClientManager, get_http_clients
 from lys.core.utils.auth import ServiceAuthUtils
 
 logger = logging.getLogger(__name__)
 
+# HttpClientManager target of the inter-service GraphQL calls
+GRAPHQL_HTTP_TARGET = "graphql"
+
+
+def _request_timeout(timeout: Optional[float]):
+    """Per-request timeout, or the one configured for the client target."""
+    return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+
 
 def build_global_id(type_name: str, node_id: str) -> str:
     """
@@ -49,13 +58,15 @@ async def fetch_graphql(
     variables: Optional[Dict[str, Any]] = None,
     secret_key: str = None,
     service_name: str = None,
-    timeout: int = 30,
+    timeout: Optional[float] = None,
     verify_ssl: bool = True,
+    http_clients: Optional[HttpClientManager] = None,
 ) -> Dict[str, Any]:
     """
     Execute a GraphQL query/mutation with automatic service authentication.
 
     Generates a service JWT token automatically for inter-service calls.
+    The request goes through the shared "graphql" client of the HttpClientManager.
 
     Args:
         url: GraphQL endpoint URL
@@ -63,8 +74,9 @@ async def fetch_graphql(
         variables: Optional variables for the query
         secret_key: Secret key for JWT generation
         service_name: Name of the calling service
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds (default: timeout of the "graphql" target)
         verify_ssl: Whether to verify SSL certificates (set False for self-signed certs)
+        http_clients: HttpClientManager to use (default: the one of the AppManager)
 
     Returns:
         Dict with 'data' and optionally 'errors' keys
@@ -76,8 +88,8 @@ async def fetch_graphql(
     if not secret_key or not service_name:
         raise ValueError("secret_key and service_name are required for inter-service calls")
 
-    # Generate service JWT token
-    auth_utils = ServiceAuthUtils(secret_key)
+    # Service JWT token, reused by the process while valid
+    auth_utils = ServiceAuthUtils.shared(secret_key)
     token = auth_utils.generate_token(service_name)
 
     headers = {
@@ -89,10 +101,10 @@ async def fetch_graphql(
     if variables:
         payload["variables"] = variables
 
-    async with httpx.AsyncClient(timeout=timeout, verify=verify_ssl) as client:
-        response = await client.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    client = (http_clients or get_http_clients()).get_async(GRAPHQL_HTTP_TARGET, verify=verify_ssl)
+    response = await client.post(url, json=payload, headers=headers, timeout=_request_timeout(timeout))
+    response.raise_for_status()
+    return response.json()
 
 
 class GraphQLClient:
@@ -102,6 +114,9 @@ class GraphQLClient:
     Supports two authentication modes:
     - Service JWT: For inter-service calls (requires secret_key and service_name)
     - Bearer JWT: For user-authenticated calls (requires bearer_token)
+
+    Requests go through the shared "graphql" clients of the HttpClientManager,
+    so successive calls reuse the open connections to the endpoint.
     """
 
     def __init__(
@@ -110,8 +125,9 @@ class GraphQLClient:
         secret_key: Optional[str] = None,
         service_name: Optional[str] = None,
         bearer_token: Optional[str] = None,
-        timeout: int = 30,
+        timeout: Optional[float] = None,
         verify_ssl: bool = True,
+        http_clients: Optional[HttpClientManager] = None,
     ):
         """
         Initialize GraphQL client.
@@ -124,8 +140,9 @@ class GraphQLClient:
             secret_key: Secret key for JWT generation (Service auth)
             service_name: Name of the calling service (Service auth)
             bearer_token: User JWT token (Bearer auth)
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds (default: timeout of the "graphql" target)
             verify_ssl: Whether to verify SSL certificates (set False for self-signed certs)
+            http_clients: HttpClientManager to use (default: the one of the AppManager)
 
         Raises:
             ValueError: If neither Service auth params nor bearer_token are provided
@@ -134,6 +151,7 @@ class GraphQLClient:
         self.timeout = timeout
         self.verify_ssl = verify_ssl
         self._bearer_token = bearer_token
+        self._http_clients = http_clients
 
         # Validate auth configuration
         has_service_auth = secret_key is not None and service_name is not None
@@ -147,7 +165,13 @@ class GraphQLClient:
 
         # Store service auth params if provided
         self._service_name = service_name
-        self._auth_utils = ServiceAuthUtils(secret_key) if secret_key else None
+        self._auth_utils = ServiceAuthUtils.shared(secret_key) if secret_key else None
+
+    @property
+    def http_clients(self) -> HttpClientManager:
+        if self._http_clients is None:
+            self._http_clients = get_http_clients()
+        return self._http_clients
 
     def _get_headers(self) -> Dict[str, str]:
         """Generate headers with appropriate authentication."""
@@ -189,14 +213,15 @@ class GraphQLClient:
 
         headers = self._get_headers()
 
-        async with httpx.AsyncClient(timeout=self.timeout, verify=self.verify_ssl) as client:
-            response = await client.post(
-                self.url,
-                json=payload,
-                headers=headers,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = self.http_clients.get_async(GRAPHQL_HTTP_TARGET, verify=self.verify_ssl)
+        response = await client.post(
+            self.url,
+            json=payload,
+            headers=headers,
+            timeout=_request_timeout(self.timeout),
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def query(
         self,
@@ -270,14 +295,15 @@ class GraphQLClient:
         if variables:
             payload["variables"] = variables
 
-        with httpx.Client(timeout=self.timeout, verify=self.verify_ssl) as client:
-            response = client.post(
-                self.url,
-                json=payload,
-                headers=self._get_headers(),
-            )
-            response.raise_for_status()
-            return response.json()
+        client = self.http_clients.get_sync(GRAPHQL_HTTP_TARGET, verify=self.verify_ssl)
+        response = client.post(
+            self.url,
+            json=payload,
+            headers=self._get_headers(),
+            timeout=_request_timeout(self.timeout),
+        )
+        response.raise_for_status()
+        return response.json()
 
     def query_sync(
         self,
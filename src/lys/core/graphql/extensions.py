@@ -5,9 +5,30 @@ This module provides custom Strawberry extensions for the lys framework,
 including database session management for GraphQL operations.
 """
 import asyncio
+import inspect
+import itertools
+import logging
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from lys.core.contexts import Context, root_field_session
+from lys.core.consts.environments import EnvironmentEnum
+from lys.core.graphql.loaders import RelationLoader
+from lys.core.utils.slow_queries import schedule_slow_statements_capture
+from lys.core.utils.sql_stats import (
+    SqlStats,
+    activate_sql_stats,
+    deactivate_sql_stats,
+    get_active_sql_stats,
+    reset_resolver_path,
+    set_resolver_path,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class _MaterializedAsyncResult:
@@ -146,6 +167,47 @@ class ThreadSafeSessionProxy:
         return getattr(self._session, name)
 
 
+class _RootFieldSessions:
+    """
+    Sessions shared out to the root fields of a read-only operation.
+
+    Root fields are dealt the sessions round-robin: the request session first, then
+    up to `size - 1` extra sessions opened on first use, so that an operation never
+    holds more than `size` pooled connections. Each extra session has its own lock
+    and RelationLoader.
+    """
+
+    def __init__(self, context: Context, session_factory: Callable[[], AsyncSession], size: int):
+        self._session_factory = session_factory
+        self._size = size
+        self._counter = itertools.count()
+        self._sessions: List[AsyncSession] = []
+        self._slots: List[Tuple[ThreadSafeSessionProxy, RelationLoader]] = [
+            (context.session, context.relation_loader)
+        ]
+
+    def next_session(self) -> Tuple[ThreadSafeSessionProxy, RelationLoader]:
+        index = next(self._counter) % self._size
+        while len(self._slots) <= index:
+            session = self._session_factory()
+            self._sessions.append(session)
+            proxy = ThreadSafeSessionProxy(session)
+            self._slots.append((proxy, RelationLoader(proxy)))
+        return self._slots[index]
+
+    async def close(self):
+        # read-only operation: nothing to commit
+        for session in self._sessions:
+            try:
+                await session.close()
+            except Exception:
+                pass  # Session will be garbage collected
+
+
+# Root field sessions of the operation being executed, set by DatabaseSessionExtension
+_root_field_sessions: ContextVar[Optional[_RootFieldSessions]] = ContextVar("_root_field_sessions", default=None)
+
+
 class DatabaseSessionExtension(SchemaExtension):
     """
     Strawberry extension that manages database session lifecycle for GraphQL operations.
@@ -162,14 +224,131 @@ class DatabaseSessionExtension(SchemaExtension):
 
     Trade-offs:
     - Sessions remain open longer (entire GraphQL operation vs. per-resolver)
-    - Potential N+1 query problem if lazy loading is used extensively
-    - Recommend using dataloaders for frequently accessed relationships
+    - Lazy loaded relations are batched per tick by the request RelationLoader,
+      but still cost one query per (entity, relation) and nesting level
+
+    Concurrent root fields:
+        With `database.concurrent_query_sessions` above 1, the root fields of a `query`
+        operation are dealt round-robin over up to that many sessions (the request
+        session included) instead of all waiting on the request session lock. A
+        dashboard query then takes about as long as its slowest field. Mutations,
+        whose root fields run serially, keep the single transactional session.
+
+    SQL statistics:
+        The statements run by an operation are counted and timed, in total and per
+        resolver path, and logged when it completes; a resolver path repeating the
+        same statement shape more than `n_plus_one_threshold` times is logged as a
+        possible N+1. The statistics are also returned in the response `extensions`
+        in DEV, or when a super user sends the `sql_stats_header` header.
+        Statements slower than `database.slow_statement_threshold_ms` are stored in
+        the log table by a background task (see utils.slow_queries).
+
+    Read replicas:
+        When `database.replicas` is configured, `query` operations get a session on a
+        replica (query resolvers must then not write) and every other operation one
+        on the primary. With `database.replica_sticky_seconds`, the queries of a user
+        who just ran a mutation keep reading from the primary for that long.
+
+    In-process operations:
+        When the context already carries a session (see LocalToolExecutor), the
+        operation uses it as is: no session is opened, committed or closed.
 
     Usage:
         The extension is automatically configured in the schema and requires no
         changes to resolver code. Resolvers access the session via info.context.session.
     """
 
+    # Request header through which a super user asks for the SQL statistics of an operation
+    sql_stats_header = "x-lys-sql-stats"
+
+    _sql_stats: Optional[SqlStats] = None
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        root_field_sessions = _root_field_sessions.get()
+        if root_field_sessions is not None and info.path.prev is None:
+            return self._resolve_root_field(root_field_sessions, _next, root, info, *args, **kwargs)
+
+        result = _next(root, info, *args, **kwargs)
+        # only awaitable resolvers can run SQL
+        if inspect.isawaitable(result) and get_active_sql_stats() is not None:
+            return self._await_with_resolver_path(result, info)
+        return result
+
+    @staticmethod
+    def _get_resolver_path(info) -> str:
+        # list indexes are dropped: the items of a list share the path of the list
+        return ".".join(str(key) for key in info.path.as_list() if not isinstance(key, int))
+
+    @classmethod
+    async def _await_with_resolver_path(cls, result, info):
+        token = set_resolver_path(cls._get_resolver_path(info))
+        try:
+            return await result
+        finally:
+            reset_resolver_path(token)
+
+    @classmethod
+    async def _resolve_root_field(cls, root_field_sessions: "_RootFieldSessions", _next, root, info, *args, **kwargs):
+        session, relation_loader = root_field_sessions.next_session()
+        # Root fields are resolved in their own task: the session set here is seen
+        # by this field's resolver and by all its nested field resolvers
+        root_field_session.set((info.context, session, relation_loader))
+        result = _next(root, info, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await cls._await_with_resolver_path(result, info)
+        return result
+
+    def get_results(self) -> Dict[str, Any]:
+        if self._sql_stats is None or not self._can_expose_sql_stats():
+            return {}
+        return {"sql": self._sql_stats.as_dict()}
+
+    def _can_expose_sql_stats(self) -> bool:
+        context = self.execution_context.context
+        if context.app_manager.settings.env == EnvironmentEnum.DEV:
+            return True
+
+        request = getattr(context, "request", None)
+        connected_user = getattr(context, "connected_user", None)
+        return (
+            request is not None
+            and request.headers.get(self.sql_stats_header) is not None
+            and isinstance(connected_user, dict)
+            and connected_user.get("is_super_user", False) is True
+        )
+
+    @staticmethod
+    def _log_sql_stats(sql_stats: SqlStats, execution_context):
+        operation_name = execution_context.operation_name
+        stats = sql_stats.as_dict()
+
+        logger.info(
+            "GraphQL operation %s ran %d SQL statements in %.1f ms",
+            operation_name, stats["statements"], stats["duration_ms"],
+            extra={"graphql_operation": operation_name, "sql_stats": stats}
+        )
+        for n_plus_one in stats["n_plus_one"]:
+            logger.warning(
+                "Possible N+1 in GraphQL operation %s: resolver path '%s' ran %d times: %s",
+                operation_name, n_plus_one["path"], n_plus_one["count"], n_plus_one["statement"],
+                extra={"graphql_operation": operation_name, "n_plus_one": n_plus_one}
+            )
+
+    @staticmethod
+    def _get_connected_user_id(execution_context) -> Optional[str]:
+        connected_user = getattr(execution_context.context, "connected_user", None)
+        return connected_user.get("sub") if isinstance(connected_user, dict) else None
+
+    def _get_session_factory(self, database, execution_context) -> Callable[[], AsyncSession]:
+        """Open the request sessions on a replica for queries, on the primary otherwise."""
+        if (
+            execution_context.operation_type == OperationType.QUERY
+            and database.has_replicas()
+            and not database.is_primary_sticky(self._get_connected_user_id(execution_context))
+        ):
+            return database.create_read_session
+        return database.session_factory
+
     async def on_execute(self):
         """
         Hook called at the start of GraphQL execution.
@@ -180,8 +359,10 @@ class DatabaseSessionExtension(SchemaExtension):
 
         Yields control to allow the GraphQL operation to execute, then cleans up.
         """
+        execution_context = self.execution_context
+
         # Get app_manager from context (set by get_context or resolver)
-        app_manager = getattr(self.execution_context.context, "app_manager", None)
+        app_manager = getattr(execution_context.context, "app_manager", None)
 
         # If no app_manager in context yet, we'll let individual resolvers handle sessions
         # This can happen for introspection queries or before resolvers set app_manager
@@ -189,16 +370,57 @@ class DatabaseSessionExtension(SchemaExtension):
         if app_manager is None or not app_manager.database.has_database_configured():
             yield
 
+        elif isinstance(execution_context.context, Context) and execution_context.context.session is not None:
+            # Session provided by the caller of an in-process operation (AI tool calls run
+            # by LocalToolExecutor): the operation runs in the caller's transaction, which
+            # the caller commits. The root field sessions of an enclosing query are not shared.
+            root_field_sessions_token = _root_field_sessions.set(None)
+            try:
+                yield
+            finally:
+                _root_field_sessions.reset(root_field_sessions_token)
+
         else:
+            session_factory = self._get_session_factory(app_manager.database, execution_context)
+
             # Create session manually (not using async with) to handle close errors
             # When parallel resolvers share a session and one fails while another
             # has an operation in progress, the session close can fail.
-            session = app_manager.database.session_factory()
+            session = session_factory()
 
             # Wrap session in thread-safe proxy to handle concurrent resolver access
             # Multiple root field resolvers may execute in parallel, and AsyncSession
             # is not safe for concurrent use. The proxy serializes all access.
-            self.execution_context.context.session = ThreadSafeSessionProxy(session)
+            execution_context.context.session = ThreadSafeSessionProxy(session)
+
+            # Batch the relation loads of the nodes resolved within the same tick
+            execution_context.context.relation_loader = RelationLoader(
+                execution_context.context.session
+            )
+
+            # Read-only operations may spread their root fields over several sessions
+            root_field_sessions = None
+            root_field_sessions_token = None
+            if execution_context.operation_type == OperationType.QUERY \
+                    and app_manager.database.settings.concurrent_query_sessions > 1:
+                root_field_sessions = _RootFieldSessions(
+                    execution_context.context,
+                    session_factory,
+                    app_manager.database.settings.concurrent_query_sessions
+                )
+                root_field_sessions_token = _root_field_sessions.set(root_field_sessions)
+
+            # Count and time the statements of the operation (see utils.sql_stats)
+            database_settings = app_manager.database.settings
+            sql_stats = SqlStats(
+                app_manager.settings.n_plus_one_threshold,
+                slow_threshold=database_settings.slow_statement_threshold_ms / 1000,
+                # only PostgreSQL plans are stored
+                explain_rate=database_settings.slow_statement_explain_rate
+                if database_settings.type == "postgresql" else 0
+            )
+            sql_stats_token = activate_sql_stats(sql_stats)
+            self._sql_stats = sql_stats
 
             try:
                 # Yield to allow the GraphQL operation to execute with session open
@@ -224,10 +446,29 @@ class DatabaseSessionExtension(SchemaExtension):
                         await session.rollback()
                     except Exception:
                         pass  # Ignore rollback errors
+                else:
+                    # Read-your-writes: keep this user's next queries on the primary
+                    user_id = self._get_connected_user_id(execution_context)
+                    if execution_context.operation_type == OperationType.MUTATION and user_id:
+                        app_manager.database.mark_primary_sticky(user_id)
             finally:
+                deactivate_sql_stats(sql_stats_token)
+                self._log_sql_stats(sql_stats, execution_context)
+                # Stored in the background, the response does not wait for it
+                schedule_slow_statements_capture(
+                    app_manager,
+                    sql_stats.slow_statements,
+                    getattr(execution_context.context, "webservice_name", None),
+                    self._get_connected_user_id(execution_context)
+                )
+
+                if root_field_sessions is not None:
+                    _root_field_sessions.reset(root_field_sessions_token)
+                    await root_field_sessions.close()
+
                 # Close session, ignoring errors if session is in invalid state
                 # This can happen when parallel resolvers have operations in progress
                 try:
                     await session.close()
                 except Exception:
-                    pass  # Session will be garbage collected
\ No newline at end of file
+                    pass  # Session will be garbage collected
@@ -8,6 +8,8 @@ from lys.core.consts.ai import ToolRiskLevel
 from lys.core.contexts import Info
 from lys.core.graphql.fields import lys_typed_field
 from lys.core.graphql.nodes import EntityNode
+from lys.core.graphql.optimizer import get_loaded_relations, get_selection_load_options, load_selected_relations
+from lys.core.graphql.selection import get_selected_subfields
 from lys.core.registries import AppRegistry
 from lys.core.utils.webservice import WebserviceIsPublicType
 
@@ -19,6 +21,20 @@ def _getter_resolver_generator(resolver: Callable, ensure_type: Type[EntityNode]
         node = await id.resolve_node(info, ensure_type=ensure_type)
         await resolver(self, node.get_entity(), info=info)
 
+        # Load the selected relations in a fixed number of queries rather than one per field
+        selected_fields = get_selected_subfields(info, ())
+        if selected_fields:
+            entity = node.get_entity()
+            await load_selected_relations(
+                info.context.session,
+                entity,
+                get_selection_load_options(
+                    ensure_type.entity_class,
+                    selected_fields,
+                    loaded_relations=get_loaded_relations(entity)
+                )
+            )
+
         return node
 
     inner_resolver.__name__ = resolver.__name__
@@ -0,0 +1,85 @@
+"""
+Request-scoped batching loaders for GraphQL resolution.
+
+Node relation fields are resolved concurrently for every node of a list. Instead of
+refreshing each entity on its own, RelationLoader gathers the relation requests
+issued within one event loop tick and loads them with a single query per
+(entity class, relation).
+"""
+from functools import partial
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import inspect, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, selectinload
+from strawberry.dataloader import DataLoader
+
+from lys.core.interfaces.entities import EntityInterface
+
+
+class RelationLoader:
+    """
+    Batch relationship loading for the entities of one GraphQL operation.
+
+    Created by DatabaseSessionExtension alongside the request session and exposed
+    as `info.context.relation_loader`. EntityNode._lazy_load_relation and
+    _lazy_load_relation_list go through it, so existing nodes need no change.
+
+    A relation already loaded on the entity (eager loading, previous access) is
+    returned without any query. Results are not cached: the loaded relation lives
+    on the entity itself, so a later expiration is honoured.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._loaders: Dict[Tuple[type, str], DataLoader] = {}
+
+    async def load(self, entity: EntityInterface, relation_name: str) -> Any:
+        """
+        Load a relationship of an entity, batched with the other loads of the same tick.
+
+        Args:
+            entity: Entity attached to the request session
+            relation_name: Name of the relationship attribute
+
+        Returns:
+            The related entity, None, or the related collection
+        """
+        state = inspect(entity)
+
+        if relation_name not in state.unloaded:
+            return getattr(entity, relation_name)
+
+        if not state.persistent:
+            # pending or detached entities cannot be selected back by identity
+            await self._session.refresh(entity, [relation_name])
+            return getattr(entity, relation_name)
+
+        key = (entity.__class__, relation_name)
+        loader = self._loaders.get(key)
+        if loader is None:
+            loader = DataLoader(load_fn=partial(self._batch_load, *key), cache=False)
+            self._loaders[key] = loader
+
+        return await loader.load(entity)
+
+    async def _batch_load(self, entity_class: type, relation_name: str,
+                          entities: List[EntityInterface]) -> List[Any]:
+        primary_key = inspect(entity_class).primary_key
+        identities = [inspect(entity).identity for entity in entities]
+
+        if len(primary_key) == 1:
+            condition = primary_key[0].in_([identity[0] for identity in identities])
+        else:
+            condition = tuple_(*primary_key).in_(identities)
+
+        # Entities are already in the identity map: selecting them again only fills
+        # the unloaded relation. lazyload("*") keeps their other eager relations from
+        # being loaded a second time.
+        stmt = select(entity_class).where(condition).options(
+            selectinload(getattr(entity_class, relation_name)),
+            lazyload("*"),
+        )
+        await self._session.execute(stmt)
+
+        return [getattr(entity, relation_name) for entity in entities]
@@ -11,6 +11,7 @@ from sqlalchemy.util import classproperty
 from strawberry import relay, field
 from strawberry.relay import Edge
 from strawberry.types import Info
+from strawberry.types.graphql import OperationType
 from strawberry.utils.aio import aenumerate
 from strawberry.utils.await_maybe import AwaitableOrValue
 
@@ -19,12 +20,22 @@ from lys.core.entities import ParametricEntity
 from lys.core.errors import LysError
 from lys.core.graphql.abstracts import AbstractListConnection
 from lys.core.graphql.interfaces import NodeInterface, EntityNodeInterface
+from lys.core.graphql.optimizer import get_selection_load_options
+from lys.core.graphql.pagination import (
+    apply_keyset_ordering,
+    build_keyset_predicate,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+    get_keyset_ordering,
+    reverse_keyset_ordering,
+)
+from lys.core.graphql.selection import get_selected_subfields, is_field_selected
 from lys.core.graphql.types import LysPageInfo
 from lys.core.interfaces.entities import EntityInterface
 from lys.core.interfaces.services import ServiceInterface
 from lys.core.permissions import add_access_constraints
 from lys.core.utils.access import get_db_object_and_check_access
-from lys.core.utils.database import get_select_total_count
+from lys.core.utils.database import get_select_estimated_count, get_select_total_count
 from lys.core.utils.manager import AppManagerCallerMixin
 from lys.core.utils.generic import resolve_service_name_from_generic
 
@@ -62,6 +73,20 @@ class EntityNode(Generic[T], ServiceNodeMixin):
     __built_connection: Dict[str, Type[relay.ListConnection]] = {}
     service_name: str
 
+    # Opt-in keyset (seek) pagination for the node list connections: cursors encode
+    # the sort-key values of their row instead of an offset. Sort keys should be
+    # non-nullable and indexed together with the id tie-breaker.
+    keyset_pagination = False
+
+    # Row count from which the list connections return an estimated pageInfo.totalCount
+    # (planner estimate on PostgreSQL, capped count elsewhere). None always counts exactly.
+    estimated_count_threshold = None
+
+    # When True, the list statements load only what the node needs: columns that are
+    # neither keys nor node fields are deferred and unselected relations are not eagerly
+    # loaded. Only for nodes whose computed fields read no other entity attribute.
+    load_selection_only = False
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         # Use centralized generic type resolver to extract service_name
@@ -141,9 +166,9 @@ class EntityNode(Generic[T], ServiceNodeMixin):
         """
         Async lazy load a single relation from the stored entity.
 
-        This method uses the session from the GraphQL context to explicitly load
-        the relationship using session.refresh(). This is required for SQLAlchemy async
-        to properly load relationships.
+        The relationship is loaded explicitly through the request RelationLoader (or
+        session.refresh() as a fallback), as SQLAlchemy async cannot lazy load on
+        attribute access. Loads of the nodes of a list are batched into one query.
 
         If the underlying foreign key is non-nullable and the relation is None, an error is raised
         to ensure GraphQL schema consistency with database constraints.
@@ -171,12 +196,8 @@ class EntityNode(Generic[T], ServiceNodeMixin):
                 f"Add '_entity: strawberry.Private[YourEntity]' to the node definition."
             )
 
-        # Use session from context to refresh the entity with the relationship
-        session = info.context.session
-        await session.refresh(self._entity, [relation_name])
-
-        # Now we can safely access the relationship (it's loaded in memory)
-        entity_relation = getattr(self._entity, relation_name, None)
+        # Load the relationship through the request loader (batched with the other nodes)
+        entity_relation = await self._load_relation(relation_name, info)
 
         if entity_relation is None:
             is_nullable = self._is_relation_nullable(relation_name)
@@ -221,9 +242,9 @@ class EntityNode(Generic[T], ServiceNodeMixin):
         """
         Async lazy load a list of relations from the stored entity.
 
-        This method uses the session from the GraphQL context to explicitly load
-        the collection relationship using session.refresh(). This is required for
-        SQLAlchemy async to properly load relationships.
+        The collection is loaded explicitly through the request RelationLoader (or
+        session.refresh() as a fallback), as SQLAlchemy async cannot lazy load on
+        attribute access. Loads of the nodes of a list are batched into one query.
 
         Args:
             relation_name: Name of the relation attribute on the entity (e.g., 'roles', 'permissions')
@@ -247,13 +268,32 @@ class EntityNode(Generic[T], ServiceNodeMixin):
                 f"Add '_entity: strawberry.Private[YourEntity]' to the node definition."
             )
 
-        # Use session from context to refresh the entity with the relationship collection
-        session = info.context.session
-        await session.refresh(self._entity, [relation_name])
+        # Load the relationship collection through the request loader (batched with the other nodes)
+        entity_relations = await self._load_relation(relation_name, info)
+        return [node_class.from_obj(item) for item in entity_relations or []]
 
-        # Now we can safely access the relationship collection (it's loaded in memory)
-        entity_relations = getattr(self._entity, relation_name, [])
-        return [node_class.from_obj(item) for item in entity_relations]
+    async def _load_relation(self, relation_name: str, info: 'Info') -> Any:
+        """
+        Load a relationship of the stored entity.
+
+        Uses the request-scoped RelationLoader set by DatabaseSessionExtension, which
+        batches the loads of every node resolved in the same tick into one query per
+        relation. Without it (session opened by a resolver), the entity is refreshed
+        with the relationship using session.refresh().
+
+        Args:
+            relation_name: Name of the relation attribute on the entity
+            info: GraphQL Info context containing the database session
+
+        Returns:
+            The loaded relation value
+        """
+        relation_loader = getattr(info.context, "relation_loader", None)
+        if relation_loader is not None:
+            return await relation_loader.load(self._entity, relation_name)
+
+        await info.context.session.refresh(self._entity, [relation_name])
+        return getattr(self._entity, relation_name, None)
 
     @classmethod
     async def resolve_node(cls, node_id: str, *,
@@ -334,11 +374,17 @@ class EntityNode(Generic[T], ServiceNodeMixin):
                     last: Optional[int] = None,
                     **kwargs: Any,
             ) -> AwaitableOrValue[Self]:
+                if effective_node_cls.keyset_pagination:
+                    return cls.resolve_keyset_connection(
+                        stmt, info=info, before=before, after=after, first=first, last=last, **kwargs
+                    )
+
                 slice_metadata, edge_class = cls.before_compute_returning_list(info, before, after, first, last)
 
                 async def resolver():
                     # add right to query
-                    protected_stmt = await add_access_constraints(stmt, info.context, node_cls.entity_class,
+                    protected_stmt = await add_access_constraints(cls.optimize_statement(stmt, info=info),
+                                                                  info.context, node_cls.entity_class,
                                                                   node_cls.app_manager)
 
                     # Append id as tiebreaker to guarantee stable pagination order.
@@ -364,32 +410,175 @@ class EntityNode(Generic[T], ServiceNodeMixin):
                             async for i, v in aenumerate(iterator)
                         ]
 
-                    async def count_entities_with_own_session():
-                        # Use a separate session for counting to allow parallel execution
-                        # The main session is used for loading entities (they stay attached)
-                        async with node_cls.app_manager.database.get_session() as count_session:
-                            return await get_select_total_count(
-                                protected_stmt,
-                                node_cls.service_class.entity_class,
-                                count_session
-                            )
-
                     # Use session from context (set by DatabaseSessionExtension) for loading entities
                     # This keeps entities attached to the session for the entire GraphQL operation
                     session = info.context.session
 
                     # Execute list_edges and count_entities in parallel
                     # - list_edges uses the main session (entities stay attached)
-                    # - count_entities uses its own session (no conflict)
+                    # - resolve_total_count uses its own session (no conflict)
                     [edges, total_count] = await asyncio.gather(
                         list_edges(session),
-                        count_entities_with_own_session()
+                        cls.resolve_total_count(protected_stmt, info=info)
                     )
 
                     return cls.prepare_returning_list(slice_metadata, edges, last, total_count)
 
                 return resolver()
 
+            @classmethod
+            def optimize_statement(cls, stmt: Select, *, info: Info) -> Select:
+                """
+                Add the loader options fetching the relations selected under `edges.node`.
+                """
+                options = get_selection_load_options(
+                    node_cls.entity_class,
+                    get_selected_subfields(info, ("edges", "node")),
+                    effective_node_cls,
+                    effective_node_cls.load_selection_only
+                )
+                return stmt.options(*options) if options else stmt
+
+            @classmethod
+            async def resolve_total_count(cls, stmt: Select, *, info: Info) -> Optional[int]:
+                """
+                Count the rows of the connection, only if `pageInfo.totalCount` is selected.
+
+                The count runs in a separate session so it can execute in parallel with the
+                page query; skipping it when unselected also spares that pool connection.
+                Like the page rows, queries count on a read replica (cf. DatabaseSessionExtension).
+                Nodes declaring `estimated_count_threshold` get a planner estimate above it.
+                """
+                if not is_field_selected(info, ("page_info", "total_count")):
+                    return None
+
+                entity_class = node_cls.service_class.entity_class
+                threshold = effective_node_cls.estimated_count_threshold
+
+                database = node_cls.app_manager.database
+                connected_user = getattr(info.context, "connected_user", None)
+                user_id = connected_user.get("sub") if isinstance(connected_user, dict) else None
+                if (
+                    info.operation.operation == OperationType.QUERY
+                    and database.has_replicas()
+                    and not database.is_primary_sticky(user_id)
+                ):
+                    count_session_manager = database.get_read_session()
+                else:
+                    count_session_manager = database.get_session()
+
+                async with count_session_manager as count_session:
+                    if threshold is not None:
+                        return await get_select_estimated_count(stmt, entity_class, count_session, threshold)
+                    return await get_select_total_count(stmt, entity_class, count_session)
+
+            @classmethod
+            async def resolve_keyset_connection(
+                    cls,
+                    stmt: Select,
+                    *,
+                    info: Info,
+                    before: Optional[str] = None,
+                    after: Optional[str] = None,
+                    first: Optional[int] = None,
+                    last: Optional[int] = None,
+                    **kwargs: Any,
+            ) -> Self:
+                """
+                Resolve the connection with seek predicates instead of LIMIT/OFFSET.
+
+                Cursors hold the sort-key values of their row (the statement ORDER BY
+                plus the id tie-breaker), so a page is read straight from the index
+                position of its cursor, whatever its depth. Walking backwards
+                (`last` without `first`) reverses the ordering, then the page.
+                """
+                max_results = info.schema.config.relay_max_results
+                for argument_name, argument_value in (("first", first), ("last", last)):
+                    if argument_value is None:
+                        continue
+                    if argument_value < 0:
+                        raise ValueError(f"Argument '{argument_name}' must be a non-negative integer.")
+                    if argument_value > max_results:
+                        raise ValueError(f"Argument '{argument_name}' cannot be higher than {max_results}.")
+
+                edge_class = cls.get_edge_class()
+                entity_class = node_cls.entity_class
+
+                protected_stmt = await add_access_constraints(cls.optimize_statement(stmt, info=info),
+                                                              info.context, entity_class,
+                                                              node_cls.app_manager)
+
+                ordering = get_keyset_ordering(
+                    protected_stmt,
+                    entity_class.id if hasattr(entity_class, "id") else None
+                )
+                sort_keys = [column for column, _ in ordering]
+
+                page_stmt = protected_stmt
+                if after:
+                    page_stmt = page_stmt.where(
+                        build_keyset_predicate(ordering, decode_keyset_cursor(after, len(ordering)))
+                    )
+                if before:
+                    page_stmt = page_stmt.where(
+                        build_keyset_predicate(
+                            reverse_keyset_ordering(ordering),
+                            decode_keyset_cursor(before, len(ordering))
+                        )
+                    )
+
+                backward = last is not None and first is None
+                page_size = (last if backward else first)
+                if page_size is None:
+                    page_size = max_results
+
+                # overfetch by one row to know whether another page exists
+                page_stmt = apply_keyset_ordering(
+                    page_stmt,
+                    reverse_keyset_ordering(ordering) if backward else ordering
+                ).add_columns(*sort_keys).limit(page_size + 1)
+
+                async def list_rows(session: AsyncSession) -> List[Any]:
+                    result = await session.stream(page_stmt)
+                    return [row async for row in result]
+
+                [rows, total_count] = await asyncio.gather(
+                    list_rows(info.context.session),
+                    cls.resolve_total_count(protected_stmt, info=info)
+                )
+
+                has_more = len(rows) > page_size
+                rows = rows[:page_size]
+                if backward:
+                    rows.reverse()
+
+                edges = [
+                    edge_class(
+                        cursor=encode_keyset_cursor(row[1:]),
+                        node=cls.resolve_node(row[0], info=info, **kwargs),
+                    )
+                    for row in rows
+                ]
+
+                has_previous_page = has_more if backward else after is not None
+                has_next_page = before is not None if backward else has_more
+
+                # both first and last: keep the tail of the forward page
+                if first is not None and last is not None and len(edges) > last:
+                    edges = edges[-last:]
+                    has_previous_page = True
+
+                return cls(
+                    edges=edges,
+                    page_info=LysPageInfo(
+                        total_count=total_count,
+                        start_cursor=edges[0].cursor if edges else None,
+                        end_cursor=edges[-1].cursor if edges else None,
+                        has_previous_page=has_previous_page,
+                        has_next_page=has_next_page,
+                    ),
+                )
+
         LysListConnection.__name__ = node_cls.__name__ + "ListConnection"
 
         connection_extension = strawberry.type(LysListConnection)
@@ -0,0 +1,137 @@
+"""
+Selection-set driven eager loading for connection and getter statements.
+
+The statements built by lys_connection and lys_getter resolvers know nothing about
+the fields the client selected. This module walks the selection set against the
+SQLAlchemy mapper and turns it into loader options, so that a response is fetched
+in a fixed number of queries instead of one per node and relation:
+
+- a selected many-to-one relation is joined (joinedload)
+- a selected collection is loaded with one extra query (selectinload)
+- nested selections are followed through the related mappers
+
+Fields are matched to relationships by name (GraphQL `privateData` -> `private_data`),
+which is the convention of node relation fields calling `_lazy_load_relation`.
+Fields that match no relationship are left to the request RelationLoader.
+"""
+from typing import Iterable, List, Optional, Set, Type
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, joinedload, lazyload, load_only, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+from strawberry.types.nodes import SelectedField
+from strawberry.utils.str_converters import to_snake_case
+
+from lys.core.graphql.selection import iter_selected_fields
+from lys.core.interfaces.entities import EntityInterface
+
+
+def _relation_load_options(mapper: Mapper, selected_fields: Iterable[SelectedField],
+                           parent: Optional[ORMOption] = None,
+                           skipped: Iterable[str] = ()) -> List[ORMOption]:
+    options = []
+
+    for selected_field in selected_fields:
+        relationship = mapper.relationships.get(to_snake_case(selected_field.name))
+        if relationship is None or relationship.key in skipped:
+            continue
+
+        attribute = relationship.class_attribute
+        if relationship.uselist:
+            loader = parent.selectinload(attribute) if parent is not None else selectinload(attribute)
+        else:
+            loader = parent.joinedload(attribute) if parent is not None else joinedload(attribute)
+
+        nested_options = _relation_load_options(
+            relationship.mapper, iter_selected_fields(selected_field.selections), loader
+        )
+        # a nested chain already carries its parent path
+        options.extend(nested_options or [loader])
+
+    return options
+
+
+def _node_field_names(node_class: type) -> Set[str]:
+    names = set()
+    for cls in node_class.__mro__:
+        names |= {name for name in getattr(cls, "__annotations__", {}) if not name.startswith("_")}
+    return names
+
+
+def get_selection_load_options(
+        entity_class: Type[EntityInterface],
+        selected_fields: List[SelectedField],
+        node_class: Optional[type] = None,
+        selection_only: bool = False,
+        loaded_relations: Iterable[str] = ()
+) -> List[ORMOption]:
+    """
+    Build the loader options fetching what a selection needs from an entity.
+
+    Args:
+        entity_class: Entity selected by the statement
+        selected_fields: Fields selected on the node (e.g. under `edges.node`)
+        node_class: Node exposing the entity, used in selection-only mode
+        selection_only: Also restrict the statement to what the node needs: columns
+            that are neither keys nor node fields are deferred and the relationships
+            that are not selected are not eagerly loaded. Only safe when the node
+            computed fields do not read other entity attributes.
+        loaded_relations: Relations already loaded on the entities, not loaded again
+
+    Returns:
+        Loader options to pass to `Select.options()` (empty if nothing applies)
+    """
+    if not selected_fields:
+        return []
+
+    mapper: Mapper = inspect(entity_class)
+    options: List[ORMOption] = list(_relation_load_options(mapper, selected_fields, skipped=set(loaded_relations)))
+
+    if selection_only and node_class is not None:
+        wanted = _node_field_names(node_class) | {to_snake_case(field.name) for field in selected_fields}
+        columns = [
+            prop.class_attribute
+            for prop in mapper.column_attrs
+            if prop.key in wanted or any(column.primary_key or column.foreign_keys for column in prop.columns)
+        ]
+        options.append(load_only(*columns))
+        options.append(lazyload("*"))
+
+    return options
+
+
+def get_loaded_relations(entity: EntityInterface) -> Set[str]:
+    """Return the names of the relationships already loaded on an entity."""
+    state = inspect(entity)
+    return set(state.mapper.relationships.keys()) - state.unloaded
+
+
+async def load_selected_relations(session: AsyncSession, entity: EntityInterface,
+                                  options: List[ORMOption]) -> None:
+    """
+    Eagerly load the selected relations of an entity already in the session.
+
+    The entity is selected again by identity with the given loader options; being
+    in the identity map, only its unloaded relations are filled. Its other eager
+    relations are not loaded a second time.
+
+    Args:
+        session: Session the entity is attached to
+        entity: Entity to complete
+        options: Loader options built by get_selection_load_options
+    """
+    if not options:
+        return
+
+    state = inspect(entity)
+    if not state.persistent:
+        return
+
+    entity_class = entity.__class__
+    primary_key = state.mapper.primary_key
+    stmt = select(entity_class).where(
+        *[column == value for column, value in zip(primary_key, state.identity)]
+    ).options(*options, lazyload("*"))
+
+    await session.execute(stmt)
@@ -0,0 +1,176 @@
+"""
+Keyset (seek) pagination helpers for LysListConnection.
+
+Offset pagination makes the database scan and discard every skipped row, so
+deep pages get linearly slower. In keyset mode a cursor carries the sort-key
+values of the row it points to, and the next page is selected with a seek
+predicate on those values, which an index on the sort columns serves directly.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+from strawberry.relay.utils import from_base64, to_base64
+
+from lys.core.consts.errors import INVALID_CURSOR_ERROR
+from lys.core.errors import LysError
+
+KEYSET_CURSOR_PREFIX = "keyset"
+
+# (column, descending)
+KeysetOrdering = List[Tuple[ColumnElement, bool]]
+
+
+def get_keyset_ordering(stmt: Select, tie_breaker: Optional[ColumnElement] = None) -> KeysetOrdering:
+    """
+    Extract the sort keys of a statement, in order, with their direction.
+
+    The tie breaker (usually the entity id) is appended when the statement does
+    not already sort on it, so that every row has a unique position.
+
+    Args:
+        stmt: Statement whose ORDER BY clauses define the page order
+        tie_breaker: Unique column appended as last sort key
+
+    Returns:
+        List of (column, descending) tuples
+    """
+    ordering: KeysetOrdering = []
+
+    for clause in stmt._order_by_clauses:
+        descending = False
+        # unwrap asc()/desc() (and nulls_first()/nulls_last() around them)
+        while isinstance(clause, UnaryExpression) and clause.modifier is not None:
+            if clause.modifier is operators.desc_op:
+                descending = True
+            clause = clause.element
+        ordering.append((clause, descending))
+
+    if hasattr(tie_breaker, "__clause_element__"):
+        # ORM attributes (Entity.id) compare against the mapped column
+        tie_breaker = tie_breaker.__clause_element__()
+
+    if tie_breaker is not None and not any(column.compare(tie_breaker) for column, _ in ordering):
+        ordering.append((tie_breaker, False))
+
+    return ordering
+
+
+def reverse_keyset_ordering(ordering: KeysetOrdering) -> KeysetOrdering:
+    """Flip the direction of every sort key (used to walk a page backwards)."""
+    return [(column, not descending) for column, descending in ordering]
+
+
+def apply_keyset_ordering(stmt: Select, ordering: KeysetOrdering) -> Select:
+    """Replace the ORDER BY clauses of a statement with the given ordering."""
+    return stmt.order_by(None).order_by(
+        *[column.desc() if descending else column.asc() for column, descending in ordering]
+    )
+
+
+def build_keyset_predicate(ordering: KeysetOrdering, values: Sequence[Any]) -> ColumnElement:
+    """
+    Build the seek predicate selecting the rows strictly after `values`.
+
+    When every key sorts in the same direction a row-value comparison is used,
+    e.g. `(created_at, id) < (:v1, :v2)`, which the database matches against a
+    composite index. Mixed directions fall back to the expanded form
+    `a > :v1 OR (a = :v1 AND b < :v2) ...`.
+
+    Sort keys are expected to be non-nullable: SQL comparisons with NULL are
+    never true, so a NULL key would end the walk early.
+
+    Args:
+        ordering: Sort keys of the page, as returned by get_keyset_ordering
+        values: Sort-key values of the last row already returned
+
+    Returns:
+        SQL boolean expression
+    """
+    columns = [column for column, _ in ordering]
+    directions = {descending for _, descending in ordering}
+
+    if len(directions) == 1:
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    conditions = []
+    for index, (column, descending) in enumerate(ordering):
+        equalities = [ordering[i][0] == values[i] for i in range(index)]
+        comparison = column < values[index] if descending else column > values[index]
+        conditions.append(and_(*equalities, comparison))
+
+    return or_(*conditions)
+
+
+def _dump_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["datetime", value.isoformat()]
+    if isinstance(value, date):
+        return ["date", value.isoformat()]
+    if isinstance(value, time):
+        return ["time", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["decimal", str(value)]
+    if isinstance(value, UUID):
+        return ["uuid", str(value)]
+    return ["value", value]
+
+
+def _load_value(dumped: list) -> Any:
+    kind, raw = dumped
+    if kind == "datetime":
+        return datetime.fromisoformat(raw)
+    if kind == "date":
+        return date.fromisoformat(raw)
+    if kind == "time":
+        return time.fromisoformat(raw)
+    if kind == "decimal":
+        return Decimal(raw)
+    if kind == "uuid":
+        return UUID(raw)
+    if kind == "value":
+        return raw
+    raise ValueError("Unknown cursor value kind '%s'" % kind)
+
+
+def encode_keyset_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of a row as an opaque Relay cursor."""
+    return to_base64(KEYSET_CURSOR_PREFIX, json.dumps([_dump_value(value) for value in values]))
+
+
+def decode_keyset_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_keyset_cursor.
+
+    Args:
+        cursor: Opaque cursor received from the client
+        size: Expected number of sort keys
+
+    Returns:
+        Sort-key values of the row the cursor points to
+
+    Raises:
+        LysError: If the cursor is malformed or does not match the ordering
+    """
+    try:
+        prefix, payload = from_base64(cursor)
+        if prefix != KEYSET_CURSOR_PREFIX:
+            raise ValueError("Wrong cursor prefix '%s'" % prefix)
+        values = [_load_value(dumped) for dumped in json.loads(payload)]
+    except (ValueError, TypeError) as ex:
+        raise LysError(INVALID_CURSOR_ERROR, "Cannot decode keyset cursor '%s': %s" % (cursor, ex))
+
+    if len(values) != size:
+        raise LysError(
+            INVALID_CURSOR_ERROR,
+            "Keyset cursor holds %d values but the ordering has %d keys" % (len(values), size)
+        )
+
+    return values
@@ -0,0 +1,79 @@
+"""
+Helpers to inspect the GraphQL selection set of the field being resolved.
+
+Resolvers use them to skip work the client did not ask for, such as the total
+count of a connection when `pageInfo.totalCount` is not selected.
+"""
+from typing import Iterable, Iterator, List, Sequence
+
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField, Selection
+from strawberry.utils.str_converters import to_camel_case
+
+from lys.core.contexts import Info
+
+
+def iter_selected_fields(selections: Iterable[Selection]) -> Iterator[SelectedField]:
+    """
+    Iterate over the fields of a selection set, flattening fragments.
+
+    Args:
+        selections: Selections as exposed by `info.selected_fields` or `SelectedField.selections`
+
+    Yields:
+        Every SelectedField, including those declared in inline fragments and fragment spreads
+    """
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        elif isinstance(selection, (InlineFragment, FragmentSpread)):
+            yield from iter_selected_fields(selection.selections)
+
+
+def _match_name(selected_field: SelectedField, name: str) -> bool:
+    # accept both python (total_count) and schema (totalCount) names
+    return selected_field.name in (name, to_camel_case(name))
+
+
+def get_selected_subfields(info: Info, path: Sequence[str]) -> List[SelectedField]:
+    """
+    Return the fields selected under `path` in the current field selection.
+
+    Args:
+        info: GraphQL info of the field being resolved
+        path: Field names to follow from the current field, e.g. ("edges", "node")
+
+    Returns:
+        Fields selected at the end of the path (empty if the path is not selected)
+    """
+    selected_fields = list(iter_selected_fields(info.selected_fields))
+    # info.selected_fields holds the current field itself
+    current = [
+        sub_field
+        for selected_field in selected_fields
+        for sub_field in iter_selected_fields(selected_field.selections)
+    ]
+
+    for name in path:
+        current = [
+            sub_field
+            for selected_field in current if _match_name(selected_field, name)
+            for sub_field in iter_selected_fields(selected_field.selections)
+        ]
+
+    return current
+
+
+def is_field_selected(info: Info, path: Sequence[str]) -> bool:
+    """
+    Check whether a field is selected under the current field.
+
+    Args:
+        info: GraphQL info of the field being resolved
+        path: Field names from the current field, the last one being the field to check,
+            e.g. ("page_info", "total_count")
+
+    Returns:
+        True if the client selected the field
+    """
+    *parent_path, name = path
+    return any(_match_name(selected_field, name) for selected_field in get_selected_subfields(info, parent_path))
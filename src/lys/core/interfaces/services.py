@@ -46,6 +46,23 @@ class EntityServiceInterface(ServiceInterface):
     async def delete(cls, entity_id: str, session: AsyncSession) -> bool:
         raise NotImplementedError
 
+    @classmethod
+    @abstractmethod
+    async def create_many(cls, session: AsyncSession, rows: List[Dict[str, Any]]) -> List[EntityInterface]:
+        raise NotImplementedError
+
+    @classmethod
+    @abstractmethod
+    async def update_many(cls, session: AsyncSession, rows: List[Dict[str, Any]]) -> List[EntityInterface]:
+        raise NotImplementedError
+
+    @classmethod
+    @abstractmethod
+    async def upsert_many(cls, session: AsyncSession, rows: List[Dict[str, Any]],
+                          conflict_columns: Optional[List[str]] = None,
+                          update_columns: Optional[List[str]] = None) -> List[EntityInterface]:
+        raise NotImplementedError
+
     @classmethod
     @abstractmethod
     async def get_multiple_by_ids(cls, entity_ids: List[str], session: AsyncSession) -> List[EntityInterface]:
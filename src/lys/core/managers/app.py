@@ -21,7 +21,10 @@ from lys.core.graphql.extensions import DatabaseSessionExtension
 from lys.core.graphql.registries import GraphqlRegistry, LysGraphqlRegistry
 from lys.core.graphql.types import DefaultQuery
 from lys.core.interfaces.permissions import PermissionInterface
+from lys.core.managers.cpu_pool import CpuPoolManager
 from lys.core.managers.database import DatabaseManager
+from lys.core.managers.http import HttpClientManager
+from lys.core.managers.parametric_cache import ParametricCacheManager
 from lys.core.managers.pubsub import PubSubManager
 from lys.core.models import PubSubConfig
 from lys.core.registries import AppRegistry, LysAppRegistry, CustomRegistry
@@ -51,6 +54,9 @@ class AppManager:
             graphql_registry = LysGraphqlRegistry()
         self.graphql_registry = graphql_registry
 
+        # GraphQL schema served by the app, set by create_app (None until then or without GraphQL components)
+        self.graphql_schema = None
+
         self.component_types: List[AppComponentTypeEnum] = []
 
         self._loaded_modules: List[str] = []
@@ -59,6 +65,12 @@ class AppManager:
 
         self.pubsub: Optional[PubSubManager] = None
 
+        self.parametric_cache = ParametricCacheManager(self)
+
+        self.cpu_pool = CpuPoolManager(self)
+
+        self.http_clients = HttpClientManager(self)
+
         # Lifecycle callbacks (set via initialize_app)
         self._on_startup: Optional[Callable[[], Awaitable[None]]] = None
         self._on_shutdown: Optional[Callable[[], Awaitable[None]]] = None
@@ -401,6 +413,7 @@ class AppManager:
                 secret_key=self.settings.secret_key,
                 service_name=self.settings.service_name,
                 verify_ssl=not self.settings.debug,
+                http_clients=self.http_clients,
             )
             result = await client.execute(mutation, {"webservices": webservices_input})
 
@@ -552,8 +565,9 @@ class AppManager:
         # Configure extensions
         extensions = [
             # Database session management: opens session at start of GraphQL operation
-            # and keeps it open for entire resolution (including nested fields)
-            DatabaseSessionExtension(),
+            # and keeps it open for entire resolution (including nested fields).
+            # Registered as a class: it keeps per-operation state (SQL statistics)
+            DatabaseSessionExtension,
             # security: limit query depth to avoid high query complexity
             QueryDepthLimiter(self.settings.query_depth_limit),
             # security: limit number of alias in a same query to avoid malicious batch requests
@@ -643,10 +657,23 @@ class AppManager:
             )
             await self.pubsub.initialize()
 
+        # Open the shared HTTP clients (service-to-service, LLM providers, SSO)
+        await self.http_clients.initialize()
+
+        # Track parametric changes before the fixtures load, so that the other
+        # processes drop the parametric rows they change
+        parametric_cache_enabled = self.parametric_cache.enabled
+        if parametric_cache_enabled:
+            await self.parametric_cache.initialize()
+
         # Phase 2: Load fixtures in dependency order (after database is ready)
         if AppComponentTypeEnum.FIXTURES in self.component_types:
             await self._load_fixtures_in_order()
 
+        # Keep the parametric rows left by the fixtures in memory
+        if parametric_cache_enabled:
+            await self.parametric_cache.warm()
+
         # Phase 3: Ensure super user exists (if configured)
         await self._ensure_super_user()
 
@@ -669,6 +696,13 @@ class AppManager:
         # Shutdown: call shutdown methods for component types that support it
         await self.registry.shutdown_services()
 
+        if parametric_cache_enabled:
+            await self.parametric_cache.shutdown()
+
+        await self.cpu_pool.shutdown()
+
+        await self.http_clients.shutdown()
+
         # Shutdown PubSub if initialized
         if self.pubsub:
             await self.pubsub.shutdown()
@@ -749,6 +783,7 @@ class AppManager:
 
         # Phase 5: load graphql api
         schema = self._load_schema()
+        self.graphql_schema = schema
 
         if schema is not None:
             # Create context getter that includes app_manager reference
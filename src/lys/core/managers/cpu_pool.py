@@ -0,0 +1,93 @@
+"""
+CpuPoolManager - bounded worker threads for CPU-bound work.
+
+Password hashing and verification (bcrypt) burn 100-300 ms of CPU per call.
+Run on the event loop, every other request of the worker waits for them; run
+through the default executor, a login storm queues without limit. Through
+`app_manager.cpu_pool`:
+
+- the work runs in a dedicated thread pool of `settings.cpu_pool_workers`
+  threads (bcrypt releases the GIL, so the threads hash in parallel);
+- at most `settings.cpu_pool_queue_size` calls wait for a thread: beyond, `run`
+  raises a 429 LysError at once instead of queueing, so a credential stuffing
+  attempt gets rejected while the rest of the API keeps its latency.
+
+The pool is created on first use, so it also serves the code running outside
+the FastAPI lifespan (scripts, tests).
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from lys.core.consts.errors import TOO_MANY_REQUESTS_ERROR
+from lys.core.errors import LysError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CpuPoolManager:
+    """
+    Size-bounded thread pool for CPU-bound calls.
+
+    Lifecycle (HTTP server - FastAPI lifespan, see AppManager._app_lifespan):
+        - shutdown(): Wait for the running calls and stop the threads
+
+    Usage:
+        valid = await app_manager.cpu_pool.run(bcrypt.checkpw, password, hashed)
+    """
+
+    def __init__(self, app_manager):
+        self.app_manager = app_manager
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # calls running or waiting for a thread
+        self._pending = 0
+
+    @property
+    def max_workers(self) -> int:
+        return max(1, self.app_manager.settings.cpu_pool_workers)
+
+    @property
+    def max_pending(self) -> int:
+        return self.max_workers + max(0, self.app_manager.settings.cpu_pool_queue_size)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="lys-cpu")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run ``func(*args)`` in the pool.
+
+        Raises:
+            LysError: TOO_MANY_REQUESTS_ERROR when the pool and its queue are full
+        """
+        if self._pending >= self.max_pending:
+            logger.warning("CPU pool saturated (%d calls pending), rejecting %s", self._pending, func.__name__)
+            raise LysError(
+                TOO_MANY_REQUESTS_ERROR,
+                f"CPU pool saturated: {self._pending} calls pending"
+            )
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    async def shutdown(self):
+        """
+        Async shutdown for FastAPI lifespan.
+
+        Called automatically by AppManager._app_lifespan.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
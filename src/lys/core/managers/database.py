@@ -1,7 +1,10 @@
 import asyncio
+import copy
+import itertools
 import logging
+import time
 from contextlib import asynccontextmanager, contextmanager
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from sqlalchemy import create_engine, Engine
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker, AsyncAttrs
@@ -9,6 +12,7 @@ from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from lys.core.configs import DatabaseSettings
+from lys.core.utils.sql_stats import instrument_engine
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +52,12 @@ class DatabaseManager:
         self._sync_engine: Optional[Engine] = None
         self._sync_session_factory: Optional[sessionmaker] = None
 
+        # Read replicas, one manager each (built on first use)
+        self._replicas: Optional[List["DatabaseManager"]] = None
+        self._replica_counter = itertools.count()
+        # Read-your-writes: sticky key -> monotonic time until which reads go to the primary
+        self._primary_sticky_until: Dict[str, float] = {}
+
     def _build_url(self, async_mode: bool = True) -> str:
         """
         Build database URL from configured components.
@@ -173,7 +183,9 @@ class DatabaseManager:
         """
         url = self._build_url(async_mode=True)
         engine_kwargs = self._get_engine_kwargs(async_mode=True)
-        return create_async_engine(url, **engine_kwargs)
+        engine = create_async_engine(url, **engine_kwargs)
+        instrument_engine(engine.sync_engine)
+        return engine
 
     def create_sync_database_engine(self) -> Engine:
         """
@@ -187,7 +199,9 @@ class DatabaseManager:
         """
         url = self._build_url(async_mode=False)
         engine_kwargs = self._get_engine_kwargs(async_mode=False)
-        return create_engine(url, **engine_kwargs)
+        engine = create_engine(url, **engine_kwargs)
+        instrument_engine(engine)
+        return engine
 
     def get_engine(self) -> AsyncEngine:
         """
@@ -274,9 +288,94 @@ class DatabaseManager:
         self._sync_engine = None
         self._sync_session_factory = None
 
+        # Replicas are rebuilt from the settings on next access
+        for replica in self._replicas or []:
+            replica.reset_database_connection()
+        self._replicas = None
+
     def has_database_configured(self):
         return self.settings.configured()
 
+    def get_replicas(self) -> List["DatabaseManager"]:
+        """
+        Get the managers of the configured read replicas.
+
+        Each replica is a DatabaseManager whose settings are the primary ones
+        overridden by the replica entry of `settings.replicas`, so it has its own
+        async and sync engines and pools.
+
+        Returns:
+            List of replica managers (empty if no replica is configured)
+        """
+        if self._replicas is None:
+            self._replicas = []
+            for overrides in self.settings.replicas:
+                replica_settings = copy.copy(self.settings)
+                replica_settings.connect_args = dict(self.settings.connect_args)
+                replica_settings.replicas = []
+                replica_settings.configure(**overrides)
+                self._replicas.append(DatabaseManager(replica_settings))
+        return self._replicas
+
+    def has_replicas(self) -> bool:
+        return bool(self.settings.replicas)
+
+    @staticmethod
+    def _get_checked_out_connections(manager: "DatabaseManager") -> int:
+        if manager._engine is None:
+            return 0
+        checkedout = getattr(manager._engine.pool, "checkedout", None)
+        return checkedout() if checkedout is not None else 0
+
+    def choose_replica(self) -> "DatabaseManager":
+        """
+        Choose the database serving the next read-only session.
+
+        With the "least_connections" strategy, the replica with the fewest checked
+        out connections is chosen; ties, and the "round_robin" strategy, rotate over
+        the replicas.
+
+        Returns:
+            A replica manager, or this manager if no replica is configured
+        """
+        replicas = self.get_replicas()
+        if not replicas:
+            return self
+
+        start = next(self._replica_counter) % len(replicas)
+        rotated = replicas[start:] + replicas[:start]
+
+        if self.settings.replica_strategy == "least_connections":
+            return min(rotated, key=self._get_checked_out_connections)
+        return rotated[0]
+
+    def mark_primary_sticky(self, key: str):
+        """
+        Route the reads of `key` (usually a user id) to the primary for a while.
+
+        Called after a write, so that the following reads of the same user see it
+        even if the replicas lag behind. No-op when `replica_sticky_seconds` is 0.
+        Stickiness is kept in process memory.
+
+        Args:
+            key: Identifier of the reader
+        """
+        if not self.settings.replica_sticky_seconds or not self.has_replicas():
+            return
+
+        now = time.monotonic()
+        # drop expired entries so the mapping stays bounded by the active writers
+        self._primary_sticky_until = {
+            sticky_key: until for sticky_key, until in self._primary_sticky_until.items() if until > now
+        }
+        self._primary_sticky_until[key] = now + self.settings.replica_sticky_seconds
+
+    def is_primary_sticky(self, key: Optional[str]) -> bool:
+        """Check whether the reads of `key` must still go to the primary."""
+        if key is None:
+            return False
+        return self._primary_sticky_until.get(key, 0) > time.monotonic()
+
     @property
     def engine(self) -> AsyncEngine:
         """Get the async database engine."""
@@ -333,10 +432,35 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @asynccontextmanager
+    async def get_read_session(self):
+        """
+        Context manager for obtaining an async session on a read replica.
+
+        The replica is chosen by `choose_replica()`; without replicas the session
+        uses the primary. Only read through it: replicas are read-only.
+        """
+        async with self.choose_replica().get_session() as session:
+            yield session
+
+    @contextmanager
+    def get_sync_read_session(self):
+        """
+        Context manager for obtaining a sync session on a read replica.
+
+        Sync counterpart of get_read_session(), e.g. for Celery reports.
+        """
+        with self.choose_replica().get_sync_session() as session:
+            yield session
+
     def create_session(self) -> AsyncSession:
         """Create a new async session."""
         return self.session_factory()
 
+    def create_read_session(self) -> AsyncSession:
+        """Create a new async session on a read replica (the primary if none)."""
+        return self.choose_replica().session_factory()
+
     def create_sync_session(self) -> Session:
         """Create a new sync session."""
         return self.sync_session_factory()
@@ -363,4 +487,6 @@ class DatabaseManager:
         """
         if self._engine:
             await self._engine.dispose()
+        for replica in self._replicas or []:
+            await replica.close()
         self.reset_database_connection()
@@ -0,0 +1,192 @@
+"""
+HttpClientManager - shared, pooled HTTP clients.
+
+Opening an ``httpx.AsyncClient`` per call means a new TCP and TLS handshake
+per call: every tool call to the gateway, every chat turn with an LLM
+provider. Through ``app_manager.http_clients`` the call sites share one
+long-lived client per target, keeping its connections alive between calls.
+
+Targets are free-form names ("graphql", "anthropic", "mistral", "sso", ...);
+each one is configured by the ``http_clients`` plugin, over the "default"
+entry and the built-in defaults::
+
+    "http_clients": {
+        "default": {"timeout": 30, "max_connections": 100},
+        "anthropic": {"timeout": 120, "http2": True},
+    }
+
+Settings per target: ``timeout`` (seconds), ``connect_timeout``,
+``max_connections``, ``max_keepalive_connections``, ``keepalive_expiry``
+(seconds) and ``http2`` (needs the ``h2`` package, ``httpx[http2]``).
+
+An async client is bound to the event loop it was created in: the clients are
+kept per loop, so the code run through ``asyncio.run`` (Celery tasks, scripts)
+gets its own client instead of reusing the connections of a closed loop.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+import httpx
+
+from lys.core.consts.plugins import HTTP_CLIENTS_PLUGIN_KEY
+
+try:
+    import h2  # noqa: F401 - HTTP/2 support of httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET = "default"
+
+DEFAULT_TARGET_CONFIG: Dict[str, Any] = {
+    "timeout": 30.0,
+    "connect_timeout": 10.0,
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "http2": False,
+}
+
+
+class HttpClientManager:
+    """
+    Keyed pool of long-lived httpx clients.
+
+    Lifecycle:
+        HTTP server (FastAPI lifespan, see AppManager._app_lifespan):
+            - initialize(): Open the async clients of the configured targets
+            - shutdown(): Close every client
+        Celery worker (worker_process_init / worker_process_shutdown):
+            - initialize_sync(): Open the sync clients of the configured targets
+            - shutdown_sync(): Close the sync clients
+
+    Clients are otherwise created on first use, so the manager also serves the
+    code running outside these hooks.
+
+    Usage:
+        client = app_manager.http_clients.get_async("graphql", verify=verify_ssl)
+        response = await client.post(url, json=payload)
+
+    The clients are shared: never close them nor use them as context managers.
+    """
+
+    def __init__(self, app_manager):
+        self.app_manager = app_manager
+        # (target, verify) -> (event loop, client)
+        self._async_clients: Dict[Tuple[str, bool], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        # (target, verify) -> client
+        self._sync_clients: Dict[Tuple[str, bool], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def _get_plugin_config(self) -> Dict[str, Dict[str, Any]]:
+        config = self.app_manager.settings.get_plugin_config(HTTP_CLIENTS_PLUGIN_KEY)
+        return config if isinstance(config, dict) else {}
+
+    def get_target_config(self, target: str) -> Dict[str, Any]:
+        """Settings of a target: its plugin entry over the "default" one and the built-in defaults."""
+        config = self._get_plugin_config()
+        return {**DEFAULT_TARGET_CONFIG, **config.get(DEFAULT_TARGET, {}), **config.get(target, {})}
+
+    def _client_kwargs(self, target: str, verify: bool) -> Dict[str, Any]:
+        config = self.get_target_config(target)
+
+        http2 = bool(config["http2"])
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested for '%s' but the h2 package is not installed, using HTTP/1.1", target)
+            http2 = False
+
+        return {
+            "timeout": httpx.Timeout(config["timeout"], connect=config["connect_timeout"]),
+            "limits": httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+            "http2": http2,
+            "verify": verify,
+        }
+
+    def get_async(self, target: str = DEFAULT_TARGET, verify: bool = True) -> httpx.AsyncClient:
+        """Shared async client of ``target`` for the running event loop."""
+        loop = asyncio.get_running_loop()
+        key = (target, verify)
+
+        entry = self._async_clients.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        # A client of another (closed) loop can no longer be closed: drop it
+        client = httpx.AsyncClient(**self._client_kwargs(target, verify))
+        self._async_clients[key] = (loop, client)
+        return client
+
+    def get_sync(self, target: str = DEFAULT_TARGET, verify: bool = True) -> httpx.Client:
+        """Shared sync client of ``target`` (thread-safe)."""
+        key = (target, verify)
+
+        client = self._sync_clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        with self._lock:
+            client = self._sync_clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.Client(**self._client_kwargs(target, verify))
+                self._sync_clients[key] = client
+            return client
+
+    def _configured_targets(self):
+        return [target for target in self._get_plugin_config() if target != DEFAULT_TARGET]
+
+    async def initialize(self):
+        """
+        Open the async clients of the configured targets.
+
+        Called automatically by AppManager._app_lifespan.
+        """
+        for target in self._configured_targets():
+            self.get_async(target)
+
+    def initialize_sync(self):
+        """
+        Open the sync clients of the configured targets.
+
+        Call this in Celery worker_process_init signal handler.
+        """
+        for target in self._configured_targets():
+            self.get_sync(target)
+
+    async def shutdown(self):
+        """
+        Close every client.
+
+        Called automatically by AppManager._app_lifespan.
+        """
+        loop = asyncio.get_running_loop()
+        async_clients, self._async_clients = self._async_clients, {}
+        for client_loop, client in async_clients.values():
+            if client_loop is loop:
+                await client.aclose()
+        self.shutdown_sync()
+
+    def shutdown_sync(self):
+        """
+        Close the sync clients.
+
+        Call this in Celery worker_process_shutdown signal handler.
+        """
+        with self._lock:
+            sync_clients, self._sync_clients = self._sync_clients, {}
+        for client in sync_clients.values():
+            client.close()
+
+
+def get_http_clients() -> HttpClientManager:
+    """HttpClientManager of the process AppManager, for the code that has no app_manager at hand."""
+    # Local import to avoid circular dependency: app_manager <- graphql client <- http
+    from lys.core.utils.manager import AppManagerCallerMixin
+    return AppManagerCallerMixin.app_manager.http_clients
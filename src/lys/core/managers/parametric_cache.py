@@ -0,0 +1,439 @@
+"""
+ParametricCacheManager - process-wide cache of parametric rows.
+
+ParametricEntity tables (statuses, types, languages, access levels...) only change
+with fixtures or admin mutations, yet every query re-reads them through their
+`lazy="selectin"` relationships. With `database.parametric_cache` enabled, every
+parametric row is kept in memory as a detached entity:
+
+- the rows are loaded at startup, once the fixtures are loaded;
+- the relationship loads of parametric entities are answered by a `do_orm_execute`
+  session listener, which replays the first result of each (statement, primary
+  keys) pair with the cached rows (the `parametric_cache_relation_results` most
+  recently used pairs of each table);
+- `EntityService.get_by_id` on a parametric entity reads through the cache;
+- `get_version` keys the caches of values derived from parametric rows (e.g. the
+  base webservices of the access claims).
+
+Cached rows are merged into the session asking for them (`merge(load=False)`,
+no statement), so they behave like loaded entities of that session.
+
+A session committing a change to a parametric row (unit of work or ORM
+INSERT/UPDATE/DELETE statement) drops the cached rows of its table, which are
+loaded again in the background, and publishes the table on the
+`parametric_cache` pubsub channel so that the other processes drop theirs.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Type
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.engine import FrozenResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.orm.loading import merge_frozen_result
+
+from lys.core.entities import ParametricEntity
+
+PARAMETRIC_CACHE_CHANNEL = "parametric_cache"
+PARAMETRIC_CACHE_INVALIDATED = "PARAMETRIC_CACHE_INVALIDATED"
+
+# Session.info key of the parametric tables changed by the current transaction
+_CHANGED_TABLES_KEY = "parametric_cache_changed_tables"
+
+logger = logging.getLogger(__name__)
+
+
+def get_selectin_load_key(orm_execute_state: ORMExecuteState) -> Optional[Tuple[Any, frozenset]]:
+    """
+    Key the result of a selectin relationship load by primary keys.
+
+    Relies on SQLAlchemy internals, checked against 2.0.43 (the version pinned in
+    pyproject.toml; tests/unit/core/test_parametric_cache.py fails if they change):
+    - SelectInLoader binds the primary keys of its batch to the "primary_keys"
+      parameter of the statement;
+    - Executable._generate_cache_key() gives the shape of the statement, None when
+      it cannot be cached.
+
+    Returns:
+        (statement cache key, primary keys), None for any other statement or a
+        statement binding other parameters
+    """
+    parameters = orm_execute_state.parameters
+    primary_keys = parameters.get("primary_keys") if isinstance(parameters, dict) else None
+    if not primary_keys:
+        return None
+
+    cache_key = orm_execute_state.statement._generate_cache_key()
+    if cache_key is None or any(bind.key != "primary_keys" for bind in cache_key.bindparams):
+        return None
+
+    return cache_key.key, frozenset(primary_keys)
+
+
+class ParametricCacheManager:
+    """
+    In-process cache of the rows of the parametric entities.
+
+    Only the parametric entities whose relationships all target cached parametric
+    entities are cached: a cached row never carries data that could change without
+    invalidating it.
+
+    Lifecycle (HTTP server - FastAPI lifespan, see AppManager._app_lifespan):
+        - initialize(): Track parametric changes and subscribe to invalidations
+        - warm(): Load every parametric row (after the fixtures)
+        - shutdown(): Stop tracking and unsubscribe
+
+    Usage:
+        status = await app_manager.parametric_cache.get(UserStatus, "ENABLED", session)
+    """
+
+    def __init__(self, app_manager):
+        self.app_manager = app_manager
+        # Identifies this process in the invalidation messages
+        self.origin = uuid.uuid4().hex
+
+        # tablename -> entity id -> detached entity
+        self._rows: Dict[str, Dict[str, ParametricEntity]] = {}
+        # tablename -> (statement cache key, primary keys) -> result of the relationship load,
+        # least recently used first
+        self._relation_results: Dict[str, "OrderedDict[Any, FrozenResult]"] = {}
+        # tablename -> invalidation count, so that a load started before an
+        # invalidation does not store stale rows
+        self._versions: Dict[str, int] = {}
+        # tablename -> tablenames of the cached entities holding a relationship to it
+        self._dependents: Dict[str, Set[str]] = {}
+
+        self._installed = False
+        self._warmed = False
+        self._subscriber: Optional[asyncio.Task] = None
+        # Strong references to the background tasks (the event loop only keeps weak ones)
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.app_manager.settings.database.parametric_cache) \
+            and self.app_manager.database.has_database_configured()
+
+    @property
+    def relation_results_size(self) -> int:
+        return self.app_manager.settings.database.parametric_cache_relation_results
+
+    ####################################################################################################################
+    #                                                    PROTECTED
+    ####################################################################################################################
+
+    def _get_cacheable_entities(self) -> Dict[str, Type[ParametricEntity]]:
+        """Return the parametric entities whose relationships only target cacheable entities."""
+        candidates = {
+            name: entity for name, entity in self.app_manager.registry.entities.items()
+            if issubclass(entity, ParametricEntity) and not getattr(entity, "__abstract__", False)
+        }
+
+        # drop the entities related to a non cacheable entity until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for name, entity in list(candidates.items()):
+                targets = [relationship.mapper.class_ for relationship in inspect(entity).relationships]
+                if any(target.__tablename__ not in candidates for target in targets):
+                    del candidates[name]
+                    changed = True
+
+        self._dependents = {}
+        for name, entity in candidates.items():
+            for relationship in inspect(entity).relationships:
+                self._dependents.setdefault(relationship.mapper.class_.__tablename__, set()).add(name)
+
+        return candidates
+
+    def _get_invalidated_tables(self, tablenames: Iterable[str]) -> Set[str]:
+        """Add to the tables the cached tables whose rows hold one of their rows."""
+        invalidated = set()
+        pending = list(tablenames)
+        while pending:
+            tablename = pending.pop()
+            if tablename not in invalidated:
+                invalidated.add(tablename)
+                pending.extend(self._dependents.get(tablename, ()))
+        return invalidated
+
+    def _spawn(self, coroutine) -> Optional[asyncio.Task]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coroutine.close()
+            return None
+        task = loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @staticmethod
+    def _track_changes(session: Session, tablenames: Iterable[str]):
+        if tablenames:
+            session.info.setdefault(_CHANGED_TABLES_KEY, set()).update(tablenames)
+
+    def _do_orm_execute(self, orm_execute_state: ORMExecuteState):
+        """Answer the relationship loads of cached entities, track the bulk statements."""
+        mappers = orm_execute_state.all_mappers
+
+        if not orm_execute_state.is_select:
+            self._track_changes(orm_execute_state.session, [
+                mapper.class_.__tablename__ for mapper in mappers
+                if issubclass(mapper.class_, ParametricEntity)
+            ])
+            return None
+
+        if not orm_execute_state.is_relationship_load or len(mappers) != 1:
+            return None
+
+        session = orm_execute_state.session
+        tablename = getattr(mappers[0].class_, "__tablename__", None)
+        rows = self._rows.get(tablename)
+        # the transaction may have changed the rows
+        if rows is None or tablename in session.info.get(_CHANGED_TABLES_KEY, ()):
+            return None
+
+        # only the selectin loads by primary key
+        key = get_selectin_load_key(orm_execute_state)
+        if key is None or orm_execute_state.execution_options.get("populate_existing"):
+            return None
+
+        for primary_key in key[1]:
+            entity = session.identity_map.get(session.identity_key(mappers[0].class_, primary_key))
+            # merging the cached row would overwrite pending changes
+            if entity is not None and inspect(entity).modified:
+                return None
+
+        results = self._relation_results.setdefault(tablename, OrderedDict())
+        cached_result = results.get(key)
+        if cached_result is not None:
+            results.move_to_end(key)
+            return merge_frozen_result(session, orm_execute_state.statement, cached_result, load=False)()
+
+        version = self._versions.get(tablename, 0)
+        frozen_result = orm_execute_state.invoke_statement().freeze()
+
+        # keep the result with the cached rows in place of the entities of this session
+        cached_rows = []
+        for row in frozen_result.rewrite_rows():
+            for index, value in enumerate(row):
+                if isinstance(value, ParametricEntity):
+                    row[index] = rows.get(str(value.id))
+                    if row[index] is None:
+                        return frozen_result()
+            cached_rows.append(row)
+
+        if self._versions.get(tablename, 0) == version and self._rows.get(tablename) is rows \
+                and self.relation_results_size > 0:
+            results[key] = frozen_result.with_new_rows(cached_rows)
+            while len(results) > self.relation_results_size:
+                results.popitem(last=False)
+
+        return frozen_result()
+
+    def _after_flush(self, session: Session, flush_context):
+        self._track_changes(session, [
+            entity.__tablename__ for entity in chain(session.new, session.dirty, session.deleted)
+            if isinstance(entity, ParametricEntity)
+        ])
+
+    def _after_commit(self, session: Session):
+        tablenames = session.info.pop(_CHANGED_TABLES_KEY, None)
+        if tablenames:
+            self.invalidate(tablenames)
+
+    def _after_transaction_end(self, session: Session, transaction):
+        # rolled back: the changes never reached the database
+        if transaction.parent is None:
+            session.info.pop(_CHANGED_TABLES_KEY, None)
+
+    def _publish(self, tablenames: Set[str]):
+        pubsub = self.app_manager.pubsub
+        if pubsub is None:
+            return
+
+        params = {"tables": sorted(tablenames), "origin": self.origin}
+
+        async def publish():
+            try:
+                await pubsub.publish(PARAMETRIC_CACHE_CHANNEL, PARAMETRIC_CACHE_INVALIDATED, params)
+            except Exception as ex:
+                logger.warning("Could not publish parametric cache invalidation: %s", ex)
+
+        if self._spawn(publish()) is None:
+            # no event loop: Celery worker
+            try:
+                pubsub.publish_sync(PARAMETRIC_CACHE_CHANNEL, PARAMETRIC_CACHE_INVALIDATED, params)
+            except Exception as ex:
+                logger.warning("Could not publish parametric cache invalidation: %s", ex)
+
+    async def _listen(self):
+        async for message in self.app_manager.pubsub.subscribe(PARAMETRIC_CACHE_CHANNEL):
+            params = message.get("params", {})
+            if message.get("signal") == PARAMETRIC_CACHE_INVALIDATED and params.get("origin") != self.origin:
+                self.invalidate(params.get("tables", []), publish=False)
+
+    ####################################################################################################################
+    #                                                    PUBLIC
+    ####################################################################################################################
+
+    def install(self):
+        """Listen to the sessions: answer parametric relationship loads, track parametric changes."""
+        if self._installed:
+            return
+        event.listen(Session, "do_orm_execute", self._do_orm_execute)
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_transaction_end", self._after_transaction_end)
+        self._installed = True
+
+    def uninstall(self):
+        """Remove the session listeners."""
+        if not self._installed:
+            return
+        event.remove(Session, "do_orm_execute", self._do_orm_execute)
+        event.remove(Session, "after_flush", self._after_flush)
+        event.remove(Session, "after_commit", self._after_commit)
+        event.remove(Session, "after_transaction_end", self._after_transaction_end)
+        self._installed = False
+
+    async def initialize(self):
+        """
+        Async init for FastAPI lifespan.
+
+        Installs the session listeners before the fixtures load, so that the other
+        processes drop the rows the fixtures change, and subscribes to their
+        invalidations. Called automatically by AppManager._app_lifespan.
+        """
+        self.install()
+        if self.app_manager.pubsub is not None:
+            self._subscriber = asyncio.get_running_loop().create_task(self._listen())
+
+    async def warm(self, tablenames: Optional[Iterable[str]] = None):
+        """
+        Load the rows of the cacheable parametric entities.
+
+        Args:
+            tablenames: Tables to load (default: every cacheable parametric entity)
+        """
+        entities = self._get_cacheable_entities()
+        if tablenames is not None:
+            entities = {name: entity for name, entity in entities.items() if name in tablenames}
+        versions = {name: self._versions.get(name, 0) for name in entities}
+
+        loaded = {}
+        async with self.app_manager.database.get_session() as session:
+            for name, entity in entities.items():
+                result = await session.execute(select(entity))
+                loaded[name] = {str(row.id): row for row in result.scalars().all()}
+            # detached rows keep their loaded attributes
+            session.expunge_all()
+
+        for name, rows in loaded.items():
+            # an invalidation arrived while loading: the next warm-up loads it
+            if self._versions.get(name, 0) == versions[name]:
+                self._rows[name] = rows
+                self._relation_results[name] = OrderedDict()
+
+        self._warmed = True
+        logger.info("Parametric cache loaded: %d tables", len(loaded))
+
+    def invalidate(self, tablenames: Iterable[str], publish: bool = True):
+        """
+        Drop the cached rows of tables and load them again in the background.
+
+        Args:
+            tablenames: Tables whose rows changed
+            publish: Publish the invalidation to the other processes
+        """
+        tablenames = set(tablenames)
+        invalidated = self._get_invalidated_tables(tablenames)
+        for tablename in invalidated:
+            self._versions[tablename] = self._versions.get(tablename, 0) + 1
+            self._rows.pop(tablename, None)
+            self._relation_results.pop(tablename, None)
+
+        if publish:
+            self._publish(tablenames)
+
+        if self._warmed:
+            async def warm():
+                try:
+                    await self.warm(invalidated)
+                except Exception as ex:
+                    logger.warning("Could not reload parametric cache tables %s: %s", sorted(invalidated), ex)
+
+            self._spawn(warm())
+
+    async def get(self, entity_class: Type[ParametricEntity], entity_id: str,
+                  session: AsyncSession) -> Optional[ParametricEntity]:
+        """
+        Get a cached parametric entity, attached to a session.
+
+        Args:
+            entity_class: Parametric entity class
+            entity_id: Entity id
+            session: Session the entity is returned in
+
+        Returns:
+            The entity, or None when the row is not cached
+        """
+        rows = self._rows.get(entity_class.__tablename__)
+        # the transaction may have changed the rows
+        if rows is None or entity_class.__tablename__ in session.info.get(_CHANGED_TABLES_KEY, ()):
+            return None
+
+        cached = rows.get(str(entity_id))
+        if cached is None:
+            return None
+
+        # the session version may hold pending changes
+        entity = session.identity_map.get(session.identity_key(entity_class, cached.id))
+        if entity is not None and not inspect(entity).expired_attributes:
+            return entity
+
+        return await session.merge(cached, load=False)
+
+    def get_version(self, tablenames: Iterable[str], session: Optional[AsyncSession] = None) -> Optional[tuple]:
+        """
+        Get the invalidation counts of parametric tables, to key the caches derived from their rows.
+
+        Args:
+            tablenames: Parametric tables the cached value is computed from
+            session: Session computing the value
+
+        Returns:
+            A tuple changing with every committed change of the tables, or None when
+            the changes are not tracked (cache disabled) or the transaction of the
+            session changed one of them
+        """
+        if not self._installed:
+            return None
+        tablenames = tuple(tablenames)
+        if session is not None and not session.info.get(_CHANGED_TABLES_KEY, set()).isdisjoint(tablenames):
+            return None
+        return tuple(self._versions.get(tablename, 0) for tablename in tablenames)
+
+    async def shutdown(self):
+        """
+        Async shutdown for FastAPI lifespan.
+
+        Called automatically by AppManager._app_lifespan.
+        """
+        self.uninstall()
+        tasks = list(self._tasks)
+        if self._subscriber is not None:
+            tasks.append(self._subscriber)
+            self._subscriber = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._rows.clear()
+        self._relation_results.clear()
+        self._warmed = False
@@ -6,19 +6,26 @@ This module provides:
 - RateLimitMiddleware: Global API rate limiting (Redis or in-memory)
 - LysCorsMiddleware: CORS middleware with plugin configuration
 - ErrorManagerMiddleware: Error handling and logging middleware
+
+The middlewares are plain ASGI applications rather than BaseHTTPMiddleware
+subclasses: BaseHTTPMiddleware runs the rest of the stack in a task group and
+copies the response body through a memory stream, once per middleware, on
+every request. Only the "http" scopes are handled; "websocket" and "lifespan"
+scopes go straight to the wrapped application.
 """
 import logging
 import os
 import sys
-import time
 import traceback
+from collections.abc import Mapping, Set
 from typing import List, Union, Dict, Any
 
 from fastapi import FastAPI, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from lys.apps.base.consts import (
     CORS_PLUGIN_KEY,
@@ -34,9 +41,10 @@ from lys.core.errors import LysError
 from lys.core.interfaces.middlewares import MiddlewareInterface
 from lys.core.interfaces.services import EntityServiceInterface
 from lys.core.utils.manager import AppManagerCallerMixin
+from lys.core.utils.rate_limit import get_rate_limit_redis, rate_limiter
 
 
-class SecurityHeadersMiddleware(MiddlewareInterface, BaseHTTPMiddleware):
+class SecurityHeadersMiddleware(MiddlewareInterface):
     """Adds standard HTTP security headers to all responses.
 
     Headers applied:
@@ -47,96 +55,65 @@ class SecurityHeadersMiddleware(MiddlewareInterface, BaseHTTPMiddleware):
     - Strict-Transport-Security: HSTS on HTTPS requests (1 year, includeSubDomains)
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_https = scope.get("scheme") == "https"
 
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Content-Type-Options"] = "nosniff"
+                headers["X-Frame-Options"] = "DENY"
+                headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+                headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
 
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+                if is_https:
+                    headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(MiddlewareInterface, AppManagerCallerMixin, BaseHTTPMiddleware):
+class RateLimitMiddleware(MiddlewareInterface, AppManagerCallerMixin):
     """Global API rate limiting middleware.
 
-    Uses Redis (via app_manager.pubsub) if available for distributed rate limiting
-    across multiple instances. Falls back to in-memory storage for single-instance
-    deployments or when Redis is not configured.
+    Sliding window limit per client IP (see lys.core.utils.rate_limit). Uses Redis
+    (via app_manager.pubsub) if available for distributed rate limiting across
+    multiple instances, with one atomic script call per request. Falls back to a
+    bounded in-memory LRU for single-instance deployments or when Redis is not
+    configured.
 
     Configuration via settings.plugins["rate_limit"]:
         - requests_per_minute: Max requests per IP per minute (default: 60)
+        - service_requests_per_minute: Max "Authorization: Service" requests per IP per minute (default: 600)
+        - memory_max_keys: Max IPs tracked by the in-memory fallback (default: 10000)
+        - webservices: Per-webservice limits, name -> requests per minute per user or IP,
+          applied by the webservice permissions (default: none)
         - enabled: Enable/disable rate limiting (default: True)
     """
 
-    def __init__(self, app):
-        BaseHTTPMiddleware.__init__(self, app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
         config = self.app_manager.settings.plugins.get(RATE_LIMIT_PLUGIN_KEY, {})
         self.requests_per_minute: int = config.get("requests_per_minute", 60)
         self.service_requests_per_minute: int = config.get("service_requests_per_minute", 600)
         self.enabled: bool = config.get("enabled", True)
 
-        # In-memory fallback: {ip: [timestamp, ...]}
-        self._memory_store: dict[str, list[float]] = {}
-
-    def _get_redis(self):
-        """Get async Redis client from pubsub if available."""
-        pubsub = self.app_manager.pubsub
-        if pubsub and pubsub._async_redis:
-            return pubsub._async_redis
-        return None
-
-    async def _check_rate_limit_redis(
-        self, client_ip: str, redis_client, limit: int, key_prefix: str = "rate_limit"
-    ) -> bool:
-        """Check rate limit using Redis INCR + EXPIRE (fixed window).
-
-        Returns True if request is allowed, False if rate limited.
-        """
-        key = f"{key_prefix}:{client_ip}"
-        try:
-            count = await redis_client.incr(key)
-            if count == 1:
-                await redis_client.expire(key, 60)
-            return count <= limit
-        except Exception as e:
-            logger.warning("Redis rate limit check failed, allowing request: %s", e)
-            return True
-
-    def _check_rate_limit_memory(
-        self, client_ip: str, limit: int, key_prefix: str = "rate_limit"
-    ) -> bool:
-        """Check rate limit using in-memory storage (fixed window).
-
-        Returns True if request is allowed, False if rate limited.
-        """
-        now = time.time()
-        window_start = now - 60
-
-        key = f"{key_prefix}:{client_ip}"
-        timestamps = self._memory_store.get(key, [])
-        timestamps = [t for t in timestamps if t > window_start]
-
-        if len(timestamps) >= limit:
-            self._memory_store[key] = timestamps
-            return False
-
-        timestamps.append(now)
-        self._memory_store[key] = timestamps
-        return True
-
-    async def dispatch(self, request: Request, call_next):
-        if not self.enabled:
-            return await call_next(request)
+        self.limiter = rate_limiter
+        self.limiter.configure(memory_max_keys=int(config.get("memory_max_keys", 10000)))
 
+    async def _is_allowed(self, request: Request) -> bool:
+        """Count the request in its rate limit bucket and tell whether it may proceed."""
         client_ip = request.client.host if request.client else "unknown"
 
         # Service-to-service calls get a separate, higher rate limit bucket.
@@ -147,20 +124,25 @@ class RateLimitMiddleware(MiddlewareInterface, AppManagerCallerMixin, BaseHTTPMi
         rate_limit = self.service_requests_per_minute if is_service_call else self.requests_per_minute
         key_prefix = "rate_limit_svc" if is_service_call else "rate_limit"
 
-        redis_client = self._get_redis()
-        if redis_client:
-            allowed = await self._check_rate_limit_redis(client_ip, redis_client, rate_limit, key_prefix)
-        else:
-            allowed = self._check_rate_limit_memory(client_ip, rate_limit, key_prefix)
+        return await self.limiter.hit(
+            f"{key_prefix}:{client_ip}", rate_limit, get_rate_limit_redis(self.app_manager)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
 
-        if not allowed:
-            return JSONResponse(
+        if not await self._is_allowed(Request(scope)):
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests"},
                 headers={"Retry-After": "60"}
             )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 class LysCorsMiddleware(MiddlewareInterface, AppManagerCallerMixin, CORSMiddleware):
@@ -230,11 +212,11 @@ class _MiddlewareLysError(AppManagerCallerMixin, HTTPException):
                 )
 
 
-class ErrorManagerMiddleware(MiddlewareInterface, BaseHTTPMiddleware):
+class ErrorManagerMiddleware(MiddlewareInterface):
     """Error handling middleware that catches and logs exceptions."""
 
-    def __init__(self, app, saved_context_keys: List[str] = None):
-        BaseHTTPMiddleware.__init__(self, app)
+    def __init__(self, app: ASGIApp, saved_context_keys: List[str] = None):
+        self.app = app
 
         if saved_context_keys is None:
             self.saved_context_keys = [
@@ -246,11 +228,14 @@ class ErrorManagerMiddleware(MiddlewareInterface, BaseHTTPMiddleware):
         else:
             self.saved_context_keys = saved_context_keys
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Process request with error handling
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         except LysError as ex:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             mlex = _MiddlewareLysError(
@@ -274,7 +259,7 @@ class ErrorManagerMiddleware(MiddlewareInterface, BaseHTTPMiddleware):
                 traceback.format_exc(),
             )
 
-            context = await self._get_context_from_request(request)
+            context = await self._get_context_from_request(Request(scope))
             await mlex.save_error_in_database(context)
             raise mlex
 
@@ -282,13 +267,29 @@ class ErrorManagerMiddleware(MiddlewareInterface, BaseHTTPMiddleware):
     def _get_from_request_state(request, name):
         return getattr(request.state, name, None)
 
+    @classmethod
+    def _to_json_compatible(cls, value: Any) -> Any:
+        """
+        Copy a request state value with plain dicts and lists, as stored in the log context.
+
+        The decoded access claims hold mapping and set views (e.g. WebserviceAccess),
+        which the JSON column cannot serialize.
+        """
+        if isinstance(value, Mapping):
+            return {key: cls._to_json_compatible(item) for key, item in value.items()}
+        if isinstance(value, Set):
+            return sorted(value, key=str)
+        if isinstance(value, (list, tuple)):
+            return [cls._to_json_compatible(item) for item in value]
+        return value
+
     async def _get_context_from_request(self, request) -> Union[Dict[str, Any], None]:
         context: Dict[str, Any] = {}
 
         for key in self.saved_context_keys:
             value = self._get_from_request_state(request, key)
             if value is not None:
-                context[key] = value
+                context[key] = self._to_json_compatible(value)
 
         if len(context.keys()) == 0:
             return None
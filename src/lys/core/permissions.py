@@ -20,11 +20,12 @@ from typing import Any, Optional
 from sqlalchemy import Select, false
 from strawberry import BasePermission
 
-from lys.core.consts.errors import PERMISSION_DENIED_ERROR, UNKNOWN_WEBSERVICE_ERROR
+from lys.core.consts.errors import PERMISSION_DENIED_ERROR, TOO_MANY_REQUESTS_ERROR, UNKNOWN_WEBSERVICE_ERROR
 from lys.core.contexts import Context
 from lys.core.interfaces.entities import EntityInterface
 from lys.core.managers.app import AppManager
 from lys.core.utils.manager import AppManagerCallerMixin
+from lys.core.utils.rate_limit import check_webservice_rate_limit
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +150,7 @@ def generate_webservice_permission(
             Core authorization logic for webservice access with explicit error handling.
 
             Flow:
+            0. Apply the webservice rate limit (rate_limit plugin "webservices")
             1. Check webservice configuration from registry
             2. Execute the permission chain via get_access_type()
             3. Update context with computed access_type for resolvers
@@ -156,6 +158,7 @@ def generate_webservice_permission(
 
             Error Handling:
                 - Unknown webservice → UNKNOWN_WEBSERVICE_ERROR
+                - Webservice rate limit exceeded → TOO_MANY_REQUESTS_ERROR
                 - Permission failures → PERMISSION_DENIED_ERROR
                 - All errors logged for debugging, access denied for security
 
@@ -164,6 +167,10 @@ def generate_webservice_permission(
                 - Updates self.code/self.message for error responses
             """
             try:
+                if not await check_webservice_rate_limit(self.app_manager, webservice_id, context):
+                    self.code, self.message = TOO_MANY_REQUESTS_ERROR
+                    return False
+
                 # Execute the pluggable permission system
                 access_type, (self.code, self.message) = await get_access_type(
                     self.app_manager, webservice_id, context
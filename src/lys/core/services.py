@@ -1,14 +1,16 @@
 import logging
-from typing import Callable, Any, TypeVar, Generic, List, cast, Optional, Dict, Type, Union, Self
+from typing import Callable, Any, TypeVar, Generic, List, cast, Optional, Dict, Type, Union, Self, Iterator, Tuple
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, insert, tuple_
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.util import classproperty
 
-from lys.core.entities import Entity
+from lys.core.entities import Entity, ParametricEntity
 from lys.core.interfaces.services import ServiceInterface, EntityServiceInterface
 from lys.core.managers.database import Base
 from lys.core.utils.manager import AppManagerCallerMixin
+from lys.core.utils.database import get_max_bound_parameters, get_upsert_insert, get_values_filter
 from lys.core.utils.generic import resolve_service_name_from_generic
 
 logger = logging.getLogger(__name__)
@@ -89,6 +91,10 @@ class EntityService(Generic[T], EntityServiceInterface, Service):
             pass  # service_name automatically set to User.__tablename__
     """
 
+    # Rows sent per statement by create_many, update_many and upsert_many. Keeps the
+    # bound parameters of a statement under the database limits.
+    bulk_chunk_size: int = 500
+
     def __init_subclass__(cls, **kwargs):
         """Automatically set service_name when subclass is created.
 
@@ -119,6 +125,12 @@ class EntityService(Generic[T], EntityServiceInterface, Service):
 
     @classmethod
     async def get_by_id(cls, entity_id: str, session:AsyncSession) -> Optional[T]:
+        if issubclass(cls.entity_class, ParametricEntity):
+            # read through the process-wide cache of parametric rows
+            entity = await cls.app_manager.parametric_cache.get(cls.entity_class, entity_id, session)
+            if entity is not None:
+                return entity
+
         result = await session.execute(
             select(cls.entity_class).where(cls.entity_class.id == entity_id)
         )
@@ -146,7 +158,6 @@ class EntityService(Generic[T], EntityServiceInterface, Service):
             Filtered dict containing only valid column and relationship fields
         """
         allowed = {c.name for c in cls.entity_class.__table__.columns}
-        from sqlalchemy import inspect as sa_inspect
         mapper = sa_inspect(cls.entity_class)
         allowed |= set(mapper.relationships.keys())
         unexpected = set(kwargs.keys()) - allowed
@@ -185,39 +196,283 @@ class EntityService(Generic[T], EntityServiceInterface, Service):
         return bool(result.rowcount)
 
     @classmethod
-    async def get_multiple_by_ids(cls, entity_ids: List[str], session: AsyncSession) -> List[T]:
-        if not entity_ids:
+    def _filter_bulk_rows(cls, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter the rows of a bulk operation, which can only set columns.
+
+        Args:
+            rows: Field name/value pairs of each row
+
+        Returns:
+            Filtered rows
+
+        Raises:
+            ValueError: If a row sets a relationship
+        """
+        relationships = set(sa_inspect(cls.entity_class).relationships.keys())
+        filtered_rows = []
+
+        for row in rows:
+            row = cls._filter_allowed_fields(row)
+            unsupported = relationships.intersection(row)
+            if unsupported:
+                raise ValueError(
+                    f"Bulk operations on {cls.__name__} only set columns, got relationships: {unsupported}"
+                )
+            filtered_rows.append(row)
+
+        return filtered_rows
+
+    @classmethod
+    def _iter_bulk_chunks(cls, rows: List[Dict[str, Any]]) -> Iterator[Tuple[List[int], List[Dict[str, Any]]]]:
+        """Split rows in chunks sharing the same keys, as one statement needs.
+
+        Args:
+            rows: Rows of a bulk operation
+
+        Yields:
+            Tuples of (positions of the rows in `rows`, rows of the chunk)
+        """
+        positions_by_keys: Dict[frozenset, List[int]] = {}
+        for position, row in enumerate(rows):
+            positions_by_keys.setdefault(frozenset(row), []).append(position)
+
+        for positions in positions_by_keys.values():
+            for start in range(0, len(positions), cls.bulk_chunk_size):
+                chunk_positions = positions[start:start + cls.bulk_chunk_size]
+                yield chunk_positions, [rows[position] for position in chunk_positions]
+
+    @classmethod
+    def _get_onupdate_values(cls, excluded: set) -> Dict[str, Any]:
+        """Evaluate the column `onupdate` defaults, which an upsert does not apply by itself.
+
+        Args:
+            excluded: Column names already set by the statement
+
+        Returns:
+            Column name/value pairs
+        """
+        values = {}
+
+        for column in cls.entity_class.__table__.columns:
+            onupdate = column.onupdate
+            if onupdate is None or column.name in excluded:
+                continue
+            if getattr(onupdate, "is_callable", False):
+                # SQLAlchemy wraps the default to take the execution context
+                values[column.name] = onupdate.arg(None)
+            elif getattr(onupdate, "is_scalar", False) or getattr(onupdate, "is_clause_element", False):
+                values[column.name] = onupdate.arg
+
+        return values
+
+    @classmethod
+    async def create_many(cls, session: AsyncSession, rows: List[Dict[str, Any]]) -> List[T]:
+        """Create entities with one multi-row INSERT ... RETURNING per chunk.
+
+        Column defaults (id, created_at) are evaluated per row, as with create().
+        Relationships cannot be set, use their foreign key columns instead.
+
+        Args:
+            session: Database session
+            rows: Field name/value pairs of each entity
+
+        Returns:
+            Created entities, attached to the session, in the order of `rows`
+        """
+        rows = cls._filter_bulk_rows(rows)
+        if not rows:
             return []
 
-        # For small lists, a single query is more efficient
-        if len(entity_ids) <= 10:
+        entity_class = cls.entity_class
+
+        if not session.get_bind().dialect.insert_returning:
+            # without RETURNING the unit of work batches the INSERT (ids are client-side)
+            entities = [entity_class(**row) for row in rows]
+            session.add_all(entities)
+            await session.flush()
+            return entities
+
+        entities: List[Optional[T]] = [None] * len(rows)
+        stmt = insert(entity_class).returning(entity_class, sort_by_parameter_order=True)
+
+        for positions, chunk in cls._iter_bulk_chunks(rows):
+            result = await session.scalars(stmt, chunk)
+            for position, entity in zip(positions, result.all()):
+                entities[position] = entity
+
+        return cast(List[T], entities)
+
+    @classmethod
+    async def update_many(cls, session: AsyncSession, rows: List[Dict[str, Any]]) -> List[T]:
+        """Update entities by id with one executemany UPDATE per chunk.
+
+        Each row holds the id of the entity to update and the fields to set. Rows
+        sharing the same fields are sent in the same statement; the updated
+        entities are then selected back with one query per chunk.
+
+        Args:
+            session: Database session
+            rows: Field name/value pairs of each entity, including its id
+
+        Returns:
+            Updated entities in the order of `rows` (unknown ids are skipped)
+
+        Raises:
+            ValueError: If a row has no id
+        """
+        rows = cls._filter_bulk_rows(rows)
+        if not rows:
+            return []
+
+        if any("id" not in row for row in rows):
+            raise ValueError(f"update_many on {cls.__name__} requires an id in every row")
+
+        entity_class = cls.entity_class
+
+        for _, chunk in cls._iter_bulk_chunks(rows):
+            await session.execute(update(entity_class), chunk)
+
+        ids = [row["id"] for row in rows]
+        entities_by_id = {}
+        for start in range(0, len(ids), cls.bulk_chunk_size):
             result = await session.execute(
-                select(cls.entity_class).where(cls.entity_class.id.in_(entity_ids))
+                select(entity_class)
+                .where(entity_class.id.in_(ids[start:start + cls.bulk_chunk_size]))
+                .execution_options(populate_existing=True)
             )
-            return cast(List[T], result.scalars().all())
+            entities_by_id.update({entity.id: entity for entity in result.scalars()})
 
-        # For larger lists, parallelize using chunks
-        chunk_size = 10
-        chunks = [entity_ids[i:i + chunk_size] for i in range(0, len(entity_ids), chunk_size)]
+        return [entities_by_id[entity_id] for entity_id in ids if entity_id in entities_by_id]
 
-        async def get_chunk(session_: AsyncSession, chunk_ids: List[str]):
-            res = await session_.execute(
-                select(cls.entity_class).where(cls.entity_class.id.in_(chunk_ids))
-            )
-            return res.scalars().all()
+    @classmethod
+    async def upsert_many(
+            cls,
+            session: AsyncSession,
+            rows: List[Dict[str, Any]],
+            conflict_columns: Optional[List[str]] = None,
+            update_columns: Optional[List[str]] = None
+    ) -> List[T]:
+        """Insert entities or update the existing ones, with one statement per chunk.
+
+        Uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite, and
+        INSERT ... ON DUPLICATE KEY UPDATE on MySQL (which then selects the rows
+        back, having no RETURNING). A chunk must not hold the same conflict key twice.
 
-        query_functions = [
-            lambda s: get_chunk(s, chunk) for chunk in chunks
-        ]
+        Args:
+            session: Database session
+            rows: Field name/value pairs of each entity, including the conflict columns
+            conflict_columns: Unique columns identifying an existing row (default: primary key)
+            update_columns: Columns overwritten on conflict (default: every given column
+                except the conflict ones)
+
+        Returns:
+            Inserted or updated entities in the order of `rows`
+
+        Raises:
+            ValueError: If a row lacks a conflict column or the dialect has no upsert
+        """
+        rows = cls._filter_bulk_rows(rows)
+        if not rows:
+            return []
 
-        results = await cls.execute_parallel(*query_functions)
+        entity_class = cls.entity_class
+        conflict_columns = conflict_columns or [column.name for column in entity_class.__table__.primary_key]
+        if any(column not in row for row in rows for column in conflict_columns):
+            raise ValueError(f"upsert_many on {cls.__name__} requires {conflict_columns} in every row")
+
+        dialect = session.get_bind().dialect
+        dialect_insert = get_upsert_insert(dialect.name)
+        is_mysql = dialect.name in ("mysql", "mariadb")
+        conflict_attributes = [getattr(entity_class, column) for column in conflict_columns]
+
+        def get_key(values):
+            return tuple(values[column] for column in conflict_columns)
+
+        entities: List[Optional[T]] = [None] * len(rows)
+
+        for positions, chunk in cls._iter_bulk_chunks(rows):
+            columns = update_columns or [key for key in chunk[0] if key not in conflict_columns]
+            stmt = dialect_insert(entity_class).values(chunk)
+            new_values = stmt.inserted if is_mysql else stmt.excluded
+            set_ = {column: new_values[column] for column in columns}
+            set_.update(cls._get_onupdate_values(set(set_)))
+            if not set_:
+                # nothing to overwrite: a no-op update still returns the existing row
+                set_ = {column: new_values[column] for column in conflict_columns}
+
+            if is_mysql:
+                await session.execute(stmt.on_duplicate_key_update(set_))
+                keys = [get_key(row) for row in chunk]
+                condition = conflict_attributes[0].in_([key[0] for key in keys]) \
+                    if len(conflict_columns) == 1 else tuple_(*conflict_attributes).in_(keys)
+                result = await session.scalars(
+                    select(entity_class).where(condition).execution_options(populate_existing=True)
+                )
+            else:
+                result = await session.scalars(
+                    stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_).returning(entity_class),
+                    execution_options={"populate_existing": True}
+                )
+
+            # RETURNING order is not guaranteed for a multi-row VALUES: match by key
+            entities_by_key = {
+                tuple(getattr(entity, column) for column in conflict_columns): entity
+                for entity in result.all()
+            }
+            for position, row in zip(positions, chunk):
+                entities[position] = entities_by_key.get(get_key(row))
+
+        return cast(List[T], entities)
 
-        # Flatten the results from all chunks
-        entities = []
-        for result in results:
-            entities.extend(result)
+    @classmethod
+    async def get_multiple_by_ids(cls, entity_ids: List[str], session: AsyncSession) -> List[T]:
+        """Get the entities matching a list of ids, in the order of the list.
 
-        return entities
+        Entities already loaded in the session are returned without a query. The
+        other ids are selected in one statement (`id = ANY(:ids)` on PostgreSQL),
+        chunked only on drivers limiting the bound parameters. Every entity is
+        attached to `session`.
+
+        Args:
+            entity_ids: Ids to look up; duplicates are returned once
+            session: Database session
+
+        Returns:
+            Found entities in the order of `entity_ids` (unknown ids are skipped)
+        """
+        if not entity_ids:
+            return []
+
+        entity_class = cls.entity_class
+        entities_by_id: Dict[str, T] = {}
+        missing_ids = []
+
+        for entity_id in dict.fromkeys(entity_ids):
+            entity = session.identity_map.get(session.identity_key(entity_class, entity_id))
+            if entity is not None:
+                state = sa_inspect(entity)
+                # an expired entity would need a lazy refresh, unavailable under asyncio
+                if not state.expired_attributes and not state.deleted:
+                    entities_by_id[str(entity_id)] = entity
+                    continue
+            missing_ids.append(entity_id)
+
+        if missing_ids:
+            dialect_name = session.get_bind().dialect.name
+            chunk_size = get_max_bound_parameters(dialect_name) or len(missing_ids)
+
+            for start in range(0, len(missing_ids), chunk_size):
+                result = await session.execute(
+                    select(entity_class).where(
+                        get_values_filter(entity_class.id, missing_ids[start:start + chunk_size], dialect_name)
+                    )
+                )
+                entities_by_id.update({str(entity.id): entity for entity in result.scalars()})
+
+        return [
+            entities_by_id[str(entity_id)]
+            for entity_id in dict.fromkeys(entity_ids) if str(entity_id) in entities_by_id
+        ]
 
     @classmethod
     async def check_and_update(cls, entity: T, **formatted_attributes: Dict[str, Any]) -> tuple[T, bool]:
@@ -1,8 +1,23 @@
 """
 Authentication utilities for service-to-service communication.
+
+Service tokens live one minute by default and inter-service traffic sends the
+same caller token many times within that minute, so neither side redoes the
+signature work per request:
+
+- ``ServiceAuthUtils.generate_token`` reuses the token it minted for a service
+  until ``TOKEN_REUSE_MARGIN_SECONDS`` before its ``exp``, and the clients share
+  one instance per secret key through ``ServiceAuthUtils.shared``;
+- ``VerifiedServiceTokenCache`` keeps the claims of the tokens the receiving
+  side already verified, keyed by a digest of the token and never past its
+  ``exp``.
 """
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from uuid import uuid4
 
 import jwt
@@ -17,6 +32,12 @@ class ServiceAuthUtils:
     ALGORITHM = "HS256"
     TOKEN_TYPE = "service"
     INTERNAL_AUDIENCE = "lys-internal"
+    # A minted token is reused until that many seconds before its exp, leaving
+    # the receiver time (and clock skew) to accept it
+    TOKEN_REUSE_MARGIN_SECONDS = 15
+
+    _shared_instances: Dict[str, "ServiceAuthUtils"] = {}
+    _shared_lock = threading.Lock()
 
     def __init__(self, secret_key: str, instance_id: str = None):
         """
@@ -30,11 +51,32 @@ class ServiceAuthUtils:
         """
         self.secret_key = secret_key
         self.instance_id = instance_id or str(uuid4())[:8]
+        # (service name, expiration minutes) -> (token, exp timestamp)
+        self._minted_tokens: Dict[Tuple[str, int], Tuple[str, float]] = {}
+
+    @classmethod
+    def shared(cls, secret_key: str) -> "ServiceAuthUtils":
+        """
+        Process-wide instance for ``secret_key``.
+
+        Short-lived clients (one GraphQLClient per conversation, fetch_graphql
+        per call) go through it, so they reuse the tokens it minted and report
+        the same instance_id.
+        """
+        instance = cls._shared_instances.get(secret_key)
+        if instance is None:
+            with cls._shared_lock:
+                instance = cls._shared_instances.setdefault(secret_key, cls(secret_key))
+        return instance
 
     def generate_token(self, service_name: str, expiration_minutes: int = 1) -> str:
         """
         Generate a JWT token for service-to-service communication.
 
+        The token minted by a previous call for the same service and expiration
+        is returned as long as it is valid for more than
+        TOKEN_REUSE_MARGIN_SECONDS.
+
         Args:
             service_name: Name of the calling service
             expiration_minutes: Token expiration time in minutes (default: 1)
@@ -42,18 +84,26 @@ class ServiceAuthUtils:
         Returns:
             Encoded JWT token string
         """
+        key = (service_name, expiration_minutes)
+        minted = self._minted_tokens.get(key)
+        if minted is not None and minted[1] - time.time() > self.TOKEN_REUSE_MARGIN_SECONDS:
+            return minted[0]
+
         now = now_utc()
+        exp = now + timedelta(minutes=expiration_minutes)
         payload = {
             "type": self.TOKEN_TYPE,
             "service_name": service_name,
             "instance_id": self.instance_id,
             "iat": now,
-            "exp": now + timedelta(minutes=expiration_minutes),
+            "exp": exp,
             "iss": service_name,
             "aud": self.INTERNAL_AUDIENCE,
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.ALGORITHM)
+        token = jwt.encode(payload, self.secret_key, algorithm=self.ALGORITHM)
+        self._minted_tokens[key] = (token, exp.timestamp())
+        return token
 
     def decode_token(self, token: str) -> Dict[str, Any]:
         """
@@ -80,4 +130,51 @@ class ServiceAuthUtils:
         if payload.get("type") != self.TOKEN_TYPE:
             raise InvalidTokenError("Not a service token")
 
-        return payload
\ No newline at end of file
+        return payload
+
+
+class VerifiedServiceTokenCache:
+    """
+    Bounded LRU of verified service token claims keyed by a SHA-256 digest of the token.
+
+    An entry is dropped at the token ``exp``, so a cached token is never
+    accepted past the moment decode_token would have rejected it. A
+    ``max_size`` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        # token digest -> (exp timestamp, claims)
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        exp, claims = entry
+        if exp <= time.time():
+            self._entries.pop(digest, None)
+            return None
+        self._entries.move_to_end(digest)
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any]):
+        exp = claims.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+        digest = self._digest(token)
+        self._entries[digest] = (exp, claims)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
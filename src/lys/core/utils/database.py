@@ -1,9 +1,20 @@
-from sqlalchemy import Select, select, func
+import json
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import Select, select, func, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, ColumnElement, Executable
 
 from lys.core.entities import Entity
 
+# Bound parameters a statement can hold on drivers expanding IN lists
+# (PostgreSQL receives the whole list as one array parameter)
+MAX_BOUND_PARAMETERS = {"sqlite": 32766, "mysql": 65535, "mariadb": 65535}
+DEFAULT_MAX_BOUND_PARAMETERS = 999
+
 
 def check_is_needing_session(method):
     is_needing_session = False
@@ -23,4 +34,119 @@ async def get_select_total_count(stmt: Select, entity: type[Entity], session:Asy
         count_stmt = count_stmt.where(stmt.whereclause)
 
     result = await session.execute(count_stmt)
-    return result.scalar_one()
\ No newline at end of file
+    return result.scalar_one()
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` wrapper around a statement (PostgreSQL)."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+def _get_select_rows_stmt(stmt: Select, entity: type[Entity]) -> Select:
+    rows_stmt = select(entity.id).select_from(*stmt.get_final_froms()).order_by(None)
+
+    if stmt.whereclause is not None:
+        rows_stmt = rows_stmt.where(stmt.whereclause)
+
+    return rows_stmt
+
+
+async def get_select_estimated_count(stmt: Select, entity: type[Entity], session: AsyncSession, threshold: int):
+    """
+    Return a cheap row count for a statement on a large table.
+
+    On PostgreSQL the planner row estimate is returned when it reaches `threshold`;
+    smaller results are counted exactly, where an estimate would be visibly wrong
+    and the count is cheap anyway. Other dialects have no usable estimate, so rows
+    are counted up to `threshold` and the count stops there: the value returned is
+    then a lower bound.
+
+    Args:
+        stmt: Statement whose rows are counted
+        entity: Entity listed by the statement
+        session: Session used to run the count
+        threshold: Row count from which an estimate is returned
+
+    Returns:
+        Exact count below the threshold, estimate (or threshold on non-PostgreSQL) above it
+    """
+    rows_stmt = _get_select_rows_stmt(stmt, entity)
+
+    if session.bind.dialect.name == "postgresql":
+        result = await session.execute(Explain(rows_stmt))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            # asyncpg hands json back undecoded
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate >= threshold:
+            return estimate
+        return await get_select_total_count(stmt, entity, session)
+
+    capped_stmt = select(func.count()).select_from(rows_stmt.distinct().limit(threshold).subquery())
+    result = await session.execute(capped_stmt)
+    return result.scalar_one()
+
+
+def get_upsert_insert(dialect_name: str) -> Callable:
+    """
+    Return the dialect `insert()` construct able to render an upsert.
+
+    PostgreSQL and SQLite constructs provide `on_conflict_do_update()`, the MySQL
+    one `on_duplicate_key_update()`.
+
+    Args:
+        dialect_name: Name of the SQLAlchemy dialect in use
+
+    Returns:
+        The dialect `insert` function
+
+    Raises:
+        ValueError: If the dialect has no upsert construct
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        raise ValueError(f"Upsert is not supported on {dialect_name}")
+
+    return insert
+
+
+def get_values_filter(column: ColumnElement, values: List[Any], dialect_name: str) -> ColumnElement:
+    """
+    Build a `column in values` condition for the dialect in use.
+
+    On PostgreSQL the values are sent as one array parameter (`column = ANY(:values)`),
+    so the statement text, and its cached plan, do not depend on the number of values.
+    Other dialects get an expanding `IN`, to be chunked with get_max_bound_parameters.
+
+    Args:
+        column: Column to filter
+        values: Accepted values
+        dialect_name: Name of the SQLAlchemy dialect in use
+
+    Returns:
+        SQL boolean expression
+    """
+    if dialect_name == "postgresql":
+        return column == any_(bindparam("values", values, type_=ARRAY(column.type), unique=True))
+    return column.in_(values)
+
+
+def get_max_bound_parameters(dialect_name: str) -> Optional[int]:
+    """Return how many values get_values_filter accepts per statement (None: no limit)."""
+    if dialect_name == "postgresql":
+        return None
+    return MAX_BOUND_PARAMETERS.get(dialect_name, DEFAULT_MAX_BOUND_PARAMETERS)
@@ -0,0 +1,160 @@
+"""
+Sliding window rate limiting.
+
+Requests are counted in fixed windows of ``window_seconds``; a request is let
+through when the count of the current window plus the share of the previous
+window still covered by the sliding window stays under the limit:
+
+    estimate = current + previous * (1 - elapsed_in_current_window / window_seconds)
+
+The limiter keeps two counters per key whatever the traffic, and the requests
+it rejects are not counted, so a client at its limit gets back under it as the
+window slides instead of waiting for the next window:
+
+- with Redis (``app_manager.pubsub``), the check and the increment run in one
+  atomic call of a Lua script, loaded once per connection (EVALSHA);
+- without Redis, or for a single process, the counters live in a bounded LRU
+  of ``memory_max_keys`` keys.
+
+``RateLimitMiddleware`` limits every request per client IP through the shared
+``rate_limiter``; ``check_webservice_rate_limit`` applies the per-webservice
+limits of the ``rate_limit`` plugin (``webservices``: name -> requests per
+minute) per connected user, or per client IP for anonymous calls.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from lys.core.consts.plugins import RATE_LIMIT_PLUGIN_KEY
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: counter of the current window, KEYS[2]: counter of the previous one
+# ARGV[1]: limit, ARGV[2]: weight of the previous window, ARGV[3]: counter TTL
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if current + previous * tonumber(ARGV[2]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 1
+"""
+
+
+class SlidingWindowRateLimiter:
+    """Sliding window counters, in Redis when available, else in a bounded in-process LRU."""
+
+    def __init__(self, window_seconds: int = 60, memory_max_keys: int = 10000):
+        self.window_seconds = window_seconds
+        self.memory_max_keys = memory_max_keys
+        # key -> [window index, count of that window, count of the window before]
+        self._memory_store: "OrderedDict[str, List[int]]" = OrderedDict()
+        # (redis client, registered script): the script is loaded once per client
+        self._script: Optional[Tuple[Any, Any]] = None
+
+    def configure(self, memory_max_keys: int):
+        """Resize the in-memory fallback (rate_limit plugin config), dropping every counter."""
+        self.memory_max_keys = max(1, memory_max_keys)
+        self._memory_store.clear()
+
+    def clear(self):
+        self._memory_store.clear()
+
+    def _window(self, now: float) -> Tuple[int, float]:
+        """Index of the current window and weight of the previous one."""
+        index = int(now // self.window_seconds)
+        elapsed = now - index * self.window_seconds
+        return index, 1 - elapsed / self.window_seconds
+
+    async def hit(self, key: str, limit: int, redis_client=None) -> bool:
+        """
+        Count a request against ``key``.
+
+        Returns:
+            True if the request is allowed, False if it is rate limited
+        """
+        if redis_client is not None:
+            return await self._hit_redis(key, limit, redis_client)
+        return self._hit_memory(key, limit)
+
+    def _get_script(self, redis_client):
+        if self._script is None or self._script[0] is not redis_client:
+            self._script = (redis_client, redis_client.register_script(SLIDING_WINDOW_SCRIPT))
+        return self._script[1]
+
+    async def _hit_redis(self, key: str, limit: int, redis_client) -> bool:
+        index, weight = self._window(time.time())
+        # the hash tag keeps both counters of a key on the same Redis Cluster slot
+        keys = [f"{{{key}}}:{index}", f"{{{key}}}:{index - 1}"]
+        try:
+            script = self._get_script(redis_client)
+            allowed = await script(keys=keys, args=[limit, weight, 2 * self.window_seconds])
+            return bool(allowed)
+        except Exception as e:
+            logger.warning("Redis rate limit check failed, allowing request: %s", e)
+            return True
+
+    def _hit_memory(self, key: str, limit: int) -> bool:
+        index, weight = self._window(time.time())
+
+        counters = self._memory_store.get(key)
+        if counters is None:
+            counters = [index, 0, 0]
+            self._memory_store[key] = counters
+            while len(self._memory_store) > self.memory_max_keys:
+                self._memory_store.popitem(last=False)
+        else:
+            self._memory_store.move_to_end(key)
+            if counters[0] != index:
+                # the window moved on: the current count becomes the previous one,
+                # unless more than one window went by
+                counters[2] = counters[1] if counters[0] == index - 1 else 0
+                counters[0], counters[1] = index, 0
+
+        if counters[1] + counters[2] * weight >= limit:
+            return False
+
+        counters[1] += 1
+        return True
+
+
+# Shared by RateLimitMiddleware and the webservice permissions of the process
+rate_limiter = SlidingWindowRateLimiter()
+
+
+def get_rate_limit_redis(app_manager):
+    """Get async Redis client from pubsub if available."""
+    pubsub = app_manager.pubsub
+    if pubsub and pubsub._async_redis:
+        return pubsub._async_redis
+    return None
+
+
+async def check_webservice_rate_limit(app_manager, webservice_id: str, context) -> bool:
+    """
+    Apply the limit configured for ``webservice_id`` in the rate_limit plugin.
+
+    Returns:
+        True if the call is allowed (or the webservice has no limit), False if it is rate limited
+    """
+    config: Dict[str, Any] = app_manager.settings.plugins.get(RATE_LIMIT_PLUGIN_KEY) or {}
+    if not config.get("enabled", True):
+        return True
+
+    limit = (config.get("webservices") or {}).get(webservice_id)
+    if limit is None:
+        return True
+
+    connected_user = context.connected_user
+    if connected_user:
+        identity = f"user:{connected_user['sub']}"
+    else:
+        request = context.request
+        identity = f"ip:{request.client.host if request is not None and request.client else 'unknown'}"
+
+    return await rate_limiter.hit(
+        f"rate_limit_ws:{webservice_id}:{identity}", int(limit), get_rate_limit_redis(app_manager)
+    )
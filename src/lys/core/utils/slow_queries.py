@@ -0,0 +1,154 @@
+"""
+Slow SQL statement capture.
+
+The statement listeners of utils.sql_stats keep, in the SqlStats of the operation,
+every statement running longer than `database.slow_statement_threshold_ms`. Once
+the operation is over, DatabaseSessionExtension hands them to
+`schedule_slow_statements_capture`, which stores them as Log entries from a
+background task with its own session: the request that ran them never waits for
+the capture.
+
+Only the statement shape and the shape of its bind parameters are stored, never
+the values. On PostgreSQL, a sampled fraction of the slow statements is also
+explained (`EXPLAIN (FORMAT JSON)`, which plans the statement without running it)
+with the original values, which are dropped afterwards.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from lys.core.consts.tablenames import LOG_TABLENAME
+
+logger = logging.getLogger(__name__)
+
+# Strong references to the running capture tasks (the event loop only keeps weak ones)
+_capture_tasks: Set[asyncio.Task] = set()
+
+
+def get_parameters_shape(parameters: Any) -> Any:
+    """
+    Describe bind parameters by their types, without their values.
+
+    Args:
+        parameters: Parameters sent to the driver: a mapping, a sequence, or a list
+            of them for an executemany
+
+    Returns:
+        JSON-serializable shape, e.g. {"id_1": "int"}, ["str", "NoneType"] or
+        {"rows": 3, "parameters": {...}} for an executemany
+    """
+    if isinstance(parameters, dict):
+        return {str(key): type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return {"rows": len(parameters), "parameters": get_parameters_shape(parameters[0])}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowStatement:
+    """
+    Statement that ran longer than the slow statement threshold.
+
+    Args:
+        statement: Normalized SQL
+        parameters_shape: Shape of the bind parameters (see get_parameters_shape)
+        duration: Execution time in seconds
+        path: Resolver path that ran it
+        explain: Original statement and parameters, kept when the statement was
+            sampled to be explained
+    """
+
+    def __init__(self, statement: str, parameters_shape: Any, duration: float, path: Optional[str],
+                 explain: Optional[tuple] = None):
+        self.statement = statement
+        self.parameters_shape = parameters_shape
+        self.duration = duration
+        self.path = path
+        self.explain = explain
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "parameters": self.parameters_shape,
+            "duration_ms": round(self.duration * 1000, 3),
+            "resolver_path": self.path or "",
+        }
+
+
+async def _explain(app_manager, slow_statement: SlowStatement) -> Optional[Any]:
+    statement, parameters = slow_statement.explain
+    try:
+        async with app_manager.database.get_engine().connect() as connection:
+            result = await connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = result.scalar_one()
+    except Exception as ex:
+        logger.warning("Could not explain slow SQL statement: %s", ex)
+        return None
+
+    # asyncpg hands json back undecoded
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+async def save_slow_statements(app_manager, slow_statements: List[SlowStatement],
+                               webservice_name: Optional[str], connected_user_id: Optional[str]):
+    """
+    Store slow statements as Log entries.
+
+    Args:
+        app_manager: Application manager (its registry must hold a log service)
+        slow_statements: Statements to store
+        webservice_name: Webservice that ran them
+        connected_user_id: User who called the webservice
+    """
+    log_service = app_manager.registry.services.get(LOG_TABLENAME)
+    if log_service is None:
+        return
+
+    is_postgresql = app_manager.database.settings.type == "postgresql"
+
+    try:
+        entries = []
+        for slow_statement in slow_statements:
+            context = slow_statement.as_dict()
+            context.update(webservice_name=webservice_name, connected_user_id=connected_user_id)
+            if is_postgresql and slow_statement.explain is not None:
+                context["explain"] = await _explain(app_manager, slow_statement)
+            # the values are not kept once explained
+            slow_statement.explain = None
+            entries.append(context)
+
+        async with app_manager.database.get_session() as session:
+            for context in entries:
+                await log_service.create(
+                    session,
+                    message=f"Slow SQL statement ({context['duration_ms']} ms) "
+                            f"in webservice {webservice_name}",
+                    file_name=webservice_name or "",
+                    line=0,
+                    traceback=context["statement"],
+                    context=context
+                )
+    except Exception as ex:
+        logger.warning("Could not save %d slow SQL statements: %s", len(slow_statements), ex)
+
+
+def schedule_slow_statements_capture(app_manager, slow_statements: List[SlowStatement],
+                                     webservice_name: Optional[str],
+                                     connected_user_id: Optional[str]) -> Optional[asyncio.Task]:
+    """
+    Store slow statements in the background.
+
+    Returns:
+        The capture task, or None when there is nothing to capture
+    """
+    if not slow_statements:
+        return None
+
+    task = asyncio.get_running_loop().create_task(
+        save_slow_statements(app_manager, slow_statements, webservice_name, connected_user_id)
+    )
+    _capture_tasks.add(task)
+    task.add_done_callback(_capture_tasks.discard)
+    return task
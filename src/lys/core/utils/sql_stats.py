@@ -0,0 +1,169 @@
+"""
+Per-operation SQL instrumentation.
+
+Engines created by DatabaseManager carry cursor execution listeners. While a
+SqlStats collector is active in the current context (DatabaseSessionExtension
+activates one per GraphQL operation), every statement executed is counted and
+timed, in total and per resolver path. The same counts flag N+1 patterns: a
+resolver path running the same statement shape again and again, and the
+statements above the slow statement threshold are kept for utils.slow_queries.
+
+The listeners run in the SQLAlchemy greenlet of the awaiting coroutine, which
+shares its context variables, so statements are attributed to the task (and the
+resolver) that issued them.
+"""
+import random
+import re
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+
+from lys.core.utils.slow_queries import SlowStatement, get_parameters_shape
+
+_active_sql_stats: ContextVar[Optional["SqlStats"]] = ContextVar("active_sql_stats", default=None)
+_resolver_path: ContextVar[Optional[str]] = ContextVar("sql_resolver_path", default=None)
+
+_SPACES_RE = re.compile(r"\s+")
+# expanded IN lists: IN (?, ?, ?) / IN ($1, $2) / IN (%(p_1)s, %(p_2)s)
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:\?|%s|%\(\w+\)s|\$\d+),?)+\s*\)", re.IGNORECASE)
+# numbered or named placeholders ($1, %(name)s)
+_PLACEHOLDER_RE = re.compile(r"\$\d+|%\(\w+\)s")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape.
+
+    Whitespace is squeezed, placeholders are replaced by `?` and expanded IN lists
+    are collapsed, so that the same query run with other values or another number
+    of ids has the same shape.
+
+    Args:
+        statement: SQL sent to the driver
+
+    Returns:
+        Normalized SQL
+    """
+    statement = _SPACES_RE.sub(" ", statement).strip()
+    statement = _IN_LIST_RE.sub("IN (?)", statement)
+    return _PLACEHOLDER_RE.sub("?", statement)
+
+
+class SqlStats:
+    """
+    SQL statements run during one GraphQL operation.
+
+    Args:
+        n_plus_one_threshold: A resolver path running the same statement shape more
+            than this many times is reported as an N+1 (0 disables the detection)
+        slow_threshold: Statements running longer than this many seconds are kept
+            in `slow_statements` (0 disables the capture)
+        explain_rate: Fraction of the slow statements kept with their parameters,
+            to be explained
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 0, slow_threshold: float = 0, explain_rate: float = 0):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_threshold = slow_threshold
+        self.explain_rate = explain_rate
+        self.slow_statements: List[SlowStatement] = []
+        self.statement_count = 0
+        self.duration = 0.0
+        # resolver path -> [statement count, duration]
+        self.paths: Dict[str, List[float]] = {}
+        # (resolver path, statement shape) -> count
+        self._shapes: Dict[Tuple[str, str], int] = {}
+
+    def record(self, statement: str, duration: float, path: Optional[str], parameters: Any = None,
+               executemany: bool = False):
+        self.statement_count += 1
+        self.duration += duration
+
+        path = path or ""
+        path_stats = self.paths.setdefault(path, [0, 0.0])
+        path_stats[0] += 1
+        path_stats[1] += duration
+
+        normalized_statement = normalize_statement(statement)
+        key = (path, normalized_statement)
+        self._shapes[key] = self._shapes.get(key, 0) + 1
+
+        if self.slow_threshold and duration > self.slow_threshold:
+            explain = None
+            # an executemany has no single plan
+            if self.explain_rate and not executemany and random.random() < self.explain_rate:
+                explain = (statement, parameters)
+            self.slow_statements.append(
+                SlowStatement(normalized_statement, get_parameters_shape(parameters), duration, path, explain)
+            )
+
+    def get_n_plus_one(self) -> List[Dict[str, Any]]:
+        """Return the resolver paths repeating a statement shape beyond the threshold."""
+        if not self.n_plus_one_threshold:
+            return []
+
+        return [
+            {"path": path, "statement": statement, "count": count}
+            for (path, statement), count in self._shapes.items()
+            if count > self.n_plus_one_threshold
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statements": self.statement_count,
+            "duration_ms": round(self.duration * 1000, 3),
+            "paths": {
+                path: {"statements": count, "duration_ms": round(duration * 1000, 3)}
+                for path, (count, duration) in self.paths.items()
+            },
+            "n_plus_one": self.get_n_plus_one(),
+        }
+
+
+def activate_sql_stats(sql_stats: SqlStats) -> Token:
+    """Collect the statements of the current context (and its child tasks) into `sql_stats`."""
+    return _active_sql_stats.set(sql_stats)
+
+
+def deactivate_sql_stats(token: Token):
+    _active_sql_stats.reset(token)
+
+
+def get_active_sql_stats() -> Optional[SqlStats]:
+    return _active_sql_stats.get()
+
+
+def set_resolver_path(path: Optional[str]) -> Token:
+    """Attribute the statements of the current context to a resolver path."""
+    return _resolver_path.set(path)
+
+
+def reset_resolver_path(token: Token):
+    _resolver_path.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _active_sql_stats.get() is not None:
+        context.sql_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sql_stats = _active_sql_stats.get()
+    start = getattr(context, "sql_stats_start", None)
+    if sql_stats is None or start is None:
+        return
+
+    sql_stats.record(statement, time.perf_counter() - start, _resolver_path.get(), parameters, executemany)
+
+
+def instrument_engine(engine: Engine):
+    """
+    Attach the statement listeners to an engine (sync engine of an AsyncEngine).
+
+    Listeners cost a context variable lookup per statement when no collector is active.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -12,9 +12,10 @@ from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from lys.apps.ai.modules.conversation.consts import AI_PURPOSE_CHATBOT, AIMessageRole
+from lys.apps.ai.modules.conversation.history import conversation_history_cache
 
 
 class TestAIConversationServiceGetOrCreate:
@@ -207,6 +208,110 @@ class TestAIConversationServiceBuildMessages:
             assert messages[1]["tool_call_id"] == "call_1"
 
 
+    @pytest.mark.asyncio
+    async def test_build_messages_only_selects_messages_after_cached_history(self, ai_app_manager):
+        """Test _build_messages extends the cached history with the messages written since."""
+        conversation_service = ai_app_manager.get_service("ai_conversation")
+        message_entity = ai_app_manager.get_entity("ai_message")
+        user_id = str(uuid4())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+
+        async with ai_app_manager.database.get_session() as session:
+            conversation = await conversation_service.get_or_create(user_id, session)
+            session.add(message_entity(
+                conversation_id=conversation.id, role=AIMessageRole.USER.value,
+                content="Hello", created_at=base,
+            ))
+            await session.flush()
+            assert len(await conversation_service._build_messages(conversation, session)) == 1
+
+            session.add(message_entity(
+                conversation_id=conversation.id, role=AIMessageRole.ASSISTANT.value,
+                content="Hi there!", created_at=base + timedelta(minutes=1),
+            ))
+            await session.flush()
+
+            statements = []
+
+            def record(orm_execute_state):
+                statements.append(orm_execute_state)
+
+            event.listen(session.sync_session, "do_orm_execute", record)
+            messages = await conversation_service._build_messages(conversation, session)
+            event.remove(session.sync_session, "do_orm_execute", record)
+
+            assert [m["content"] for m in messages] == ["Hello", "Hi there!"]
+            assert conversation_history_cache._get_local(conversation.id).token_estimate > 0
+            # The consistency count, then the messages after the cursor only
+            assert len(statements) == 2
+            assert "count" in str(statements[0].statement).lower()
+
+    @pytest.mark.asyncio
+    async def test_build_messages_rebuilds_history_missing_late_committed_messages(self, ai_app_manager):
+        """Messages committed behind the cursor by an overlapping turn are not lost."""
+        conversation_service = ai_app_manager.get_service("ai_conversation")
+        message_entity = ai_app_manager.get_entity("ai_message")
+        user_id = str(uuid4())
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+
+        async with ai_app_manager.database.get_session() as session:
+            conversation = await conversation_service.get_or_create(user_id, session)
+            session.add(message_entity(
+                conversation_id=conversation.id, role=AIMessageRole.USER.value,
+                content="Second turn", created_at=base,
+            ))
+            await session.flush()
+            assert len(await conversation_service._build_messages(conversation, session)) == 1
+
+            # The first turn buffered its message earlier and commits after the second one
+            session.add(message_entity(
+                conversation_id=conversation.id, role=AIMessageRole.USER.value,
+                content="First turn", created_at=base - timedelta(seconds=1),
+            ))
+            await session.flush()
+
+            messages = await conversation_service._build_messages(conversation, session)
+
+            assert [m["content"] for m in messages] == ["First turn", "Second turn"]
+            assert len(conversation_history_cache._get_local(conversation.id).refs) == 2
+
+
+class TestAIMessageBufferFlush:
+    """Test the rows written by AIMessageBuffer.flush."""
+
+    @pytest.mark.asyncio
+    async def test_flush_stores_sql_null_in_unset_json_columns(self, ai_app_manager):
+        """Rows padded with None store SQL NULL, not the JSON literal null."""
+        conversation_service = ai_app_manager.get_service("ai_conversation")
+        message_service = ai_app_manager.get_service("ai_message")
+        message_entity = ai_app_manager.get_entity("ai_message")
+        user_id = str(uuid4())
+
+        async with ai_app_manager.database.get_session() as session:
+            conversation = await conversation_service.get_or_create(user_id, session)
+            buffer = message_service.buffer(conversation.id)
+            user_id_ = buffer.add(AIMessageRole.USER.value, content="Hi")
+            assistant_id = buffer.add(
+                AIMessageRole.ASSISTANT.value, content="", tool_calls=[{"id": "call-1"}]
+            )
+            tool_id = buffer.add_tool_result("call-1", {"data": "result"})
+            await buffer.flush(session)
+
+            rows = (await session.execute(
+                select(
+                    message_entity.id,
+                    message_entity.tool_calls.is_(None),
+                    message_entity.tool_result.is_(None),
+                ).where(message_entity.conversation_id == conversation.id)
+            )).all()
+
+            assert {row[0]: (bool(row[1]), bool(row[2])) for row in rows} == {
+                user_id_: (True, True),
+                assistant_id: (False, True),
+                tool_id: (True, False),
+            }
+
+
 # ==============================================================================
 # Conversation compaction (summaries) — DB-backed paths
 # ==============================================================================
@@ -303,6 +408,39 @@ class TestAIConversationServiceCompaction:
             built = await conversation_service._build_messages(conv, session, current_summary=summary)
             assert [b["content"] for b in built] == ["m3", "m4", "m5"]
 
+    @pytest.mark.asyncio
+    async def test_build_messages_rebases_cached_history_on_new_summary(self, ai_app_manager):
+        """A summary completed after the history was cached drops the messages it carries."""
+        conversation_service = ai_app_manager.get_service("ai_conversation")
+        summary_entity = ai_app_manager.get_entity("ai_conversation_summary")
+        message_entity = ai_app_manager.get_entity("ai_message")
+        user_id = str(uuid4())
+
+        async with ai_app_manager.database.get_session() as session:
+            conv = await conversation_service.get_or_create(user_id, session)
+            base = datetime(2026, 1, 1, tzinfo=UTC)
+            msgs = []
+            for i in range(6):
+                m = message_entity(
+                    conversation_id=conv.id, role=self._alternating_role(i),
+                    content=f"m{i}", created_at=base + timedelta(minutes=i),
+                )
+                session.add(m)
+                msgs.append(m)
+            await session.flush()
+            assert len(await conversation_service._build_messages(conv, session)) == 6
+
+            summary = summary_entity(
+                conversation_id=conv.id, through_message_id=msgs[2].id,
+                summary="...", completed=True, created_at=base + timedelta(hours=1),
+            )
+            session.add(summary)
+            await session.flush()
+
+            built = await conversation_service._build_messages(conv, session, current_summary=summary)
+            assert [b["content"] for b in built] == ["m3", "m4", "m5"]
+            assert conversation_history_cache._get_local(conv.id).summary_id == summary.id
+
     @pytest.mark.asyncio
     async def test_maybe_enqueue_compaction_creates_pending_and_dispatches(self, ai_app_manager):
         """Over the token threshold, a pending summary row is created and the task dispatched."""
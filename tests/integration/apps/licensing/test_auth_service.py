@@ -169,3 +169,78 @@ class TestLicensingAuthServiceClientSubscriptionClaim:
         async with licensing_app_manager.database.get_session() as session:
             claim = await auth_service._get_client_subscription_claim(str(uuid4()), session)
             assert claim is None
+
+
+class TestLicensingAuthServiceQueryCount:
+    """Test the claims chain runs a fixed number of statements."""
+
+    @pytest.mark.asyncio
+    async def test_statement_count_independent_of_webservice_catalog(self, licensing_app_manager):
+        """Test claims generation statements do not grow with the webservices."""
+        from sqlalchemy import event, insert
+
+        from lys.apps.base.modules.webservice.entities import webservice_access_level
+        from lys.apps.organization.consts import ORGANIZATION_ROLE_ACCESS_LEVEL
+        from lys.core.consts.webservices import CONNECTED_ACCESS_LEVEL, OWNER_ACCESS_LEVEL
+
+        client_service = licensing_app_manager.get_service("client")
+        auth_service = licensing_app_manager.get_service("auth")
+        user_service = licensing_app_manager.get_service("user")
+        access_level_entity = licensing_app_manager.get_entity("access_level")
+        webservice_entity = licensing_app_manager.get_entity("webservice")
+        access_levels = (CONNECTED_ACCESS_LEVEL, OWNER_ACCESS_LEVEL, ORGANIZATION_ROLE_ACCESS_LEVEL)
+
+        async with licensing_app_manager.database.get_session() as session:
+            for access_level_id in access_levels:
+                if await session.get(access_level_entity, access_level_id) is None:
+                    session.add(access_level_entity(id=access_level_id, enabled=True))
+            client = await client_service.create_client_with_owner(
+                session=session,
+                client_name=f"QueryCount-Corp-{uuid4().hex[:8]}",
+                email=f"querycount-{uuid4().hex[:8]}@example.com",
+                password="Password123!",
+                language_id="en",
+                send_verification_email=False
+            )
+            await session.commit()
+            owner_id = client.owner_id
+
+        async def add_webservices(count):
+            async with licensing_app_manager.database.get_session() as session:
+                ids = [f"query_count_ws_{uuid4().hex[:8]}" for _ in range(count)]
+                session.add_all([
+                    webservice_entity(id=ws_id, enabled=True, is_licenced=index % 2 == 0)
+                    for index, ws_id in enumerate(ids)
+                ])
+                await session.flush()
+                await session.execute(insert(webservice_access_level), [
+                    {"webservice_id": ws_id, "access_level_id": access_level_id}
+                    for ws_id in ids for access_level_id in access_levels
+                ])
+                await session.commit()
+
+        async def count_statements():
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            engine = licensing_app_manager.database.engine.sync_engine
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                async with licensing_app_manager.database.get_session() as session:
+                    owner = await user_service.get_by_id(owner_id, session)
+                    statements.clear()
+                    claims = await auth_service.generate_access_claims(owner, session)
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+            return len(statements), claims
+
+        await add_webservices(2)
+        small_count, small_claims = await count_statements()
+        await add_webservices(40)
+        large_count, large_claims = await count_statements()
+
+        assert len(large_claims["organizations"][client.id]["webservices"]) >= \
+            len(small_claims["organizations"][client.id]["webservices"]) + 40
+        assert large_count == small_count
@@ -29,7 +29,7 @@ from lys.apps.user_auth.modules.auth.consts import (
     SUCCEED_LOGIN_ATTEMPT_STATUS
 )
 from lys.apps.user_auth.modules.auth.models import LoginInputModel
-from lys.apps.user_auth.modules.auth.store import ACCESS_TOKEN_KEY_PREFIX
+from lys.apps.user_auth.modules.auth.store import ACCESS_TOKEN_KEY_PREFIX, AccessTokenStore
 from lys.apps.user_auth.modules.user.consts import ENABLED_USER_STATUS, DISABLED_USER_STATUS
 from lys.core.configs import LysAppSettings
 from lys.core.consts.component_types import AppComponentTypeEnum
@@ -798,8 +798,12 @@ class TestGenerateAccessToken:
         expected_key = f"{ACCESS_TOKEN_KEY_PREFIX}{token_str}"
         assert expected_key in fake_pubsub.store
 
+        # webservice claims are stored encoded against the webservice catalog
         stored_claims = json.loads(fake_pubsub.store[expected_key])
-        assert stored_claims == claims  # exact roundtrip
+        assert stored_claims["webservice_catalog"] in {
+            key.rsplit(":", 1)[1] for key in fake_pubsub.store if key.startswith("lys:webservice_catalog:")
+        }
+        assert await AccessTokenStore(fake_pubsub).get(token_str) == claims  # exact roundtrip
 
         # TTL must match access_token_expire_minutes (15 in test config) in seconds.
         assert fake_pubsub.ttls[expected_key] == _TEST_AUTH_CONFIG["access_token_expire_minutes"] * 60
@@ -0,0 +1,186 @@
+"""
+Integration tests and benchmark for the lys middleware stack.
+
+The middlewares configured through ``settings.middlewares`` are plain ASGI
+applications. These tests mount the full stack (SecurityHeaders, RateLimit,
+ErrorManager, ServiceAuth, UserAuth) on a FastAPI app and check that:
+- the request context and response headers are the ones the BaseHTTPMiddleware
+  implementations produced;
+- streamed responses still reach the client chunk by chunk;
+- the stack serves more requests per second than the same number of no-op
+  BaseHTTPMiddleware layers, i.e. less than the per-layer overhead alone of the
+  previous implementation.
+
+Test approach: real middlewares and FastAPI app, mocked AppManager (no Redis,
+no database), requests sent through httpx's ASGI transport.
+"""
+import asyncio
+import logging
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+from unittest.mock import MagicMock, patch
+
+from lys.apps.base.middlewares import ServiceAuthMiddleware
+from lys.apps.user_auth.middlewares import UserAuthMiddleware
+from lys.core.middlewares import ErrorManagerMiddleware, RateLimitMiddleware, SecurityHeadersMiddleware
+from lys.core.utils.manager import AppManagerCallerMixin
+
+# Same order as a typical settings.middlewares (first entry is the innermost layer)
+LYS_MIDDLEWARES = [
+    UserAuthMiddleware,
+    ServiceAuthMiddleware,
+    ErrorManagerMiddleware,
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+]
+
+BENCHMARK_REQUESTS = 300
+
+
+class _NoopHTTPMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+@pytest.fixture
+def mock_app_manager():
+    app_manager = MagicMock()
+    app_manager.settings.secret_key = "x" * 64
+    app_manager.settings.plugins = {"rate_limit": {"requests_per_minute": 10 ** 9}}
+    app_manager.settings.get_plugin_config.side_effect = lambda key: app_manager.settings.plugins.get(key, {})
+    app_manager.pubsub = None
+    with patch.object(AppManagerCallerMixin, "_app_manager", app_manager):
+        yield app_manager
+
+
+def _build_app(middlewares) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {
+            "connected_user": request.state.connected_user,
+            "service_caller": request.state.service_caller,
+        }
+
+    @app.get("/plain")
+    async def plain():
+        return {"ok": True}
+
+    for middleware in middlewares:
+        app.add_middleware(middleware)
+    return app
+
+
+async def _requests_per_second(app: FastAPI, path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # warm up (middleware stack build, route compilation)
+        for _ in range(20):
+            (await client.get(path)).raise_for_status()
+
+        started = time.perf_counter()
+        for _ in range(BENCHMARK_REQUESTS):
+            (await client.get(path)).raise_for_status()
+        elapsed = time.perf_counter() - started
+    return BENCHMARK_REQUESTS / elapsed
+
+
+class TestMiddlewareStackBehaviour:
+
+    @pytest.mark.asyncio
+    async def test_request_context_and_headers(self, mock_app_manager):
+        app = _build_app(LYS_MIDDLEWARES)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://test") as client:
+            response = await client.get("/ping")
+
+        assert response.status_code == 200
+        assert response.json() == {"connected_user": None, "service_caller": None}
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["strict-transport-security"] == "max-age=31536000; includeSubDomains"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_gets_security_headers(self, mock_app_manager):
+        mock_app_manager.settings.plugins["rate_limit"] = {"requests_per_minute": 1}
+        app = _build_app(LYS_MIDDLEWARES)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/plain")).status_code == 200
+            response = await client.get("/plain")
+
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Too many requests"}
+        assert response.headers["retry-after"] == "60"
+        assert response.headers["x-frame-options"] == "DENY"
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_is_not_buffered(self, mock_app_manager):
+        app = FastAPI()
+        first_chunk_sent = asyncio.Event()
+
+        @app.get("/stream")
+        async def stream():
+            async def chunks():
+                yield b"first"
+                # only resumes once the client received the first chunk
+                await asyncio.wait_for(first_chunk_sent.wait(), timeout=5)
+                yield b"second"
+
+            return StreamingResponse(chunks(), media_type="text/plain")
+
+        for middleware in LYS_MIDDLEWARES:
+            app.add_middleware(middleware)
+
+        bodies = []
+
+        async def receive():
+            await asyncio.sleep(10)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                bodies.append(message["body"])
+                first_chunk_sent.set()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "scheme": "http",
+            "method": "GET",
+            "path": "/stream",
+            "raw_path": b"/stream",
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+        assert bodies == [b"first", b"second"]
+
+
+class TestMiddlewareStackBenchmark:
+
+    @pytest.mark.asyncio
+    async def test_lys_stack_faster_than_base_http_middlewares(self, mock_app_manager):
+        bare_rps = await _requests_per_second(_build_app([]), "/plain")
+        base_http_rps = await _requests_per_second(
+            _build_app([_NoopHTTPMiddleware] * len(LYS_MIDDLEWARES)), "/plain"
+        )
+        lys_rps = await _requests_per_second(_build_app(LYS_MIDDLEWARES), "/plain")
+
+        logging.info(
+            "Middleware stack benchmark: bare %.0f rps, %d no-op BaseHTTPMiddleware %.0f rps, lys stack %.0f rps",
+            bare_rps, len(LYS_MIDDLEWARES), base_http_rps, lys_rps
+        )
+        assert lys_rps > base_http_rps, f"lys stack {lys_rps:.0f} rps <= BaseHTTPMiddleware {base_http_rps:.0f} rps"
@@ -8,6 +8,8 @@ into components using configure_app_manager_for_testing().
 from typing import Dict, Type, Any
 from unittest.mock import Mock, AsyncMock
 
+from lys.core.managers.http import HttpClientManager
+
 
 class MockRegister:
     """Mock of LysAppRegister."""
@@ -83,6 +85,8 @@ class MockAppManager:
         self.settings = MockSettings()
         self.register = MockRegister(self._entities, self._services)
         self.graphql_register = Mock()
+        self.graphql_schema = None
+        self.http_clients = HttpClientManager(self)
 
     def get_entity(self, name: str):
         """
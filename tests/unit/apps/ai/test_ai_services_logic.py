@@ -504,6 +504,123 @@ class TestAIToolServiceGetAccessibleTools:
             AIToolService._initialized = original_init
 
 
+class TestAIToolServiceCatalog:
+    """Tests for the AIToolService catalog refresh and memoized tool lists."""
+
+    @pytest.fixture
+    def tool_service(self):
+        from lys.apps.ai.modules.core.services import AIToolService
+
+        app_manager = MagicMock()
+        app_manager.settings.get_plugin_config.return_value = {
+            "executor": {"gateway_url": "http://gateway/graphql", "tools_ttl": 60},
+        }
+        AIToolService.reset()
+        with patch.object(AIToolService, "app_manager", app_manager):
+            yield AIToolService
+        AIToolService.reset()
+
+    @staticmethod
+    def _catalog(*names):
+        return {name: {"definition": {"type": "function"}, "operation_type": "query"} for name in names}
+
+    @pytest.mark.asyncio
+    async def test_catalog_reloaded_after_ttl(self, tool_service):
+        load = AsyncMock(side_effect=[self._catalog("ws_1"), self._catalog("ws_1", "ws_2")])
+
+        with patch.object(tool_service, "_load_tools_remote", load):
+            with patch("lys.apps.ai.modules.core.services.time.monotonic", return_value=100):
+                first = await tool_service.get_accessible_tools({"is_super_user": True})
+                await tool_service.get_accessible_tools({"is_super_user": True})
+            with patch("lys.apps.ai.modules.core.services.time.monotonic", return_value=161):
+                second = await tool_service.get_accessible_tools({"is_super_user": True})
+
+        assert load.await_count == 2
+        assert [t["webservice"] for t in first] == ["ws_1"]
+        assert [t["webservice"] for t in second] == ["ws_1", "ws_2"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_on_next_request(self, tool_service):
+        load = AsyncMock(side_effect=[self._catalog("ws_1"), self._catalog("ws_2")])
+
+        with patch.object(tool_service, "_load_tools_remote", load):
+            await tool_service.get_tool("ws_1")
+            tool_service.invalidate()
+            tool = await tool_service.get_tool("ws_2")
+
+        assert load.await_count == 2
+        assert tool is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_keeps_previous_catalog(self, tool_service):
+        load = AsyncMock(side_effect=[self._catalog("ws_1"), None])
+
+        with patch.object(tool_service, "_load_tools_remote", load):
+            await tool_service.get_tool("ws_1")
+            tool_service.invalidate()
+            tool = await tool_service.get_tool("ws_1")
+
+        assert load.await_count == 2
+        assert tool is not None
+
+    @pytest.mark.asyncio
+    async def test_same_permission_set_shares_the_tool_list(self, tool_service):
+        tool_service._tools = self._catalog("ws_tool", "ws_other_tool")
+        tool_service._initialized = True
+        user_1 = {"webservices": {"ws_tool": {}, "ws_login": {}}, "organizations": {}}
+        user_2 = {"webservices": {"ws_tool": {}}, "organizations": {"client-1": {"webservices": ["ws_logout"]}}}
+
+        first = await tool_service.get_accessible_tools(user_1)
+        first.append({"webservice": "confirm_action"})
+        second = await tool_service.get_accessible_tools(user_2)
+
+        assert [t["webservice"] for t in second] == ["ws_tool"]
+        assert second[0] is first[0]
+        assert len(tool_service._views) == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_lists_dropped_with_the_catalog(self, tool_service):
+        user = {"webservices": {"ws_1": {}, "ws_2": {}}}
+        load = AsyncMock(side_effect=[self._catalog("ws_1"), self._catalog("ws_1", "ws_2")])
+
+        with patch.object(tool_service, "_load_tools_remote", load):
+            before = await tool_service.get_accessible_tools(user)
+            tool_service.invalidate()
+            after = await tool_service.get_accessible_tools(user)
+
+        assert [t["webservice"] for t in before] == ["ws_1"]
+        assert [t["webservice"] for t in after] == ["ws_1", "ws_2"]
+
+    @pytest.mark.asyncio
+    async def test_tool_lists_bounded(self, tool_service):
+        tool_service._tools = self._catalog("ws_1", "ws_2", "ws_3")
+        tool_service._initialized = True
+        tool_service._views_size = 2
+
+        for name in ("ws_1", "ws_2", "ws_3"):
+            await tool_service.get_accessible_tools({"webservices": {name: {}}})
+
+        assert list(tool_service._views) == [frozenset({"ws_2"}), frozenset({"ws_3"})]
+
+    @pytest.mark.asyncio
+    async def test_change_signal_marks_catalog_stale(self, tool_service):
+        async def subscribe(channel):
+            yield {"signal": "OTHER", "params": {}}
+            yield {"signal": "AI_TOOLS_CHANGED", "params": {}}
+
+        tool_service._initialized = True
+        tool_service.app_manager.pubsub.subscribe = Mock(side_effect=subscribe)
+
+        await tool_service.on_initialize()
+        listener = tool_service._change_listener
+        await listener
+        await tool_service.on_shutdown()
+
+        tool_service.app_manager.pubsub.subscribe.assert_called_once_with("ai_tools")
+        assert tool_service._expires_at == 0
+        assert tool_service._change_listener is None
+
+
 class TestContextToolService:
     """Tests for ContextToolService register/get/execute logic."""
 
@@ -357,6 +357,14 @@ class TestParsePluginConfig:
 
         assert config.executor.verify_ssl is True
 
+    def test_parse_executor_config_local_execution(self):
+        """Test that executor local_execution defaults to True and can be disabled."""
+        enabled = parse_plugin_config({"executor": {"gateway_url": "https://gateway:8000/graphql"}})
+        disabled = parse_plugin_config({"executor": {"local_execution": False}})
+
+        assert enabled.executor.local_execution is True
+        assert disabled.executor.local_execution is False
+
     def test_parse_executor_config_empty(self):
         """Test parsing config with no executor section."""
         plugin_config = {
@@ -0,0 +1,156 @@
+"""
+Unit tests for the conversation history cache.
+"""
+from datetime import datetime, timedelta, UTC
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from lys.apps.ai.modules.conversation.history import (
+    HISTORY_CACHE_KEY_PREFIX,
+    ConversationHistory,
+    ConversationHistoryCache,
+    estimate_tokens,
+)
+
+BASE = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _row(index, role="user", content=None, **fields):
+    return SimpleNamespace(
+        id=f"m{index}",
+        role=role,
+        content=content if content is not None else f"message {index}",
+        tool_calls=fields.get("tool_calls"),
+        tool_call_id=fields.get("tool_call_id"),
+        tool_result=fields.get("tool_result"),
+        created_at=BASE + timedelta(minutes=index),
+    )
+
+
+class TestConversationHistory:
+
+    def test_extended_serializes_and_moves_cursor(self):
+        rows = [
+            _row(0),
+            _row(1, role="assistant", content="", tool_calls=[{"id": "call-1"}]),
+            _row(2, role="tool", content="", tool_call_id="call-1", tool_result={"data": 1}),
+        ]
+
+        history = ConversationHistory().extended(rows)
+
+        assert history.messages == [
+            {"role": "user", "content": "message 0"},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": "call-1"}]},
+            {"role": "tool", "content": "{'data': 1}", "tool_call_id": "call-1"},
+        ]
+        assert history.cursor == (rows[2].created_at, "m2")
+        assert history.token_estimate == sum(estimate_tokens(message) for message in history.messages)
+
+    def test_extended_leaves_the_history_untouched(self):
+        history = ConversationHistory().extended([_row(0)])
+
+        longer = history.extended([_row(1)])
+
+        assert len(history.messages) == 1
+        assert len(longer.messages) == 2
+        assert longer.token_estimate > history.token_estimate
+
+    def test_rebased_drops_messages_up_to_the_boundary(self):
+        history = ConversationHistory().extended([_row(i) for i in range(4)])
+
+        rebased = history.rebased("summary-1", "m1")
+
+        assert rebased.summary_id == "summary-1"
+        assert [message["content"] for message in rebased.messages] == ["message 2", "message 3"]
+        assert rebased.cursor == history.cursor
+        assert rebased.boundary == (BASE + timedelta(minutes=1), "m1")
+        assert rebased.token_estimate < history.token_estimate
+
+    def test_rebased_unknown_boundary_needs_a_rebuild(self):
+        history = ConversationHistory().extended([_row(0)])
+
+        assert history.rebased("summary-1", "m-older") is None
+
+    def test_json_round_trip(self):
+        history = ConversationHistory(summary_id="summary-1", boundary=(BASE, "m-boundary")).extended(
+            [_row(0), _row(1, role="assistant")]
+        )
+
+        assert ConversationHistory.from_json(history.to_json()) == history
+
+
+class TestConversationHistoryCache:
+
+    @pytest.mark.asyncio
+    async def test_entry_expires(self):
+        cache = ConversationHistoryCache(ttl_seconds=10)
+        history = ConversationHistory()
+
+        with patch("lys.apps.ai.modules.conversation.history.time.monotonic", return_value=100):
+            await cache.set("conv-1", history)
+            fresh = await cache.get("conv-1")
+        with patch("lys.apps.ai.modules.conversation.history.time.monotonic", return_value=111):
+            expired = await cache.get("conv-1")
+
+        assert fresh is history
+        assert expired is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_bounded_size_evicts_least_recently_used(self):
+        cache = ConversationHistoryCache(max_size=2)
+        await cache.set("conv-1", ConversationHistory())
+        await cache.set("conv-2", ConversationHistory())
+        await cache.get("conv-1")
+        await cache.set("conv-3", ConversationHistory())
+
+        assert await cache.get("conv-2") is None
+        assert await cache.get("conv-1") is not None
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_keeps_nothing(self):
+        cache = ConversationHistoryCache(max_size=0)
+        await cache.set("conv-1", ConversationHistory())
+
+        assert await cache.get("conv-1") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_workers(self):
+        stored = {}
+        pubsub = Mock(
+            set_key=AsyncMock(side_effect=lambda key, value, ttl_seconds: stored.update({key: value})),
+            get_key=AsyncMock(side_effect=lambda key: stored.get(key)),
+        )
+        history = ConversationHistory().extended([_row(0)])
+
+        await ConversationHistoryCache(ttl_seconds=60, redis=True).set("conv-1", history, pubsub)
+        other_worker = ConversationHistoryCache(redis=True)
+        loaded = await other_worker.get("conv-1", pubsub)
+
+        pubsub.set_key.assert_awaited_once_with(f"{HISTORY_CACHE_KEY_PREFIX}conv-1", history.to_json(), ttl_seconds=60)
+        assert loaded == history
+        assert len(other_worker) == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_off_by_default(self):
+        pubsub = Mock(set_key=AsyncMock(), get_key=AsyncMock())
+        cache = ConversationHistoryCache()
+
+        await cache.set("conv-1", ConversationHistory(), pubsub)
+        cache.clear()
+
+        assert await cache.get("conv-1", pubsub) is None
+        pubsub.set_key.assert_not_called()
+        pubsub.get_key.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_the_database(self):
+        pubsub = Mock(set_key=AsyncMock(side_effect=ConnectionError()), get_key=AsyncMock(side_effect=ConnectionError()))
+        cache = ConversationHistoryCache(redis=True)
+
+        await cache.set("conv-1", ConversationHistory(), pubsub)
+        cache.clear()
+
+        assert await cache.get("conv-1", pubsub) is None
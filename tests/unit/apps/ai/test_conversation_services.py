@@ -20,6 +20,17 @@ from lys.apps.ai.modules.conversation.consts import (
 # real SQLAlchemy entities for select() statements
 
 
+def _message_buffer(message_service, conversation_id="conv-1"):
+    """Message buffer of a turn writing through a mocked AIMessageService."""
+    from lys.apps.ai.modules.conversation.services import AIMessageBuffer
+    return AIMessageBuffer(message_service, conversation_id)
+
+
+def _saved_rows(message_service):
+    """Rows written by the message buffers of a mocked AIMessageService, in order."""
+    return [row for c in message_service.create_many.call_args_list for row in c.args[1]]
+
+
 class TestAIConversationServiceGetOrCreate:
     """Tests for get_or_create method."""
 
@@ -217,6 +228,80 @@ class TestAIMessageServiceAddToolResult:
         )
 
 
+class TestAIMessageBuffer:
+    """Tests for AIMessageBuffer."""
+
+    def test_created_at_strictly_increasing(self):
+        """Messages added within the same clock tick still get increasing created_at."""
+        from datetime import datetime, UTC
+
+        buffer = _message_buffer(AsyncMock())
+        now = datetime(2026, 1, 1, tzinfo=UTC)
+
+        with patch("lys.apps.ai.modules.conversation.services.datetime") as mock_datetime:
+            mock_datetime.now.return_value = now
+            for _ in range(3):
+                buffer.add(AIMessageRole.USER.value, content="Hi")
+
+        created_at = [row["created_at"] for row in buffer._rows]
+        assert created_at[0] == now
+        assert created_at[0] < created_at[1] < created_at[2]
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_all_rows_with_one_call(self):
+        """Rows are written in the order they were added, all with the same columns."""
+        mock_msg_service = AsyncMock()
+        mock_session = AsyncMock()
+        buffer = _message_buffer(mock_msg_service)
+
+        user_id = buffer.add(AIMessageRole.USER.value, content="Hi")
+        buffer.add(AIMessageRole.ASSISTANT.value, content="", tool_calls=[{"id": "call-1"}], provider="mistral")
+        buffer.add_tool_result("call-1", {"data": "result"})
+
+        await buffer.flush(mock_session)
+
+        mock_msg_service.create_many.assert_awaited_once()
+        assert mock_msg_service.create_many.call_args.args[0] is mock_session
+        rows = _saved_rows(mock_msg_service)
+        assert rows[0]["id"] == user_id
+        assert [row["role"] for row in rows] == [
+            AIMessageRole.USER.value, AIMessageRole.ASSISTANT.value, AIMessageRole.TOOL.value,
+        ]
+        assert rows[0]["tool_calls"] is None
+        assert rows[2]["tool_result"] == {"data": "result"}
+        assert len({frozenset(row) for row in rows}) == 1
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_empty_buffer_writes_nothing(self):
+        mock_msg_service = AsyncMock()
+
+        assert await _message_buffer(mock_msg_service).flush(AsyncMock()) == []
+        mock_msg_service.create_many.assert_not_called()
+
+    def test_discard(self):
+        buffer = _message_buffer(AsyncMock())
+        user_id = buffer.add(AIMessageRole.USER.value, content="Hi")
+
+        buffer.discard(user_id)
+
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_after_failure_logs_errors(self):
+        """The recovery flush never raises over the failure of the turn."""
+        mock_msg_service = AsyncMock()
+        mock_msg_service.create_many.side_effect = Exception("DB connection lost")
+        buffer = _message_buffer(mock_msg_service)
+        buffer.add(AIMessageRole.USER.value, content="Hi")
+
+        with patch("lys.apps.ai.modules.conversation.services.logger") as mock_logger:
+            await buffer.flush_after_failure(AsyncMock())
+
+        mock_msg_service.create_many.assert_awaited_once()
+        mock_logger.error.assert_called_once()
+
+
 class TestAIMessageFeedbackServiceRateMessage:
     """Tests for AIMessageFeedbackService.rate_message method."""
 
@@ -646,6 +731,9 @@ class TestPrepareChatContext:
         mock_conversation = MagicMock()
         mock_conversation.id = "conv-123"
         mock_message_service = AsyncMock()
+        mock_message_service.buffer = MagicMock(
+            side_effect=lambda conversation_id: _message_buffer(mock_message_service, conversation_id)
+        )
         mock_ai_service = AsyncMock()
 
         mock_app_manager = MagicMock()
@@ -691,7 +779,7 @@ class TestPrepareChatContext:
             info=mock_info,
         )
 
-        expected_keys = {"tools", "llm_tools", "executor", "conversation", "message_service", "ai_service", "messages", "info", "user_message_id"}
+        expected_keys = {"tools", "llm_tools", "executor", "conversation", "message_service", "ai_service", "messages", "info", "message_buffer", "user_message_id"}
         assert set(ctx.keys()) == expected_keys
 
     @pytest.mark.asyncio
@@ -716,12 +804,12 @@ class TestPrepareChatContext:
         assert messages[-1]["content"] == "What can you do?"
 
     @pytest.mark.asyncio
-    async def test_saves_user_message_to_db(self, connected_user, mock_session, mock_info, _setup_mocks):
-        """Test that user message is saved to DB during context preparation."""
+    async def test_buffers_user_message(self, connected_user, mock_session, mock_info, _setup_mocks):
+        """Test that the user message is buffered, not written, during context preparation."""
         from lys.apps.ai.modules.conversation.services import AIConversationService
 
         mocks = _setup_mocks
-        await AIConversationService._prepare_chat_context(
+        ctx = await AIConversationService._prepare_chat_context(
             user_id="user-123",
             content="Test message",
             session=mock_session,
@@ -729,12 +817,13 @@ class TestPrepareChatContext:
             info=mock_info,
         )
 
-        mocks["mock_message_service"].create.assert_called_once_with(
-            mock_session,
-            conversation_id="conv-123",
-            role=AIMessageRole.USER.value,
-            content="Test message",
-        )
+        mocks["mock_message_service"].create.assert_not_called()
+        await ctx["message_buffer"].flush(mock_session)
+        [row] = _saved_rows(mocks["mock_message_service"])
+        assert row["id"] == ctx["user_message_id"]
+        assert row["conversation_id"] == "conv-123"
+        assert row["role"] == AIMessageRole.USER.value
+        assert row["content"] == "Test message"
 
     @pytest.mark.asyncio
     async def test_llm_tools_extracts_definitions(self, connected_user, mock_session, mock_info, _setup_mocks):
@@ -856,6 +945,7 @@ class TestChatWithTools:
             "executor": MagicMock(),
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Hi"}],
@@ -882,6 +972,7 @@ class TestChatWithTools:
         mock_msg_service = AsyncMock()
         mock_ai_service = AsyncMock()
         mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
 
         # First call: LLM requests a tool call
         tool_call_response = self._make_ai_response(
@@ -907,6 +998,7 @@ class TestChatWithTools:
             "executor": mock_executor,
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [{"type": "function", "function": {"name": "dangerous_tool"}}],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Do it"}],
@@ -939,6 +1031,7 @@ class TestChatWithTools:
         mock_msg_service = AsyncMock()
         mock_ai_service = AsyncMock()
         mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
         mock_executor.execute = AsyncMock(return_value={"data": "result"})
 
         # Always return tool calls to force max iterations
@@ -952,6 +1045,7 @@ class TestChatWithTools:
             "executor": mock_executor,
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [{"type": "function", "function": {"name": "loop_tool"}}],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Go"}],
@@ -968,17 +1062,18 @@ class TestChatWithTools:
         assert result["tool_calls_count"] == 2
 
     @pytest.mark.asyncio
-    async def test_tool_error_db_save_failure_does_not_cascade(self, mock_session, mock_info):
-        """Test that a DB failure when saving tool error does not crash the agent loop."""
+    async def test_turn_written_with_one_insert(self, mock_session, mock_info):
+        """Test that the messages of a turn, tool errors included, are written together at its end."""
         from lys.apps.ai.modules.conversation.services import AIConversationService
 
         mock_conversation = MagicMock()
         mock_conversation.id = "conv-1"
         mock_msg_service = AsyncMock()
-        # add_tool_result raises to simulate DB failure
-        mock_msg_service.add_tool_result = AsyncMock(side_effect=Exception("DB connection lost"))
+        message_buffer = _message_buffer(mock_msg_service)
+        message_buffer.add(AIMessageRole.USER.value, content="Do it")
         mock_ai_service = AsyncMock()
         mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
 
         tool_call_response = self._make_ai_response(
             content="",
@@ -987,7 +1082,7 @@ class TestChatWithTools:
                 "function": {"name": "failing_tool", "arguments": "{}"},
             }],
         )
-        final_response = self._make_ai_response("Done despite DB error.")
+        final_response = self._make_ai_response("Done.")
 
         mock_ai_service.chat_with_purpose = AsyncMock(
             side_effect=[tool_call_response, final_response]
@@ -1000,6 +1095,7 @@ class TestChatWithTools:
             "executor": mock_executor,
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": message_buffer,
             "ai_service": mock_ai_service,
             "llm_tools": [{"type": "function", "function": {"name": "failing_tool"}}],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Do it"}],
@@ -1012,11 +1108,193 @@ class TestChatWithTools:
                 info=mock_info,
             )
 
-        # Loop should complete successfully despite DB save failure
-        assert result["content"] == "Done despite DB error."
-        assert result["conversation_id"] == "conv-1"
-        # DB save was attempted
-        mock_msg_service.add_tool_result.assert_called_once()
+        assert result["content"] == "Done."
+        mock_msg_service.create.assert_not_called()
+        mock_msg_service.add_tool_result.assert_not_called()
+        mock_msg_service.create_many.assert_awaited_once()
+        rows = _saved_rows(mock_msg_service)
+        assert [row["role"] for row in rows] == [
+            AIMessageRole.USER.value, AIMessageRole.ASSISTANT.value,
+            AIMessageRole.TOOL.value, AIMessageRole.ASSISTANT.value,
+        ]
+        assert rows[2]["tool_call_id"] == "call-1"
+        assert rows[2]["tool_result"] == {"error": "Tool 'failing_tool' failed to execute."}
+        assert rows[3]["content"] == "Done."
+        # create_many inserts rows sharing the same columns with one statement
+        assert len({frozenset(row) for row in rows}) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_turn_saves_partial_history(self, mock_session, mock_info):
+        """Test that the messages buffered before a provider failure are still written."""
+        from lys.apps.ai.modules.conversation.services import AIConversationService
+
+        mock_msg_service = AsyncMock()
+        message_buffer = _message_buffer(mock_msg_service)
+        message_buffer.add(AIMessageRole.USER.value, content="Go")
+        mock_ai_service = AsyncMock()
+        mock_ai_service.chat_with_purpose = AsyncMock(side_effect=[
+            self._make_ai_response(
+                content="", tool_calls=[{"id": "call-1", "function": {"name": "get_a", "arguments": "{}"}}]
+            ),
+            ConnectionError("Provider down"),
+        ])
+        mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
+        mock_executor.execute = AsyncMock(return_value={"data": "result"})
+
+        ctx = {
+            "executor": mock_executor,
+            "conversation": MagicMock(id="conv-1"),
+            "message_service": mock_msg_service,
+            "message_buffer": message_buffer,
+            "ai_service": mock_ai_service,
+            "llm_tools": [{"type": "function", "function": {"name": "get_a"}}],
+            "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Go"}],
+            "info": mock_info,
+        }
+
+        with patch.object(AIConversationService, "_prepare_chat_context", new_callable=AsyncMock, return_value=ctx):
+            with pytest.raises(ConnectionError):
+                await AIConversationService.chat_with_tools(
+                    user_id="user-123", content="Go", session=mock_session, info=mock_info,
+                )
+
+        assert [row["role"] for row in _saved_rows(mock_msg_service)] == [
+            AIMessageRole.USER.value, AIMessageRole.ASSISTANT.value, AIMessageRole.TOOL.value,
+        ]
+
+    @staticmethod
+    def _make_tracking_executor(read_only_tools, durations):
+        """Executor recording the start/end of each call and the highest number of calls in flight."""
+        import asyncio
+
+        executor = MagicMock()
+        executor.is_read_only = MagicMock(side_effect=lambda name: name in read_only_tools)
+        executor.events = []
+        executor.in_flight = 0
+        executor.max_in_flight = 0
+
+        async def execute(tool_name, arguments, context):
+            executor.events.append(("start", tool_name))
+            executor.in_flight += 1
+            executor.max_in_flight = max(executor.max_in_flight, executor.in_flight)
+            await asyncio.sleep(durations.get(tool_name, 0))
+            executor.in_flight -= 1
+            executor.events.append(("end", tool_name))
+            return {"tool": tool_name}
+
+        executor.execute = AsyncMock(side_effect=execute)
+        return executor
+
+    async def _run_tool_turn(self, mock_session, mock_info, executor, tool_names, max_concurrent=4):
+        from lys.apps.ai.modules.conversation.services import AIConversationService
+
+        tool_calls = [
+            {"id": f"call-{index}", "function": {"name": name, "arguments": "{}"}}
+            for index, name in enumerate(tool_names)
+        ]
+        mock_ai_service = AsyncMock()
+        mock_ai_service.chat_with_purpose = AsyncMock(side_effect=[
+            self._make_ai_response(content="", tool_calls=tool_calls),
+            self._make_ai_response("Done."),
+        ])
+        mock_msg_service = AsyncMock()
+        ctx = {
+            "executor": executor,
+            "conversation": MagicMock(id="conv-1"),
+            "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
+            "ai_service": mock_ai_service,
+            "llm_tools": [{"type": "function", "function": {"name": name}} for name in tool_names],
+            "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Go"}],
+            "info": mock_info,
+        }
+
+        with patch.object(AIConversationService, "_prepare_chat_context", new_callable=AsyncMock, return_value=ctx), \
+                patch.object(AIConversationService, "_get_max_concurrent_tool_calls", return_value=max_concurrent):
+            result = await AIConversationService.chat_with_tools(
+                user_id="user-123", content="Go", session=mock_session, info=mock_info,
+            )
+        return result, ctx["messages"], mock_msg_service
+
+    @pytest.mark.asyncio
+    async def test_read_only_tool_calls_run_concurrently(self, mock_session, mock_info):
+        """Read-only calls of a turn overlap, while results keep the order of the calls."""
+        # the first call is the slowest: completion order is the reverse of the call order
+        executor = self._make_tracking_executor(
+            {"get_a", "get_b", "get_c"}, {"get_a": 0.03, "get_b": 0.02, "get_c": 0.01}
+        )
+
+        result, messages, mock_msg_service = await self._run_tool_turn(
+            mock_session, mock_info, executor, ["get_a", "get_b", "get_c"]
+        )
+
+        assert executor.max_in_flight == 3
+        assert [r["tool_name"] for r in result["tool_results"]] == ["get_a", "get_b", "get_c"]
+        assert [m["tool_call_id"] for m in messages if m["role"] == "tool"] == ["call-0", "call-1", "call-2"]
+        saved = [row["tool_call_id"] for row in _saved_rows(mock_msg_service) if row["role"] == "tool"]
+        assert saved == ["call-0", "call-1", "call-2"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tool_calls_capped(self, mock_session, mock_info):
+        """No more than max_concurrent_tool_calls read-only calls run at once."""
+        names = ["get_a", "get_b", "get_c", "get_d"]
+        executor = self._make_tracking_executor(set(names), {name: 0.01 for name in names})
+
+        await self._run_tool_turn(mock_session, mock_info, executor, names, max_concurrent=2)
+
+        assert executor.max_in_flight == 2
+        assert executor.execute.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_mutating_tool_calls_stay_sequential(self, mock_session, mock_info):
+        """A mutation runs after the calls before it and before the calls after it."""
+        executor = self._make_tracking_executor({"get_a", "get_b"}, {"get_a": 0.01, "update_c": 0.01})
+
+        result, _, _ = await self._run_tool_turn(
+            mock_session, mock_info, executor, ["get_a", "update_c", "get_b"]
+        )
+
+        assert executor.max_in_flight == 1
+        assert executor.events == [
+            ("start", "get_a"), ("end", "get_a"),
+            ("start", "update_c"), ("end", "update_c"),
+            ("start", "get_b"), ("end", "get_b"),
+        ]
+        assert [r["tool_name"] for r in result["tool_results"]] == ["get_a", "update_c", "get_b"]
+
+    @pytest.mark.asyncio
+    async def test_failed_concurrent_call_does_not_affect_others(self, mock_session, mock_info):
+        """A read-only call raising is reported on its own, the others succeed."""
+        executor = self._make_tracking_executor({"get_a", "get_b"}, {})
+        succeed = executor.execute.side_effect
+
+        async def execute(tool_name, arguments, context):
+            if tool_name == "get_a":
+                raise Exception("boom")
+            return await succeed(tool_name, arguments, context)
+
+        executor.execute = AsyncMock(side_effect=execute)
+
+        result, _, _ = await self._run_tool_turn(mock_session, mock_info, executor, ["get_a", "get_b"])
+
+        assert [(r["tool_name"], r["success"]) for r in result["tool_results"]] == [
+            ("get_a", False), ("get_b", True)
+        ]
+
+    def test_batch_tool_calls(self):
+        """Consecutive read-only calls share a batch; other calls get one of their own."""
+        from lys.apps.ai.modules.conversation.services import AIConversationService
+
+        executor = MagicMock()
+        executor.is_read_only = MagicMock(side_effect=lambda name: name.startswith("get_"))
+        calls = [{"function": {"name": name}} for name in ["get_a", "get_b", "update_c", "navigate", "get_d"]]
+
+        batches = AIConversationService._batch_tool_calls(executor, calls)
+
+        assert [[c["function"]["name"] for c in batch] for batch in batches] == [
+            ["get_a", "get_b"], ["update_c"], ["navigate"], ["get_d"]
+        ]
 
 
 # ========== chat_with_tools_streaming ==========
@@ -1099,6 +1377,7 @@ class TestChatWithToolsStreaming:
             "executor": MagicMock(),
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Hi"}],
@@ -1121,8 +1400,8 @@ class TestChatWithToolsStreaming:
         assert len(done_events) == 1
 
         # Verify provider is dynamic, not hardcoded
-        create_call = mock_msg_service.create.call_args
-        assert create_call.kwargs.get("provider") == "mistral" or create_call[1].get("provider") == "mistral"
+        [row] = _saved_rows(mock_msg_service)
+        assert row["provider"] == "mistral"
 
     @staticmethod
     def _reasoning_ctx():
@@ -1140,6 +1419,7 @@ class TestChatWithToolsStreaming:
             "executor": MagicMock(),
             "conversation": MagicMock(id="conv-1"),
             "message_service": AsyncMock(),
+            "message_buffer": _message_buffer(AsyncMock()),
             "ai_service": mock_ai_service,
             "llm_tools": [],
             "messages": [{"role": "system", "content": "sys"}],
@@ -1164,6 +1444,67 @@ class TestChatWithToolsStreaming:
                 events.append(event)
         return events
 
+    @pytest.mark.asyncio
+    async def test_read_only_tool_calls_start_together_and_report_in_order(self, mock_session, connected_user):
+        """Every call of a concurrent batch is announced, then the results follow in call order."""
+        import asyncio
+        from lys.apps.ai.modules.conversation.services import AIConversationService
+        from lys.apps.ai.utils.providers.abstracts import AIStreamChunk
+
+        turns = iter([
+            [AIStreamChunk(tool_calls=[
+                {"index": 0, "id": "call-0", "function": {"name": "get_a", "arguments": "{}"}},
+                {"index": 1, "id": "call-1", "function": {"name": "get_b", "arguments": "{}"}},
+            ], finish_reason="tool_calls")],
+            [AIStreamChunk(content="Done.", finish_reason="stop")],
+        ])
+
+        async def fake_stream(*args, **kwargs):
+            for chunk in next(turns):
+                yield chunk
+
+        async def execute(tool_name, arguments, context):
+            await asyncio.sleep(0.02 if tool_name == "get_a" else 0)
+            return {"tool": tool_name}
+
+        executor = MagicMock()
+        executor.is_read_only = MagicMock(return_value=True)
+        executor.execute = AsyncMock(side_effect=execute)
+        mock_ai_service = MagicMock()
+        mock_ai_service.chat_stream_with_purpose = fake_stream
+        mock_msg_service = AsyncMock()
+        ctx = {
+            "executor": executor,
+            "conversation": MagicMock(id="conv-1"),
+            "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
+            "ai_service": mock_ai_service,
+            "llm_tools": [{"type": "function", "function": {"name": "get_a"}}],
+            "messages": [{"role": "system", "content": "sys"}],
+            "info": MagicMock(),
+            "user_message_id": "user-msg-1",
+        }
+
+        events = []
+        with patch.object(AIConversationService, "_prepare_chat_context", new_callable=AsyncMock, return_value=ctx), \
+                patch.object(AIConversationService, "_get_max_concurrent_tool_calls", return_value=4):
+            async for event in AIConversationService.chat_with_tools_streaming(
+                user_id="user-123", content="Hi", session=mock_session,
+                connected_user=connected_user, access_token="tok",
+            ):
+                events.append(event)
+
+        tool_events = [
+            (e.split("\n")[0], json.loads(e.split("data: ")[1])["name"])
+            for e in events if "event: tool_" in e
+        ]
+        assert tool_events == [
+            ("event: tool_start", "get_a"), ("event: tool_start", "get_b"),
+            ("event: tool_result", "get_a"), ("event: tool_result", "get_b"),
+        ]
+        saved = [row["tool_call_id"] for row in _saved_rows(mock_msg_service) if row["role"] == "tool"]
+        assert saved == ["call-0", "call-1"]
+
     @pytest.mark.asyncio
     async def test_reasoning_content_withheld_by_default(self, mock_session, connected_user):
         """The trace names internal tools: only its size may leave without an opt-in."""
@@ -1204,15 +1545,17 @@ class TestChatWithToolsStreaming:
         mock_ai_service.chat_stream_with_purpose = failing_stream
 
         mock_msg_service = AsyncMock()
+        message_buffer = _message_buffer(mock_msg_service)
         ctx = {
             "executor": MagicMock(),
             "conversation": MagicMock(id="conv-1"),
             "message_service": mock_msg_service,
+            "message_buffer": message_buffer,
             "ai_service": mock_ai_service,
             "llm_tools": [],
             "messages": [{"role": "system", "content": "sys"}],
             "info": MagicMock(),
-            "user_message_id": "user-msg-1",
+            "user_message_id": message_buffer.add(AIMessageRole.USER.value, content="Hi"),
         }
 
         events = []
@@ -1231,32 +1574,46 @@ class TestChatWithToolsStreaming:
         assert "An error occurred" in error_data["message"]
         assert "sk-secret" not in error_data["message"]
         assert "api-key" not in error_data["message"]
-        # Orphaned user message should be deleted
-        mock_msg_service.delete.assert_called_once_with("user-msg-1", mock_session)
+        # Orphaned user message should never be written
+        mock_msg_service.create_many.assert_not_called()
+        mock_msg_service.delete.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_provider_error_delete_failure_still_yields_error_event(self, mock_session, connected_user):
-        """Test that client receives error event even when orphaned message deletion fails."""
+    async def test_provider_error_after_tool_hop_saves_partial_history(self, mock_session, connected_user):
+        """Test that a provider error after a tool hop writes the turn so far and yields the error event."""
         from lys.apps.ai.modules.conversation.services import AIConversationService
+        from lys.apps.ai.utils.providers.abstracts import AIStreamChunk
 
-        async def failing_stream(*args, **kwargs):
-            raise ConnectionError("Provider down")
-            yield  # pragma: no cover
+        call_count = 0
+
+        async def fake_stream(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 2:
+                raise ConnectionError("Provider down")
+            yield AIStreamChunk(
+                tool_calls=[{"index": 0, "id": "call-1", "function": {"name": "get_a", "arguments": "{}"}}],
+                finish_reason="tool_calls",
+            )
 
         mock_ai_service = MagicMock()
-        mock_ai_service.chat_stream_with_purpose = failing_stream
+        mock_ai_service.chat_stream_with_purpose = fake_stream
+        mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
+        mock_executor.execute = AsyncMock(return_value={"data": "result"})
 
         mock_msg_service = AsyncMock()
-        mock_msg_service.delete.side_effect = Exception("DB connection lost")
+        message_buffer = _message_buffer(mock_msg_service)
         ctx = {
-            "executor": MagicMock(),
+            "executor": mock_executor,
             "conversation": MagicMock(id="conv-1"),
             "message_service": mock_msg_service,
+            "message_buffer": message_buffer,
             "ai_service": mock_ai_service,
-            "llm_tools": [],
+            "llm_tools": [{"type": "function", "function": {"name": "get_a"}}],
             "messages": [{"role": "system", "content": "sys"}],
             "info": MagicMock(),
-            "user_message_id": "user-msg-1",
+            "user_message_id": message_buffer.add(AIMessageRole.USER.value, content="Hi"),
         }
 
         events = []
@@ -1267,13 +1624,52 @@ class TestChatWithToolsStreaming:
             ):
                 events.append(event)
 
-        # Delete was attempted despite failure
-        mock_msg_service.delete.assert_called_once_with("user-msg-1", mock_session)
-        # Client still receives the error event
-        assert len(events) == 1
-        error_data = json.loads(events[0].split("data: ")[1].strip())
-        assert error_data["code"] == "PROVIDER_ERROR"
-        assert "An error occurred" in error_data["message"]
+        assert "PROVIDER_ERROR" in events[-1]
+        assert [row["role"] for row in _saved_rows(mock_msg_service)] == [
+            AIMessageRole.USER.value, AIMessageRole.ASSISTANT.value, AIMessageRole.TOOL.value,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_closed_stream_saves_partial_history(self, mock_session, connected_user):
+        """Test that a stream closed by the client mid-turn writes the messages buffered so far."""
+        from lys.apps.ai.modules.conversation.services import AIConversationService
+        from lys.apps.ai.utils.providers.abstracts import AIStreamChunk
+
+        async def fake_stream(*args, **kwargs):
+            yield AIStreamChunk(
+                tool_calls=[{"index": 0, "id": "call-1", "function": {"name": "get_a", "arguments": "{}"}}],
+                finish_reason="tool_calls",
+            )
+
+        mock_ai_service = MagicMock()
+        mock_ai_service.chat_stream_with_purpose = fake_stream
+        mock_msg_service = AsyncMock()
+        message_buffer = _message_buffer(mock_msg_service)
+        ctx = {
+            "executor": AsyncMock(is_read_only=MagicMock(return_value=False)),
+            "conversation": MagicMock(id="conv-1"),
+            "message_service": mock_msg_service,
+            "message_buffer": message_buffer,
+            "ai_service": mock_ai_service,
+            "llm_tools": [{"type": "function", "function": {"name": "get_a"}}],
+            "messages": [{"role": "system", "content": "sys"}],
+            "info": MagicMock(),
+            "user_message_id": message_buffer.add(AIMessageRole.USER.value, content="Hi"),
+        }
+
+        with patch.object(AIConversationService, "_prepare_chat_context", new_callable=AsyncMock, return_value=ctx):
+            stream = AIConversationService.chat_with_tools_streaming(
+                user_id="user-123", content="Hi", session=mock_session,
+                connected_user=connected_user, access_token="tok",
+            )
+            async for event in stream:
+                if "event: tool_start" in event:
+                    break
+            await stream.aclose()
+
+        assert [row["role"] for row in _saved_rows(mock_msg_service)] == [
+            AIMessageRole.USER.value, AIMessageRole.ASSISTANT.value,
+        ]
 
     @pytest.mark.asyncio
     async def test_tool_error_sanitized_in_stream(self, mock_session, connected_user):
@@ -1285,6 +1681,7 @@ class TestChatWithToolsStreaming:
         mock_conversation.id = "conv-1"
         mock_msg_service = AsyncMock()
         mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
         mock_executor.execute = AsyncMock(
             side_effect=Exception("DB error: host=prod-db.internal password=p@ss")
         )
@@ -1313,6 +1710,7 @@ class TestChatWithToolsStreaming:
             "executor": mock_executor,
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [{"type": "function", "function": {"name": "bad_tool"}}],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Go"}],
@@ -1339,17 +1737,16 @@ class TestChatWithToolsStreaming:
         assert "prod-db" not in error_data["result"]["error"]
 
     @pytest.mark.asyncio
-    async def test_tool_error_db_save_failure_does_not_cascade_stream(self, mock_session, connected_user):
-        """Test that a DB failure when saving tool error does not crash the streaming loop."""
+    async def test_stream_turn_written_with_one_insert(self, mock_session, connected_user):
+        """Test that the messages of a streamed turn, tool errors included, are written together at its end."""
         from lys.apps.ai.modules.conversation.services import AIConversationService
         from lys.apps.ai.utils.providers.abstracts import AIStreamChunk
 
         mock_conversation = MagicMock()
         mock_conversation.id = "conv-1"
         mock_msg_service = AsyncMock()
-        # add_tool_result raises to simulate DB failure
-        mock_msg_service.add_tool_result = AsyncMock(side_effect=Exception("DB connection lost"))
         mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
         mock_executor.execute = AsyncMock(
             side_effect=Exception("Tool execution failed")
         )
@@ -1376,6 +1773,7 @@ class TestChatWithToolsStreaming:
             "executor": mock_executor,
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [{"type": "function", "function": {"name": "bad_tool"}}],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Go"}],
@@ -1391,13 +1789,16 @@ class TestChatWithToolsStreaming:
             ):
                 events.append(event)
 
-        # Streaming should complete despite DB save failure
-        token_events = [e for e in events if "event: token" in e]
         done_events = [e for e in events if "event: done" in e]
-        assert len(token_events) >= 1
         assert len(done_events) == 1
-        # DB save was attempted
-        mock_msg_service.add_tool_result.assert_called_once()
+        mock_msg_service.add_tool_result.assert_not_called()
+        mock_msg_service.create_many.assert_awaited_once()
+        rows = _saved_rows(mock_msg_service)
+        assert [row["role"] for row in rows] == [
+            AIMessageRole.ASSISTANT.value, AIMessageRole.TOOL.value, AIMessageRole.ASSISTANT.value,
+        ]
+        assert rows[1]["tool_result"] == {"error": "Tool 'bad_tool' failed to execute."}
+        assert rows[2]["content"] == "Recovered."
 
     @pytest.mark.asyncio
     async def test_dynamic_provider_from_chunks(self, mock_session, connected_user):
@@ -1420,6 +1821,7 @@ class TestChatWithToolsStreaming:
             "executor": MagicMock(),
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Hi"}],
@@ -1435,9 +1837,9 @@ class TestChatWithToolsStreaming:
                 pass
 
         # Verify message was saved with dynamic provider, not "mistral"
-        create_call = mock_msg_service.create.call_args
-        assert create_call[1]["provider"] == "openai"
-        assert create_call[1]["model"] == "custom-model"
+        [row] = _saved_rows(mock_msg_service)
+        assert row["provider"] == "openai"
+        assert row["model"] == "custom-model"
 
     @pytest.mark.asyncio
     async def test_max_iterations_yields_error(self, mock_session, connected_user):
@@ -1449,6 +1851,7 @@ class TestChatWithToolsStreaming:
         mock_conversation.id = "conv-1"
         mock_msg_service = AsyncMock()
         mock_executor = AsyncMock()
+        mock_executor.is_read_only = MagicMock(return_value=False)
         mock_executor.execute = AsyncMock(return_value={"data": "ok"})
 
         async def tool_stream(*args, **kwargs):
@@ -1466,6 +1869,7 @@ class TestChatWithToolsStreaming:
             "executor": mock_executor,
             "conversation": mock_conversation,
             "message_service": mock_msg_service,
+            "message_buffer": _message_buffer(mock_msg_service),
             "ai_service": mock_ai_service,
             "llm_tools": [{"type": "function", "function": {"name": "loop"}}],
             "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": "Go"}],
@@ -1643,6 +2047,31 @@ class TestMaybeEnqueueCompaction:
         session.execute.assert_not_called()
         session.commit.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_without_usage_uses_history_estimate(self):
+        """Without billed usage, the running estimate of the history is the trigger metric."""
+        from lys.apps.ai.modules.conversation.history import ConversationHistory
+        from lys.apps.ai.modules.conversation.services import AIConversationService
+
+        app_manager = MagicMock()
+        app_manager.settings.get_plugin_config.return_value = {
+            "chatbot": {"compaction": {"token_threshold": 1000}}
+        }
+        session = AsyncMock()
+        conversation = MagicMock()
+        conversation.id = "c1"
+
+        with patch.object(AIConversationService, "app_manager", app_manager), \
+                patch.object(AIConversationService, "_load_current_summary", new_callable=AsyncMock,
+                             return_value=None), \
+                patch.object(AIConversationService, "_load_history", new_callable=AsyncMock,
+                             return_value=ConversationHistory(token_estimate=500)) as mock_load_history:
+            await AIConversationService.maybe_enqueue_compaction(conversation, session, None)
+
+        mock_load_history.assert_awaited_once_with(conversation, session, None, store=False)
+        session.execute.assert_not_called()
+        session.commit.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_never_raises_on_internal_error(self):
         from lys.apps.ai.modules.conversation.services import AIConversationService
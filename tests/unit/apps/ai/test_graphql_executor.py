@@ -535,6 +535,15 @@ class TestGraphQLToolExecutorExecute:
         assert result["status"] == "error"
         assert "bio" in result["message"]
 
+    def test_is_read_only(self, executor):
+        """Only the tools of query webservices are read-only."""
+        executor.add_tool("get_user", {"function": {"name": "get_user"}}, operation_type="query")
+
+        assert executor.is_read_only("get_user") is True
+        assert executor.is_read_only("update_user") is False
+        assert executor.is_read_only("navigate") is False
+        assert executor.is_read_only("unknown_tool") is False
+
 
 # ========== Special tools dispatch ==========
 
@@ -0,0 +1,243 @@
+"""
+Unit tests for LocalToolExecutor.
+
+Tests the in-process execution of tools against the app GraphQL schema and the
+fallback to the gateway for the tools of remote webservices.
+"""
+
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+import strawberry
+from strawberry.permission import BasePermission
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from lys.apps.ai.modules.core.executors.local import LocalToolContext, LocalToolExecutor
+
+
+class IsAllowed(BasePermission):
+    """Stands for the webservice permission: records the access on the context."""
+
+    message = "Access denied"
+
+    async def has_permission(self, source, info, **kwargs) -> bool:
+        context = info.context
+        context.access_type = True
+        context.webservice_name = info.field_name
+        return context.connected_user is not None or context.service_caller is not None
+
+
+@strawberry.type
+class UserType:
+    id: str
+    first_name: str
+    caller: Optional[str]
+
+
+@strawberry.type
+class Query:
+    @strawberry.field(permission_classes=[IsAllowed])
+    async def user(self, info: strawberry.Info, id: str) -> UserType:
+        await info.context.session.execute("SELECT user")
+        caller = info.context.connected_user or info.context.service_caller
+        return UserType(id=id, first_name="John", caller=caller.get("sub") or caller.get("service_name"))
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation(permission_classes=[IsAllowed])
+    async def update_user(self, info: strawberry.Info, id: str, first_name: str) -> UserType:
+        if not first_name:
+            raise ValueError("first_name is required")
+        await info.context.session.execute("UPDATE user")
+        return UserType(id=id, first_name=first_name, caller=None)
+
+
+SCHEMA = strawberry.Schema(query=Query, mutation=Mutation)
+
+
+def _tool(name, operation_name, operation_type, properties, return_fields="id first_name caller"):
+    return {
+        "definition": {
+            "type": "function",
+            "function": {
+                "name": name,
+                "parameters": {"type": "object", "properties": properties},
+            },
+            "_graphql": {
+                "operation_name": operation_name,
+                "return_fields": return_fields,
+            },
+        },
+        "operation_type": operation_type,
+    }
+
+
+def _make_executor(bearer_token="user-jwt", schema=SCHEMA):
+    app_manager = MagicMock()
+    app_manager.graphql_schema = schema
+
+    with patch("lys.apps.ai.modules.core.executors.graphql.GraphQLClient") as MockClient:
+        MockClient.return_value = AsyncMock()
+        if bearer_token:
+            executor = LocalToolExecutor(app_manager, gateway_url="http://gateway/graphql", bearer_token=bearer_token)
+        else:
+            executor = LocalToolExecutor(
+                app_manager, gateway_url="http://gateway/graphql", secret_key="secret", service_name="chatbot-api"
+            )
+
+    executor._initialized = True
+    executor._tools = {
+        "get_user": _tool("get_user", "user", "query", {"id": {"type": "string", "_graphql_type": "String!"}}),
+        "update_user": _tool("update_user", "updateUser", "mutation", {
+            "id": {"type": "string", "_graphql_type": "String!"},
+            "first_name": {"type": "string", "_graphql_type": "String!"},
+        }),
+        "list_orders": _tool("list_orders", "allOrders", "query", {}, return_fields="id"),
+    }
+    return executor
+
+
+def _make_context(connected_user=None):
+    savepoint = AsyncMock()
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.begin_nested = AsyncMock(return_value=savepoint)
+
+    caller_context = SimpleNamespace(
+        connected_user=connected_user if connected_user is not None else {"sub": "user-1"},
+        access_token="user-jwt",
+        access_type={"caller": True},
+        webservice_name="chat_with_ai",
+        request=None,
+    )
+    return {"session": session, "info": SimpleNamespace(context=caller_context)}, session, savepoint
+
+
+class TestLocalToolExecutorIsLocal:
+    """Tests for LocalToolExecutor.is_local_operation."""
+
+    def test_root_fields_of_the_schema_are_local(self):
+        executor = _make_executor()
+
+        assert executor.is_local_operation("query", "user") is True
+        assert executor.is_local_operation("mutation", "updateUser") is True
+
+    def test_unknown_or_wrong_operation_type_is_not_local(self):
+        executor = _make_executor()
+
+        assert executor.is_local_operation("query", "allOrders") is False
+        assert executor.is_local_operation("query", "updateUser") is False
+
+    def test_nothing_is_local_without_schema(self):
+        executor = _make_executor(schema=None)
+
+        assert executor.is_local_operation("query", "user") is False
+
+
+class TestLocalToolExecutorExecute:
+    """Tests for LocalToolExecutor.execute."""
+
+    @pytest.mark.asyncio
+    async def test_query_runs_in_process_with_caller_session_and_user(self):
+        executor = _make_executor()
+        context, session, _ = _make_context()
+
+        result = await executor.execute("get_user", {"id": "user-1"}, context)
+
+        assert result == {"id": "user-1", "firstName": "John", "caller": "user-1"}
+        session.execute.assert_awaited_once_with("SELECT user")
+        session.begin_nested.assert_not_called()
+        executor._client.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_caller_context_is_left_untouched(self):
+        executor = _make_executor()
+        context, _, _ = _make_context()
+
+        await executor.execute("get_user", {"id": "user-1"}, context)
+
+        caller_context = context["info"].context
+        assert caller_context.access_type == {"caller": True}
+        assert caller_context.webservice_name == "chat_with_ai"
+
+    @pytest.mark.asyncio
+    async def test_permission_still_applies(self):
+        executor = _make_executor()
+        context, session, _ = _make_context()
+        context["info"].context.connected_user = None
+
+        result = await executor.execute("get_user", {"id": "user-1"}, context)
+
+        assert result == {"status": "error", "message": "Access denied"}
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_service_auth_runs_as_calling_service(self):
+        executor = _make_executor(bearer_token=None)
+        context, _, _ = _make_context()
+
+        result = await executor.execute("get_user", {"id": "user-1"}, context)
+
+        assert result["caller"] == "chatbot-api"
+
+    @pytest.mark.asyncio
+    async def test_mutation_commits_its_savepoint(self):
+        executor = _make_executor()
+        context, session, savepoint = _make_context()
+
+        result = await executor.execute("update_user", {"id": "user-1", "first_name": "Jane"}, context)
+
+        assert result["firstName"] == "Jane"
+        session.execute.assert_awaited_once_with("UPDATE user")
+        savepoint.commit.assert_awaited_once()
+        savepoint.rollback.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_mutation_rolls_back_its_savepoint(self):
+        executor = _make_executor()
+        context, _, savepoint = _make_context()
+
+        result = await executor.execute("update_user", {"id": "user-1", "first_name": ""}, context)
+
+        assert result == {"status": "error", "message": "first_name is required"}
+        savepoint.rollback.assert_awaited_once()
+        savepoint.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_remote_operation_goes_through_gateway(self):
+        executor = _make_executor()
+        executor._client.execute.return_value = {"data": {"allOrders": [{"id": "order-1"}]}}
+        context, session, _ = _make_context()
+
+        result = await executor.execute("list_orders", {}, context)
+
+        assert result == [{"id": "order-1"}]
+        executor._client.execute.assert_awaited_once()
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_without_session_goes_through_gateway(self):
+        executor = _make_executor()
+        executor._client.execute.return_value = {"data": {"user": {"id": "user-1"}}}
+
+        result = await executor.execute("get_user", {"id": "user-1"}, {})
+
+        assert result == {"id": "user-1"}
+        executor._client.execute.assert_awaited_once()
+
+
+class TestLocalToolContext:
+    """Tests for LocalToolContext."""
+
+    def test_state_is_kept_on_the_context(self):
+        request = MagicMock()
+        context = LocalToolContext(MagicMock(), MagicMock(), request=request, connected_user={"sub": "user-1"})
+
+        context.access_type = {"owner": True}
+
+        assert context.connected_user == {"sub": "user-1"}
+        assert context.access_type == {"owner": True}
+        assert context.service_caller is None
+        assert request.state.access_type != {"owner": True}
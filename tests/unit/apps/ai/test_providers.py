@@ -27,6 +27,15 @@ from lys.apps.ai.utils.providers.exceptions import (
     AIValidationError,
 )
 from lys.apps.ai.modules.core.services import AIService
+from lys.core.managers.http import HttpClientManager
+
+
+@pytest.fixture(autouse=True)
+def http_clients():
+    """Fresh HttpClientManager per test: the httpx.AsyncClient / httpx.Client patches apply to the clients it opens."""
+    manager = HttpClientManager(MagicMock())
+    with patch("lys.apps.ai.utils.providers.abstracts.get_http_clients", return_value=manager):
+        yield manager
 
 
 class TestMistralProvider:
@@ -82,7 +91,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             response = await provider.chat(messages, config)
 
@@ -106,7 +115,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             response = await provider.chat(messages, config)
 
@@ -120,7 +129,7 @@ class TestMistralProvider:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             response = provider.chat_sync(messages, config)
 
@@ -137,7 +146,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIAuthError) as exc_info:
                 await provider.chat(messages, config)
@@ -152,7 +161,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIRateLimitError) as exc_info:
                 await provider.chat(messages, config)
@@ -167,7 +176,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIModelNotFoundError) as exc_info:
                 await provider.chat(messages, config)
@@ -182,7 +191,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIProviderError) as exc_info:
                 await provider.chat(messages, config)
@@ -195,7 +204,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.side_effect = httpx.TimeoutException("Timeout")
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AITimeoutError) as exc_info:
                 await provider.chat(messages, config)
@@ -211,7 +220,7 @@ class TestMistralProvider:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIAuthError):
                 provider.chat_sync(messages, config)
@@ -221,7 +230,7 @@ class TestMistralProvider:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.side_effect = httpx.TimeoutException("Timeout")
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AITimeoutError):
                 provider.chat_sync(messages, config)
@@ -242,7 +251,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             await provider.chat(messages, config)
 
@@ -276,7 +285,7 @@ class TestMistralProvider:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             result = await provider.chat(messages, config)
 
@@ -447,14 +456,11 @@ class TestMistralProviderChatStream:
         stream_cm = AsyncMock()
         stream_cm.__aenter__.return_value = mock_response
 
-        # AsyncClient() returns an async context manager whose __aenter__ yields an object with .stream()
+        # the shared AsyncClient of the provider, whose .stream() yields mock_response
         mock_http_client = MagicMock()
         mock_http_client.stream.return_value = stream_cm
 
-        client_cm = AsyncMock()
-        client_cm.__aenter__.return_value = mock_http_client
-
-        return client_cm, mock_http_client
+        return mock_http_client
 
     @pytest.mark.asyncio
     async def test_chat_stream_text_response(self, provider, config, messages):
@@ -465,8 +471,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = []
             async for chunk in provider.chat_stream(messages, config):
                 chunks.append(chunk)
@@ -487,8 +493,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = []
             async for chunk in provider.chat_stream(messages, config):
                 chunks.append(chunk)
@@ -509,8 +515,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
 
         assert chunks[0].reasoning == "internal trace"
@@ -526,8 +532,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
 
         assert chunks[0].usage["cache_read_tokens"] == 9
@@ -547,8 +553,8 @@ class TestMistralProviderChatStream:
                 ]},
                 {"role": "user", "content": "hi"},
             ]
-            client_cm, http_client = self._make_stream_mock(["data: [DONE]"])
-            with patch("httpx.AsyncClient", return_value=client_cm):
+            http_client = self._make_stream_mock(["data: [DONE]"])
+            with patch("httpx.AsyncClient", return_value=http_client):
                 [c async for c in provider.chat_stream(msgs, config)]
             return http_client.stream.call_args.kwargs["json"]
 
@@ -569,8 +575,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = []
             async for chunk in provider.chat_stream(messages, config):
                 chunks.append(chunk)
@@ -587,8 +593,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = []
             async for chunk in provider.chat_stream(messages, config):
                 chunks.append(chunk)
@@ -599,8 +605,8 @@ class TestMistralProviderChatStream:
     @pytest.mark.asyncio
     async def test_chat_stream_auth_error(self, provider, config, messages):
         """Test that 401 during streaming raises AIAuthError."""
-        client_cm, _ = self._make_stream_mock([], status_code=401)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock([], status_code=401)
+        with patch("httpx.AsyncClient", return_value=http_client):
             with pytest.raises(AIAuthError):
                 async for _ in provider.chat_stream(messages, config):
                     pass  # pragma: no cover
@@ -612,10 +618,7 @@ class TestMistralProviderChatStream:
         mock_http_client = MagicMock()
         mock_http_client.stream.side_effect = httpx.TimeoutException("Timeout")
 
-        client_cm = AsyncMock()
-        client_cm.__aenter__.return_value = mock_http_client
-
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        with patch("httpx.AsyncClient", return_value=mock_http_client):
             with pytest.raises(AITimeoutError):
                 async for _ in provider.chat_stream(messages, config):
                     pass  # pragma: no cover
@@ -629,8 +632,8 @@ class TestMistralProviderChatStream:
             "data: [DONE]",
         ]
 
-        client_cm, mock_http_client = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        mock_http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=mock_http_client):
             async for _ in provider.chat_stream(messages, config, tools=tools):
                 pass
 
@@ -880,7 +883,7 @@ class TestMistralProviderReasoningContent:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIValidationError):
                 await provider.chat_json(messages, config, _SampleSchema)
@@ -896,7 +899,7 @@ class TestMistralProviderReasoningContent:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             await provider.chat(messages, config)
 
@@ -918,8 +921,8 @@ class TestMistralProviderReasoningContent:
             "data: [DONE]",
         ]
 
-        client_cm, _ = TestMistralProviderChatStream._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = TestMistralProviderChatStream._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [chunk async for chunk in provider.chat_stream(messages, config)]
 
         assert len(chunks) == 3
@@ -932,8 +935,8 @@ class TestMistralProviderReasoningContent:
     async def test_chat_stream_forwards_reasoning_effort(self, provider, config, messages):
         lines = ["data: [DONE]"]
 
-        client_cm, mock_http_client = TestMistralProviderChatStream._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        mock_http_client = TestMistralProviderChatStream._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=mock_http_client):
             [chunk async for chunk in provider.chat_stream(messages, config)]
 
         payload = mock_http_client.stream.call_args[1]["json"]
@@ -1049,7 +1052,7 @@ class TestMistralProviderLogValidationFailure:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with caplog.at_level(logging.WARNING, logger="lys.apps.ai.utils.providers.mistral"):
                 with pytest.raises(AIValidationError):
@@ -1082,7 +1085,7 @@ class TestMistralProviderLogValidationFailure:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with caplog.at_level(logging.WARNING, logger="lys.apps.ai.utils.providers.mistral"):
                 result = await provider.chat_json(
@@ -1141,7 +1144,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             result = await provider.chat_json(messages, config, _SampleSchema)
 
@@ -1157,7 +1160,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             await provider.chat_json(messages, config, _SampleSchema)
 
@@ -1177,7 +1180,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIValidationError) as exc_info:
                 await provider.chat_json(messages, config, _SampleSchema)
@@ -1191,7 +1194,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIAuthError):
                 await provider.chat_json(messages, config, _SampleSchema)
@@ -1201,7 +1204,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.side_effect = httpx.TimeoutException("Timeout")
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AITimeoutError):
                 await provider.chat_json(messages, config, _SampleSchema)
@@ -1214,7 +1217,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             result = provider.chat_json_sync(messages, config, _SampleSchema)
 
@@ -1228,7 +1231,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             provider.chat_json_sync(messages, config, _SampleSchema)
 
@@ -1244,7 +1247,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIValidationError):
                 provider.chat_json_sync(messages, config, _SampleSchema)
@@ -1255,7 +1258,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AIAuthError):
                 provider.chat_json_sync(messages, config, _SampleSchema)
@@ -1264,7 +1267,7 @@ class TestMistralProviderChatJson:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.side_effect = httpx.TimeoutException("Timeout")
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             with pytest.raises(AITimeoutError):
                 provider.chat_json_sync(messages, config, _SampleSchema)
@@ -1429,7 +1432,7 @@ class TestMistralCacheKeyField:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             await provider.chat(messages, config)
             payload = mock_instance.post.call_args[1]["json"]
         assert payload["prompt_cache_key"].startswith("sys-")
@@ -1891,7 +1894,7 @@ class TestAnthropicProviderChat:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = await provider.chat(messages, config)
         assert isinstance(result, AIResponse)
         assert result.content == "Hello there"
@@ -1909,7 +1912,7 @@ class TestAnthropicProviderChat:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = await provider.chat(messages, config)
         assert result.content == "calling"
         assert result.tool_calls[0]["id"] == "tu-1"
@@ -1922,7 +1925,7 @@ class TestAnthropicProviderChat:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = provider.chat_sync(messages, config)
         assert result.content == "Sync hi"
 
@@ -1936,7 +1939,7 @@ class TestAnthropicProviderChat:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(exc):
                 await provider.chat(messages, config)
 
@@ -1945,7 +1948,7 @@ class TestAnthropicProviderChat:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.side_effect = httpx.TimeoutException("Timeout")
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AITimeoutError):
                 await provider.chat(messages, config)
 
@@ -1984,10 +1987,7 @@ class TestAnthropicProviderChatStream:
 
         mock_http_client = MagicMock()
         mock_http_client.stream.return_value = stream_cm
-
-        client_cm = AsyncMock()
-        client_cm.__aenter__.return_value = mock_http_client
-        return client_cm, mock_http_client
+        return mock_http_client
 
     @pytest.mark.asyncio
     async def test_stream_text_and_usage(self, provider, config, messages):
@@ -1998,8 +1998,8 @@ class TestAnthropicProviderChatStream:
             'data: {"type":"message_delta","delta":{"stop_reason":"end_turn"},"usage":{"output_tokens":13}}',
             'data: {"type":"message_stop"}',
         ]
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
         # message_start and message_stop forward nothing.
         assert len(chunks) == 2
@@ -2020,8 +2020,8 @@ class TestAnthropicProviderChatStream:
             'data: {"type":"message_delta","delta":{"stop_reason":"end_turn"},"usage":{"output_tokens":13}}',
             'data: {"type":"message_stop"}',
         ]
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
         assert chunks[-1].usage == {
             "prompt_tokens": 42,
@@ -2040,8 +2040,8 @@ class TestAnthropicProviderChatStream:
             'data: {"type":"message_delta","delta":{"stop_reason":"end_turn"},"usage":{"output_tokens":2}}',
             'data: {"type":"message_stop"}',
         ]
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
         # Text chunks carry no model; the final (message_delta) chunk does.
         assert chunks[-1].model == "claude-opus-4-8"
@@ -2055,8 +2055,8 @@ class TestAnthropicProviderChatStream:
             '"delta":{"type":"input_json_delta","partial_json":"{\\"a\\":1}"}}',
             'data: {"type":"content_block_stop","index":1}',
         ]
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
         assert chunks[0].tool_calls[0]["id"] == "tu-1"
         assert chunks[0].tool_calls[0]["function"]["name"] == "f"
@@ -2072,8 +2072,8 @@ class TestAnthropicProviderChatStream:
             '"content_block":{"type":"tool_use","id":"tu-1","name":"f"}}',
             'data: {"type":"content_block_stop","index":0}',
         ]
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
         assert len(chunks) == 2
         assert chunks[1].tool_calls[0]["function"]["arguments"] == "{}"
@@ -2085,16 +2085,16 @@ class TestAnthropicProviderChatStream:
             "data: {not json}",
             'data: {"type":"content_block_delta","index":0,"delta":{"type":"text_delta","text":"ok"}}',
         ]
-        client_cm, _ = self._make_stream_mock(lines)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock(lines)
+        with patch("httpx.AsyncClient", return_value=http_client):
             chunks = [c async for c in provider.chat_stream(messages, config)]
         assert len(chunks) == 1
         assert chunks[0].content == "ok"
 
     @pytest.mark.asyncio
     async def test_stream_auth_error(self, provider, config, messages):
-        client_cm, _ = self._make_stream_mock([], status_code=401)
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        http_client = self._make_stream_mock([], status_code=401)
+        with patch("httpx.AsyncClient", return_value=http_client):
             with pytest.raises(AIAuthError):
                 async for _ in provider.chat_stream(messages, config):
                     pass  # pragma: no cover
@@ -2103,9 +2103,7 @@ class TestAnthropicProviderChatStream:
     async def test_stream_timeout(self, provider, config, messages):
         mock_http_client = MagicMock()
         mock_http_client.stream.side_effect = httpx.TimeoutException("Timeout")
-        client_cm = AsyncMock()
-        client_cm.__aenter__.return_value = mock_http_client
-        with patch("httpx.AsyncClient", return_value=client_cm):
+        with patch("httpx.AsyncClient", return_value=mock_http_client):
             with pytest.raises(AITimeoutError):
                 async for _ in provider.chat_stream(messages, config):
                     pass  # pragma: no cover
@@ -2153,7 +2151,7 @@ class TestAnthropicProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = await provider.chat_json(messages, config, _SampleSchema)
         assert isinstance(result, _SampleSchema)
         assert result.name == "Alice"
@@ -2165,7 +2163,7 @@ class TestAnthropicProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             await provider.chat_json(messages, config, _SampleSchema)
             payload = mock_instance.post.call_args[1]["json"]
         assert payload["tool_choice"]["type"] == "tool"
@@ -2178,7 +2176,7 @@ class TestAnthropicProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AIValidationError):
                 await provider.chat_json(messages, config, _SampleSchema)
 
@@ -2188,7 +2186,7 @@ class TestAnthropicProviderChatJson:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AIValidationError):
                 await provider.chat_json(messages, config, _SampleSchema)
 
@@ -2197,7 +2195,7 @@ class TestAnthropicProviderChatJson:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = provider.chat_json_sync(messages, config, _SampleSchema)
         assert result.name == "Carol"
 
@@ -2323,7 +2321,7 @@ class TestAnthropicProviderChatJsonRecovery:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             return await provider.chat_json(messages, config, _SampleSchema)
 
     @pytest.mark.asyncio
@@ -2385,7 +2383,7 @@ class TestAnthropicProviderChatJsonRecovery:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = provider.chat_json_sync(messages, config, _SampleSchema)
         assert result.name == "Carol"
 
@@ -2420,7 +2418,7 @@ class TestMistralChatJsonTruncation:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AIResponseTruncatedError):
                 await provider.chat_json([{"role": "user", "content": "hi"}], config, _SampleSchema)
 
@@ -2429,7 +2427,7 @@ class TestMistralChatJsonTruncation:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AIResponseTruncatedError):
                 provider.chat_json_sync([{"role": "user", "content": "hi"}], config, _SampleSchema)
 
@@ -2438,7 +2436,7 @@ class TestMistralChatJsonTruncation:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AIValidationError) as exc_info:
                 provider.chat_json_sync([{"role": "user", "content": "hi"}], config, _SampleSchema)
         assert not isinstance(exc_info.value, AIResponseTruncatedError)
@@ -2478,7 +2476,7 @@ class TestMistralProviderOCR:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = await provider.ocr(b"%PDF-1.4", "application/pdf", config)
             payload = mock_instance.post.call_args[1]["json"]
             url = mock_instance.post.call_args[0][0]
@@ -2493,7 +2491,7 @@ class TestMistralProviderOCR:
         with patch("httpx.Client") as mock_client:
             mock_instance = MagicMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__enter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             result = provider.ocr_sync(b"data", "application/pdf", config)
         assert result == "Hello"
 
@@ -2503,7 +2501,7 @@ class TestMistralProviderOCR:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AIAuthError):
                 await provider.ocr(b"data", "application/pdf", config)
 
@@ -2512,7 +2510,7 @@ class TestMistralProviderOCR:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.side_effect = httpx.TimeoutException("Timeout")
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
             with pytest.raises(AITimeoutError):
                 await provider.ocr(b"data", "application/pdf", config)
 
@@ -8,13 +8,12 @@ Tests cover:
 - Wrong Authorization prefix
 """
 
-import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 from jwt import InvalidTokenError, ExpiredSignatureError
 
 
 class TestServiceAuthMiddleware:
-    """Test ServiceAuthMiddleware dispatch logic."""
+    """Test ServiceAuthMiddleware authentication logic."""
 
     def _make_request(self, auth_header=None):
         """Create a mock Starlette Request."""
@@ -26,11 +25,11 @@ class TestServiceAuthMiddleware:
         request.state = MagicMock()
         return request
 
-    @pytest.mark.asyncio
-    async def test_valid_service_token(self):
+    def test_valid_service_token(self):
         """Test valid service JWT sets service_caller on request.state."""
         with patch("lys.apps.base.middlewares.AppManagerCallerMixin") as mock_mixin:
             from lys.apps.base.middlewares import ServiceAuthMiddleware
+            from lys.core.utils.auth import VerifiedServiceTokenCache
 
             decoded = {"type": "service", "service_name": "test-service"}
             mock_auth_utils = MagicMock()
@@ -38,90 +37,87 @@ class TestServiceAuthMiddleware:
 
             middleware = object.__new__(ServiceAuthMiddleware)
             middleware.auth_utils = mock_auth_utils
+            middleware.verified_tokens = VerifiedServiceTokenCache()
 
             request = self._make_request("Service valid-jwt-token")
-            call_next = AsyncMock(return_value=MagicMock())
 
-            await middleware.dispatch(request, call_next)
+            middleware.authenticate(request)
 
             mock_auth_utils.decode_token.assert_called_once_with("valid-jwt-token")
             assert request.state.service_caller == decoded
-            call_next.assert_called_once_with(request)
 
-    @pytest.mark.asyncio
-    async def test_invalid_token(self):
+    def test_invalid_token(self):
         """Test invalid JWT sets service_caller to None."""
         with patch("lys.apps.base.middlewares.AppManagerCallerMixin"):
             from lys.apps.base.middlewares import ServiceAuthMiddleware
+            from lys.core.utils.auth import VerifiedServiceTokenCache
 
             mock_auth_utils = MagicMock()
             mock_auth_utils.decode_token.side_effect = InvalidTokenError("bad token")
 
             middleware = object.__new__(ServiceAuthMiddleware)
             middleware.auth_utils = mock_auth_utils
+            middleware.verified_tokens = VerifiedServiceTokenCache()
 
             request = self._make_request("Service bad-token")
-            call_next = AsyncMock(return_value=MagicMock())
 
-            await middleware.dispatch(request, call_next)
+            middleware.authenticate(request)
 
             assert request.state.service_caller is None
-            call_next.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_expired_token(self):
+    def test_expired_token(self):
         """Test expired JWT sets service_caller to None."""
         with patch("lys.apps.base.middlewares.AppManagerCallerMixin"):
             from lys.apps.base.middlewares import ServiceAuthMiddleware
+            from lys.core.utils.auth import VerifiedServiceTokenCache
 
             mock_auth_utils = MagicMock()
             mock_auth_utils.decode_token.side_effect = ExpiredSignatureError("expired")
 
             middleware = object.__new__(ServiceAuthMiddleware)
             middleware.auth_utils = mock_auth_utils
+            middleware.verified_tokens = VerifiedServiceTokenCache()
 
             request = self._make_request("Service expired-token")
-            call_next = AsyncMock(return_value=MagicMock())
 
-            await middleware.dispatch(request, call_next)
+            middleware.authenticate(request)
 
             assert request.state.service_caller is None
-            call_next.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_no_authorization_header(self):
+    def test_no_authorization_header(self):
         """Test missing Authorization header sets service_caller to None."""
         with patch("lys.apps.base.middlewares.AppManagerCallerMixin"):
             from lys.apps.base.middlewares import ServiceAuthMiddleware
+            from lys.core.utils.auth import VerifiedServiceTokenCache
 
             mock_auth_utils = MagicMock()
 
             middleware = object.__new__(ServiceAuthMiddleware)
             middleware.auth_utils = mock_auth_utils
+            middleware.verified_tokens = VerifiedServiceTokenCache()
 
             request = self._make_request()
-            call_next = AsyncMock(return_value=MagicMock())
 
-            await middleware.dispatch(request, call_next)
+            middleware.authenticate(request)
 
             mock_auth_utils.decode_token.assert_not_called()
             assert request.state.service_caller is None
 
-    @pytest.mark.asyncio
-    async def test_wrong_prefix(self):
+    def test_wrong_prefix(self):
         """Test non-Service prefix does not attempt to decode."""
         with patch("lys.apps.base.middlewares.AppManagerCallerMixin"):
             from lys.apps.base.middlewares import ServiceAuthMiddleware
+            from lys.core.utils.auth import VerifiedServiceTokenCache
 
             mock_auth_utils = MagicMock()
 
             middleware = object.__new__(ServiceAuthMiddleware)
             middleware.auth_utils = mock_auth_utils
+            middleware.verified_tokens = VerifiedServiceTokenCache()
 
             request = self._make_request("Bearer some-jwt")
-            call_next = AsyncMock(return_value=MagicMock())
 
-            await middleware.dispatch(request, call_next)
+            middleware.authenticate(request)
 
             mock_auth_utils.decode_token.assert_not_called()
             assert request.state.service_caller is None
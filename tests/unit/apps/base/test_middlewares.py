@@ -18,8 +18,8 @@ class TestServiceAuthMiddlewareInit:
         assert ServiceAuthMiddleware.AUTHORIZATION_PREFIX == "Service "
 
 
-class TestServiceAuthMiddlewareDispatch:
-    """Tests for ServiceAuthMiddleware.dispatch method."""
+class TestServiceAuthMiddlewareAuthenticate:
+    """Tests for ServiceAuthMiddleware.authenticate method."""
 
     @pytest.fixture
     def mock_app_manager(self):
@@ -36,42 +36,32 @@ class TestServiceAuthMiddlewareDispatch:
         request.state = MagicMock()
         return request
 
-    @pytest.fixture
-    def mock_call_next(self):
-        """Create mock call_next function."""
-        async def call_next(request):
-            return MagicMock(status_code=200)
-        return call_next
-
-    @pytest.mark.asyncio
-    async def test_dispatch_without_auth_header(self, mock_request, mock_call_next, mock_app_manager):
-        """Test dispatch when no Authorization header is present."""
+    def test_authenticate_without_auth_header(self, mock_request, mock_app_manager):
+        """Test authenticate when no Authorization header is present."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
 
         mock_request.headers = {}
 
         with patch.object(ServiceAuthMiddleware, 'app_manager', mock_app_manager):
             middleware = ServiceAuthMiddleware(MagicMock())
-            await middleware.dispatch(mock_request, mock_call_next)
+            middleware.authenticate(mock_request)
 
         assert mock_request.state.service_caller is None
 
-    @pytest.mark.asyncio
-    async def test_dispatch_with_non_service_auth_header(self, mock_request, mock_call_next, mock_app_manager):
-        """Test dispatch when Authorization header doesn't start with 'Service '."""
+    def test_authenticate_with_non_service_auth_header(self, mock_request, mock_app_manager):
+        """Test authenticate when Authorization header doesn't start with 'Service '."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
 
         mock_request.headers = {"Authorization": "Bearer some_token"}
 
         with patch.object(ServiceAuthMiddleware, 'app_manager', mock_app_manager):
             middleware = ServiceAuthMiddleware(MagicMock())
-            await middleware.dispatch(mock_request, mock_call_next)
+            middleware.authenticate(mock_request)
 
         assert mock_request.state.service_caller is None
 
-    @pytest.mark.asyncio
-    async def test_dispatch_with_valid_service_token(self, mock_request, mock_call_next, mock_app_manager):
-        """Test dispatch with valid service JWT token."""
+    def test_authenticate_with_valid_service_token(self, mock_request, mock_app_manager):
+        """Test authenticate with valid service JWT token."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
 
         mock_request.headers = {"Authorization": "Service valid_token_here"}
@@ -83,13 +73,12 @@ class TestServiceAuthMiddlewareDispatch:
              with patch('lys.apps.base.middlewares.ServiceAuthUtils', return_value=mock_auth_utils):
                 middleware = ServiceAuthMiddleware(MagicMock())
                 middleware.auth_utils = mock_auth_utils
-                await middleware.dispatch(mock_request, mock_call_next)
+                middleware.authenticate(mock_request)
 
         assert mock_request.state.service_caller == {"service_name": "test-service"}
 
-    @pytest.mark.asyncio
-    async def test_dispatch_with_expired_token(self, mock_request, mock_call_next, mock_app_manager):
-        """Test dispatch with expired service JWT token."""
+    def test_authenticate_with_expired_token(self, mock_request, mock_app_manager):
+        """Test authenticate with expired service JWT token."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
         from jwt import ExpiredSignatureError
 
@@ -102,13 +91,12 @@ class TestServiceAuthMiddlewareDispatch:
             with patch('lys.apps.base.middlewares.ServiceAuthUtils', return_value=mock_auth_utils):
                 middleware = ServiceAuthMiddleware(MagicMock())
                 middleware.auth_utils = mock_auth_utils
-                await middleware.dispatch(mock_request, mock_call_next)
+                middleware.authenticate(mock_request)
 
         assert mock_request.state.service_caller is None
 
-    @pytest.mark.asyncio
-    async def test_dispatch_with_invalid_token(self, mock_request, mock_call_next, mock_app_manager):
-        """Test dispatch with invalid service JWT token."""
+    def test_authenticate_with_invalid_token(self, mock_request, mock_app_manager):
+        """Test authenticate with invalid service JWT token."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
         from jwt import InvalidTokenError
 
@@ -121,13 +109,12 @@ class TestServiceAuthMiddlewareDispatch:
             with patch('lys.apps.base.middlewares.ServiceAuthUtils', return_value=mock_auth_utils):
                 middleware = ServiceAuthMiddleware(MagicMock())
                 middleware.auth_utils = mock_auth_utils
-                await middleware.dispatch(mock_request, mock_call_next)
+                middleware.authenticate(mock_request)
 
         assert mock_request.state.service_caller is None
 
-    @pytest.mark.asyncio
-    async def test_dispatch_with_unexpected_error(self, mock_request, mock_call_next, mock_app_manager):
-        """Test dispatch with unexpected error during token validation."""
+    def test_authenticate_with_unexpected_error(self, mock_request, mock_app_manager):
+        """Test authenticate with unexpected error during token validation."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
 
         mock_request.headers = {"Authorization": "Service some_token"}
@@ -139,30 +126,99 @@ class TestServiceAuthMiddlewareDispatch:
             with patch('lys.apps.base.middlewares.ServiceAuthUtils', return_value=mock_auth_utils):
                 middleware = ServiceAuthMiddleware(MagicMock())
                 middleware.auth_utils = mock_auth_utils
-                await middleware.dispatch(mock_request, mock_call_next)
+                middleware.authenticate(mock_request)
 
         assert mock_request.state.service_caller is None
 
-    @pytest.mark.asyncio
-    async def test_dispatch_calls_next_middleware(self, mock_request, mock_app_manager):
-        """Test that dispatch calls call_next."""
+    def test_repeated_token_verified_once(self, mock_request, mock_app_manager):
+        """Test that a token seen again before its exp is served from the verified-token cache."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
+        from lys.core.utils.auth import ServiceAuthUtils
 
-        mock_request.headers = {}
-        call_next_called = False
-        expected_response = MagicMock(status_code=200)
+        token = ServiceAuthUtils("test_secret_key").generate_token("test-service")
+        mock_request.headers = {"Authorization": f"Service {token}"}
+
+        with patch.object(ServiceAuthMiddleware, 'app_manager', mock_app_manager):
+            middleware = ServiceAuthMiddleware(MagicMock())
+
+        with patch.object(middleware.auth_utils, 'decode_token', wraps=middleware.auth_utils.decode_token) as decode:
+            first = middleware.authenticate(mock_request)
+            first["service_name"] = "changed by a handler"
+            second = middleware.authenticate(mock_request)
+
+        decode.assert_called_once_with(token)
+        assert second["service_name"] == "test-service"
+
+    def test_invalid_token_not_cached(self, mock_request, mock_app_manager):
+        """Test that a rejected token is verified again on every request."""
+        from lys.apps.base.middlewares import ServiceAuthMiddleware
+        from lys.core.utils.auth import ServiceAuthUtils
 
-        async def mock_call_next(request):
-            nonlocal call_next_called
-            call_next_called = True
-            return expected_response
+        token = ServiceAuthUtils("another_secret").generate_token("test-service")
+        mock_request.headers = {"Authorization": f"Service {token}"}
 
         with patch.object(ServiceAuthMiddleware, 'app_manager', mock_app_manager):
             middleware = ServiceAuthMiddleware(MagicMock())
-            response = await middleware.dispatch(mock_request, mock_call_next)
 
-        assert call_next_called is True
-        assert response is expected_response
+        assert middleware.authenticate(mock_request) is None
+        assert middleware.authenticate(mock_request) is None
+        assert len(middleware.verified_tokens) == 0
+
+
+class TestServiceAuthMiddlewareCall:
+    """Tests for ServiceAuthMiddleware as an ASGI application."""
+
+    @pytest.fixture
+    def mock_app_manager(self):
+        """Create mock app manager."""
+        app_manager = MagicMock()
+        app_manager.settings.secret_key = "test_secret_key"
+        return app_manager
+
+    @pytest.mark.asyncio
+    async def test_call_injects_service_caller_and_calls_app(self, mock_app_manager):
+        """Test that the wrapped app runs with service_caller in the scope state."""
+        from lys.apps.base.middlewares import ServiceAuthMiddleware
+        from starlette.requests import Request
+
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen["service_caller"] = Request(scope).state.service_caller
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(b"authorization", b"Service valid_token")],
+        }
+        mock_auth_utils = MagicMock()
+        mock_auth_utils.decode_token.return_value = {"service_name": "test-service"}
+
+        with patch.object(ServiceAuthMiddleware, 'app_manager', mock_app_manager):
+            middleware = ServiceAuthMiddleware(app)
+            middleware.auth_utils = mock_auth_utils
+            await middleware(scope, AsyncMock(), AsyncMock())
+
+        assert seen["service_caller"] == {"service_name": "test-service"}
+        mock_auth_utils.decode_token.assert_called_once_with("valid_token")
+
+    @pytest.mark.asyncio
+    async def test_call_passes_through_non_http_scopes(self, mock_app_manager):
+        """Test that lifespan and websocket scopes reach the app untouched."""
+        from lys.apps.base.middlewares import ServiceAuthMiddleware
+
+        app = AsyncMock()
+        scope = {"type": "lifespan"}
+
+        with patch.object(ServiceAuthMiddleware, 'app_manager', mock_app_manager):
+            middleware = ServiceAuthMiddleware(app)
+            middleware.auth_utils = MagicMock()
+            await middleware(scope, "receive", "send")
+
+        app.assert_awaited_once_with(scope, "receive", "send")
+        middleware.auth_utils.decode_token.assert_not_called()
+        assert "state" not in scope
 
 
 class TestServiceAuthMiddlewareInterface:
@@ -175,9 +231,10 @@ class TestServiceAuthMiddlewareInterface:
 
         assert issubclass(ServiceAuthMiddleware, MiddlewareInterface)
 
-    def test_inherits_base_http_middleware(self):
-        """Test that ServiceAuthMiddleware inherits from BaseHTTPMiddleware."""
+    def test_is_pure_asgi_middleware(self):
+        """Test that ServiceAuthMiddleware is a plain ASGI app, not a BaseHTTPMiddleware."""
         from lys.apps.base.middlewares import ServiceAuthMiddleware
         from starlette.middleware.base import BaseHTTPMiddleware
 
-        assert issubclass(ServiceAuthMiddleware, BaseHTTPMiddleware)
+        assert not issubclass(ServiceAuthMiddleware, BaseHTTPMiddleware)
+        assert callable(ServiceAuthMiddleware.__call__)
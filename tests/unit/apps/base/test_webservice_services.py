@@ -4,8 +4,11 @@ Unit tests for webservice services.
 Tests WebserviceService methods with mocked dependencies.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
+from sqlalchemy.orm import Session
 
 
 class TestWebserviceServiceAccessibleWebservices:
@@ -91,6 +94,8 @@ class TestWebserviceServiceRegisterWebservices:
         session.get = AsyncMock()
         session.add = MagicMock()
         session.flush = AsyncMock()
+        # Unbound session: receives the commit listeners
+        session.sync_session = Session()
         return session
 
     @pytest.fixture
@@ -159,6 +164,182 @@ class TestWebserviceServiceRegisterWebservices:
         assert existing_ws.app_name == "test_app"
         mock_session.flush.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_register_ai_tool_publishes_catalog_change_after_commit(
+            self, mock_session, mock_app_manager, mock_webservice_config
+    ):
+        """Test that registering an AI tool publishes the catalog change once committed."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        mock_webservice_config.attributes.ai_tool = {"type": "function"}
+        mock_session.get.side_effect = [MagicMock(), None]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                # The service leaves the commit to the request
+                mock_session.commit.assert_not_called()
+                mock_app_manager.pubsub.publish.assert_not_called()
+
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_awaited_once_with("ai_tools", "AI_TOOLS_CHANGED", {})
+
+    @pytest.mark.asyncio
+    async def test_register_ai_tool_rolled_back_publishes_nothing(
+            self, mock_session, mock_app_manager, mock_webservice_config
+    ):
+        """Test that a rolled back AI tool registration is not published."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        mock_webservice_config.attributes.ai_tool = {"type": "function"}
+        mock_session.get.side_effect = [MagicMock(), None]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                mock_session.sync_session.begin()
+                mock_session.sync_session.rollback()
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_register_unchanged_ai_tool_publishes_nothing(
+            self, mock_session, mock_app_manager, mock_webservice_config
+    ):
+        """Test that registering the same AI tool again leaves the catalog alone."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        mock_webservice_config.attributes.ai_tool = {"type": "function"}
+        existing_ws = MagicMock(ai_tool={"type": "function"}, operation_type="READ")
+        mock_session.get.side_effect = [MagicMock(), existing_ws]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_register_ai_tool_operation_type_change_publishes_catalog_change(
+            self, mock_session, mock_app_manager, mock_webservice_config
+    ):
+        """Test that an AI tool turned from query to mutation publishes the catalog change."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        mock_webservice_config.attributes.ai_tool = {"type": "function"}
+        mock_webservice_config.attributes.operation_type = "CREATE"
+        existing_ws = MagicMock(ai_tool={"type": "function"}, operation_type="READ")
+        mock_session.get.side_effect = [MagicMock(), existing_ws]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_awaited_once_with("ai_tools", "AI_TOOLS_CHANGED", {})
+
+    @pytest.mark.asyncio
+    async def test_register_operation_type_change_without_ai_tool_publishes_nothing(
+            self, mock_session, mock_app_manager, mock_webservice_config
+    ):
+        """Test that the operation type of a webservice without AI tool leaves the catalog alone."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        mock_webservice_config.attributes.operation_type = "CREATE"
+        existing_ws = MagicMock(ai_tool=None, operation_type="READ")
+        mock_webservice_config.attributes.ai_tool = None
+        mock_session.get.side_effect = [MagicMock(), existing_ws]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_register_removed_ai_tool_publishes_catalog_change(
+            self, mock_session, mock_app_manager, mock_webservice_config
+    ):
+        """Test that removing an AI tool from a webservice publishes the catalog change."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        existing_ws = MagicMock(ai_tool={"type": "function"})
+        mock_session.get.side_effect = [MagicMock(), existing_ws]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_awaited_once_with("ai_tools", "AI_TOOLS_CHANGED", {})
+
+    @pytest.mark.asyncio
+    async def test_register_without_ai_tool_publishes_nothing(self, mock_session, mock_app_manager, mock_webservice_config):
+        """Test that registering webservices without AI tools leaves the catalog alone."""
+        from lys.apps.base.modules.webservice.services import WebserviceService
+
+        mock_session.get.side_effect = [MagicMock(), None]
+        mock_app_manager.pubsub.publish = AsyncMock()
+
+        with patch.object(WebserviceService, 'app_manager', mock_app_manager):
+            with patch.object(WebserviceService, 'entity_class', MagicMock()):
+                await WebserviceService.register_webservices(
+                    [mock_webservice_config],
+                    "test_app",
+                    mock_session
+                )
+
+                mock_session.sync_session.commit()
+                await asyncio.sleep(0)
+
+        mock_app_manager.pubsub.publish.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_register_webservices_returns_count(self, mock_session, mock_app_manager):
         """Test that method returns count of registered webservices."""
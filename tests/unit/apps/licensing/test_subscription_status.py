@@ -0,0 +1,198 @@
+"""
+Unit tests for the provider subscription status cache.
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from lys.apps.licensing.modules.subscription.status import (
+    SUBSCRIPTION_STATUS_CHANGED,
+    SUBSCRIPTION_STATUS_CHANNEL,
+    ProviderStatusCache,
+)
+
+
+class TestProviderStatusCache:
+
+    def test_fresh_then_stale_then_dropped(self):
+        cache = ProviderStatusCache(ttl_seconds=10, stale_seconds=60)
+
+        with patch("lys.apps.licensing.modules.subscription.status.time.monotonic", return_value=100):
+            cache.set("sub-1", "active")
+            fresh = cache.get("sub-1")
+        with patch("lys.apps.licensing.modules.subscription.status.time.monotonic", return_value=120):
+            stale = cache.get("sub-1")
+        with patch("lys.apps.licensing.modules.subscription.status.time.monotonic", return_value=160):
+            dropped = cache.get("sub-1")
+
+        assert (fresh, stale, dropped) == (("active", True), ("active", False), None)
+        assert len(cache) == 0
+
+    def test_bounded_size_evicts_least_recently_used(self):
+        cache = ProviderStatusCache(max_size=2)
+        cache.set("sub-1", "active")
+        cache.set("sub-2", "active")
+        cache.get("sub-1")
+        cache.set("sub-3", "suspended")
+
+        assert cache.get("sub-2") is None
+        assert cache.get("sub-1") == ("active", True)
+
+    def test_disabled_cache_keeps_nothing(self):
+        cache = ProviderStatusCache(max_size=0)
+        cache.set("sub-1", "active")
+        assert cache.get("sub-1") is None
+
+    @pytest.mark.asyncio
+    async def test_publish_records_and_broadcasts(self):
+        cache = ProviderStatusCache()
+        pubsub = Mock(publish=AsyncMock())
+
+        await cache.publish("sub-1", "suspended", pubsub)
+
+        assert cache.get("sub-1") == ("suspended", True)
+        pubsub.publish.assert_awaited_once_with(
+            SUBSCRIPTION_STATUS_CHANNEL, SUBSCRIPTION_STATUS_CHANGED,
+            {"subscription_id": "sub-1", "status": "suspended"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_keeps_local_status(self):
+        cache = ProviderStatusCache()
+        pubsub = Mock(publish=AsyncMock(side_effect=ConnectionError("down")))
+
+        await cache.publish("sub-1", "canceled", pubsub)
+
+        assert cache.get("sub-1") == ("canceled", True)
+
+    @pytest.mark.asyncio
+    async def test_listen_applies_changes_of_other_workers(self):
+        cache = ProviderStatusCache()
+        cache.set("sub-2", "active")
+
+        async def subscribe(channel):
+            yield {"signal": SUBSCRIPTION_STATUS_CHANGED, "params": {"subscription_id": "sub-1", "status": "suspended"}}
+            yield {"signal": SUBSCRIPTION_STATUS_CHANGED, "params": {"subscription_id": "sub-2", "status": None}}
+            yield {"signal": "OTHER", "params": {"subscription_id": "sub-3", "status": "active"}}
+
+        await cache.listen(Mock(subscribe=subscribe))
+
+        assert cache.get("sub-1") == ("suspended", True)
+        assert cache.get("sub-2") is None
+        assert cache.get("sub-3") is None
+
+
+class TestLicensingAuthServiceProviderStatuses:
+    """Tests for LicensingAuthService._get_provider_statuses() with a fake provider."""
+
+    @pytest.fixture
+    def provider(self):
+        from lys.apps.licensing.modules.auth.services import LicensingAuthService
+
+        calls = []
+
+        async def verify(customer_id, subscription_id):
+            calls.append(subscription_id)
+            await asyncio.sleep(0.05)
+            return f"status-of-{subscription_id}"
+
+        cache = ProviderStatusCache()
+        with patch("lys.apps.licensing.modules.auth.services.provider_status_cache", cache), \
+                patch.object(LicensingAuthService, "_verify_subscription_status", side_effect=verify):
+            yield LicensingAuthService, cache, calls
+
+    @pytest.mark.asyncio
+    async def test_missing_statuses_fetched_concurrently_and_cached(self, provider):
+        service, cache, calls = provider
+        pairs = {(f"cust-{i}", f"sub-{i}") for i in range(10)}
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        statuses = await service._get_provider_statuses(pairs)
+        elapsed = loop.time() - started
+
+        assert statuses == {f"sub-{i}": f"status-of-sub-{i}" for i in range(10)}
+        # ten provider calls of 50 ms each, run together
+        assert elapsed < 0.3
+        assert cache.get("sub-3") == ("status-of-sub-3", True)
+
+        calls.clear()
+        assert await service._get_provider_statuses(pairs) == statuses
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_webhook_status_served_without_provider_call(self, provider):
+        service, cache, calls = provider
+        cache.set("sub-1", "suspended")
+
+        assert await service._get_provider_statuses([("cust-1", "sub-1")]) == {"sub-1": "suspended"}
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_stale_status_served_and_refreshed_in_background(self, provider):
+        service, cache, calls = provider
+        cache.ttl_seconds = 0
+        cache.set("sub-1", "active")
+
+        assert await service._get_provider_statuses([("cust-1", "sub-1")]) == {"sub-1": "active"}
+        await asyncio.gather(*service._status_refreshes.values())
+
+        assert calls == ["sub-1"]
+        assert cache.get("sub-1") == ("status-of-sub-1", False)
+        assert service._status_refreshes == {}
+
+
+    @pytest.mark.asyncio
+    async def test_provider_error_fails_open_without_caching(self, provider):
+        service, cache, calls = provider
+
+        with patch.object(service, "_verify_subscription_status", AsyncMock(return_value=None)):
+            statuses = await service._get_provider_statuses([("cust-1", "sub-1")])
+
+        assert statuses == {"sub-1": "active"}
+        assert cache.get("sub-1") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_cached_status(self, provider):
+        service, cache, calls = provider
+        cache.ttl_seconds = 0
+        cache.set("sub-1", "canceled")
+
+        with patch.object(service, "_verify_subscription_status", AsyncMock(return_value=None)):
+            statuses = await service._get_provider_statuses([("cust-1", "sub-1")])
+            await asyncio.gather(*service._status_refreshes.values())
+
+        assert statuses == {"sub-1": "canceled"}
+        assert cache.get("sub-1") == ("canceled", False)
+
+
+class TestMollieWebhookRecordsStatus:
+    """Tests for the status recording of MollieWebhookService."""
+
+    @pytest.mark.asyncio
+    async def test_subscription_webhook_records_status(self):
+        from lys.apps.licensing.modules.mollie.services import MollieWebhookService
+
+        cache = ProviderStatusCache()
+        mollie_sub = Mock(id="sub-1", status="suspended")
+
+        with patch("lys.apps.licensing.modules.mollie.services.provider_status_cache", cache), \
+                patch.object(MollieWebhookService, "app_manager", Mock(pubsub=None), create=True):
+            await MollieWebhookService._handle_subscription(mollie_sub, AsyncMock())
+
+        assert cache.get("sub-1") == ("suspended", True)
+
+    @pytest.mark.asyncio
+    async def test_subscription_payment_webhook_drops_status(self):
+        from lys.apps.licensing.modules.mollie.services import MollieWebhookService
+
+        cache = ProviderStatusCache()
+        cache.set("sub-1", "active")
+        payment = Mock(id="tr_1", status="open", subscription_id="sub-1")
+
+        with patch("lys.apps.licensing.modules.mollie.services.provider_status_cache", cache), \
+                patch.object(MollieWebhookService, "app_manager", Mock(pubsub=None), create=True):
+            await MollieWebhookService._handle_payment(payment, AsyncMock())
+
+        assert cache.get("sub-1") is None
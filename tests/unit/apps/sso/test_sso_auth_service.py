@@ -12,7 +12,7 @@ Tests cover:
 - handle_login returns error URL when link not found
 - handle_link creates SSO link
 
-Test approach: Unit (mocked Redis via PubSub, mocked httpx, mocked app_manager)
+Test approach: Unit (mocked Redis via PubSub, mocked HTTP clients, mocked app_manager)
 """
 
 import json
@@ -31,6 +31,7 @@ from lys.apps.sso.errors import (
 )
 from lys.apps.sso.modules.auth.services import SSOAuthService
 from lys.core.errors import LysError
+from lys.core.managers.http import HttpClientManager
 
 from tests.mocks.utils import configure_classes_for_testing
 from tests.mocks.app_manager import MockAppManager
@@ -129,7 +130,7 @@ class TestGenerateAuthorizeUrl:
             "authorization_endpoint": "https://login.microsoftonline.com/authorize",
         }
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth:
 
             # Mock discovery response (httpx Response.json() is sync)
@@ -138,8 +139,6 @@ class TestGenerateAuthorizeUrl:
             mock_resp.raise_for_status = MagicMock()
             mock_client_instance = AsyncMock()
             mock_client_instance.get = AsyncMock(return_value=mock_resp)
-            mock_client_instance.__aenter__ = AsyncMock(return_value=mock_client_instance)
-            mock_client_instance.__aexit__ = AsyncMock(return_value=False)
             mock_httpx.return_value = mock_client_instance
 
             # Mock OAuth2 client
@@ -421,7 +420,7 @@ def _mock_oidc_flow(
     mock_jwks_resp.json.return_value = {"keys": []}
     mock_jwks_resp.raise_for_status = MagicMock()
 
-    # httpx.AsyncClient used as context manager - called twice (discovery, JWKS)
+    # shared "sso" httpx.AsyncClient - called twice (discovery, JWKS)
     call_count = {"n": 0}
     responses = [mock_discovery_resp, mock_jwks_resp]
 
@@ -433,8 +432,6 @@ def _mock_oidc_flow(
         return resp
 
     mock_http_instance.get = AsyncMock(side_effect=get_side_effect)
-    mock_http_instance.__aenter__ = AsyncMock(return_value=mock_http_instance)
-    mock_http_instance.__aexit__ = AsyncMock(return_value=False)
     mock_httpx.return_value = mock_http_instance
 
     # Mock AsyncOAuth2Client for token exchange
@@ -476,7 +473,7 @@ class TestHandleCallbackOIDCFlow:
         """Successful OIDC flow: state valid, token exchanged, claims extracted."""
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -502,7 +499,7 @@ class TestHandleCallbackOIDCFlow:
         """No id_token in provider response raises SSO_CALLBACK_ERROR."""
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -526,7 +523,7 @@ class TestHandleCallbackOIDCFlow:
         """Discovery without jwks_uri raises SSO_CALLBACK_ERROR."""
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -558,7 +555,7 @@ class TestHandleCallbackOIDCFlow:
 
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -580,7 +577,7 @@ class TestHandleCallbackOIDCFlow:
         """Token nonce not matching expected nonce raises SSO_INVALID_TOKEN."""
         _mock_valid_state(mock_pubsub, nonce="expected-nonce")
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -600,7 +597,7 @@ class TestHandleCallbackOIDCFlow:
         """No email in claims raises SSO_MISSING_EMAIL."""
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -620,7 +617,7 @@ class TestHandleCallbackOIDCFlow:
         """When email is empty, preferred_username is used as fallback."""
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -640,7 +637,7 @@ class TestHandleCallbackOIDCFlow:
         """Microsoft 'oid' claim is preferred over 'sub' for external_user_id."""
         _mock_valid_state(mock_pubsub)
 
-        with patch("lys.apps.sso.modules.auth.services.httpx.AsyncClient") as mock_httpx, \
+        with patch.object(HttpClientManager, "get_async") as mock_httpx, \
              patch("lys.apps.sso.modules.auth.services.AsyncOAuth2Client") as mock_oauth, \
              patch("lys.apps.sso.modules.auth.services.JsonWebKey") as mock_jwk, \
              patch("lys.apps.sso.modules.auth.services.authlib_jwt") as mock_jwt:
@@ -0,0 +1,187 @@
+"""
+Unit tests for the compact encoding of the webservice claims.
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import JSON, Column, Integer, MetaData, Table, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from lys.apps.user_auth.modules.auth.claims import (
+    CATALOG_CLAIM,
+    SETS_CLAIM,
+    WEBSERVICE_CATALOG_KEY_PREFIX,
+    WebserviceAccess,
+    WebserviceCatalog,
+    WebserviceCatalogs,
+    WebserviceSet,
+    decode_claims,
+    encode_claims,
+    get_claims_webservice_names,
+)
+from lys.core.middlewares import ErrorManagerMiddleware, _MiddlewareLysError
+
+
+class _FakePubSub:
+    def __init__(self):
+        self.store = {}
+
+    async def set_key(self, key, value, ttl_seconds=None):
+        self.store[key] = value
+        return True
+
+    async def get_key(self, key):
+        return self.store.get(key)
+
+
+def _owner_claims(client_count, extra_webservice_count=0):
+    org_webservices = ["create_project", "list_projects", "manage_billing"]
+    org_webservices += [f"organization_webservice_{i}" for i in range(extra_webservice_count)]
+    return {
+        "sub": "user-1",
+        "is_super_user": False,
+        "webservices": {"me": "full", "logout": "full", "user": "owner"},
+        "organizations": {
+            f"client-{i}": {"level": "client", "webservices": org_webservices} for i in range(client_count)
+        },
+    }
+
+
+class TestWebserviceCatalog:
+
+    def test_version_depends_on_names_only(self):
+        assert WebserviceCatalog(["b", "a"]).version == WebserviceCatalog(["a", "b", "a"]).version
+        assert WebserviceCatalog(["a"]).version != WebserviceCatalog(["a", "b"]).version
+
+    def test_set_membership(self):
+        catalog = WebserviceCatalog(["a", "b", "c", "d"])
+        webservices = WebserviceSet(catalog, catalog.mask(["b", "d"]))
+
+        assert "b" in webservices
+        assert "a" not in webservices
+        assert "unknown" not in webservices
+        assert set(webservices) == {"b", "d"}
+        assert len(webservices) == 2
+
+    def test_access_mapping(self):
+        catalog = WebserviceCatalog(["a", "b", "c"])
+        access = WebserviceAccess({
+            "full": WebserviceSet(catalog, catalog.mask(["a"])),
+            "owner": WebserviceSet(catalog, catalog.mask(["c"])),
+        })
+
+        assert access == {"a": "full", "c": "owner"}
+        assert access.get("c") == "owner"
+        assert access.get("b") is None
+        assert set(access.keys()) == {"a", "c"}
+
+
+class TestClaimsEncoding:
+
+    def test_roundtrip(self):
+        claims = _owner_claims(2)
+        catalog = WebserviceCatalog(get_claims_webservice_names(claims))
+
+        decoded = decode_claims(json.loads(json.dumps(encode_claims(claims, catalog))), catalog)
+
+        assert decoded["sub"] == "user-1"
+        assert decoded["webservices"] == claims["webservices"]
+        assert set(decoded["organizations"]["client-1"]["webservices"]) == {
+            "create_project", "list_projects", "manage_billing"
+        }
+        assert decoded["organizations"]["client-1"]["level"] == "client"
+        assert CATALOG_CLAIM not in decoded and SETS_CLAIM not in decoded
+
+    def test_distinct_sets_stored_once(self):
+        claims = _owner_claims(40)
+        catalog = WebserviceCatalog(get_claims_webservice_names(claims))
+
+        encoded = encode_claims(claims, catalog)
+        decoded = decode_claims(encoded, catalog)
+
+        # full, owner and the organization set
+        assert len(encoded[SETS_CLAIM]) == 3
+        organization_sets = {id(org["webservices"]) for org in decoded["organizations"].values()}
+        assert len(organization_sets) == 1
+
+    def test_size_does_not_scale_with_webservices_per_client(self):
+        def encoded_size(claims):
+            catalog = WebserviceCatalog(get_claims_webservice_names(claims))
+            return len(json.dumps(encode_claims(claims, catalog)))
+
+        def growth(client_count):
+            return encoded_size(_owner_claims(client_count, 50)) - encoded_size(_owner_claims(client_count))
+
+        # 50 more webservices per client only widen the shared bitsets
+        assert growth(40) == growth(1)
+        assert growth(40) < 50
+
+
+class TestWebserviceCatalogs:
+
+    def test_catalog_grows_for_unknown_names(self):
+        catalogs = WebserviceCatalogs()
+        catalogs.seed(["a", "b"])
+        seeded = catalogs.for_names(["a"])
+
+        extended = catalogs.for_names(["a", "z"])
+
+        assert extended is not seeded
+        assert extended.names == ("a", "b", "z")
+        assert catalogs.for_names(["b"]) is extended
+
+    @pytest.mark.asyncio
+    async def test_other_process_reads_catalog_from_redis(self):
+        pubsub = _FakePubSub()
+        writer = WebserviceCatalogs()
+        catalog = writer.for_names(["a", "b"])
+        await writer.persist(catalog, pubsub)
+
+        reader = WebserviceCatalogs()
+        loaded = await reader.get(catalog.version, pubsub)
+
+        assert f"{WEBSERVICE_CATALOG_KEY_PREFIX}{catalog.version}" in pubsub.store
+        assert loaded.names == catalog.names
+        assert await reader.get("unknown", pubsub) is None
+
+
+class TestClaimsInErrorLog:
+
+    @pytest.mark.asyncio
+    async def test_error_context_with_decoded_claims_is_saved(self):
+        """The log context holding decoded claims goes through a JSON column."""
+        claims = _owner_claims(2)
+        catalog = WebserviceCatalog(get_claims_webservice_names(claims))
+        decoded = decode_claims(json.loads(json.dumps(encode_claims(claims, catalog))), catalog)
+        request = SimpleNamespace(state=SimpleNamespace(connected_user=decoded, webservice_name="me"))
+
+        context = await ErrorManagerMiddleware(MagicMock())._get_context_from_request(request)
+
+        logs = Table("log", MetaData(), Column("id", Integer, primary_key=True), Column("context", JSON))
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(logs.metadata.create_all)
+
+            async def create(session, **fields):
+                async with engine.begin() as connection:
+                    await connection.execute(insert(logs).values(context=fields["context"]))
+
+            app_manager = MagicMock()
+            app_manager.registry.services.get.return_value = MagicMock(create=create)
+            error = _MiddlewareLysError(500, "INTERNAL_ERROR", "boom", "file.py", 1, "traceback")
+            with patch.object(_MiddlewareLysError, "app_manager", app_manager):
+                await error.save_error_in_database(context)
+
+            async with engine.connect() as connection:
+                saved = (await connection.execute(select(logs.c.context))).scalar_one()
+        finally:
+            await engine.dispose()
+
+        assert saved["webservice_name"] == "me"
+        assert saved["connected_user"]["webservices"] == claims["webservices"]
+        assert saved["connected_user"]["organizations"]["client-0"]["webservices"] == sorted(
+            claims["organizations"]["client-0"]["webservices"]
+        )
@@ -178,7 +178,8 @@ class TestAuthenticateUserAntiEnumeration:
         mock_session = AsyncMock()
 
         with patch.object(AuthService, "get_user_from_login", new_callable=AsyncMock, return_value=None), \
-             patch.object(AuthService, "app_manager", create=True):
+             patch.object(AuthService, "app_manager", create=True) as mock_am:
+            mock_am.cpu_pool.run = AsyncMock(side_effect=lambda func, *args: func(*args))
             with pytest.raises(LysError) as exc_info:
                 await AuthService.authenticate_user("unknown@test.com", "password", mock_session)
             assert exc_info.value.status_code == INVALID_CREDENTIALS_ERROR[0]
@@ -194,8 +195,9 @@ class TestAuthenticateUserAntiEnumeration:
         mock_session = AsyncMock()
 
         with patch.object(AuthService, "get_user_from_login", new_callable=AsyncMock, return_value=None), \
-             patch.object(AuthService, "app_manager", create=True), \
+             patch.object(AuthService, "app_manager", create=True) as mock_am, \
              patch.object(bcrypt, "checkpw", return_value=False) as mock_checkpw:
+            mock_am.cpu_pool.run = AsyncMock(side_effect=lambda func, *args: func(*args))
             with pytest.raises(LysError):
                 await AuthService.authenticate_user("unknown@test.com", "password", mock_session)
             mock_checkpw.assert_called_once()
@@ -217,7 +219,7 @@ class TestAuthenticateUserAntiEnumeration:
              patch.object(AuthService, "app_manager", create=True) as mock_am:
             mock_utils.config = {"login_rate_limit_enabled": True}
             mock_user_service = Mock()
-            mock_user_service.check_password.return_value = True
+            mock_user_service.check_password_async = AsyncMock(return_value=True)
             mock_am.get_service.return_value = mock_user_service
             mock_am.get_entity.return_value = Mock
 
@@ -246,7 +248,7 @@ class TestAuthenticateUserAntiEnumeration:
              patch.object(AuthService, "app_manager", create=True) as mock_am:
             mock_utils.config = {"login_rate_limit_enabled": False}
             mock_user_service = Mock()
-            mock_user_service.check_password.return_value = False
+            mock_user_service.check_password_async = AsyncMock(return_value=False)
             mock_am.get_service.return_value = mock_user_service
             mock_am.get_entity.return_value = mock_attempt_entity
 
@@ -0,0 +1,173 @@
+"""
+Unit tests for AccessTokenStore and the in-process access claims cache.
+"""
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from lys.apps.user_auth.modules.auth.store import (
+    ACCESS_TOKEN_CHANNEL,
+    ACCESS_TOKEN_REVOKED,
+    AccessClaimsCache,
+    AccessTokenStore,
+)
+
+
+def _claims(expires_in=3600):
+    return {"sub": "user-1", "exp": int(time.time() + expires_in), "xsrf_token": "abc"}
+
+
+def _make_pubsub(raw=None):
+    pubsub = MagicMock()
+    pubsub.get_key = AsyncMock(return_value=raw)
+    pubsub.delete_key = AsyncMock(return_value=True)
+    pubsub.publish = AsyncMock(return_value=1)
+    return pubsub
+
+
+class TestAccessClaimsCache:
+
+    def test_set_and_get(self):
+        cache = AccessClaimsCache(max_size=10, ttl_seconds=30)
+        claims = _claims()
+        cache.set("token", claims)
+        assert cache.get("token") == claims
+        assert cache.get("token") is not claims
+
+    def test_get_returns_a_copy(self):
+        cache = AccessClaimsCache(max_size=10, ttl_seconds=30)
+        claims = _claims()
+        expected = dict(claims)
+        cache.set("token", claims)
+
+        cache.get("token")["sub"] = "other-user"
+        claims["xsrf_token"] = "changed"
+
+        assert cache.get("token") == expected
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AccessClaimsCache(max_size=2, ttl_seconds=30)
+        cache.set("a", _claims())
+        cache.set("b", _claims())
+        cache.get("a")
+        cache.set("c", _claims())
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_entry_expires_after_ttl(self):
+        cache = AccessClaimsCache(max_size=10, ttl_seconds=30)
+        with patch("lys.apps.user_auth.modules.auth.store.time.monotonic", return_value=1000.0):
+            cache.set("token", _claims())
+        with patch("lys.apps.user_auth.modules.auth.store.time.monotonic", return_value=1031.0):
+            assert cache.get("token") is None
+
+    def test_ttl_capped_by_token_expiry(self):
+        cache = AccessClaimsCache(max_size=10, ttl_seconds=30)
+        with patch("lys.apps.user_auth.modules.auth.store.time.monotonic", return_value=1000.0):
+            cache.set("token", _claims(expires_in=5))
+        with patch("lys.apps.user_auth.modules.auth.store.time.monotonic", return_value=1006.0):
+            assert cache.get("token") is None
+
+    def test_expired_token_not_cached(self):
+        cache = AccessClaimsCache(max_size=10, ttl_seconds=30)
+        cache.set("token", _claims(expires_in=-1))
+        assert len(cache) == 0
+
+    def test_disabled_with_zero_ttl(self):
+        cache = AccessClaimsCache(max_size=10, ttl_seconds=0)
+        cache.set("token", _claims())
+        assert cache.get("token") is None
+
+
+class TestAccessTokenStoreClaimsCache:
+
+    @pytest.mark.asyncio
+    async def test_get_reads_through_cache(self):
+        claims = _claims()
+        pubsub = _make_pubsub('{"sub": "user-1", "exp": %d, "xsrf_token": "abc"}' % claims["exp"])
+        store = AccessTokenStore(pubsub, claims_cache=AccessClaimsCache())
+
+        first = await store.get("token")
+        second = await store.get("token")
+
+        assert first == claims
+        assert second == first
+        pubsub.get_key.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_mutating_returned_claims_does_not_change_next_get(self):
+        claims = _claims()
+        pubsub = _make_pubsub('{"sub": "user-1", "exp": %d, "xsrf_token": "abc"}' % claims["exp"])
+        store = AccessTokenStore(pubsub, claims_cache=AccessClaimsCache())
+
+        (await store.get("token"))["sub"] = "other-user"
+        cached = await store.get("token")
+        cached["is_super_user"] = True
+
+        assert await store.get("token") == claims
+        pubsub.get_key.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_without_cache_always_reads_redis(self):
+        pubsub = _make_pubsub('{"sub": "user-1"}')
+        store = AccessTokenStore(pubsub)
+
+        await store.get("token")
+        await store.get("token")
+
+        assert pubsub.get_key.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_evicts_and_publishes_revocation(self):
+        cache = AccessClaimsCache()
+        cache.set("token", _claims())
+        pubsub = _make_pubsub()
+        store = AccessTokenStore(pubsub, claims_cache=cache)
+
+        deleted = await store.delete("token")
+
+        assert deleted is True
+        assert cache.get("token") is None
+        pubsub.publish.assert_awaited_once_with(ACCESS_TOKEN_CHANNEL, ACCESS_TOKEN_REVOKED, {"token_id": "token"})
+
+    @pytest.mark.asyncio
+    async def test_delete_survives_publish_failure(self):
+        pubsub = _make_pubsub()
+        pubsub.publish = AsyncMock(side_effect=ConnectionError("redis down"))
+        store = AccessTokenStore(pubsub)
+
+        assert await store.delete("token") is True
+
+    @pytest.mark.asyncio
+    async def test_listen_revocations_evicts_other_workers_tokens(self):
+        cache = AccessClaimsCache()
+        cache.set("revoked", _claims())
+        cache.set("kept", _claims())
+
+        async def subscribe(channel):
+            assert channel == ACCESS_TOKEN_CHANNEL
+            yield {"signal": "OTHER", "params": {"token_id": "kept"}}
+            yield {"signal": ACCESS_TOKEN_REVOKED, "params": {"token_id": "revoked"}}
+
+        pubsub = _make_pubsub()
+        pubsub.subscribe = subscribe
+        await AccessTokenStore(pubsub).listen_revocations(cache)
+
+        assert cache.get("revoked") is None
+        assert cache.get("kept") is not None
+
+    @pytest.mark.asyncio
+    async def test_listen_revocations_defaults_to_store_cache(self):
+        cache = AccessClaimsCache()
+        cache.set("revoked", _claims())
+
+        async def subscribe(channel):
+            yield {"signal": ACCESS_TOKEN_REVOKED, "params": {"token_id": "revoked"}}
+
+        pubsub = _make_pubsub()
+        pubsub.subscribe = subscribe
+        await AccessTokenStore(pubsub, claims_cache=cache).listen_revocations()
+
+        assert cache.get("revoked") is None
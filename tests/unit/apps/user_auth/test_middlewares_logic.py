@@ -1,5 +1,5 @@
 """
-Unit tests for UserAuthMiddleware dispatch logic.
+Unit tests for UserAuthMiddleware authentication logic.
 
 Tests opaque access token resolution via AccessTokenStore (cookie vs header),
 XSRF checking, and connected_user injection.
@@ -21,12 +21,6 @@ def _make_request(cookies=None, headers=None, method="POST"):
     return request
 
 
-def _make_call_next():
-    """Create a mock call_next that returns a response."""
-    response = Mock()
-    return AsyncMock(return_value=response), response
-
-
 def _build_middleware(stored_claims=None, store_raises=None, store=None):
     """
     Construct a UserAuthMiddleware with an in-memory stub store.
@@ -62,15 +56,13 @@ class TestNoToken:
     @pytest.mark.asyncio
     async def test_no_token_sets_none(self):
         request = _make_request()
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware()
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
         assert request.state.access_token is None
-        call_next.assert_called_once_with(request)
         # Store must not even be queried when no token is present.
         middleware._stub_store.get.assert_not_called()
 
@@ -85,11 +77,10 @@ class TestTokenFromCookie:
             cookies={"access_token": "opaque-uuid-1"},
             headers={"x-xsrf-token": "abc123"},
         )
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user == claims
         assert request.state.access_token == "opaque-uuid-1"
@@ -103,11 +94,10 @@ class TestTokenFromHeader:
     async def test_bearer_header_token(self):
         claims = {"sub": "user-1", "exp": 9999999999, "xsrf_token": "abc123"}
         request = _make_request(headers={"Authorization": "Bearer my-token"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user == claims
         assert request.state.access_token == "my-token"
@@ -116,11 +106,10 @@ class TestTokenFromHeader:
     @pytest.mark.asyncio
     async def test_non_bearer_header_ignored(self):
         request = _make_request(headers={"Authorization": "Basic dXNlcjpwYXNz"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims={"sub": "x", "exp": 1, "xsrf_token": "y"})
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
         middleware._stub_store.get.assert_not_called()
@@ -132,11 +121,10 @@ class TestTokenNotInStore:
     @pytest.mark.asyncio
     async def test_unknown_token_sets_none(self):
         request = _make_request(cookies={"access_token": "unknown-uuid"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=None)
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
         assert request.state.access_token is None
@@ -145,11 +133,10 @@ class TestTokenNotInStore:
     async def test_store_failure_sets_none(self):
         """Redis/store failure must degrade to anonymous, not 500 the request."""
         request = _make_request(cookies={"access_token": "any-uuid"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(store_raises=RuntimeError("redis down"))
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
         assert request.state.access_token is None
@@ -163,14 +150,13 @@ class TestNoStoreAvailable:
         from lys.apps.user_auth.middlewares import UserAuthMiddleware
 
         request = _make_request(cookies={"access_token": "some-uuid"})
-        call_next, _ = _make_call_next()
 
         middleware = UserAuthMiddleware.__new__(UserAuthMiddleware)
         middleware.auth_utils = Mock()
         middleware.auth_utils.config = {}
         middleware._build_store = lambda: None  # pubsub unavailable
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
         assert request.state.access_token is None
@@ -184,11 +170,10 @@ class TestMissingClaims:
         # Missing 'sub' claim
         claims = {"exp": 9999999999, "xsrf_token": "abc123"}
         request = _make_request(cookies={"access_token": "uuid"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
 
@@ -197,11 +182,10 @@ class TestMissingClaims:
         # Missing 'xsrf_token' claim
         claims = {"sub": "user-1", "exp": 9999999999}
         request = _make_request(cookies={"access_token": "uuid"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
 
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user is None
 
@@ -218,13 +202,12 @@ class TestXSRFValidation:
             cookies={"access_token": "uuid"},
             headers={"x-xsrf-token": "wrong-token"},
         )
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
         middleware.auth_utils.config = {"check_xsrf_token": True}
 
         with pytest.raises(LysError, match="INVALID_XSRF_TOKEN_ERROR"):
-            await middleware.dispatch(request, call_next)
+            await middleware.authenticate(request)
 
     @pytest.mark.asyncio
     async def test_xsrf_missing_header_raises(self):
@@ -232,25 +215,23 @@ class TestXSRFValidation:
 
         claims = {"sub": "user-1", "exp": 9999999999, "xsrf_token": "expected-token"}
         request = _make_request(cookies={"access_token": "uuid"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
         middleware.auth_utils.config = {"check_xsrf_token": True}
 
         with pytest.raises(LysError, match="INVALID_XSRF_TOKEN_ERROR"):
-            await middleware.dispatch(request, call_next)
+            await middleware.authenticate(request)
 
     @pytest.mark.asyncio
     async def test_xsrf_skipped_for_bearer(self):
         claims = {"sub": "user-1", "exp": 9999999999, "xsrf_token": "token"}
         request = _make_request(headers={"Authorization": "Bearer my-token"})
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
         middleware.auth_utils.config = {"check_xsrf_token": True}
 
         # Should NOT raise even though no x-xsrf-token header
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user == claims
 
@@ -263,13 +244,12 @@ class TestXSRFValidation:
             cookies={"access_token": "uuid"},
             method=method,
         )
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
         middleware.auth_utils.config = {"check_xsrf_token": True}
 
         # Should NOT raise even though no x-xsrf-token header
-        await middleware.dispatch(request, call_next)
+        await middleware.authenticate(request)
 
         assert request.state.connected_user == claims
 
@@ -283,10 +263,70 @@ class TestXSRFValidation:
             cookies={"access_token": "uuid"},
             method="POST",
         )
-        call_next, _ = _make_call_next()
 
         middleware = _build_middleware(stored_claims=claims)
         middleware.auth_utils.config = {"check_xsrf_token": True}
 
         with pytest.raises(LysError, match="INVALID_XSRF_TOKEN_ERROR"):
-            await middleware.dispatch(request, call_next)
+            await middleware.authenticate(request)
+
+
+class TestASGICall:
+    """Tests for UserAuthMiddleware as an ASGI application."""
+
+    def _scope(self, headers=None, method="GET"):
+        return {"type": "http", "method": method, "path": "/", "headers": headers or []}
+
+    @pytest.mark.asyncio
+    async def test_connected_user_visible_downstream(self):
+        from starlette.requests import Request
+
+        claims = {"sub": "user-1", "exp": 9999999999, "xsrf_token": "token"}
+        seen = {}
+
+        async def app(scope, receive, send):
+            state = Request(scope).state
+            seen["connected_user"] = state.connected_user
+            seen["access_token"] = state.access_token
+
+        middleware = _build_middleware(stored_claims=claims)
+        middleware.app = app
+
+        await middleware(self._scope([(b"authorization", b"Bearer my-token")]), AsyncMock(), AsyncMock())
+
+        assert seen == {"connected_user": claims, "access_token": "my-token"}
+
+    @pytest.mark.asyncio
+    async def test_downstream_error_reraised(self):
+        middleware = _build_middleware()
+        middleware.app = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await middleware(self._scope(), AsyncMock(), AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_xsrf_error_stops_request(self):
+        from lys.core.errors import LysError
+
+        claims = {"sub": "user-1", "exp": 9999999999, "xsrf_token": "expected-token"}
+        middleware = _build_middleware(stored_claims=claims)
+        middleware.auth_utils.config = {"check_xsrf_token": True}
+        middleware.app = AsyncMock()
+
+        with pytest.raises(LysError, match="INVALID_XSRF_TOKEN_ERROR"):
+            await middleware(
+                self._scope([(b"cookie", b"access_token=uuid")], method="POST"), AsyncMock(), AsyncMock()
+            )
+
+        middleware.app.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_http_scope_passes_through(self):
+        middleware = _build_middleware()
+        middleware.app = AsyncMock()
+        scope = {"type": "websocket", "path": "/", "headers": []}
+
+        await middleware(scope, "receive", "send")
+
+        middleware.app.assert_awaited_once_with(scope, "receive", "send")
+        middleware._stub_store.get.assert_not_called()
@@ -126,6 +126,7 @@ class TestResetPassword:
 
         with patch.object(UserService, "app_manager", create=True) as mock_am:
             mock_am.get_service.return_value = mock_token_service
+            mock_am.cpu_pool.run = AsyncMock(side_effect=lambda func, *args: func(*args))
             with patch.object(UserService, "get_by_id", new_callable=AsyncMock, return_value=mock_user):
                 with patch("lys.apps.user_auth.modules.user.services.AuthUtils") as MockAuthUtils:
                     MockAuthUtils.hash_password.return_value = "new-hash"
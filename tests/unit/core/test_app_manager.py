@@ -36,6 +36,7 @@ def _create_app_manager():
         mock_settings.return_value.permissions = []
         mock_settings.return_value.middlewares = []
         mock_settings.return_value.database = MagicMock()
+        mock_settings.return_value.database.parametric_cache = False
         mock_db.return_value = MagicMock(spec=DatabaseManager)
         mock_registry.return_value = MagicMock()
         mock_registry.return_value.services = {}
@@ -54,6 +54,22 @@ class TestDatabaseSettingsValidation:
         with pytest.raises(ValueError, match="Unsupported database type: oracle"):
             db.validate()
 
+    def test_validate_unsupported_replica_strategy_raises(self):
+        db = DatabaseSettings()
+        db.type = "sqlite"
+        db.database = ":memory:"
+        db.replica_strategy = "random"
+        with pytest.raises(ValueError, match="Unsupported replica strategy: random"):
+            db.validate()
+
+    def test_validate_slow_statement_explain_rate_out_of_range_raises(self):
+        db = DatabaseSettings()
+        db.type = "sqlite"
+        db.database = ":memory:"
+        db.slow_statement_explain_rate = 1.5
+        with pytest.raises(ValueError, match="slow_statement_explain_rate must be between 0 and 1"):
+            db.validate()
+
 
 class TestAppSettingsProperties:
     """Tests for AppSettings environment-driven properties."""
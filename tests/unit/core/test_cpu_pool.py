@@ -0,0 +1,88 @@
+"""
+Unit tests for CpuPoolManager.
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from lys.core.consts.errors import TOO_MANY_REQUESTS_ERROR
+from lys.core.errors import LysError
+from lys.core.managers.cpu_pool import CpuPoolManager
+
+
+def _cpu_pool(workers=2, queue_size=1):
+    app_manager = MagicMock()
+    app_manager.settings.cpu_pool_workers = workers
+    app_manager.settings.cpu_pool_queue_size = queue_size
+    return CpuPoolManager(app_manager)
+
+
+class TestCpuPoolManager:
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        pool = _cpu_pool()
+        try:
+            thread_name = await pool.run(lambda: threading.current_thread().name)
+        finally:
+            await pool.shutdown()
+
+        assert thread_name.startswith("lys-cpu")
+        assert pool.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        pool = _cpu_pool()
+        ticks = []
+
+        async def tick():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        try:
+            await asyncio.gather(pool.run(time.sleep, 0.1), tick())
+        finally:
+            await pool.shutdown()
+
+        # the ticks are not delayed by the 100 ms of blocking work
+        assert ticks[-1] - ticks[0] < 0.09
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_workers_and_queue(self):
+        pool = _cpu_pool(workers=2, queue_size=1)
+        release = threading.Event()
+
+        try:
+            running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            assert pool.pending == 3
+
+            with pytest.raises(LysError) as exc_info:
+                await pool.run(release.wait)
+
+            release.set()
+            assert await asyncio.gather(*running) == [True, True, True]
+        finally:
+            release.set()
+            await pool.shutdown()
+
+        assert exc_info.value.status_code == TOO_MANY_REQUESTS_ERROR[0]
+        assert pool.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_is_raised_and_slot_released(self):
+        pool = _cpu_pool(workers=1, queue_size=0)
+
+        def fail():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError):
+                await pool.run(fail)
+            assert await pool.run(lambda: 42) == 42
+        finally:
+            await pool.shutdown()
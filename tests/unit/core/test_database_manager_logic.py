@@ -1,6 +1,9 @@
 """
 Unit tests for DatabaseManager logic (_build_url, _get_sync_poolclass, _get_engine_kwargs, etc.).
 """
+import asyncio
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, NullPool
@@ -234,3 +237,92 @@ class TestResetAndHasDatabase:
         assert mgr._session_factory is None
         assert mgr._sync_engine is None
         assert mgr._sync_session_factory is None
+
+
+class TestReadReplicas:
+    """Tests for replica routing, with SQLite files standing in for primary and replica."""
+
+    def _make_manager(self, tmp_path, replicas=2, **overrides):
+        settings = DatabaseSettings()
+        settings.type = "sqlite"
+        settings.database = str(tmp_path / "primary.db")
+        settings.replicas = [{"database": str(tmp_path / f"replica-{i}.db")} for i in range(replicas)]
+        for k, v in overrides.items():
+            setattr(settings, k, v)
+        return DatabaseManager(settings)
+
+    def test_replicas_override_primary_settings(self, tmp_path):
+        mgr = self._make_manager(tmp_path, pool_recycle=60)
+        replicas = mgr.get_replicas()
+        assert [replica.settings.database for replica in replicas] == [
+            str(tmp_path / "replica-0.db"), str(tmp_path / "replica-1.db")
+        ]
+        assert all(replica.settings.pool_recycle == 60 for replica in replicas)
+        assert all(replica.settings.replicas == [] for replica in replicas)
+        assert mgr.settings.database == str(tmp_path / "primary.db")
+
+    def test_no_replica_chooses_primary(self, tmp_path):
+        mgr = self._make_manager(tmp_path, replicas=0)
+        assert mgr.has_replicas() is False
+        assert mgr.choose_replica() is mgr
+
+    def test_round_robin(self, tmp_path):
+        mgr = self._make_manager(tmp_path)
+        replicas = mgr.get_replicas()
+        assert [mgr.choose_replica() for _ in range(4)] == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+    def test_least_connections(self, tmp_path):
+        mgr = self._make_manager(tmp_path, replica_strategy="least_connections")
+        replicas = mgr.get_replicas()
+        busy_engine = MagicMock()
+        busy_engine.pool.checkedout.return_value = 3
+        replicas[0]._engine = busy_engine
+        assert [mgr.choose_replica() for _ in range(3)] == [replicas[1]] * 3
+
+    def test_primary_stickiness_expires(self, tmp_path):
+        mgr = self._make_manager(tmp_path, replica_sticky_seconds=5)
+        with patch("lys.core.managers.database.time.monotonic", return_value=100.0):
+            mgr.mark_primary_sticky("user-1")
+            assert mgr.is_primary_sticky("user-1") is True
+            assert mgr.is_primary_sticky("user-2") is False
+            assert mgr.is_primary_sticky(None) is False
+        with patch("lys.core.managers.database.time.monotonic", return_value=106.0):
+            assert mgr.is_primary_sticky("user-1") is False
+
+    def test_stickiness_disabled_by_default(self, tmp_path):
+        mgr = self._make_manager(tmp_path)
+        mgr.mark_primary_sticky("user-1")
+        assert mgr.is_primary_sticky("user-1") is False
+
+    def test_read_session_reads_replica(self, tmp_path):
+        from sqlalchemy import text
+
+        mgr = self._make_manager(tmp_path, replicas=1)
+
+        async def scenario():
+            for database, origin in ((mgr, "primary"), (mgr.get_replicas()[0], "replica")):
+                async with database.get_session() as session:
+                    await session.execute(text("CREATE TABLE origin (name TEXT)"))
+                    await session.execute(text("INSERT INTO origin VALUES (:name)"), {"name": origin})
+
+            async with mgr.get_session() as session:
+                primary = (await session.execute(text("SELECT name FROM origin"))).scalar_one()
+            async with mgr.get_read_session() as session:
+                replica = (await session.execute(text("SELECT name FROM origin"))).scalar_one()
+            await mgr.close()
+            return primary, replica
+
+        assert asyncio.run(scenario()) == ("primary", "replica")
+
+    def test_sync_read_session_reads_replica(self, tmp_path):
+        from sqlalchemy import text
+
+        mgr = self._make_manager(tmp_path, replicas=1)
+        for database, origin in ((mgr, "primary"), (mgr.get_replicas()[0], "replica")):
+            with database.get_sync_session() as session:
+                session.execute(text("CREATE TABLE origin (name TEXT)"))
+                session.execute(text("INSERT INTO origin VALUES (:name)"), {"name": origin})
+
+        with mgr.get_sync_read_session() as session:
+            assert session.execute(text("SELECT name FROM origin")).scalar_one() == "replica"
+        mgr.reset_database_connection()
@@ -9,7 +9,12 @@ from unittest.mock import MagicMock, AsyncMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from lys.core.utils.database import check_is_needing_session, get_select_total_count
+from lys.core.utils.database import (
+    Explain,
+    check_is_needing_session,
+    get_select_estimated_count,
+    get_select_total_count,
+)
 
 
 class TestCheckIsNeedingSession:
@@ -101,3 +106,109 @@ class TestGetSelectTotalCount:
 
         result = self._run(get_select_total_count(mock_stmt, mock_entity, mock_session))
         assert result == 10
+
+
+class TestGetSelectEstimatedCount:
+    """Tests for get_select_estimated_count function."""
+
+    def _run(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def _table(self):
+        from sqlalchemy import Column, Integer, MetaData, Table
+        return Table("estimated_row", MetaData(), Column("id", Integer, primary_key=True))
+
+    def _postgres_session(self, plan_rows, exact_count=7):
+        plan_result = MagicMock()
+        plan_result.scalar_one.return_value = '[{"Plan": {"Plan Rows": %d}}]' % plan_rows
+        count_result = MagicMock()
+        count_result.scalar_one.return_value = exact_count
+
+        mock_session = AsyncMock()
+        mock_session.bind.dialect.name = "postgresql"
+        mock_session.execute.side_effect = [plan_result, count_result]
+        return mock_session
+
+    def test_explain_compiles_on_postgresql(self):
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+
+        table = self._table()
+        sql = str(Explain(select(table.c.id).where(table.c.id > 3)).compile(dialect=postgresql.dialect()))
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT estimated_row.id")
+
+    def test_postgresql_returns_planner_estimate_above_threshold(self):
+        from sqlalchemy import select
+
+        table = self._table()
+        mock_session = self._postgres_session(plan_rows=250000)
+
+        result = self._run(get_select_estimated_count(select(table), table.c, mock_session, 10000))
+        assert result == 250000
+        assert isinstance(mock_session.execute.await_args.args[0], Explain)
+
+    def test_postgresql_counts_exactly_below_threshold(self):
+        from sqlalchemy import select
+
+        table = self._table()
+        mock_session = self._postgres_session(plan_rows=12, exact_count=9)
+
+        result = self._run(get_select_estimated_count(select(table), table.c, mock_session, 10000))
+        assert result == 9
+        assert mock_session.execute.await_count == 2
+
+    def test_sqlite_count_is_capped(self):
+        from sqlalchemy import select
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        table = self._table()
+
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(table.metadata.create_all)
+                await conn.execute(table.insert(), [{"id": i} for i in range(1, 31)])
+            async with async_sessionmaker(engine)() as session:
+                capped = await get_select_estimated_count(select(table), table.c, session, 10)
+                exact = await get_select_estimated_count(
+                    select(table).where(table.c.id <= 4), table.c, session, 10
+                )
+            await engine.dispose()
+            return capped, exact
+
+        assert self._run(scenario()) == (10, 4)
+
+
+class TestGetValuesFilter:
+
+    def test_postgresql_uses_one_array_parameter(self):
+        from sqlalchemy import Column, MetaData, String, Table, select
+        from sqlalchemy.dialects import postgresql
+
+        from lys.core.utils.database import get_values_filter
+
+        table = Table("values_filter", MetaData(), Column("id", String))
+        stmt = select(table).where(get_values_filter(table.c.id, ["a", "b", "c"], "postgresql"))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "= ANY" in sql
+        assert sql.count("%(") == 1
+
+    def test_other_dialects_use_in(self):
+        from sqlalchemy import Column, MetaData, String, Table
+
+        from lys.core.utils.database import get_values_filter
+
+        table = Table("values_filter", MetaData(), Column("id", String))
+        assert "IN" in str(get_values_filter(table.c.id, ["a"], "sqlite"))
+
+    def test_max_bound_parameters(self):
+        from lys.core.utils.database import get_max_bound_parameters
+
+        assert get_max_bound_parameters("postgresql") is None
+        assert get_max_bound_parameters("sqlite") == 32766
+        assert get_max_bound_parameters("oracle") == 999
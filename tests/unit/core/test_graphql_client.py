@@ -8,6 +8,15 @@ from unittest.mock import patch, AsyncMock, MagicMock
 import httpx
 
 from lys.core.graphql.client import GraphQLClient, fetch_graphql
+from lys.core.managers.http import HttpClientManager
+
+
+@pytest.fixture(autouse=True)
+def http_clients():
+    """Fresh HttpClientManager per test: the httpx.AsyncClient / httpx.Client patches apply to the clients it opens."""
+    manager = HttpClientManager(MagicMock())
+    with patch("lys.core.graphql.client.get_http_clients", return_value=manager):
+        yield manager
 
 
 class TestFetchGraphQL:
@@ -22,12 +31,12 @@ class TestFetchGraphQL:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_client = AsyncMock()
             mock_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
                 mock_auth = MagicMock()
                 mock_auth.generate_token.return_value = "test-token"
-                MockAuth.return_value = mock_auth
+                MockAuth.shared.return_value = mock_auth
 
                 result = await fetch_graphql(
                     url="http://gateway/graphql",
@@ -48,12 +57,12 @@ class TestFetchGraphQL:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_client = AsyncMock()
             mock_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
                 mock_auth = MagicMock()
                 mock_auth.generate_token.return_value = "test-token"
-                MockAuth.return_value = mock_auth
+                MockAuth.shared.return_value = mock_auth
 
                 result = await fetch_graphql(
                     url="http://gateway/graphql",
@@ -103,7 +112,7 @@ class TestGraphQLClient:
         with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
             mock_auth = MagicMock()
             mock_auth.generate_token.return_value = "test-token"
-            MockAuth.return_value = mock_auth
+            MockAuth.shared.return_value = mock_auth
 
             client = GraphQLClient(
                 url="http://gateway/graphql",
@@ -138,7 +147,7 @@ class TestGraphQLClient:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_http_client = AsyncMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             result = await client.execute("query { users { id } }")
 
@@ -153,7 +162,7 @@ class TestGraphQLClient:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_http_client = AsyncMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             result = await client.execute(
                 "query GetUser($id: ID!) { user(id: $id) { id } }",
@@ -173,7 +182,7 @@ class TestGraphQLClient:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_http_client = AsyncMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             result = await client.query("query { users { id } }")
 
@@ -191,7 +200,7 @@ class TestGraphQLClient:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_http_client = AsyncMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             with pytest.raises(ValueError) as exc_info:
                 await client.query("query { user(id: 999) { id } }")
@@ -207,7 +216,7 @@ class TestGraphQLClient:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_http_client = AsyncMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             result = await client.mutate(
                 "mutation CreateUser($email: String!) { createUser(email: $email) { id } }",
@@ -226,7 +235,7 @@ class TestGraphQLClient:
                 request=MagicMock(),
                 response=MagicMock(status_code=500),
             )
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             with pytest.raises(httpx.HTTPStatusError):
                 await client.execute("query { users { id } }")
@@ -258,11 +267,11 @@ class TestVerifySSL:
 
     @pytest.mark.asyncio
     async def test_execute_passes_verify_ssl_to_httpx(self):
-        """Test that execute passes verify_ssl to httpx.AsyncClient."""
+        """Test that execute passes verify_ssl to the pooled httpx.AsyncClient."""
         with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
             mock_auth = MagicMock()
             mock_auth.generate_token.return_value = "token"
-            MockAuth.return_value = mock_auth
+            MockAuth.shared.return_value = mock_auth
 
             client = GraphQLClient(
                 url="http://gateway/graphql",
@@ -277,18 +286,19 @@ class TestVerifySSL:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_http_client = AsyncMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             await client.execute("query { test }")
 
-            MockClient.assert_called_once_with(timeout=30, verify=False)
+            MockClient.assert_called_once()
+            assert MockClient.call_args.kwargs["verify"] is False
 
     def test_execute_sync_passes_verify_ssl_to_httpx(self):
-        """Test that execute_sync passes verify_ssl to httpx.Client."""
+        """Test that execute_sync passes verify_ssl to the pooled httpx.Client."""
         with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
             mock_auth = MagicMock()
             mock_auth.generate_token.return_value = "token"
-            MockAuth.return_value = mock_auth
+            MockAuth.shared.return_value = mock_auth
 
             client = GraphQLClient(
                 url="http://gateway/graphql",
@@ -303,27 +313,55 @@ class TestVerifySSL:
         with patch("lys.core.graphql.client.httpx.Client") as MockClient:
             mock_http_client = MagicMock()
             mock_http_client.post.return_value = mock_response
-            MockClient.return_value.__enter__.return_value = mock_http_client
+            MockClient.return_value = mock_http_client
 
             client.execute_sync("query { test }")
 
-            MockClient.assert_called_once_with(timeout=30, verify=False)
+            MockClient.assert_called_once()
+            assert MockClient.call_args.kwargs["verify"] is False
+
+    @pytest.mark.asyncio
+    async def test_execute_reuses_pooled_client(self):
+        """Test that successive executes share one httpx.AsyncClient and pass the timeout per request."""
+        with patch("lys.core.graphql.client.ServiceAuthUtils"):
+            client = GraphQLClient(
+                url="http://gateway/graphql",
+                secret_key="secret",
+                service_name="test-service",
+                timeout=12,
+            )
+
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.json.return_value = {"data": {}}
+
+        with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
+            mock_http_client = AsyncMock()
+            mock_http_client.is_closed = False
+            mock_http_client.post.return_value = mock_response
+            MockClient.return_value = mock_http_client
+
+            await client.execute("query { test }")
+            await client.execute("query { test }")
+
+            MockClient.assert_called_once()
+            assert mock_http_client.post.call_count == 2
+            assert mock_http_client.post.call_args.kwargs["timeout"] == 12
 
     @pytest.mark.asyncio
     async def test_fetch_graphql_passes_verify_ssl(self):
-        """Test that fetch_graphql passes verify_ssl to httpx.AsyncClient."""
+        """Test that fetch_graphql passes verify_ssl to the pooled httpx.AsyncClient."""
         mock_response = MagicMock(spec=httpx.Response)
         mock_response.json.return_value = {"data": {}}
 
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_client = AsyncMock()
             mock_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
                 mock_auth = MagicMock()
                 mock_auth.generate_token.return_value = "token"
-                MockAuth.return_value = mock_auth
+                MockAuth.shared.return_value = mock_auth
 
                 await fetch_graphql(
                     url="http://gateway/graphql",
@@ -333,7 +371,8 @@ class TestVerifySSL:
                     verify_ssl=False,
                 )
 
-            MockClient.assert_called_once_with(timeout=30, verify=False)
+            MockClient.assert_called_once()
+            assert MockClient.call_args.kwargs["verify"] is False
 
     @pytest.mark.asyncio
     async def test_fetch_graphql_default_verify_ssl_true(self):
@@ -344,12 +383,12 @@ class TestVerifySSL:
         with patch("lys.core.graphql.client.httpx.AsyncClient") as MockClient:
             mock_client = AsyncMock()
             mock_client.post.return_value = mock_response
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             with patch("lys.core.graphql.client.ServiceAuthUtils") as MockAuth:
                 mock_auth = MagicMock()
                 mock_auth.generate_token.return_value = "token"
-                MockAuth.return_value = mock_auth
+                MockAuth.shared.return_value = mock_auth
 
                 await fetch_graphql(
                     url="http://gateway/graphql",
@@ -358,4 +397,5 @@ class TestVerifySSL:
                     service_name="test-service",
                 )
 
-            MockClient.assert_called_once_with(timeout=30, verify=True)
+            MockClient.assert_called_once()
+            assert MockClient.call_args.kwargs["verify"] is True
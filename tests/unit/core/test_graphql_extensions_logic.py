@@ -457,6 +457,140 @@ class TestDatabaseSessionExtensionHappyPath:
 
         assert isinstance(mock_context.session, ThreadSafeSessionProxy)
 
+    def test_creates_relation_loader_on_request_session(self):
+        """The context should expose a RelationLoader bound to the request session proxy."""
+        from lys.core.graphql.loaders import RelationLoader
+
+        ext, mock_session, mock_context = self._make_extension()
+
+        async def consume():
+            gen = ext.on_execute()
+            await gen.__anext__()
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+
+        self._run(consume())
+
+        assert isinstance(mock_context.relation_loader, RelationLoader)
+        assert mock_context.relation_loader._session is mock_context.session
+
+
+class TestDatabaseSessionExtensionCallerSession:
+    """Tests for DatabaseSessionExtension when the context already carries the caller's session."""
+
+    def _run(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_uses_caller_session_as_is(self):
+        """An in-process operation runs in the caller's session: nothing opened, committed or closed."""
+        from lys.core.contexts import Context
+
+        ext = DatabaseSessionExtension.__new__(DatabaseSessionExtension)
+        mock_app_manager = MagicMock()
+        mock_app_manager.database.has_database_configured.return_value = True
+        caller_session = AsyncMock()
+        context = Context()
+        context.app_manager = mock_app_manager
+        context.session = caller_session
+        mock_exec_ctx = MagicMock()
+        mock_exec_ctx.context = context
+        ext.execution_context = mock_exec_ctx
+
+        async def consume():
+            gen = ext.on_execute()
+            await gen.__anext__()
+            assert context.session is caller_session
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+
+        self._run(consume())
+
+        mock_app_manager.database.session_factory.assert_not_called()
+        caller_session.commit.assert_not_called()
+        caller_session.close.assert_not_called()
+
+
+class TestDatabaseSessionExtensionReplicaRouting:
+    """Tests for the routing of operations between the primary and the read replicas."""
+
+    def _run(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def _make_extension(self, operation_type, sticky=False, user_id="user-1"):
+        from strawberry.types.graphql import OperationType
+
+        ext = DatabaseSessionExtension.__new__(DatabaseSessionExtension)
+        primary_session = AsyncMock()
+        replica_session = AsyncMock()
+        mock_app_manager = MagicMock()
+        mock_app_manager.database.has_database_configured.return_value = True
+        mock_app_manager.database.has_replicas.return_value = True
+        mock_app_manager.database.is_primary_sticky.return_value = sticky
+        mock_app_manager.database.session_factory.return_value = primary_session
+        mock_app_manager.database.create_read_session.return_value = replica_session
+        mock_app_manager.database.settings.concurrent_query_sessions = 0
+        mock_app_manager.database.settings.slow_statement_threshold_ms = 0
+        mock_context = MagicMock()
+        mock_context.app_manager = mock_app_manager
+        mock_context.connected_user = {"sub": user_id} if user_id else None
+        mock_exec_ctx = MagicMock()
+        mock_exec_ctx.context = mock_context
+        mock_exec_ctx.operation_type = getattr(OperationType, operation_type)
+        ext.execution_context = mock_exec_ctx
+        return ext, mock_app_manager.database, primary_session, replica_session
+
+    def _execute(self, ext):
+        async def consume():
+            gen = ext.on_execute()
+            await gen.__anext__()
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+
+        self._run(consume())
+
+    def test_query_reads_from_replica(self):
+        ext, database, primary_session, replica_session = self._make_extension("QUERY")
+        self._execute(ext)
+
+        assert ext.execution_context.context.session._session is replica_session
+        database.is_primary_sticky.assert_called_once_with("user-1")
+        database.mark_primary_sticky.assert_not_called()
+
+    def test_mutation_writes_to_primary_and_marks_user_sticky(self):
+        ext, database, primary_session, replica_session = self._make_extension("MUTATION")
+        self._execute(ext)
+
+        assert ext.execution_context.context.session._session is primary_session
+        database.create_read_session.assert_not_called()
+        database.mark_primary_sticky.assert_called_once_with("user-1")
+
+    def test_anonymous_mutation_is_not_sticky(self):
+        ext, database, _, _ = self._make_extension("MUTATION", user_id=None)
+        self._execute(ext)
+
+        database.mark_primary_sticky.assert_not_called()
+
+    def test_sticky_user_query_reads_from_primary(self):
+        ext, database, primary_session, _ = self._make_extension("QUERY", sticky=True)
+        self._execute(ext)
+
+        assert ext.execution_context.context.session._session is primary_session
+
+    def test_query_without_replicas_reads_from_primary(self):
+        ext, database, primary_session, _ = self._make_extension("QUERY")
+        database.has_replicas.return_value = False
+        self._execute(ext)
+
+        assert ext.execution_context.context.session._session is primary_session
+
 
 class TestDatabaseSessionExtensionExceptionPath:
     """Tests for DatabaseSessionExtension when GraphQL execution raises."""
@@ -629,3 +763,264 @@ class TestDatabaseSessionExtensionCloseFailure:
 
         mock_session.rollback.assert_awaited_once()
         mock_session.close.assert_awaited_once()
+
+
+class _FakeSession:
+    """Session stub recording how many statements run at the same time."""
+
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self):
+        self.closed = False
+
+    async def execute(self, *args, **kwargs):
+        _FakeSession.in_flight += 1
+        _FakeSession.max_in_flight = max(_FakeSession.max_in_flight, _FakeSession.in_flight)
+        await asyncio.sleep(0.01)
+        _FakeSession.in_flight -= 1
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class TestDatabaseSessionExtensionConcurrentRootFields:
+    """Tests for the per root field sessions of read-only operations."""
+
+    def _execute(self, query, concurrent_query_sessions):
+        import strawberry
+        from lys.core.contexts import Context
+
+        sessions = []
+        seen = {}
+
+        def session_factory():
+            session = _FakeSession()
+            sessions.append(session)
+            return session
+
+        @strawberry.type
+        class Item:
+            name: str
+
+            @strawberry.field
+            async def detail(self, info: strawberry.Info) -> str:
+                await info.context.session.execute("detail")
+                seen.setdefault(self.name, set()).add(id(info.context.session))
+                return self.name
+
+        async def resolve_item(info: strawberry.Info, name: str) -> Item:
+            await info.context.session.execute("item")
+            seen.setdefault(name, set()).add(id(info.context.session))
+            return Item(name=name)
+
+        @strawberry.type
+        class Query:
+            @strawberry.field
+            async def a(self, info: strawberry.Info) -> Item:
+                return await resolve_item(info, "a")
+
+            @strawberry.field
+            async def b(self, info: strawberry.Info) -> Item:
+                return await resolve_item(info, "b")
+
+            @strawberry.field
+            async def c(self, info: strawberry.Info) -> Item:
+                return await resolve_item(info, "c")
+
+            @strawberry.field
+            async def d(self, info: strawberry.Info) -> Item:
+                return await resolve_item(info, "d")
+
+        @strawberry.type
+        class Mutation:
+            @strawberry.mutation
+            async def touch(self, info: strawberry.Info) -> Item:
+                return await resolve_item(info, "touch")
+
+        schema = strawberry.Schema(Query, mutation=Mutation, extensions=[DatabaseSessionExtension])
+
+        context = Context()
+        context.app_manager = MagicMock()
+        context.app_manager.database.has_database_configured.return_value = True
+        context.app_manager.database.has_replicas.return_value = False
+        context.app_manager.database.session_factory.side_effect = session_factory
+        context.app_manager.database.settings.concurrent_query_sessions = concurrent_query_sessions
+
+        _FakeSession.in_flight = 0
+        _FakeSession.max_in_flight = 0
+        result = asyncio.run(schema.execute(query, context_value=context))
+        assert result.errors is None
+        return sessions, seen, _FakeSession.max_in_flight
+
+    def test_root_fields_share_one_session_by_default(self):
+        sessions, seen, max_in_flight = self._execute("{ a { detail } b { detail } c { detail } }", 0)
+
+        assert len(sessions) == 1
+        assert max_in_flight == 1
+
+    def test_root_fields_run_concurrently_on_own_sessions(self):
+        sessions, seen, max_in_flight = self._execute("{ a { detail } b { detail } c { detail } }", 4)
+
+        assert len(sessions) == 3
+        assert max_in_flight == 3
+        # nested fields use the session of their root field
+        assert all(len(session_ids) == 1 for session_ids in seen.values())
+        assert len({session_id for session_ids in seen.values() for session_id in session_ids}) == 3
+        assert all(session.closed for session in sessions)
+
+    def test_sessions_are_capped(self):
+        sessions, seen, max_in_flight = self._execute("{ a { detail } b { detail } c { detail } d { detail } }", 2)
+
+        assert len(sessions) == 2
+        assert max_in_flight == 2
+
+    def test_mutation_keeps_single_session(self):
+        sessions, seen, max_in_flight = self._execute("mutation { touch { detail } }", 4)
+
+        assert len(sessions) == 1
+
+
+class TestDatabaseSessionExtensionSqlStats:
+    """Tests for the SQL statistics of an operation, on a real SQLite engine."""
+
+    def _execute(self, env, headers=None, connected_user=None, slow_threshold_ms=0, log_service=None):
+        from contextlib import asynccontextmanager
+        from types import SimpleNamespace
+
+        import strawberry
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        from lys.core.consts.environments import EnvironmentEnum
+        from lys.core.contexts import Context
+        from lys.core.utils.sql_stats import instrument_engine
+
+        @strawberry.type
+        class Item:
+            id: int
+
+            @strawberry.field
+            async def detail(self, info: strawberry.Info) -> int:
+                return (await info.context.session.execute(text("SELECT :id"), {"id": self.id})).scalar_one()
+
+        @strawberry.type
+        class Query:
+            @strawberry.field
+            async def items(self, info: strawberry.Info) -> list[Item]:
+                await info.context.session.execute(text("SELECT 1"))
+                return [Item(id=i) for i in range(3)]
+
+        schema = strawberry.Schema(Query, extensions=[DatabaseSessionExtension])
+
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            instrument_engine(engine.sync_engine)
+
+            context = Context()
+            context.request = SimpleNamespace(
+                headers=headers or {}, state=SimpleNamespace(connected_user=connected_user)
+            )
+            context.app_manager = MagicMock()
+            context.app_manager.settings.env = getattr(EnvironmentEnum, env)
+            context.app_manager.settings.n_plus_one_threshold = 2
+            context.app_manager.database.has_database_configured.return_value = True
+            context.app_manager.database.has_replicas.return_value = False
+            context.app_manager.database.session_factory = async_sessionmaker(engine)
+
+            @asynccontextmanager
+            async def get_session():
+                yield "log-session"
+
+            context.app_manager.database.get_session = get_session
+            context.app_manager.database.settings.concurrent_query_sessions = 0
+            context.app_manager.database.settings.slow_statement_threshold_ms = slow_threshold_ms
+            context.app_manager.database.settings.slow_statement_explain_rate = 1
+            context.app_manager.database.settings.type = "sqlite"
+            context.app_manager.registry.services.get.return_value = log_service
+            try:
+                result = await schema.execute("{ items { id detail } }", context_value=context)
+                # let the background slow statement capture run
+                await asyncio.sleep(0.01)
+                return result
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(run())
+
+    def test_dev_returns_stats_in_extensions(self):
+        result = self._execute("DEV")
+
+        assert result.errors is None
+        sql = result.extensions["sql"]
+        assert sql["statements"] == 4
+        assert sql["paths"]["items"]["statements"] == 1
+        assert sql["paths"]["items.detail"]["statements"] == 3
+        assert sql["n_plus_one"] == [{"path": "items.detail", "statement": "SELECT ?", "count": 3}]
+
+    def test_logs_stats_and_n_plus_one(self, caplog):
+        import logging
+
+        with caplog.at_level(logging.INFO, logger="lys.core.graphql.extensions"):
+            self._execute("PROD")
+
+        assert "ran 4 SQL statements" in caplog.text
+        assert "Possible N+1" in caplog.text
+        assert "items.detail" in caplog.text
+
+    def test_prod_hides_stats(self):
+        result = self._execute("PROD")
+
+        assert "sql" not in (result.extensions or {})
+
+    def test_prod_super_user_with_header_gets_stats(self):
+        result = self._execute(
+            "PROD",
+            headers={DatabaseSessionExtension.sql_stats_header: "1"},
+            connected_user={"sub": "user-1", "is_super_user": True},
+        )
+
+        assert result.extensions["sql"]["statements"] == 4
+
+    def test_prod_header_requires_super_user(self):
+        result = self._execute(
+            "PROD",
+            headers={DatabaseSessionExtension.sql_stats_header: "1"},
+            connected_user={"sub": "user-1", "is_super_user": False},
+        )
+
+        assert "sql" not in (result.extensions or {})
+
+    def test_slow_statements_saved_in_background(self):
+        log_service = MagicMock()
+        log_service.create = AsyncMock()
+
+        result = self._execute(
+            "PROD", connected_user={"sub": "user-1"}, slow_threshold_ms=0.000001, log_service=log_service
+        )
+
+        assert result.errors is None
+        assert log_service.create.await_count == 4
+        args, kwargs = log_service.create.await_args_list[1]
+        assert args == ("log-session",)
+        context = kwargs["context"]
+        assert context["statement"] == "SELECT ?"
+        assert context["parameters"] == ["int"]
+        assert context["resolver_path"] == "items.detail"
+        assert context["connected_user_id"] == "user-1"
+        # no plan outside PostgreSQL
+        assert "explain" not in context
+
+    def test_no_slow_statement_below_threshold(self):
+        log_service = MagicMock()
+        log_service.create = AsyncMock()
+
+        self._execute("PROD", slow_threshold_ms=60000, log_service=log_service)
+
+        log_service.create.assert_not_awaited()
@@ -0,0 +1,124 @@
+"""
+Unit tests for the request-scoped RelationLoader.
+
+Loads run against a real SQLite database so the number of statements issued
+for a batch of nodes can be counted.
+"""
+import asyncio
+import os
+import tempfile
+from typing import List, Optional
+
+from sqlalchemy import ForeignKey, String, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import select
+
+from lys.core.graphql.extensions import ThreadSafeSessionProxy
+from lys.core.graphql.loaders import RelationLoader
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Status(_Base):
+    __tablename__ = "loader_status"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+
+
+class _Parent(_Base):
+    __tablename__ = "loader_parent"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    status_id: Mapped[Optional[str]] = mapped_column(ForeignKey("loader_status.id"), nullable=True)
+    status: Mapped[Optional[_Status]] = relationship(lazy="select")
+    children: Mapped[List["_Child"]] = relationship(lazy="select")
+
+
+class _Child(_Base):
+    __tablename__ = "loader_child"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    parent_id: Mapped[str] = mapped_column(ForeignKey("loader_parent.id"))
+
+
+def _run_scenario(scenario):
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(_Base.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine)
+        async with session_factory() as session:
+            session.add_all([_Status(id="ACTIVE")])
+            for i in range(10):
+                session.add(_Parent(id="p-%d" % i, status_id="ACTIVE" if i % 2 else None))
+                session.add_all([_Child(id="c-%d-%d" % (i, j), parent_id="p-%d" % i) for j in range(i % 3)])
+            await session.commit()
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async with session_factory() as session:
+            result = await scenario(ThreadSafeSessionProxy(session), statements)
+
+        await engine.dispose()
+        return result
+
+    loop = asyncio.new_event_loop()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            return loop.run_until_complete(run(os.path.join(directory, "loader.db")))
+    finally:
+        loop.close()
+
+
+class TestRelationLoader:
+
+    def test_batches_loads_into_one_query_per_relation(self):
+        async def scenario(session, statements):
+            parents = (await session.scalars(select(_Parent).order_by(_Parent.id))).all()
+            statements.clear()
+
+            loader = RelationLoader(session)
+            statuses, children = await asyncio.gather(
+                asyncio.gather(*[loader.load(parent, "status") for parent in parents]),
+                asyncio.gather(*[loader.load(parent, "children") for parent in parents]),
+            )
+            return statuses, children, list(statements)
+
+        statuses, children, statements = _run_scenario(scenario)
+
+        assert [status.id if status else None for status in statuses] == [None, "ACTIVE"] * 5
+        assert [len(items) for items in children] == [i % 3 for i in range(10)]
+        # one parent select + one selectin select per relation
+        assert len(statements) == 4
+
+    def test_loaded_relation_issues_no_query(self):
+        async def scenario(session, statements):
+            parents = (await session.scalars(select(_Parent))).all()
+            loader = RelationLoader(session)
+            await asyncio.gather(*[loader.load(parent, "children") for parent in parents])
+            statements.clear()
+
+            await asyncio.gather(*[loader.load(parent, "children") for parent in parents])
+            return list(statements)
+
+        assert _run_scenario(scenario) == []
+
+    def test_pending_entity_falls_back_to_refresh(self):
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        session = MagicMock()
+        session.refresh = AsyncMock()
+        parent = _Parent(id="pending")
+
+        loop = asyncio.new_event_loop()
+        try:
+            with patch.object(RelationLoader, "_batch_load", new_callable=AsyncMock) as batch_load:
+                loop.run_until_complete(RelationLoader(session).load(parent, "children"))
+            batch_load.assert_not_called()
+        finally:
+            loop.close()
+
+        session.refresh.assert_awaited_once_with(parent, ["children"])
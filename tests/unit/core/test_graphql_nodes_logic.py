@@ -233,6 +233,7 @@ class TestLazyLoadRelation:
 
         mock_info = MagicMock()
         mock_info.context.session = mock_session
+        mock_info.context.relation_loader = None
 
         mock_node_class = MagicMock()
         mock_result_node = MagicMock()
@@ -266,6 +267,7 @@ class TestLazyLoadRelation:
 
         mock_info = MagicMock()
         mock_info.context.session = mock_session
+        mock_info.context.relation_loader = None
 
         mock_node_class = MagicMock()
 
@@ -297,6 +299,7 @@ class TestLazyLoadRelation:
 
         mock_info = MagicMock()
         mock_info.context.session = mock_session
+        mock_info.context.relation_loader = None
 
         mock_node_class = MagicMock()
 
@@ -422,6 +425,7 @@ class TestLazyLoadRelationList:
 
         mock_info = MagicMock()
         mock_info.context.session = mock_session
+        mock_info.context.relation_loader = None
 
         mock_node_class = MagicMock()
         node1, node2 = MagicMock(), MagicMock()
@@ -455,6 +459,7 @@ class TestLazyLoadRelationList:
 
         mock_info = MagicMock()
         mock_info.context.session = mock_session
+        mock_info.context.relation_loader = None
 
         mock_node_class = MagicMock()
 
@@ -881,6 +886,310 @@ class TestBuildListConnectionResolveConnection:
             FakeNode._app_manager = None
 
 
+class TestBuildListConnectionTotalCount:
+    """Tests for the selection-aware LysListConnection.resolve_total_count()."""
+
+    def _build_connection(self, node_name, service_name, threshold=None):
+        FakeNode = _make_node_for_build_list(node_name, service_name)
+        FakeNode.estimated_count_threshold = threshold
+        FakeEntity = type(node_name + "Entity", (), {"id": MagicMock()})
+
+        mock_service = MagicMock()
+        mock_service.entity_class = FakeEntity
+        mock_am = MagicMock()
+        mock_am.get_service.return_value = mock_service
+        mock_am.get_entity.return_value = FakeEntity
+        mock_am.registry.get_node.return_value = FakeNode
+        FakeNode._app_manager = mock_am
+
+        mock_count_session = AsyncMock()
+        mock_am.database.get_session.return_value = mock_count_session
+        mock_count_session.__aenter__ = AsyncMock(return_value=mock_count_session)
+        mock_count_session.__aexit__ = AsyncMock(return_value=False)
+
+        return FakeNode, mock_am, FakeNode.build_list_connection()
+
+    def _resolve(self, connection_cls, selected, info=None):
+        with patch(
+            "lys.core.graphql.nodes.is_field_selected", return_value=selected
+        ), patch(
+            "lys.core.graphql.nodes.get_select_total_count", new_callable=AsyncMock, return_value=42
+        ) as total_count, patch(
+            "lys.core.graphql.nodes.get_select_estimated_count", new_callable=AsyncMock, return_value=1000
+        ) as estimated_count:
+            loop = asyncio.new_event_loop()
+            try:
+                result = loop.run_until_complete(
+                    connection_cls.resolve_total_count(MagicMock(), info=info or MagicMock())
+                )
+            finally:
+                loop.close()
+        return result, total_count, estimated_count
+
+    def test_skips_count_when_total_count_not_selected(self):
+        FakeNode, mock_am, connection_cls = self._build_connection("FakeCountNodeA", "fake_count_a")
+        try:
+            result, total_count, estimated_count = self._resolve(connection_cls, selected=False)
+            assert result is None
+            total_count.assert_not_called()
+            estimated_count.assert_not_called()
+            mock_am.database.get_session.assert_not_called()
+        finally:
+            FakeNode._app_manager = None
+
+    def test_exact_count_when_selected(self):
+        FakeNode, mock_am, connection_cls = self._build_connection("FakeCountNodeB", "fake_count_b")
+        try:
+            result, total_count, estimated_count = self._resolve(connection_cls, selected=True)
+            assert result == 42
+            total_count.assert_awaited_once()
+            estimated_count.assert_not_called()
+        finally:
+            FakeNode._app_manager = None
+
+    def test_estimated_count_when_threshold_declared(self):
+        FakeNode, mock_am, connection_cls = self._build_connection(
+            "FakeCountNodeC", "fake_count_c", threshold=500
+        )
+        try:
+            result, total_count, estimated_count = self._resolve(connection_cls, selected=True)
+            assert result == 1000
+            assert estimated_count.await_args.args[3] == 500
+            total_count.assert_not_called()
+        finally:
+            FakeNode._app_manager = None
+
+
+    def _query_info(self, user_id="user-1"):
+        from strawberry.types.graphql import OperationType
+
+        info = MagicMock()
+        info.operation.operation = OperationType.QUERY
+        info.context.connected_user = {"sub": user_id}
+        return info
+
+    def _mock_read_session(self, mock_am):
+        mock_read_session = AsyncMock()
+        mock_am.database.get_read_session.return_value = mock_read_session
+        mock_read_session.__aenter__ = AsyncMock(return_value=mock_read_session)
+        mock_read_session.__aexit__ = AsyncMock(return_value=False)
+        return mock_read_session
+
+    def test_query_counts_on_replica(self):
+        FakeNode, mock_am, connection_cls = self._build_connection("FakeCountNodeD", "fake_count_d")
+        mock_am.database.has_replicas.return_value = True
+        mock_am.database.is_primary_sticky.return_value = False
+        mock_read_session = self._mock_read_session(mock_am)
+        try:
+            result, total_count, _ = self._resolve(connection_cls, selected=True, info=self._query_info())
+            assert result == 42
+            assert total_count.await_args.args[2] is mock_read_session
+            mock_am.database.is_primary_sticky.assert_called_once_with("user-1")
+            mock_am.database.get_session.assert_not_called()
+        finally:
+            FakeNode._app_manager = None
+
+    def test_sticky_user_counts_on_primary(self):
+        FakeNode, mock_am, connection_cls = self._build_connection("FakeCountNodeE", "fake_count_e")
+        mock_am.database.has_replicas.return_value = True
+        mock_am.database.is_primary_sticky.return_value = True
+        self._mock_read_session(mock_am)
+        try:
+            self._resolve(connection_cls, selected=True, info=self._query_info())
+            mock_am.database.get_session.assert_called_once()
+            mock_am.database.get_read_session.assert_not_called()
+        finally:
+            FakeNode._app_manager = None
+
+
+class TestBuildListConnectionOptimizeStatement:
+    """Tests for LysListConnection.optimize_statement()."""
+
+    def _build_connection(self, node_name, service_name):
+        FakeNode = _make_node_for_build_list(node_name, service_name)
+        mock_am = MagicMock()
+        mock_am.registry.get_node.return_value = FakeNode
+        FakeNode._app_manager = mock_am
+        return FakeNode, FakeNode.build_list_connection()
+
+    def test_returns_statement_unchanged_without_options(self):
+        FakeNode, connection_cls = self._build_connection("FakeOptimizeNodeA", "fake_optimize_a")
+        mock_stmt = MagicMock()
+        try:
+            with patch("lys.core.graphql.nodes.get_selection_load_options", return_value=[]):
+                assert connection_cls.optimize_statement(mock_stmt, info=MagicMock()) is mock_stmt
+            mock_stmt.options.assert_not_called()
+        finally:
+            FakeNode._app_manager = None
+
+    def test_adds_options_for_node_selection(self):
+        FakeNode, connection_cls = self._build_connection("FakeOptimizeNodeB", "fake_optimize_b")
+        FakeNode.load_selection_only = True
+        mock_stmt = MagicMock()
+        option = MagicMock()
+        try:
+            with patch(
+                "lys.core.graphql.nodes.get_selected_subfields", return_value=["selected"]
+            ) as selected_subfields, patch(
+                "lys.core.graphql.nodes.get_selection_load_options", return_value=[option]
+            ) as load_options:
+                result = connection_cls.optimize_statement(mock_stmt, info=MagicMock())
+
+            assert result is mock_stmt.options.return_value
+            mock_stmt.options.assert_called_once_with(option)
+            assert selected_subfields.call_args.args[1] == ("edges", "node")
+            assert load_options.call_args.args[1:] == (["selected"], FakeNode, True)
+        finally:
+            FakeNode._app_manager = None
+
+
+class TestBuildListConnectionKeyset:
+    """Tests for the keyset (seek) pagination mode of LysListConnection."""
+
+    def _run_with_database(self, scenario):
+        """Run `scenario(connection_cls, info, base, entity_class)` against a seeded SQLite database."""
+        import os
+        import tempfile
+        from contextlib import asynccontextmanager
+        from datetime import datetime, timedelta
+        from types import SimpleNamespace
+
+        from sqlalchemy import DateTime, String
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+        class _Base(DeclarativeBase):
+            pass
+
+        class KeysetEntity(_Base):
+            __tablename__ = "keyset_entity"
+            id: Mapped[str] = mapped_column(String, primary_key=True)
+            created_at: Mapped[datetime] = mapped_column(DateTime)
+
+        FakeNode = _make_node_for_build_list("FakeKeysetNode", "fake_keyset")
+        FakeNode.keyset_pagination = True
+
+        mock_service = MagicMock()
+        mock_service.entity_class = KeysetEntity
+        mock_am = MagicMock()
+        mock_am.get_service.return_value = mock_service
+        mock_am.get_entity.return_value = KeysetEntity
+        mock_am.registry.get_node.return_value = FakeNode
+        FakeNode._app_manager = mock_am
+
+        connection_cls = FakeNode.build_list_connection()
+
+        async def run(path):
+            # file database: the count runs on its own connection
+            engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            async with engine.begin() as conn:
+                await conn.run_sync(_Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine)
+
+            @asynccontextmanager
+            async def get_session():
+                async with session_factory() as count_session:
+                    yield count_session
+
+            mock_am.database.get_session = get_session
+
+            base = datetime(2026, 1, 1)
+            async with session_factory() as session:
+                session.add_all([
+                    KeysetEntity(id="e-%02d" % i, created_at=base + timedelta(hours=i // 2))
+                    for i in range(12)
+                ])
+                await session.commit()
+
+                info = MagicMock()
+                info.schema.config.relay_max_results = 100
+                info.context.session = session
+                result = await scenario(connection_cls, info, KeysetEntity)
+
+            await engine.dispose()
+            return result
+
+        try:
+            with patch(
+                "lys.core.graphql.nodes.add_access_constraints",
+                new=AsyncMock(side_effect=lambda stmt, *args: stmt)
+            ), patch(
+                "lys.core.graphql.nodes.is_field_selected",
+                return_value=True
+            ), patch.object(
+                connection_cls, "get_edge_class",
+                return_value=lambda cursor, node: SimpleNamespace(cursor=cursor, node=node)
+            ), patch.object(
+                connection_cls, "resolve_node",
+                side_effect=lambda entity, info, **kwargs: entity.id
+            ):
+                loop = asyncio.new_event_loop()
+                try:
+                    with tempfile.TemporaryDirectory() as directory:
+                        return loop.run_until_complete(run(os.path.join(directory, "keyset.db")))
+                finally:
+                    loop.close()
+        finally:
+            FakeNode._app_manager = None
+
+    def test_forward_walk_visits_every_row_in_order(self):
+        from sqlalchemy import select
+
+        async def scenario(connection_cls, info, entity):
+            stmt = select(entity).order_by(entity.created_at.desc())
+            pages = []
+            after = None
+            while True:
+                page = await connection_cls.resolve_connection(stmt, info=info, first=5, after=after)
+                pages.append(page)
+                if not page.page_info.has_next_page:
+                    return pages
+                after = page.page_info.end_cursor
+
+        pages = self._run_with_database(scenario)
+
+        ids = [edge.node for page in pages for edge in page.edges]
+        # created_at desc, then id asc as tie breaker
+        expected = []
+        for hour in reversed(range(6)):
+            expected.extend(["e-%02d" % (hour * 2), "e-%02d" % (hour * 2 + 1)])
+        assert ids == expected
+        assert [len(page.edges) for page in pages] == [5, 5, 2]
+        assert pages[0].page_info.has_previous_page is False
+        assert pages[1].page_info.has_previous_page is True
+        assert all(page.page_info.total_count == 12 for page in pages)
+
+    def test_backward_walk_from_end(self):
+        from sqlalchemy import select
+
+        async def scenario(connection_cls, info, entity):
+            stmt = select(entity).order_by(entity.id.asc())
+            last_page = await connection_cls.resolve_connection(stmt, info=info, last=5)
+            previous_page = await connection_cls.resolve_connection(
+                stmt, info=info, last=5, before=last_page.page_info.start_cursor
+            )
+            return last_page, previous_page
+
+        last_page, previous_page = self._run_with_database(scenario)
+
+        assert [edge.node for edge in last_page.edges] == ["e-07", "e-08", "e-09", "e-10", "e-11"]
+        assert last_page.page_info.has_previous_page is True
+        assert last_page.page_info.has_next_page is False
+        assert [edge.node for edge in previous_page.edges] == ["e-02", "e-03", "e-04", "e-05", "e-06"]
+        assert previous_page.page_info.has_next_page is True
+
+    def test_rejects_first_above_max_results(self):
+        from sqlalchemy import select
+
+        async def scenario(connection_cls, info, entity):
+            try:
+                await connection_cls.resolve_connection(select(entity), info=info, first=101)
+            except ValueError as e:
+                return str(e)
+
+        assert "cannot be higher than 100" in self._run_with_database(scenario)
+
+
 class TestServiceNodeInitSubclass:
     """Tests for ServiceNode.__init_subclass__ covering line 56-58."""
 
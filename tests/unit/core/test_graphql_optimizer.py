@@ -0,0 +1,178 @@
+"""
+Unit tests for the selection-set driven eager loading optimizer.
+
+Options are applied on a real SQLite database and the statements issued are
+counted, so the tests check the number of queries a response costs.
+"""
+import asyncio
+import os
+import tempfile
+from typing import List, Optional
+
+from sqlalchemy import ForeignKey, String, Text, event, inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from strawberry.types.nodes import SelectedField
+
+from lys.core.graphql.optimizer import (
+    get_loaded_relations,
+    get_selection_load_options,
+    load_selected_relations,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Tag(_Base):
+    __tablename__ = "optimizer_tag"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+
+
+class _Status(_Base):
+    __tablename__ = "optimizer_status"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+
+
+class _Child(_Base):
+    __tablename__ = "optimizer_child"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    parent_id: Mapped[str] = mapped_column(ForeignKey("optimizer_parent.id"))
+    tag_id: Mapped[str] = mapped_column(ForeignKey("optimizer_tag.id"))
+    tag: Mapped[_Tag] = relationship(lazy="select")
+
+
+class _Parent(_Base):
+    __tablename__ = "optimizer_parent"
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status_id: Mapped[str] = mapped_column(ForeignKey("optimizer_status.id"))
+    status: Mapped[_Status] = relationship(lazy="select")
+    audit_status: Mapped[_Status] = relationship(lazy="selectin", viewonly=True)
+    children: Mapped[List[_Child]] = relationship(lazy="select")
+
+
+class _ParentNode:
+    id: str
+    name: str
+
+
+def _field(name, *selections):
+    return SelectedField(name=name, directives={}, arguments={}, selections=list(selections), alias=None)
+
+
+def _run_scenario(scenario):
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(_Base.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine)
+        async with session_factory() as session:
+            session.add_all([_Status(id="ACTIVE"), _Tag(id="RED"), _Tag(id="BLUE")])
+            for i in range(8):
+                session.add(_Parent(id="p-%d" % i, name="parent %d" % i, notes="long notes", status_id="ACTIVE"))
+                session.add_all([
+                    _Child(id="c-%d-%d" % (i, j), parent_id="p-%d" % i, tag_id="RED" if j else "BLUE")
+                    for j in range(3)
+                ])
+            await session.commit()
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async with session_factory() as session:
+            result = await scenario(session, statements)
+
+        await engine.dispose()
+        return result
+
+    loop = asyncio.new_event_loop()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            return loop.run_until_complete(run(os.path.join(directory, "optimizer.db")))
+    finally:
+        loop.close()
+
+
+class TestGetSelectionLoadOptions:
+
+    def test_no_selection_gives_no_option(self):
+        assert get_selection_load_options(_Parent, []) == []
+
+    def test_unknown_fields_are_ignored(self):
+        assert get_selection_load_options(_Parent, [_field("id"), _field("displayName")]) == []
+
+    def test_nested_selection_loads_in_fixed_number_of_queries(self):
+        selection = [
+            _field("id"),
+            _field("status", _field("id")),
+            _field("children", _field("id"), _field("tag", _field("id"))),
+        ]
+
+        async def scenario(session, statements):
+            stmt = select(_Parent).options(*get_selection_load_options(_Parent, selection))
+            parents = (await session.scalars(stmt)).all()
+            count = len(statements)
+            # everything selected is loaded: reading it issues no query
+            tags = {child.tag.id for parent in parents for child in parent.children}
+            statuses = {parent.status.id for parent in parents}
+            return count, len(statements), tags, statuses
+
+        count, count_after_access, tags, statuses = _run_scenario(scenario)
+
+        # parents joined with status, children joined with their tag, and the
+        # audit_status relation eagerly loaded by its mapping
+        assert count == 3
+        assert count_after_access == count
+        assert tags == {"RED", "BLUE"}
+        assert statuses == {"ACTIVE"}
+
+    def test_selection_only_defers_columns_and_eager_relations(self):
+        selection = [_field("id"), _field("name")]
+
+        async def scenario(session, statements):
+            options = get_selection_load_options(_Parent, selection, _ParentNode, selection_only=True)
+            parents = (await session.scalars(select(_Parent).options(*options))).all()
+            return len(statements), inspect(parents[0]).unloaded
+
+        count, unloaded = _run_scenario(scenario)
+
+        assert count == 1
+        assert "notes" in unloaded
+        assert "audit_status" in unloaded
+        assert "name" not in unloaded and "status_id" not in unloaded
+
+
+class TestLoadSelectedRelations:
+
+    def test_loads_unloaded_relations_of_one_entity(self):
+        selection = [_field("children", _field("tag", _field("id"))), _field("auditStatus", _field("id"))]
+
+        async def scenario(session, statements):
+            parent = await session.get(_Parent, "p-1")
+            loaded = get_loaded_relations(parent)
+            statements.clear()
+
+            options = get_selection_load_options(_Parent, selection, loaded_relations=loaded)
+            await load_selected_relations(session, parent, options)
+            return loaded, len(statements), sorted(child.tag.id for child in parent.children)
+
+        loaded, count, tags = _run_scenario(scenario)
+
+        assert loaded == {"audit_status"}
+        # parent, then children joined with their tag; audit_status is not reloaded
+        assert count == 2
+        assert tags == ["BLUE", "RED", "RED"]
+
+    def test_no_option_issues_no_query(self):
+        async def scenario(session, statements):
+            parent = await session.get(_Parent, "p-1")
+            statements.clear()
+            await load_selected_relations(session, parent, [])
+            return len(statements)
+
+        assert _run_scenario(scenario) == 0
@@ -0,0 +1,153 @@
+"""
+Unit tests for keyset pagination helpers.
+
+Predicates are checked against a real in-memory SQLite database so that the
+seek conditions are validated on actual rows, not on compiled SQL strings.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import DateTime, Integer, String, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from lys.core.errors import LysError
+from lys.core.graphql.pagination import (
+    apply_keyset_ordering,
+    build_keyset_predicate,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+    get_keyset_ordering,
+    reverse_keyset_ordering,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Row(_Base):
+    __tablename__ = "keyset_row"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    rank: Mapped[int] = mapped_column(Integer)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _walk(stmt, page_size):
+    """Walk every page of `stmt` with seek predicates and return the visited ids."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+
+    base = datetime(2026, 1, 1)
+    session_factory = async_sessionmaker(engine)
+    async with session_factory() as session:
+        # duplicated created_at/rank values force the tie breaker to matter
+        session.add_all([
+            _Row(id="row-%02d" % i, created_at=base + timedelta(days=i // 3), rank=i % 4)
+            for i in range(17)
+        ])
+        await session.commit()
+
+        ordering = get_keyset_ordering(stmt, _Row.id)
+        sort_keys = [column for column, _ in ordering]
+        expected = list((await session.scalars(apply_keyset_ordering(stmt, ordering))).all())
+
+        visited = []
+        cursor = None
+        while True:
+            page_stmt = stmt
+            if cursor is not None:
+                page_stmt = page_stmt.where(
+                    build_keyset_predicate(ordering, decode_keyset_cursor(cursor, len(ordering)))
+                )
+            page_stmt = apply_keyset_ordering(page_stmt, ordering).add_columns(*sort_keys).limit(page_size)
+            rows = (await session.execute(page_stmt)).all()
+            if not rows:
+                break
+            visited.extend(row[0].id for row in rows)
+            cursor = encode_keyset_cursor(rows[-1][1:])
+
+    await engine.dispose()
+    return visited, [row.id for row in expected]
+
+
+class TestGetKeysetOrdering:
+
+    def test_appends_tie_breaker(self):
+        stmt = select(_Row).order_by(_Row.created_at.desc())
+        ordering = get_keyset_ordering(stmt, _Row.id)
+        assert [descending for _, descending in ordering] == [True, False]
+        assert ordering[1][0].key == "id"
+
+    def test_does_not_duplicate_tie_breaker(self):
+        stmt = select(_Row).order_by(_Row.id.desc())
+        ordering = get_keyset_ordering(stmt, _Row.id)
+        assert len(ordering) == 1
+        assert ordering[0][1] is True
+
+    def test_plain_column_is_ascending(self):
+        stmt = select(_Row).order_by(_Row.rank)
+        ordering = get_keyset_ordering(stmt)
+        assert ordering[0][1] is False
+
+    def test_reverse_flips_directions(self):
+        ordering = get_keyset_ordering(select(_Row).order_by(_Row.rank.desc()), _Row.id)
+        assert [d for _, d in reverse_keyset_ordering(ordering)] == [False, True]
+
+
+class TestBuildKeysetPredicate:
+
+    def test_uniform_direction_uses_row_value(self):
+        ordering = get_keyset_ordering(select(_Row).order_by(_Row.rank.desc()), None)
+        ordering.append((_Row.id, True))
+        sql = str(build_keyset_predicate(ordering, [1, "a"]))
+        assert "(keyset_row.rank, keyset_row.id) <" in sql
+
+    def test_walk_descending_visits_every_row_once(self):
+        stmt = select(_Row).order_by(_Row.created_at.desc(), _Row.id.desc())
+        visited, expected = _run(_walk(stmt, 4))
+        assert visited == expected
+
+    def test_walk_mixed_directions_visits_every_row_once(self):
+        stmt = select(_Row).order_by(_Row.created_at.desc())
+        visited, expected = _run(_walk(stmt, 3))
+        assert visited == expected
+        assert len(visited) == 17
+
+    def test_walk_ascending_with_duplicates(self):
+        stmt = select(_Row).order_by(_Row.rank.asc())
+        visited, expected = _run(_walk(stmt, 5))
+        assert visited == expected
+
+
+class TestKeysetCursor:
+
+    def test_round_trip_typed_values(self):
+        values = [datetime(2026, 3, 4, 5, 6, 7), Decimal("1.50"), uuid4(), 3, "abc", None]
+        assert decode_keyset_cursor(encode_keyset_cursor(values), len(values)) == values
+
+    def test_rejects_offset_cursor(self):
+        from strawberry.relay.utils import to_base64
+        with pytest.raises(LysError):
+            decode_keyset_cursor(to_base64("arrayconnection", 3), 1)
+
+    def test_rejects_garbage(self):
+        with pytest.raises(LysError):
+            decode_keyset_cursor("not a cursor", 1)
+
+    def test_rejects_wrong_size(self):
+        with pytest.raises(LysError):
+            decode_keyset_cursor(encode_keyset_cursor([1, 2]), 3)
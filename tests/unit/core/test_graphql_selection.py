@@ -0,0 +1,65 @@
+"""
+Unit tests for GraphQL selection set helpers.
+"""
+from unittest.mock import MagicMock
+
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+
+from lys.core.graphql.selection import get_selected_subfields, is_field_selected, iter_selected_fields
+
+
+def _field(name, *selections):
+    return SelectedField(name=name, directives={}, arguments={}, selections=list(selections), alias=None)
+
+
+def _info(*selections):
+    info = MagicMock()
+    info.selected_fields = [_field("allUsers", *selections)]
+    return info
+
+
+class TestIterSelectedFields:
+
+    def test_flattens_fragments(self):
+        selections = [
+            _field("a"),
+            InlineFragment(type_condition="T", selections=[_field("b")], directives={}),
+            FragmentSpread(name="F", type_condition="T", directives={}, selections=[_field("c")]),
+        ]
+        assert [f.name for f in iter_selected_fields(selections)] == ["a", "b", "c"]
+
+
+class TestIsFieldSelected:
+
+    def test_total_count_selected(self):
+        info = _info(_field("pageInfo", _field("hasNextPage"), _field("totalCount")))
+        assert is_field_selected(info, ("page_info", "total_count")) is True
+
+    def test_total_count_not_selected(self):
+        info = _info(_field("pageInfo", _field("hasNextPage")), _field("edges", _field("node")))
+        assert is_field_selected(info, ("page_info", "total_count")) is False
+
+    def test_total_count_selected_through_fragment(self):
+        info = _info(
+            FragmentSpread(
+                name="Paging", type_condition="UserNodeListConnection", directives={},
+                selections=[_field("pageInfo", _field("totalCount"))]
+            )
+        )
+        assert is_field_selected(info, ("page_info", "total_count")) is True
+
+    def test_nothing_selected(self):
+        info = MagicMock()
+        info.selected_fields = []
+        assert is_field_selected(info, ("page_info", "total_count")) is False
+
+
+class TestGetSelectedSubfields:
+
+    def test_returns_fields_at_path(self):
+        info = _info(_field("edges", _field("node", _field("id"), _field("email"))))
+        assert [f.name for f in get_selected_subfields(info, ("edges", "node"))] == ["id", "email"]
+
+    def test_empty_path_returns_direct_children(self):
+        info = _info(_field("edges"), _field("pageInfo"))
+        assert [f.name for f in get_selected_subfields(info, ())] == ["edges", "pageInfo"]
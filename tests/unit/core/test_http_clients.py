@@ -0,0 +1,187 @@
+"""
+Unit tests for HttpClientManager.
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from lys.core.managers.http import DEFAULT_TARGET_CONFIG, HttpClientManager
+
+
+def _http_clients(config=None):
+    app_manager = MagicMock()
+    app_manager.settings.get_plugin_config.return_value = config or {}
+    return HttpClientManager(app_manager)
+
+
+@pytest.fixture
+def local_server():
+    """HTTP/1.1 keep-alive server on localhost counting the connections it accepts."""
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", connections
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestTargetConfig:
+
+    def test_defaults(self):
+        assert _http_clients().get_target_config("graphql") == DEFAULT_TARGET_CONFIG
+
+    def test_target_over_default_over_builtin(self):
+        http_clients = _http_clients({
+            "default": {"timeout": 10, "max_connections": 50},
+            "anthropic": {"timeout": 120},
+        })
+
+        config = http_clients.get_target_config("anthropic")
+
+        assert config["timeout"] == 120
+        assert config["max_connections"] == 50
+        assert config["keepalive_expiry"] == DEFAULT_TARGET_CONFIG["keepalive_expiry"]
+
+    def test_client_built_from_config(self):
+        http_clients = _http_clients({"sso": {"timeout": 5, "connect_timeout": 2, "max_connections": 7}})
+
+        with patch("httpx.Client") as mock_client:
+            http_clients.get_sync("sso", verify=False)
+
+        kwargs = mock_client.call_args.kwargs
+        assert kwargs["timeout"] == httpx.Timeout(5, connect=2)
+        assert kwargs["limits"].max_connections == 7
+        assert kwargs["verify"] is False
+        assert kwargs["http2"] is False
+
+    def test_http2_without_h2_falls_back(self):
+        http_clients = _http_clients({"mistral": {"http2": True}})
+
+        with patch("lys.core.managers.http.HTTP2_AVAILABLE", False), patch("httpx.Client") as mock_client:
+            http_clients.get_sync("mistral")
+
+        assert mock_client.call_args.kwargs["http2"] is False
+
+
+class TestAsyncClients:
+
+    @pytest.mark.asyncio
+    async def test_same_client_per_target_and_verify(self):
+        http_clients = _http_clients()
+        try:
+            graphql = http_clients.get_async("graphql")
+
+            assert http_clients.get_async("graphql") is graphql
+            assert http_clients.get_async("graphql", verify=False) is not graphql
+            assert http_clients.get_async("mistral") is not graphql
+        finally:
+            await http_clients.shutdown()
+
+        assert graphql.is_closed
+
+    def test_new_client_per_event_loop(self):
+        http_clients = _http_clients()
+
+        async def get_client():
+            return http_clients.get_async("graphql")
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_closed_client_replaced(self):
+        http_clients = _http_clients()
+        client = http_clients.get_async("graphql")
+        await client.aclose()
+
+        assert http_clients.get_async("graphql") is not client
+        await http_clients.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_initialize_opens_configured_targets(self):
+        http_clients = _http_clients({"default": {"timeout": 10}, "anthropic": {}, "mistral": {}})
+        try:
+            await http_clients.initialize()
+
+            assert sorted(target for target, _ in http_clients._async_clients) == ["anthropic", "mistral"]
+        finally:
+            await http_clients.shutdown()
+
+        assert http_clients._async_clients == {}
+
+    @pytest.mark.asyncio
+    async def test_connection_reused_across_calls(self, local_server):
+        url, connections = local_server
+        http_clients = _http_clients()
+        try:
+            for _ in range(5):
+                response = await http_clients.get_async("graphql").get(url)
+                assert response.text == "ok"
+        finally:
+            await http_clients.shutdown()
+
+        assert len(connections) == 1
+
+
+class TestSyncClients:
+
+    def test_same_client_across_threads(self):
+        http_clients = _http_clients()
+        clients = []
+
+        threads = [threading.Thread(target=lambda: clients.append(http_clients.get_sync("mistral"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(client) for client in clients}) == 1
+        http_clients.shutdown_sync()
+        assert clients[0].is_closed
+
+    def test_initialize_sync_and_shutdown_sync(self):
+        http_clients = _http_clients({"graphql": {"timeout": 5}})
+
+        http_clients.initialize_sync()
+        client = http_clients._sync_clients[("graphql", True)]
+        http_clients.shutdown_sync()
+
+        assert client.is_closed
+        assert http_clients._sync_clients == {}
+
+    def test_connection_reused_across_calls(self, local_server):
+        url, connections = local_server
+        http_clients = _http_clients()
+        try:
+            for _ in range(5):
+                assert http_clients.get_sync("graphql").get(url).text == "ok"
+        finally:
+            http_clients.shutdown_sync()
+
+        assert len(connections) == 1
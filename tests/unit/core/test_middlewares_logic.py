@@ -1,18 +1,68 @@
 """
 Unit tests for core middlewares module logic.
 
-Tests _MiddlewareLysError and ErrorManagerMiddleware.
+Tests _MiddlewareLysError, ErrorManagerMiddleware, SecurityHeadersMiddleware
+and RateLimitMiddleware. The middlewares are ASGI applications: they are called
+with a scope around a minimal downstream app and the messages they send are
+collected.
 """
 
 import asyncio
 from unittest.mock import MagicMock, AsyncMock, patch
 
+import pytest
+from starlette.responses import PlainTextResponse
+
 from lys.core.consts.environments import EnvironmentEnum
+from lys.core.errors import LysError
 from lys.core.middlewares import (
     _MiddlewareLysError, ErrorManagerMiddleware, SecurityHeadersMiddleware, RateLimitMiddleware
 )
 
 
+def _make_scope(scheme="http", client=("127.0.0.1", 50000), headers=None):
+    return {
+        "type": "http",
+        "scheme": scheme,
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": client,
+    }
+
+
+def _downstream_app():
+    """ASGI app answering 200 "ok", recording its calls."""
+    async def app(scope, receive, send):
+        app.calls += 1
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    app.calls = 0
+    return app
+
+
+def _call(middleware, scope):
+    """Run the middleware on a scope, return the status and headers it sends."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(middleware(scope, receive, send))
+    finally:
+        loop.close()
+
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    headers = {key.decode().lower(): value.decode() for key, value in start["headers"]}
+    return start["status"], headers
+
+
 class TestMiddlewareLysError:
 
     def test_dev_includes_debug_info(self):
@@ -159,145 +209,109 @@ class TestErrorManagerMiddleware:
         assert "key2" not in result
 
 
-class TestSecurityHeadersMiddleware:
+class TestErrorManagerMiddlewareCall:
 
-    def _make_request(self, scheme="http"):
-        request = MagicMock()
-        request.url.scheme = scheme
-        return request
+    def test_passes_response_through(self):
+        app = _downstream_app()
+        status, _ = _call(ErrorManagerMiddleware(app), _make_scope())
+        assert status == 200
+        assert app.calls == 1
 
-    def _make_response(self):
-        response = MagicMock()
-        response.headers = {}
-        return response
+    def test_lys_error_wrapped_without_saving(self):
+        async def app(scope, receive, send):
+            raise LysError((403, "FORBIDDEN"), "nope")
 
-    def test_sets_content_type_options(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request()
-        response = self._make_response()
+        middleware = ErrorManagerMiddleware(app)
+        mock_app_manager = MagicMock()
+        mock_app_manager.settings.env = EnvironmentEnum.PROD
 
-        async def call_next(_):
-            return response
+        with patch.object(_MiddlewareLysError, "app_manager", mock_app_manager), \
+                patch.object(_MiddlewareLysError, "save_error_in_database", AsyncMock()) as save:
+            with pytest.raises(_MiddlewareLysError) as exc_info:
+                _call(middleware, _make_scope())
 
-        loop = asyncio.new_event_loop()
-        try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
-        finally:
-            loop.close()
+        assert exc_info.value.status_code == 403
+        assert exc_info.value.detail == "FORBIDDEN"
+        save.assert_not_called()
 
-        assert result.headers["X-Content-Type-Options"] == "nosniff"
+    def test_unexpected_error_saved_with_state_context(self):
+        async def app(scope, receive, send):
+            scope.setdefault("state", {})["webservice_name"] = "all_users"
+            raise ValueError("boom")
 
-    def test_sets_frame_options(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request()
-        response = self._make_response()
+        middleware = ErrorManagerMiddleware(app)
+        mock_app_manager = MagicMock()
+        mock_app_manager.settings.env = EnvironmentEnum.PROD
 
-        async def call_next(_):
-            return response
+        with patch.object(_MiddlewareLysError, "app_manager", mock_app_manager), \
+                patch.object(_MiddlewareLysError, "save_error_in_database", AsyncMock()) as save:
+            with pytest.raises(_MiddlewareLysError) as exc_info:
+                _call(middleware, _make_scope())
 
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.debug_message == "boom"
+        save.assert_awaited_once_with({"webservice_name": "all_users"})
+
+    def test_non_http_scope_passes_through(self):
+        app = AsyncMock()
+        scope = {"type": "lifespan"}
         loop = asyncio.new_event_loop()
         try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
+            loop.run_until_complete(ErrorManagerMiddleware(app)(scope, "receive", "send"))
         finally:
             loop.close()
+        app.assert_awaited_once_with(scope, "receive", "send")
 
-        assert result.headers["X-Frame-Options"] == "DENY"
 
-    def test_sets_referrer_policy(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request()
-        response = self._make_response()
+class TestSecurityHeadersMiddleware:
 
-        async def call_next(_):
-            return response
+    def test_sets_content_type_options(self):
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope())
+        assert headers["x-content-type-options"] == "nosniff"
 
-        loop = asyncio.new_event_loop()
-        try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
-        finally:
-            loop.close()
+    def test_sets_frame_options(self):
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope())
+        assert headers["x-frame-options"] == "DENY"
 
-        assert result.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+    def test_sets_referrer_policy(self):
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope())
+        assert headers["referrer-policy"] == "strict-origin-when-cross-origin"
 
     def test_sets_permissions_policy(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request()
-        response = self._make_response()
-
-        async def call_next(_):
-            return response
-
-        loop = asyncio.new_event_loop()
-        try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
-        finally:
-            loop.close()
-
-        assert result.headers["Permissions-Policy"] == "camera=(), microphone=(), geolocation=()"
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope())
+        assert headers["permissions-policy"] == "camera=(), microphone=(), geolocation=()"
 
     def test_no_hsts_on_http(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request(scheme="http")
-        response = self._make_response()
-
-        async def call_next(_):
-            return response
-
-        loop = asyncio.new_event_loop()
-        try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
-        finally:
-            loop.close()
-
-        assert "Strict-Transport-Security" not in result.headers
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope(scheme="http"))
+        assert "strict-transport-security" not in headers
 
     def test_hsts_on_https(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request(scheme="https")
-        response = self._make_response()
-
-        async def call_next(_):
-            return response
-
-        loop = asyncio.new_event_loop()
-        try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
-        finally:
-            loop.close()
-
-        assert result.headers["Strict-Transport-Security"] == "max-age=31536000; includeSubDomains"
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope(scheme="https"))
+        assert headers["strict-transport-security"] == "max-age=31536000; includeSubDomains"
 
     def test_all_headers_present_on_https(self):
-        middleware = SecurityHeadersMiddleware(MagicMock())
-        request = self._make_request(scheme="https")
-        response = self._make_response()
+        _, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope(scheme="https"))
 
-        async def call_next(_):
-            return response
+        assert "x-content-type-options" in headers
+        assert "x-frame-options" in headers
+        assert "referrer-policy" in headers
+        assert "permissions-policy" in headers
+        assert "strict-transport-security" in headers
 
-        loop = asyncio.new_event_loop()
-        try:
-            result = loop.run_until_complete(middleware.dispatch(request, call_next))
-        finally:
-            loop.close()
+    def test_keeps_response_headers(self):
+        status, headers = _call(SecurityHeadersMiddleware(_downstream_app()), _make_scope())
+        assert status == 200
+        assert headers["content-type"].startswith("text/plain")
 
-        assert "X-Content-Type-Options" in result.headers
-        assert "X-Frame-Options" in result.headers
-        assert "Referrer-Policy" in result.headers
-        assert "Permissions-Policy" in result.headers
-        assert "Strict-Transport-Security" in result.headers
+    def test_overrides_downstream_value(self):
+        async def app(scope, receive, send):
+            await PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})(scope, receive, send)
 
+        _, headers = _call(SecurityHeadersMiddleware(app), _make_scope())
+        assert headers["x-frame-options"] == "DENY"
 
-class TestRateLimitMiddleware:
 
-    def _make_request(self, ip="127.0.0.1", headers=None):
-        request = MagicMock()
-        request.client.host = ip
-        request.headers = headers or {}
-        return request
-
-    def _make_response(self):
-        return MagicMock()
+class TestRateLimitMiddleware:
 
     def _create_middleware(self, config=None, pubsub=None):
         mock_app_manager = MagicMock()
@@ -306,16 +320,15 @@ class TestRateLimitMiddleware:
             mock_app_manager.settings.plugins["rate_limit"] = config
         mock_app_manager.pubsub = pubsub
 
+        app = _downstream_app()
         with patch.object(RateLimitMiddleware, "app_manager", mock_app_manager):
-            middleware = RateLimitMiddleware(MagicMock())
+            middleware = RateLimitMiddleware(app)
         return middleware, mock_app_manager
 
-    def _run(self, coro):
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
+    def _call(self, middleware, mock_am, scope=None):
+        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
+            status, headers = _call(middleware, scope or _make_scope())
+        return status, headers
 
     def test_default_config(self):
         middleware, _ = self._create_middleware()
@@ -328,173 +341,154 @@ class TestRateLimitMiddleware:
         assert middleware.enabled is False
 
     def test_disabled_passes_through(self):
-        middleware, _ = self._create_middleware({"enabled": False})
-        request = self._make_request()
-        response = self._make_response()
+        middleware, mock_am = self._create_middleware({"enabled": False, "requests_per_minute": 1})
 
-        async def call_next(_):
-            return response
+        for _ in range(3):
+            status, _ = self._call(middleware, mock_am)
+            assert status == 200
 
-        result = self._run(middleware.dispatch(request, call_next))
-        assert result is response
+        assert middleware.app.calls == 3
+        assert middleware.limiter._memory_store == {}
 
     def test_allows_under_limit_memory(self):
         middleware, mock_am = self._create_middleware({"requests_per_minute": 5})
-        request = self._make_request()
-        response = self._make_response()
-
-        async def call_next(_):
-            return response
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            result = self._run(middleware.dispatch(request, call_next))
+        status, _ = self._call(middleware, mock_am)
 
-        assert result is response
+        assert status == 200
+        assert middleware.app.calls == 1
 
     def test_blocks_over_limit_memory(self):
         middleware, mock_am = self._create_middleware({"requests_per_minute": 3})
-        request = self._make_request()
-        response = self._make_response()
 
-        async def call_next(_):
-            return response
+        # Send 3 allowed requests
+        for _ in range(3):
+            self._call(middleware, mock_am)
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            # Send 3 allowed requests
-            for _ in range(3):
-                self._run(middleware.dispatch(request, call_next))
+        # 4th request should be blocked
+        status, headers = self._call(middleware, mock_am)
 
-            # 4th request should be blocked
-            result = self._run(middleware.dispatch(request, call_next))
-
-        assert result.status_code == 429
-        assert result.body is not None
+        assert status == 429
+        assert headers["content-type"] == "application/json"
+        assert middleware.app.calls == 3
 
     def test_different_ips_have_separate_limits(self):
         middleware, mock_am = self._create_middleware({"requests_per_minute": 2})
-        response = self._make_response()
+        scope_a = lambda: _make_scope(client=("10.0.0.1", 1))
+        scope_b = lambda: _make_scope(client=("10.0.0.2", 1))
 
-        async def call_next(_):
-            return response
+        # Exhaust limit for IP A
+        for _ in range(2):
+            self._call(middleware, mock_am, scope_a())
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            # Exhaust limit for IP A
-            for _ in range(2):
-                self._run(middleware.dispatch(self._make_request("10.0.0.1"), call_next))
+        # IP A blocked
+        status_a, _ = self._call(middleware, mock_am, scope_a())
+        assert status_a == 429
+
+        # IP B still allowed
+        status_b, _ = self._call(middleware, mock_am, scope_b())
+        assert status_b == 200
 
-            # IP A blocked
-            result_a = self._run(middleware.dispatch(self._make_request("10.0.0.1"), call_next))
-            assert result_a.status_code == 429
+    def test_service_calls_use_separate_bucket(self):
+        middleware, mock_am = self._create_middleware({"requests_per_minute": 1, "service_requests_per_minute": 2})
+        service_scope = lambda: _make_scope(headers={"Authorization": "Service token"})
 
-            # IP B still allowed
-            result_b = self._run(middleware.dispatch(self._make_request("10.0.0.2"), call_next))
-            assert result_b is response
+        assert self._call(middleware, mock_am)[0] == 200
+        assert self._call(middleware, mock_am)[0] == 429
+        assert self._call(middleware, mock_am, service_scope())[0] == 200
+        assert self._call(middleware, mock_am, service_scope())[0] == 200
+        assert self._call(middleware, mock_am, service_scope())[0] == 429
+        assert "rate_limit_svc:127.0.0.1" in middleware.limiter._memory_store
 
     def test_429_has_retry_after_header(self):
         middleware, mock_am = self._create_middleware({"requests_per_minute": 1})
-        request = self._make_request()
-        response = self._make_response()
 
-        async def call_next(_):
-            return response
+        self._call(middleware, mock_am)
+        status, headers = self._call(middleware, mock_am)
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            self._run(middleware.dispatch(request, call_next))
-            result = self._run(middleware.dispatch(request, call_next))
-
-        assert result.status_code == 429
-        assert result.headers["Retry-After"] == "60"
+        assert status == 429
+        assert headers["retry-after"] == "60"
 
-    def test_uses_redis_when_available(self):
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=1)
-        mock_redis.expire = AsyncMock()
+    def _redis_pubsub(self, script):
+        mock_redis = MagicMock()
+        mock_redis.register_script = MagicMock(return_value=script)
 
         mock_pubsub = MagicMock()
         mock_pubsub._async_redis = mock_redis
+        return mock_pubsub, mock_redis
+
+    def test_uses_redis_when_available(self):
+        script = AsyncMock(return_value=1)
+        mock_pubsub, mock_redis = self._redis_pubsub(script)
 
         middleware, mock_am = self._create_middleware(pubsub=mock_pubsub)
-        request = self._make_request()
-        response = self._make_response()
 
-        async def call_next(_):
-            return response
+        status, _ = self._call(middleware, mock_am)
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            result = self._run(middleware.dispatch(request, call_next))
-
-        assert result is response
-        mock_redis.incr.assert_called_once_with("rate_limit:127.0.0.1")
-        mock_redis.expire.assert_called_once_with("rate_limit:127.0.0.1", 60)
+        assert status == 200
+        # one atomic script call per request: current and previous window counters
+        script.assert_awaited_once()
+        keys = script.call_args.kwargs["keys"]
+        assert len(keys) == 2
+        assert all(key.startswith("{rate_limit:127.0.0.1}:") for key in keys)
+        assert script.call_args.kwargs["args"][0] == 60
+        assert middleware.limiter._memory_store == {}
 
     def test_redis_over_limit_returns_429(self):
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=61)
-
-        mock_pubsub = MagicMock()
-        mock_pubsub._async_redis = mock_redis
+        mock_pubsub, _ = self._redis_pubsub(AsyncMock(return_value=0))
 
         middleware, mock_am = self._create_middleware(pubsub=mock_pubsub)
-        request = self._make_request()
-        response = self._make_response()
 
-        async def call_next(_):
-            return response
+        status, _ = self._call(middleware, mock_am)
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            result = self._run(middleware.dispatch(request, call_next))
-
-        assert result.status_code == 429
+        assert status == 429
 
-    def test_redis_expire_only_on_first_incr(self):
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=5)
-
-        mock_pubsub = MagicMock()
-        mock_pubsub._async_redis = mock_redis
+    def test_redis_script_registered_once(self):
+        mock_pubsub, mock_redis = self._redis_pubsub(AsyncMock(return_value=1))
 
         middleware, mock_am = self._create_middleware(pubsub=mock_pubsub)
-        request = self._make_request()
-        response = self._make_response()
-
-        async def call_next(_):
-            return response
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            self._run(middleware.dispatch(request, call_next))
+        for _ in range(3):
+            self._call(middleware, mock_am)
 
-        mock_redis.expire.assert_not_called()
+        mock_redis.register_script.assert_called_once()
 
     def test_redis_failure_allows_request(self):
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(side_effect=Exception("Redis down"))
-
-        mock_pubsub = MagicMock()
-        mock_pubsub._async_redis = mock_redis
+        mock_pubsub, _ = self._redis_pubsub(AsyncMock(side_effect=Exception("Redis down")))
 
         middleware, mock_am = self._create_middleware(pubsub=mock_pubsub)
-        request = self._make_request()
-        response = self._make_response()
 
-        async def call_next(_):
-            return response
+        status, _ = self._call(middleware, mock_am)
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            result = self._run(middleware.dispatch(request, call_next))
+        assert status == 200
+
+    def test_memory_max_keys_config(self):
+        middleware, mock_am = self._create_middleware({"requests_per_minute": 5, "memory_max_keys": 2})
 
-        assert result is response
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            self._call(middleware, mock_am, _make_scope(client=(ip, 1)))
+
+        assert list(middleware.limiter._memory_store) == ["rate_limit:10.0.0.2", "rate_limit:10.0.0.3"]
 
     def test_no_client_uses_unknown_ip(self):
         middleware, mock_am = self._create_middleware({"requests_per_minute": 1})
-        request = MagicMock()
-        request.client = None
-        request.headers = {}
-        response = self._make_response()
 
-        async def call_next(_):
-            return response
+        self._call(middleware, mock_am, _make_scope(client=None))
 
-        with patch.object(RateLimitMiddleware, "app_manager", mock_am):
-            self._run(middleware.dispatch(request, call_next))
+        assert "rate_limit:unknown" in middleware.limiter._memory_store
+
+    def test_non_http_scope_passes_through(self):
+        middleware, mock_am = self._create_middleware({"requests_per_minute": 1})
+        middleware.app = AsyncMock()
+        scope = {"type": "websocket", "path": "/", "headers": []}
+
+        loop = asyncio.new_event_loop()
+        try:
+            with patch.object(RateLimitMiddleware, "app_manager", mock_am):
+                for _ in range(2):
+                    loop.run_until_complete(middleware(scope, "receive", "send"))
+        finally:
+            loop.close()
 
-        assert "rate_limit:unknown" in middleware._memory_store
+        assert middleware.app.await_count == 2
+        assert middleware.limiter._memory_store == {}
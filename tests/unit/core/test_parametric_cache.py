@@ -0,0 +1,322 @@
+"""
+Unit tests for ParametricCacheManager.
+
+The cache runs against a real SQLite database so the statements it saves can be
+counted.
+"""
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import ForeignKey, event, select, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from lys.core.entities import Entity, ParametricEntity
+from lys.core.managers.parametric_cache import (
+    PARAMETRIC_CACHE_CHANNEL,
+    PARAMETRIC_CACHE_INVALIDATED,
+    ParametricCacheManager,
+    get_selectin_load_key,
+)
+from lys.core.services import EntityService
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Status(ParametricEntity, _Base):
+    __tablename__ = "cache_status"
+    __abstract__ = False
+
+
+class _Kind(ParametricEntity, _Base):
+    __tablename__ = "cache_kind"
+    __abstract__ = False
+    status_id: Mapped[str] = mapped_column(ForeignKey("cache_status.id"))
+    status: Mapped[_Status] = relationship(lazy="selectin")
+
+
+class _Owner(Entity, _Base):
+    __tablename__ = "cache_owner"
+    __abstract__ = False
+
+
+class _Plan(ParametricEntity, _Base):
+    """Parametric entity related to business data: not cached."""
+    __tablename__ = "cache_plan"
+    __abstract__ = False
+    owner_id: Mapped[Optional[str]] = mapped_column(ForeignKey("cache_owner.id"), nullable=True)
+    owner: Mapped[Optional[_Owner]] = relationship(lazy="selectin")
+
+
+class _Item(Entity, _Base):
+    __tablename__ = "cache_item"
+    __abstract__ = False
+    status_id: Mapped[str] = mapped_column(ForeignKey("cache_status.id"))
+    status: Mapped[_Status] = relationship(lazy="selectin")
+    kind_id: Mapped[Optional[str]] = mapped_column(ForeignKey("cache_kind.id"), nullable=True)
+    kind: Mapped[Optional[_Kind]] = relationship(lazy="selectin")
+
+
+def _run_scenario(scenario, pubsub=None, relation_results=1000):
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(_Base.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add_all([_Status(id="ENABLED"), _Status(id="DISABLED", enabled=False)])
+            session.add_all([_Kind(id="STANDARD", status_id="ENABLED"), _Plan(id="FREE")])
+            session.add_all([
+                _Item(status_id="ENABLED" if i % 2 else "DISABLED", kind_id="STANDARD") for i in range(6)
+            ])
+            await session.commit()
+
+        @asynccontextmanager
+        async def get_session():
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        app_manager = MagicMock()
+        app_manager.settings.database.parametric_cache = True
+        app_manager.settings.database.parametric_cache_relation_results = relation_results
+        app_manager.registry.entities = {
+            entity.__tablename__: entity for entity in (_Status, _Kind, _Owner, _Plan, _Item)
+        }
+        app_manager.database.get_session = get_session
+        app_manager.pubsub = pubsub
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        cache = ParametricCacheManager(app_manager)
+        cache.install()
+        try:
+            await cache.warm()
+            statements.clear()
+            return await scenario(cache, session_factory, statements)
+        finally:
+            await cache.shutdown()
+            await engine.dispose()
+
+    loop = asyncio.new_event_loop()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            return loop.run_until_complete(run(os.path.join(directory, "cache.db")))
+    finally:
+        loop.close()
+
+
+class TestParametricCacheRelationships:
+
+    def test_relationship_loads_served_from_cache(self):
+        async def scenario(cache, session_factory, statements):
+            counts = []
+            for _ in range(2):
+                statements.clear()
+                async with session_factory() as session:
+                    items = (await session.scalars(select(_Item))).all()
+                    counts.append(len(statements))
+                    values = sorted((item.status.id, item.status.enabled, item.kind.status.id) for item in items)
+                    attached = all(item.status in session for item in items)
+            return counts, values, attached
+
+        counts, values, attached = _run_scenario(scenario)
+
+        # the first run fills the relationship results, the second only selects the items
+        assert counts == [4, 1]
+        assert values[0] == ("DISABLED", False, "ENABLED")
+        assert values[-1] == ("ENABLED", True, "ENABLED")
+        assert attached
+
+    def test_relationship_results_bounded(self):
+        async def scenario(cache, session_factory, statements):
+            for status_id in ("ENABLED", "DISABLED", "ENABLED"):
+                async with session_factory() as session:
+                    (await session.scalars(select(_Item).where(_Item.status_id == status_id))).all()
+            return list(cache._relation_results["cache_status"].values())
+
+        results = _run_scenario(scenario, relation_results=1)
+
+        assert len(results) == 1
+        assert [row[0].id for row in results[0].data] == ["ENABLED"]
+
+    def test_selectin_load_key_matches_sqlalchemy_internals(self):
+        """Fails when the SQLAlchemy internals get_selectin_load_key relies on change."""
+        async def scenario(cache, session_factory, statements):
+            keys = []
+
+            def record(orm_execute_state):
+                if orm_execute_state.is_relationship_load:
+                    keys.append(get_selectin_load_key(orm_execute_state))
+
+            cache.uninstall()
+            async with session_factory() as session:
+                event.listen(session.sync_session, "do_orm_execute", record)
+                (await session.scalars(select(_Item))).all()
+            return keys
+
+        keys = _run_scenario(scenario)
+
+        assert None not in keys, "selectin loads no longer bind 'primary_keys' or have no cache key"
+        assert frozenset({"ENABLED", "DISABLED"}) in [primary_keys for _, primary_keys in keys]
+
+    def test_only_closed_parametric_entities_are_cached(self):
+        async def scenario(cache, session_factory, statements):
+            return set(cache._rows)
+
+        assert _run_scenario(scenario) == {"cache_status", "cache_kind"}
+
+
+class TestParametricCacheGet:
+
+    def test_get_merges_cached_row_without_statement(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                status = await cache.get(_Status, "DISABLED", session)
+                return status.id, status.enabled, status in session, len(statements)
+
+        assert _run_scenario(scenario) == ("DISABLED", False, True, 0)
+
+    def test_get_unknown_id(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                return await cache.get(_Status, "UNKNOWN", session)
+
+        assert _run_scenario(scenario) is None
+
+    def test_get_returns_session_entity_with_pending_changes(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                status = (await session.scalars(select(_Status).where(_Status.id == "ENABLED"))).one()
+                status.description = "changed"
+                cached = await cache.get(_Status, "ENABLED", session)
+                return cached is status, cached.description
+
+        assert _run_scenario(scenario) == (True, "changed")
+
+    def test_get_skips_cache_after_change_in_transaction(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                await session.execute(update(_Status).values(description="bulk"))
+                return await cache.get(_Status, "ENABLED", session)
+
+        assert _run_scenario(scenario) is None
+
+    def test_entity_service_get_by_id_reads_through_cache(self):
+        async def scenario(cache, session_factory, statements):
+            service = type("StatusService", (EntityService,), {})
+            service.service_name = "cache_status"
+            app_manager = MagicMock()
+            app_manager.get_entity.return_value = _Status
+            app_manager.parametric_cache = cache
+
+            async with session_factory() as session:
+                with patch.object(service, "app_manager", app_manager):
+                    cached = await service.get_by_id("ENABLED", session)
+                    cached_count = len(statements)
+                    unknown = await service.get_by_id("UNKNOWN", session)
+            return cached.id, cached_count, unknown, len(statements)
+
+        assert _run_scenario(scenario) == ("ENABLED", 0, None, 1)
+
+
+class TestParametricCacheInvalidation:
+
+    def test_commit_invalidates_reloads_and_publishes(self):
+        pubsub = MagicMock()
+        pubsub.publish = AsyncMock()
+
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                status = await cache.get(_Status, "ENABLED", session)
+                status.description = "changed"
+                await session.commit()
+
+            # dropped with the kinds holding a status, then reloaded in the background
+            dropped = {"cache_status", "cache_kind"}.isdisjoint(cache._rows)
+            await asyncio.sleep(0.1)
+
+            async with session_factory() as session:
+                status = await cache.get(_Status, "ENABLED", session)
+            return dropped, status.description
+
+        dropped, description = _run_scenario(scenario, pubsub)
+
+        assert dropped
+        assert description == "changed"
+        channel, signal, params = pubsub.publish.await_args.args
+        assert (channel, signal, params["tables"]) == (
+            PARAMETRIC_CACHE_CHANNEL, PARAMETRIC_CACHE_INVALIDATED, ["cache_status"]
+        )
+
+    def test_bulk_update_invalidates(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                await session.execute(update(_Kind).values(description="bulk"))
+                await session.commit()
+            return "cache_kind" in cache._rows, "cache_status" in cache._rows
+
+        assert _run_scenario(scenario) == (False, True)
+
+    def test_rollback_keeps_cache(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                status = await cache.get(_Status, "ENABLED", session)
+                status.description = "changed"
+                await session.flush()
+                await session.rollback()
+            async with session_factory() as session:
+                await session.commit()
+            return "cache_status" in cache._rows
+
+        assert _run_scenario(scenario) is True
+
+    def test_business_data_changes_keep_cache(self):
+        async def scenario(cache, session_factory, statements):
+            async with session_factory() as session:
+                session.add(_Item(status_id="ENABLED"))
+                await session.commit()
+            return set(cache._rows)
+
+        assert _run_scenario(scenario) == {"cache_status", "cache_kind"}
+
+    def test_messages_from_other_processes_invalidate(self):
+        async def scenario(cache, session_factory, statements):
+            async def subscribe(channel):
+                yield {"signal": PARAMETRIC_CACHE_INVALIDATED,
+                       "params": {"tables": ["cache_kind"], "origin": cache.origin}}
+                yield {"signal": PARAMETRIC_CACHE_INVALIDATED,
+                       "params": {"tables": ["cache_status"], "origin": "other"}}
+
+            cache.app_manager.pubsub = MagicMock(subscribe=subscribe)
+            cache._warmed = False
+            await cache._listen()
+            return set(cache._rows)
+
+        # own message ignored, the status drops the kinds too
+        assert _run_scenario(scenario) == set()
+
+
+class TestParametricCacheVersion:
+
+    def test_version_changes_with_committed_changes(self):
+        async def scenario(cache, session_factory, statements):
+            before = cache.get_version(["cache_status", "cache_item"])
+            async with session_factory() as session:
+                await session.execute(update(_Status).values(description="bulk"))
+                in_transaction = cache.get_version(["cache_status"], session)
+                other_table = cache.get_version(["cache_kind"], session)
+                await session.commit()
+            after = cache.get_version(["cache_status", "cache_item"])
+            return before != after, before[1] == after[1], in_transaction, other_table is not None
+
+        assert _run_scenario(scenario) == (True, True, None, True)
@@ -6,7 +6,17 @@ Tests Service base class and EntityService value comparison methods.
 
 import asyncio
 import logging
+import os
+import tempfile
+from datetime import datetime, UTC
+from typing import Optional
 from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import DateTime, ForeignKey, String, Uuid, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from lys.core.entities import Entity
 from lys.core.services import EntityService, Service
@@ -241,3 +251,246 @@ class TestFilterAllowedFields:
         with patch.object(service, "app_manager", mock_am):
             result = service._filter_allowed_fields({"roles": [], "client": MagicMock()})
         assert result == {}
+
+
+def _run_item_service_scenario(scenario):
+    """Run `scenario(service, session, statements)` against a real SQLite database.
+
+    `statements` collects the SQL statements issued, so tests can check how many
+    round trips an operation costs.
+    """
+    class _Base(DeclarativeBase):
+        pass
+
+    class _Category(_Base):
+        __tablename__ = "bulk_category"
+        id: Mapped[str] = mapped_column(String, primary_key=True)
+
+    class _Item(_Base):
+        __tablename__ = "bulk_item"
+        id: Mapped[str] = mapped_column(Uuid(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
+        code: Mapped[str] = mapped_column(String, unique=True)
+        name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+        category_id: Mapped[Optional[str]] = mapped_column(ForeignKey("bulk_category.id"), nullable=True)
+        category: Mapped[Optional[_Category]] = relationship()
+        created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+        updated_at: Mapped[Optional[datetime]] = mapped_column(
+            DateTime(timezone=True), nullable=True, onupdate=lambda: datetime.now(UTC)
+        )
+
+    service = type("ItemService", (EntityService,), {})
+    service.service_name = "bulk_item"
+    mock_app_manager = MagicMock()
+    mock_app_manager.get_entity.return_value = _Item
+
+    async def run(path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(_Base.metadata.create_all)
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+
+        async with async_sessionmaker(engine)() as session:
+            with patch.object(service, "app_manager", mock_app_manager):
+                result = await scenario(service, session, statements)
+        await engine.dispose()
+        return result
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        return asyncio.run(run(path))
+    finally:
+        os.remove(path)
+
+
+class TestBulkOperations:
+    """Bulk create/update/upsert run against a real SQLite database, counting statements."""
+
+    _run = staticmethod(_run_item_service_scenario)
+
+    def test_create_many_one_statement_per_key_set(self):
+        async def scenario(service, session, statements):
+            statements.clear()
+            entities = await service.create_many(session, [
+                {"code": "a"}, {"code": "b", "name": "B"}, {"code": "c"}, {"code": "d", "name": "D"},
+            ])
+            return entities, len(statements)
+
+        entities, count = self._run(scenario)
+
+        assert [entity.code for entity in entities] == ["a", "b", "c", "d"]
+        assert [entity.name for entity in entities] == [None, "B", None, "D"]
+        assert all(entity.id and entity.created_at for entity in entities)
+        assert len({entity.id for entity in entities}) == 4
+        assert count == 2
+
+    def test_create_many_empty(self):
+        async def scenario(service, session, statements):
+            return await service.create_many(session, [])
+
+        assert self._run(scenario) == []
+
+    def test_create_many_chunks(self):
+        async def scenario(service, session, statements):
+            service.bulk_chunk_size = 3
+            statements.clear()
+            entities = await service.create_many(session, [{"code": str(i)} for i in range(7)])
+            return entities, len(statements)
+
+        entities, count = self._run(scenario)
+
+        assert [entity.code for entity in entities] == [str(i) for i in range(7)]
+        assert count == 3
+
+    def test_create_many_filters_unknown_fields(self):
+        async def scenario(service, session, statements):
+            return await service.create_many(session, [{"code": "a", "is_super_user": True}])
+
+        entities = self._run(scenario)
+
+        assert entities[0].code == "a"
+
+    def test_bulk_rejects_relationships(self):
+        async def scenario(service, session, statements):
+            with pytest.raises(ValueError):
+                await service.create_many(session, [{"code": "a", "category": MagicMock()}])
+
+        self._run(scenario)
+
+    def test_update_many_executemany_and_select_back(self):
+        async def scenario(service, session, statements):
+            created = await service.create_many(session, [{"code": str(i)} for i in range(4)])
+            statements.clear()
+            updated = await service.update_many(session, [
+                {"id": created[2].id, "name": "two"},
+                {"id": created[0].id, "name": "zero"},
+            ])
+            return created, updated, len(statements)
+
+        created, updated, count = self._run(scenario)
+
+        assert [entity.id for entity in updated] == [created[2].id, created[0].id]
+        assert [entity.name for entity in updated] == ["two", "zero"]
+        assert all(entity.updated_at is not None for entity in updated)
+        assert created[1].name is None
+        assert count == 2
+
+    def test_update_many_requires_id(self):
+        async def scenario(service, session, statements):
+            with pytest.raises(ValueError):
+                await service.update_many(session, [{"name": "nameless"}])
+
+        self._run(scenario)
+
+    def test_upsert_many_inserts_and_updates(self):
+        async def scenario(service, session, statements):
+            existing = (await service.create_many(session, [{"code": "b", "name": "old"}]))[0]
+            statements.clear()
+            entities = await service.upsert_many(
+                session,
+                [{"code": "a", "name": "A"}, {"code": "b", "name": "B"}, {"code": "c", "name": "C"}],
+                conflict_columns=["code"],
+            )
+            return existing, entities, len(statements)
+
+        existing, entities, count = self._run(scenario)
+
+        assert [entity.code for entity in entities] == ["a", "b", "c"]
+        assert [entity.name for entity in entities] == ["A", "B", "C"]
+        # the existing row keeps its id and gets its onupdate timestamp
+        assert entities[1] is existing
+        assert entities[1].updated_at is not None
+        assert entities[0].updated_at is None
+        assert count == 1
+
+    def test_upsert_many_requires_conflict_columns(self):
+        async def scenario(service, session, statements):
+            with pytest.raises(ValueError):
+                await service.upsert_many(session, [{"name": "A"}], conflict_columns=["code"])
+
+        self._run(scenario)
+
+
+class TestGetMultipleByIds:
+    """get_multiple_by_ids serves the identity map first and selects the rest in one query."""
+
+    def test_returns_input_order_in_one_query(self):
+        async def scenario(service, session, statements):
+            created = await service.create_many(session, [{"code": str(i)} for i in range(30)])
+            ids = [entity.id for entity in created]
+            await session.commit()
+            session.expunge_all()
+            statements.clear()
+            wanted = ids[::-1][:25]
+            entities = await service.get_multiple_by_ids(wanted, session)
+            return wanted, entities, len(statements), [entity in session for entity in entities]
+
+        wanted, entities, count, attached = _run_item_service_scenario(scenario)
+
+        assert [entity.id for entity in entities] == wanted
+        assert count == 1
+        assert all(attached)
+
+    def test_identity_map_hits_cost_no_query(self):
+        async def scenario(service, session, statements):
+            created = await service.create_many(session, [{"code": str(i)} for i in range(3)])
+            statements.clear()
+            entities = await service.get_multiple_by_ids([entity.id for entity in created], session)
+            return created, entities, len(statements)
+
+        created, entities, count = _run_item_service_scenario(scenario)
+
+        assert entities == created
+        assert count == 0
+
+    def test_expired_entities_are_selected_again(self):
+        async def scenario(service, session, statements):
+            created = await service.create_many(session, [{"code": "a"}, {"code": "b"}])
+            ids = [entity.id for entity in created]
+            session.expire(created[1])
+            statements.clear()
+            entities = await service.get_multiple_by_ids(ids, session)
+            return created, entities, len(statements)
+
+        created, entities, count = _run_item_service_scenario(scenario)
+
+        assert entities == created
+        assert entities[1].code == "b"
+        assert count == 1
+
+    def test_skips_unknown_and_duplicate_ids(self):
+        async def scenario(service, session, statements):
+            created = await service.create_many(session, [{"code": "a"}])
+            session.expunge_all()
+            return created, await service.get_multiple_by_ids(
+                [created[0].id, str(uuid4()), created[0].id], session
+            )
+
+        created, entities = _run_item_service_scenario(scenario)
+
+        assert [entity.id for entity in entities] == [created[0].id]
+
+    def test_chunks_on_bound_parameter_limit(self):
+        async def scenario(service, session, statements):
+            created = await service.create_many(session, [{"code": str(i)} for i in range(5)])
+            session.expunge_all()
+            statements.clear()
+            with patch("lys.core.services.get_max_bound_parameters", return_value=2):
+                entities = await service.get_multiple_by_ids([entity.id for entity in created], session)
+            return created, entities, len(statements)
+
+        created, entities, count = _run_item_service_scenario(scenario)
+
+        assert [entity.id for entity in entities] == [entity.id for entity in created]
+        assert count == 3
+
+    def test_empty_list(self):
+        async def scenario(service, session, statements):
+            return await service.get_multiple_by_ids([], session)
+
+        assert _run_item_service_scenario(scenario) == []
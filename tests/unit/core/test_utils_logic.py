@@ -2,12 +2,15 @@
 Unit tests for core utility modules.
 
 Tests cover:
-- AuthUtils (core): generate_token, decode_token
+- AuthUtils (core): generate_token, decode_token, token reuse
+- VerifiedServiceTokenCache
 - datetime utils: now_utc
 """
 
+import time
+
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone
 
 import jwt
@@ -144,6 +147,93 @@ class TestCoreAuthUtils:
 
         assert utils1.instance_id != utils2.instance_id
 
+    def test_generate_token_reuses_valid_token(self):
+        """Test generate_token returns the previously minted token while it is valid."""
+        from lys.core.utils.auth import ServiceAuthUtils
+
+        utils = ServiceAuthUtils("test-secret")
+
+        with patch("lys.core.utils.auth.jwt.encode", wraps=jwt.encode) as encode:
+            token1 = utils.generate_token("my-service")
+            token2 = utils.generate_token("my-service")
+            other_service = utils.generate_token("other-service")
+            other_expiration = utils.generate_token("my-service", expiration_minutes=5)
+
+        assert token1 == token2
+        assert other_service != token1
+        assert other_expiration != token1
+        assert encode.call_count == 3
+
+    def test_generate_token_renews_before_exp(self):
+        """Test a token is minted again once it is within the reuse margin of its exp."""
+        from lys.core.utils.auth import ServiceAuthUtils
+
+        utils = ServiceAuthUtils("test-secret")
+        token1 = utils.generate_token("my-service")
+        exp = utils._minted_tokens[("my-service", 1)][1]
+
+        with patch("lys.core.utils.auth.time.time", return_value=exp - utils.TOKEN_REUSE_MARGIN_SECONDS + 1), \
+                patch("lys.core.utils.auth.jwt.encode", return_value="renewed") as encode:
+            token2 = utils.generate_token("my-service")
+
+        encode.assert_called_once()
+        assert token2 == "renewed" != token1
+
+    def test_shared_instance_per_secret(self):
+        """Test shared returns one instance per secret key."""
+        from lys.core.utils.auth import ServiceAuthUtils
+
+        assert ServiceAuthUtils.shared("secret-a") is ServiceAuthUtils.shared("secret-a")
+        assert ServiceAuthUtils.shared("secret-a") is not ServiceAuthUtils.shared("secret-b")
+
+
+class TestVerifiedServiceTokenCache:
+    """Test the verified service token cache."""
+
+    def test_get_returns_cached_claims(self):
+        from lys.core.utils.auth import VerifiedServiceTokenCache
+
+        cache = VerifiedServiceTokenCache()
+        claims = {"service_name": "my-service", "exp": time.time() + 60}
+        cache.set("token", claims)
+
+        assert cache.get("token") is claims
+        assert cache.get("other-token") is None
+
+    def test_entry_dropped_at_exp(self):
+        from lys.core.utils.auth import VerifiedServiceTokenCache
+
+        cache = VerifiedServiceTokenCache()
+        exp = time.time() + 60
+        cache.set("token", {"exp": exp})
+
+        with patch("lys.core.utils.auth.time.time", return_value=exp):
+            assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_claims_without_future_exp_not_cached(self):
+        from lys.core.utils.auth import VerifiedServiceTokenCache
+
+        cache = VerifiedServiceTokenCache()
+        cache.set("no-exp", {"service_name": "my-service"})
+        cache.set("expired", {"exp": time.time() - 1})
+
+        assert len(cache) == 0
+
+    def test_bounded_lru(self):
+        from lys.core.utils.auth import VerifiedServiceTokenCache
+
+        cache = VerifiedServiceTokenCache(max_size=2)
+        exp = time.time() + 60
+        cache.set("a", {"exp": exp})
+        cache.set("b", {"exp": exp})
+        cache.get("a")
+        cache.set("c", {"exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
 
 class TestNowUtc:
     """Test datetime utility."""
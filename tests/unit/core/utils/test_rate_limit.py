@@ -0,0 +1,189 @@
+"""
+Unit tests for the sliding window rate limiter.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from lys.core.utils.rate_limit import (
+    SLIDING_WINDOW_SCRIPT,
+    SlidingWindowRateLimiter,
+    check_webservice_rate_limit,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _hit_at(limiter, now, key="k", limit=3, redis_client=None):
+    with patch("lys.core.utils.rate_limit.time.time", return_value=now):
+        return _run(limiter.hit(key, limit, redis_client))
+
+
+class TestMemorySlidingWindow:
+
+    def test_allows_up_to_limit(self):
+        limiter = SlidingWindowRateLimiter()
+        assert [_hit_at(limiter, 600.0) for _ in range(4)] == [True, True, True, False]
+
+    def test_rejected_requests_are_not_counted(self):
+        limiter = SlidingWindowRateLimiter()
+        for _ in range(10):
+            _hit_at(limiter, 600.0)
+        assert limiter._memory_store["k"] == [10, 3, 0]
+
+    def test_previous_window_weighs_on_the_next(self):
+        limiter = SlidingWindowRateLimiter()
+        for _ in range(3):
+            _hit_at(limiter, 630.0)
+
+        # 15s into the next window, 3 * 0.75 = 2.25 of the previous window still count: room for 1
+        assert _hit_at(limiter, 675.0) is True
+        assert _hit_at(limiter, 675.0) is False
+        # 45s into it, only 0.75 (+ 1): room for 2 more
+        assert _hit_at(limiter, 705.0) is True
+        assert _hit_at(limiter, 705.0) is True
+        assert _hit_at(limiter, 705.0) is False
+
+    def test_counters_reset_after_two_windows(self):
+        limiter = SlidingWindowRateLimiter()
+        for _ in range(3):
+            _hit_at(limiter, 600.0)
+
+        assert _hit_at(limiter, 730.0) is True
+        assert limiter._memory_store["k"] == [12, 1, 0]
+
+    def test_keys_are_independent(self):
+        limiter = SlidingWindowRateLimiter()
+        assert _hit_at(limiter, 600.0, key="a", limit=1) is True
+        assert _hit_at(limiter, 600.0, key="a", limit=1) is False
+        assert _hit_at(limiter, 600.0, key="b", limit=1) is True
+
+    def test_lru_eviction_bounds_memory(self):
+        limiter = SlidingWindowRateLimiter(memory_max_keys=2)
+        _hit_at(limiter, 600.0, key="a")
+        _hit_at(limiter, 600.0, key="b")
+        _hit_at(limiter, 600.0, key="a")
+        _hit_at(limiter, 600.0, key="c")
+
+        assert list(limiter._memory_store) == ["a", "c"]
+
+    def test_configure_resizes_and_clears(self):
+        limiter = SlidingWindowRateLimiter()
+        _hit_at(limiter, 600.0)
+
+        limiter.configure(memory_max_keys=5)
+
+        assert limiter.memory_max_keys == 5
+        assert len(limiter._memory_store) == 0
+
+
+class TestRedisSlidingWindow:
+
+    def _redis(self, result=1):
+        script = AsyncMock(return_value=result)
+        redis_client = MagicMock()
+        redis_client.register_script = MagicMock(return_value=script)
+        return redis_client, script
+
+    def test_single_script_call(self):
+        limiter = SlidingWindowRateLimiter()
+        redis_client, script = self._redis()
+
+        assert _hit_at(limiter, 615.0, key="rate_limit:1.2.3.4", limit=60, redis_client=redis_client) is True
+
+        redis_client.register_script.assert_called_once_with(SLIDING_WINDOW_SCRIPT)
+        script.assert_awaited_once_with(
+            keys=["{rate_limit:1.2.3.4}:10", "{rate_limit:1.2.3.4}:9"],
+            args=[60, 0.75, 120],
+        )
+        assert len(limiter._memory_store) == 0
+
+    def test_rejected(self):
+        limiter = SlidingWindowRateLimiter()
+        redis_client, _ = self._redis(result=0)
+
+        assert _hit_at(limiter, 600.0, redis_client=redis_client) is False
+
+    def test_script_registered_again_for_new_client(self):
+        limiter = SlidingWindowRateLimiter()
+        first, _ = self._redis()
+        second, _ = self._redis()
+
+        _hit_at(limiter, 600.0, redis_client=first)
+        _hit_at(limiter, 600.0, redis_client=first)
+        _hit_at(limiter, 600.0, redis_client=second)
+
+        first.register_script.assert_called_once()
+        second.register_script.assert_called_once()
+
+    def test_failure_allows(self):
+        limiter = SlidingWindowRateLimiter()
+        redis_client, script = self._redis()
+        script.side_effect = ConnectionError("down")
+
+        assert _hit_at(limiter, 600.0, redis_client=redis_client) is True
+
+
+class TestCheckWebserviceRateLimit:
+
+    def _app_manager(self, config):
+        app_manager = MagicMock()
+        app_manager.settings.plugins = {"rate_limit": config} if config is not None else {}
+        app_manager.pubsub = None
+        return app_manager
+
+    def _context(self, connected_user=None, ip="10.0.0.1"):
+        context = MagicMock()
+        context.connected_user = connected_user
+        context.request.client.host = ip
+        return context
+
+    def test_no_limit_configured(self):
+        limiter = MagicMock()
+        with patch("lys.core.utils.rate_limit.rate_limiter", limiter):
+            assert _run(check_webservice_rate_limit(self._app_manager(None), "login", self._context())) is True
+        limiter.hit.assert_not_called()
+
+    def test_webservice_without_limit(self):
+        limiter = MagicMock()
+        app_manager = self._app_manager({"webservices": {"login": 5}})
+        with patch("lys.core.utils.rate_limit.rate_limiter", limiter):
+            assert _run(check_webservice_rate_limit(app_manager, "all_users", self._context())) is True
+        limiter.hit.assert_not_called()
+
+    def test_disabled(self):
+        limiter = MagicMock()
+        app_manager = self._app_manager({"enabled": False, "webservices": {"login": 5}})
+        with patch("lys.core.utils.rate_limit.rate_limiter", limiter):
+            assert _run(check_webservice_rate_limit(app_manager, "login", self._context())) is True
+        limiter.hit.assert_not_called()
+
+    def test_limited_per_connected_user(self):
+        limiter = SlidingWindowRateLimiter()
+        app_manager = self._app_manager({"webservices": {"export_users": 1}})
+        user = {"sub": "user-1"}
+
+        with patch("lys.core.utils.rate_limit.rate_limiter", limiter):
+            assert _run(check_webservice_rate_limit(app_manager, "export_users", self._context(user, "10.0.0.1"))) is True
+            # same user from another IP
+            assert _run(check_webservice_rate_limit(app_manager, "export_users", self._context(user, "10.0.0.2"))) is False
+            # another user
+            assert _run(check_webservice_rate_limit(
+                app_manager, "export_users", self._context({"sub": "user-2"}, "10.0.0.1")
+            )) is True
+
+        assert "rate_limit_ws:export_users:user:user-1" in limiter._memory_store
+
+    def test_limited_per_ip_when_anonymous(self):
+        limiter = SlidingWindowRateLimiter()
+        app_manager = self._app_manager({"webservices": {"login": 1}})
+
+        with patch("lys.core.utils.rate_limit.rate_limiter", limiter):
+            assert _run(check_webservice_rate_limit(app_manager, "login", self._context(ip="10.0.0.1"))) is True
+            assert _run(check_webservice_rate_limit(app_manager, "login", self._context(ip="10.0.0.1"))) is False
+            assert _run(check_webservice_rate_limit(app_manager, "login", self._context(ip="10.0.0.2"))) is True
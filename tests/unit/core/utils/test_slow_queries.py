@@ -0,0 +1,168 @@
+"""
+Unit tests for the slow SQL statement capture.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from lys.core.utils.slow_queries import (
+    SlowStatement,
+    get_parameters_shape,
+    save_slow_statements,
+    schedule_slow_statements_capture,
+)
+from lys.core.utils.sql_stats import SqlStats
+
+
+class TestGetParametersShape:
+
+    def test_mapping(self):
+        assert get_parameters_shape({"id_1": 3, "name": "a"}) == {"id_1": "int", "name": "str"}
+
+    def test_sequence(self):
+        assert get_parameters_shape(("a", None, 1.5)) == ["str", "NoneType", "float"]
+
+    def test_executemany(self):
+        assert get_parameters_shape([("a", 1), ("b", 2)]) == {"rows": 2, "parameters": ["str", "int"]}
+
+    def test_no_parameters(self):
+        assert get_parameters_shape(None) is None
+
+
+class TestSqlStatsSlowStatements:
+
+    def test_keeps_statements_above_threshold(self):
+        stats = SqlStats(slow_threshold=0.1)
+        stats.record("SELECT * FROM t WHERE id = $1", 0.05, "items", ("a",))
+        stats.record("SELECT * FROM t WHERE id IN ($1, $2)", 0.2, "items", ("a", "b"))
+
+        assert len(stats.slow_statements) == 1
+        slow_statement = stats.slow_statements[0]
+        assert slow_statement.as_dict() == {
+            "statement": "SELECT * FROM t WHERE id IN (?)",
+            "parameters": ["str", "str"],
+            "duration_ms": 200.0,
+            "resolver_path": "items",
+        }
+        # not sampled: the values are not kept
+        assert slow_statement.explain is None
+
+    def test_disabled_by_default(self):
+        stats = SqlStats()
+        stats.record("SELECT 1", 10, None)
+
+        assert stats.slow_statements == []
+
+    def test_sampled_statements_keep_their_parameters(self):
+        stats = SqlStats(slow_threshold=0.1, explain_rate=1)
+        stats.record("SELECT $1", 0.2, None, ("a",))
+        stats.record("INSERT INTO t VALUES ($1)", 0.2, None, [("a",), ("b",)], executemany=True)
+
+        assert stats.slow_statements[0].explain == ("SELECT $1", ("a",))
+        assert stats.slow_statements[1].explain is None
+
+
+class TestSaveSlowStatements:
+
+    def _app_manager(self, database_type, log_service, plan=None):
+        app_manager = MagicMock()
+        app_manager.registry.services.get.return_value = log_service
+        app_manager.database.settings.type = database_type
+
+        @asynccontextmanager
+        async def get_session():
+            yield "log-session"
+
+        app_manager.database.get_session = get_session
+
+        connection = MagicMock()
+        connection.exec_driver_sql = AsyncMock(return_value=MagicMock(scalar_one=MagicMock(return_value=plan)))
+
+        @asynccontextmanager
+        async def connect():
+            yield connection
+
+        app_manager.database.get_engine.return_value.connect = connect
+        return app_manager, connection
+
+    def _slow_statement(self, explain=None):
+        return SlowStatement("SELECT * FROM t WHERE id = ?", ["str"], 0.5, "items", explain)
+
+    def test_creates_one_log_per_statement(self):
+        log_service = MagicMock(create=AsyncMock())
+        app_manager, _ = self._app_manager("sqlite", log_service)
+
+        asyncio.run(save_slow_statements(app_manager, [self._slow_statement()], "all_items", "user-1"))
+
+        args, kwargs = log_service.create.await_args
+        assert args == ("log-session",)
+        assert kwargs["file_name"] == "all_items"
+        assert kwargs["traceback"] == "SELECT * FROM t WHERE id = ?"
+        assert kwargs["context"] == {
+            "statement": "SELECT * FROM t WHERE id = ?",
+            "parameters": ["str"],
+            "duration_ms": 500.0,
+            "resolver_path": "items",
+            "webservice_name": "all_items",
+            "connected_user_id": "user-1",
+        }
+
+    def test_postgresql_sampled_statement_is_explained(self):
+        log_service = MagicMock(create=AsyncMock())
+        app_manager, connection = self._app_manager("postgresql", log_service, plan='[{"Plan": {}}]')
+        slow_statement = self._slow_statement(("SELECT * FROM t WHERE id = $1", ("a",)))
+
+        asyncio.run(save_slow_statements(app_manager, [slow_statement], "all_items", None))
+
+        connection.exec_driver_sql.assert_awaited_once_with(
+            "EXPLAIN (FORMAT JSON) SELECT * FROM t WHERE id = $1", ("a",)
+        )
+        assert log_service.create.await_args.kwargs["context"]["explain"] == [{"Plan": {}}]
+        # values dropped once explained
+        assert slow_statement.explain is None
+
+    def test_explain_failure_still_saves(self):
+        log_service = MagicMock(create=AsyncMock())
+        app_manager, connection = self._app_manager("postgresql", log_service)
+        connection.exec_driver_sql.side_effect = RuntimeError("boom")
+
+        asyncio.run(save_slow_statements(
+            app_manager, [self._slow_statement(("SELECT 1", ()))], "all_items", None
+        ))
+
+        assert log_service.create.await_args.kwargs["context"]["explain"] is None
+
+    def test_save_errors_are_swallowed(self):
+        log_service = MagicMock(create=AsyncMock(side_effect=RuntimeError("boom")))
+        app_manager, _ = self._app_manager("sqlite", log_service)
+
+        asyncio.run(save_slow_statements(app_manager, [self._slow_statement()], None, None))
+
+    def test_no_log_service(self):
+        app_manager, _ = self._app_manager("sqlite", None)
+
+        asyncio.run(save_slow_statements(app_manager, [self._slow_statement()], None, None))
+
+
+class TestScheduleSlowStatementsCapture:
+
+    def test_nothing_to_capture(self):
+        async def run():
+            return schedule_slow_statements_capture(MagicMock(), [], None, None)
+
+        assert asyncio.run(run()) is None
+
+    def test_runs_in_background(self):
+        log_service = MagicMock(create=AsyncMock())
+        app_manager = TestSaveSlowStatements()._app_manager("sqlite", log_service)[0]
+        slow_statement = SlowStatement("SELECT 1", [], 0.5, None)
+
+        async def run():
+            task = schedule_slow_statements_capture(app_manager, [slow_statement], None, None)
+            # scheduled, not run yet
+            assert log_service.create.await_count == 0
+            await task
+
+        asyncio.run(run())
+
+        assert log_service.create.await_count == 1
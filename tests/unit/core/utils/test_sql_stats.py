@@ -0,0 +1,142 @@
+"""
+Unit tests for the per-operation SQL instrumentation.
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from lys.core.utils.sql_stats import (
+    SqlStats,
+    activate_sql_stats,
+    deactivate_sql_stats,
+    instrument_engine,
+    normalize_statement,
+    reset_resolver_path,
+    set_resolver_path,
+)
+
+
+class TestNormalizeStatement:
+
+    def test_squeezes_whitespace(self):
+        assert normalize_statement("SELECT a\n  FROM  t") == "SELECT a FROM t"
+
+    def test_collapses_in_lists(self):
+        assert normalize_statement("SELECT a FROM t WHERE id IN (?, ?, ?)") == \
+            normalize_statement("SELECT a FROM t WHERE id IN (?)")
+
+    def test_replaces_numbered_placeholders(self):
+        assert normalize_statement("SELECT a FROM t WHERE id = $1 AND b IN ($2, $3)") == \
+            "SELECT a FROM t WHERE id = ? AND b IN (?)"
+
+    def test_replaces_named_placeholders(self):
+        assert normalize_statement("SELECT a FROM t WHERE id = %(id_1)s") == "SELECT a FROM t WHERE id = ?"
+
+    def test_keeps_postgresql_casts(self):
+        assert normalize_statement("SELECT a FROM t WHERE id = $1::UUID") == "SELECT a FROM t WHERE id = ?::UUID"
+
+
+class TestSqlStats:
+
+    def test_totals_and_paths(self):
+        stats = SqlStats()
+        stats.record("SELECT 1", 0.002, "users")
+        stats.record("SELECT 2", 0.001, "users.edges.node.status")
+        stats.record("SELECT 3", 0.001, None)
+
+        result = stats.as_dict()
+
+        assert result["statements"] == 3
+        assert result["duration_ms"] == 4.0
+        assert result["paths"]["users"] == {"statements": 1, "duration_ms": 2.0}
+        assert result["paths"][""]["statements"] == 1
+
+    def test_n_plus_one_above_threshold(self):
+        stats = SqlStats(n_plus_one_threshold=2)
+        for _ in range(3):
+            stats.record("SELECT * FROM status WHERE id = $1", 0.001, "users.edges.node.status")
+        stats.record("SELECT * FROM users", 0.001, "users")
+
+        assert stats.get_n_plus_one() == [{
+            "path": "users.edges.node.status",
+            "statement": "SELECT * FROM status WHERE id = ?",
+            "count": 3,
+        }]
+
+    def test_same_count_as_threshold_is_not_flagged(self):
+        stats = SqlStats(n_plus_one_threshold=3)
+        for _ in range(3):
+            stats.record("SELECT * FROM status WHERE id = $1", 0.001, "users.edges.node.status")
+
+        assert stats.get_n_plus_one() == []
+
+    def test_n_plus_one_disabled(self):
+        stats = SqlStats(n_plus_one_threshold=0)
+        for _ in range(50):
+            stats.record("SELECT 1", 0.001, "a")
+
+        assert stats.get_n_plus_one() == []
+
+
+class TestInstrumentEngine:
+
+    def _run(self, scenario):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            instrument_engine(engine.sync_engine)
+            # idempotent
+            instrument_engine(engine.sync_engine)
+            try:
+                return await scenario(engine)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(run())
+
+    def test_records_statements_of_active_context(self):
+        async def scenario(engine):
+            stats = SqlStats()
+            token = activate_sql_stats(stats)
+            try:
+                async with engine.connect() as conn:
+                    path_token = set_resolver_path("users")
+                    await conn.execute(text("SELECT 1"))
+                    reset_resolver_path(path_token)
+                    await conn.execute(text("SELECT 2"))
+            finally:
+                deactivate_sql_stats(token)
+            return stats
+
+        stats = self._run(scenario)
+
+        assert stats.statement_count == 2
+        assert stats.paths["users"][0] == 1
+        assert stats.paths[""][0] == 1
+        assert stats.duration > 0
+
+    def test_ignores_statements_without_active_stats(self):
+        async def scenario(engine):
+            stats = SqlStats()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return stats
+
+        assert self._run(scenario).statement_count == 0
+
+    def test_attributes_statements_to_their_task(self):
+        async def scenario(engine):
+            first, second = SqlStats(), SqlStats()
+
+            async def run_with(stats, count):
+                activate_sql_stats(stats)
+                async with engine.connect() as conn:
+                    for _ in range(count):
+                        await conn.execute(text("SELECT 1"))
+
+            await asyncio.gather(run_with(first, 2), run_with(second, 3))
+            return first, second
+
+        first, second = self._run(scenario)
+
+        assert (first.statement_count, second.statement_count) == (2, 3)